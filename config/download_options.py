@@ -3,8 +3,10 @@
 ダウンロードオプション管理 - 型安全なAPI
 """
 
-from dataclasses import dataclass, field, asdict
-from typing import Optional, Dict, Any, Literal
+import copy
+import threading
+from dataclasses import dataclass, field, asdict, FrozenInstanceError
+from typing import Optional, Dict, Any, Literal, ClassVar
 from enum import Enum
 
 
@@ -87,8 +89,15 @@ class DownloadOptions:
     
     全てのダウンロード設定を型安全に管理するデータクラス。
     GUI依存を排除し、バリデーションとデフォルト値を提供。
+    
+    freeze() で変更不可のスナップショットを作成でき、ダウンロード中の
+    ワーカースレッドはTk変数の代わりにこのスナップショットを参照する。
     """
     
+    _frozen: ClassVar[bool] = False
+    # 最後にメインスレッドで読み取ったスナップショット（メインスレッドが応答しない場合に再利用）
+    _last_gui_snapshot: ClassVar[Optional['DownloadOptions']] = None
+    
     # === 基本設定 ===
     wait_time: int = 1  # ページ間の待機時間（秒）
     sleep_value: int = 3  # スリープ値（秒）
@@ -118,8 +127,23 @@ class DownloadOptions:
     
     # === 圧縮設定 ===
     compression_enabled: str = "off"  # "on" | "off"
-    compression_format: str = "ZIP"  # "ZIP" | "7Z" | "RAR"
+    compression_format: str = "ZIP"  # "ZIP" | "7Z" | "TAR" | "TAR.XZ" | "TAR.ZST"
     compression_delete_original: bool = False
+    compression_delete_folder: bool = False  # 圧縮後にフォルダごと削除
+    compression_stream_direct: bool = False  # ダウンロード中に直接ZIPへ書き込む
+    compression_profile: str = "自動（画像は無圧縮）"  # ZIPエントリの圧縮方式
+    compression_sample_unknown: bool = True  # 不明な形式は先頭を試し圧縮して判定
+    compression_max_workers: int = 1  # 同時に実行する圧縮数
+    compression_level: str = "自動"  # TAR・7Zの圧縮レベル（自動は画像主体なら高速）
+    
+    # === ライブラリ索引 ===
+    library_skip_existing: bool = True  # ダウンロード済みのギャラリーをスキップ
+    
+    # === DLログ（ギャラリー情報の保存） ===
+    dl_log_enabled: bool = False
+    dl_log_individual_save: bool = False  # ギャラリーごとにフォルダへ保存
+    dl_log_batch_save: bool = False  # 全URL完了時に保存先ルートへ一括保存
+    dl_log_file_format: str = "HTML"  # "HTML" | "CSV" | "TEXT"
     
     # === エラーハンドリング ===
     error_handling_mode: str = "manual"  # ErrorHandlingMode
@@ -141,6 +165,7 @@ class DownloadOptions:
     # === 画像処理 ===
     preserve_animation: bool = True
     jpg_quality: int = 85
+    interpolation_mode: str = "三次補完（画質優先）"
     
     # === ファイル処理 ===
     duplicate_file_mode: str = "overwrite"  # DuplicateMode
@@ -158,6 +183,13 @@ class DownloadOptions:
     selenium_session_retry_enabled: bool = False
     selenium_persistent_enabled: bool = False
     selenium_page_retry_enabled: bool = False
+    selenium_always_enabled: bool = False  # 常時Selenium（全ページで使用）
+    selenium_use_for_page_info: bool = False  # ページ情報取得にもSeleniumを使う
+    
+    # === HTTPリトライ失敗時 ===
+    wait_for_auto_recovery: bool = True  # 自動再開を待つ
+    lower_security_level: bool = False  # SSLエラー時にセキュリティレベルを下げる
+    skip_certificate_verify: bool = False  # SSLエラー時に証明書検証をスキップ
     
     # === ダウンロード範囲 ===
     download_range_enabled: bool = False
@@ -169,6 +201,28 @@ class DownloadOptions:
     title: Optional[str] = None  # ギャラリータイトル（内部使用）
     folder_path: str = ""  # 保存フォルダパス（GUIから取得）
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self._frozen:
+            raise FrozenInstanceError(f"凍結済みのDownloadOptionsは変更できません: {name}")
+        super().__setattr__(name, value)
+    
+    @property
+    def is_frozen(self) -> bool:
+        return self._frozen
+    
+    def freeze(self) -> 'DownloadOptions':
+        """
+        変更不可のスナップショットを作成
+        
+        Returns:
+            凍結済みのコピー（既に凍結済みの場合は自身）
+        """
+        if self._frozen:
+            return self
+        snapshot = copy.deepcopy(self)
+        object.__setattr__(snapshot, '_frozen', True)
+        return snapshot
+    
     def validate(self) -> tuple[bool, str]:
         """
         オプションのバリデーション
@@ -300,14 +354,26 @@ class DownloadOptions:
             except:
                 return default
         
-        # ResizeValuesを構築
+        # ResizeValuesを構築（GUIは resize_values 辞書にStringVarを保持している）
+        gui_resize_values = getattr(parent, 'resize_values', None)
+        
+        def resize_value(key: str, attr_name: str, default: int) -> int:
+            if isinstance(gui_resize_values, dict) and key in gui_resize_values:
+                value = gui_resize_values[key]
+                try:
+                    value = value.get() if hasattr(value, 'get') else value
+                except Exception:
+                    return default
+                return safe_int(value, default)
+            return safe_int(safe_get(attr_name, default), default)
+        
         resize_values = ResizeValues(
-            height=safe_int(safe_get('height_limit', 1024), 1024),
-            width=safe_int(safe_get('width_limit', 1024), 1024),
-            short=safe_int(safe_get('short_side_limit', 1024), 1024),
-            long=safe_int(safe_get('long_side_limit', 1024), 1024),
-            percentage=safe_int(safe_get('percentage_value', 80), 80),
-            unified=safe_int(safe_get('unified_limit', 1600), 1600)
+            height=resize_value('height', 'height_limit', 1024),
+            width=resize_value('width', 'width_limit', 1024),
+            short=resize_value('short', 'short_side_limit', 1024),
+            long=resize_value('long', 'long_side_limit', 1024),
+            percentage=resize_value('percentage', 'percentage_value', 80),
+            unified=resize_value('unified', 'unified_limit', 1600)
         )
         
         return cls(
@@ -333,6 +399,17 @@ class DownloadOptions:
             compression_enabled=safe_get('compression_enabled', "off"),
             compression_format=safe_get('compression_format', "ZIP"),
             compression_delete_original=safe_bool(safe_get('compression_delete_original', False), False),
+            compression_delete_folder=safe_bool(safe_get('compression_delete_folder', False), False),
+            compression_stream_direct=safe_bool(safe_get('compression_stream_direct', False), False),
+            compression_profile=safe_get('compression_profile', "自動（画像は無圧縮）"),
+            compression_sample_unknown=safe_bool(safe_get('compression_sample_unknown', True), True),
+            compression_max_workers=max(1, safe_int(safe_get('compression_max_workers', 1), 1)),
+            compression_level=safe_get('compression_level', "自動"),
+            library_skip_existing=safe_bool(safe_get('library_skip_existing', True), True),
+            dl_log_enabled=safe_bool(safe_get('dl_log_enabled', False), False),
+            dl_log_individual_save=safe_bool(safe_get('dl_log_individual_save', False), False),
+            dl_log_batch_save=safe_bool(safe_get('dl_log_batch_save', False), False),
+            dl_log_file_format=safe_get('dl_log_file_format', "HTML"),
             error_handling_mode=safe_get('error_handling_mode', "manual"),
             auto_resume_delay=safe_int(safe_get('auto_resume_delay', 5), 5),
             retry_delay_increment=safe_int(safe_get('retry_delay_increment', 10), 10),
@@ -346,6 +423,7 @@ class DownloadOptions:
             multithread_count=safe_int(safe_get('multithread_count', 3), 3),
             preserve_animation=safe_bool(safe_get('preserve_animation', True), True),
             jpg_quality=safe_int(safe_get('jpg_quality', 85), 85),
+            interpolation_mode=safe_get('interpolation_mode', "三次補完（画質優先）"),
             duplicate_file_mode=safe_get('duplicate_file_mode', "overwrite"),
             skip_count=safe_int(safe_get('skip_count', 10), 10),
             skip_after_count_enabled=safe_bool(safe_get('skip_after_count_enabled', False), False),
@@ -357,12 +435,77 @@ class DownloadOptions:
             selenium_session_retry_enabled=safe_bool(safe_get('selenium_session_retry_enabled', False), False),
             selenium_persistent_enabled=safe_bool(safe_get('selenium_persistent_enabled', False), False),
             selenium_page_retry_enabled=safe_bool(safe_get('selenium_page_retry_enabled', False), False),
+            selenium_always_enabled=safe_bool(safe_get('selenium_always_enabled', False), False),
+            selenium_use_for_page_info=safe_bool(safe_get('selenium_use_for_page_info', False), False),
+            wait_for_auto_recovery=safe_bool(safe_get('wait_for_auto_recovery', True), True),
+            lower_security_level=safe_bool(safe_get('lower_security_level', False), False),
+            skip_certificate_verify=safe_bool(safe_get('skip_certificate_verify', False), False),
             download_range_enabled=safe_bool(safe_get('download_range_enabled', False), False),
             download_range_mode=safe_get('download_range_mode', "全てのURL"),
             download_range_start=safe_get('download_range_start', ""),
-            download_range_end=safe_get('download_range_end', "")
+            download_range_end=safe_get('download_range_end', ""),
+            folder_path=safe_get('folder_var', "")
         )
     
+    @classmethod
+    def snapshot_from_gui(cls, parent: Any, timeout: float = 5.0) -> 'DownloadOptions':
+        """
+        GUIから凍結済みスナップショットを生成
+        
+        Tk変数の読み取りはメインスレッドで行う。ワーカースレッドから呼ばれた場合は
+        root.after でメインスレッドに読み取りを依頼し、結果を待つ。
+        ワーカースレッドからTk変数を直接読むことはない。
+        
+        Args:
+            parent: GUIオブジェクト（rootを持つメインウィンドウ）
+            timeout: メインスレッドの応答を待つ秒数（超えた場合は前回のスナップショットを使用）
+            
+        Returns:
+            凍結済みDownloadOptionsインスタンス
+            
+        Raises:
+            TimeoutError: メインスレッドが応答せず、前回のスナップショットも無い場合
+        """
+        root = getattr(parent, 'root', None)
+        if root is None or threading.current_thread() is threading.main_thread():
+            return cls._remember_snapshot(cls.from_gui(parent).freeze())
+        
+        result: Dict[str, Any] = {}
+        done = threading.Event()
+        
+        def capture():
+            try:
+                result['options'] = cls.from_gui(parent)
+            except Exception as e:
+                result['error'] = e
+            finally:
+                done.set()
+        
+        try:
+            root.after(0, capture)
+        except Exception:
+            # メインループ停止後など
+            return cls._last_snapshot_or_raise("メインループが停止しています")
+        
+        if not done.wait(timeout):
+            # メインスレッドがこのスレッドを待っている場合などのデッドロック回避
+            return cls._last_snapshot_or_raise(f"メインスレッドが{timeout}秒以内に応答しませんでした")
+        if 'error' in result:
+            raise result['error']
+        return cls._remember_snapshot(result['options'].freeze())
+    
+    @classmethod
+    def _remember_snapshot(cls, snapshot: 'DownloadOptions') -> 'DownloadOptions':
+        DownloadOptions._last_gui_snapshot = snapshot
+        return snapshot
+    
+    @classmethod
+    def _last_snapshot_or_raise(cls, reason: str) -> 'DownloadOptions':
+        snapshot = DownloadOptions._last_gui_snapshot
+        if snapshot is None:
+            raise TimeoutError(f"GUIからオプションを取得できません: {reason}")
+        return snapshot
+    
     def __repr__(self) -> str:
         """デバッグ用文字列表現"""
         return (
@@ -72,6 +72,7 @@ class CompletionCoordinator:
             self._update_state(context)
             print("[DEBUG] CompletionCoordinator: 状態更新後、GUI更新イベント送信前")
             self._send_gui_update_event(context)
+            self._record_library(context)
             print("[DEBUG] CompletionCoordinator: GUI更新イベント送信後、圧縮処理前")
             if context.options.get('compression_enabled'):
                 print("[DEBUG] CompletionCoordinator: 圧縮処理開始")
@@ -119,6 +120,26 @@ class CompletionCoordinator:
         normalized_url = self.session_manager.ui_bridge.normalize_url(context.url)
         self.state_manager.set_url_status(normalized_url, 'completed')
     
+    def _record_library(self, context: CompletionContext):
+        """ライブラリ索引へ記録（圧縮前に記録し、圧縮後はアーカイブとして解決される）"""
+        try:
+            if not context.save_folder or not hasattr(self.core, 'library_index'):
+                return
+            from core.managers.library_index import STATE_COMPLETED, STATE_INCOMPLETE
+            normalized_url = self.session_manager.ui_bridge.normalize_url(context.url)
+            self.core.library_index.record(
+                normalized_url,
+                context.save_folder,
+                pages=context.actual_total_pages,
+                state=STATE_INCOMPLETE if context.has_errors else STATE_COMPLETED,
+                title=getattr(self.core, 'current_gallery_title', '') or ''
+            )
+        except Exception as e:
+            self.session_manager.ui_bridge.post_log(
+                f"[CompletionCoordinator] ライブラリ索引の記録エラー: {e}",
+                "warning"
+            )
+    
     def _send_gui_update_event(self, context: CompletionContext):
         """GUI更新イベント送信"""
         def update_gui():
@@ -31,6 +31,16 @@ from core.handlers.resume_manager import ResumeManager
 from core.handlers.download_flow_manager import DownloadFlowManager
 from core.handlers.image_processor import ImageProcessor
 from core.handlers.compression_manager import CompressionManager
+from core.handlers.post_processor import PostProcessingStage
+from core.handlers.gallery_manifest import GalleryManifest
+from core.models.image_page_urls import compact_image_page_urls, decode_image_page_urls
+from core.models.gallery_page import GalleryPage, extract_image_page_urls, extract_tags, find_gallery_link
+from core.stage_metrics import (
+    get_stage_metrics, host_of, gallery_key_of,
+    STAGE_INDEX_CRAWL, STAGE_TRANSFER, STAGE_SAVE, STAGE_POST_PROCESS, STAGE_RATE_LIMIT_WAIT,
+    STAGE_RETRY_BACKOFF
+)
+from utils.image_ops import detect_animation, run_post_process_job
 from core.progress_tracker import ProgressTracker, DownloadPhase, ThrottledProgressObserver
 
 class EHDownloaderCore:
@@ -74,6 +84,12 @@ class EHDownloaderCore:
         # ⭐Phase7: ImageProcessor - 画像処理を分離⭐
         self.image_processor = ImageProcessor(self)
         
+        # ⭐画像後処理ステージ（JPG変換・リサイズをプロセスプールで実行）⭐
+        self.post_processor = PostProcessingStage(self)
+        # ⭐工程別の所要時間（パフォーマンスパネル・バッチ終了時のJSON出力用）⭐
+        self.stage_metrics = get_stage_metrics()
+        self.post_processor.on_resize_complete = self.image_processor.on_gallery_resize_complete
+        
         # ⭐Phase7: CompressionManager - 圧縮処理を分離⭐
         self.compression_manager = CompressionManager(self)
         
@@ -81,6 +97,14 @@ class EHDownloaderCore:
         from core.managers.gallery_info_manager import GalleryInfoManager
         self.gallery_info_manager = GalleryInfoManager(self)
         
+        # ⭐ダウンロード済みギャラリーの索引（gid → 保存先・完了状態）⭐
+        from core.managers.library_index import LibraryIndex
+        self.library_index = LibraryIndex(self)
+        
+        # ⭐未完了ギャラリーの修復（プレースホルダー・未完了フォルダの不足ページのみ再取得）⭐
+        from core.managers.repair_manager import RepairManager
+        self.repair_manager = RepairManager(self)
+        
         # ⭐Phase9: ValidationManager - 検証処理を分離⭐
         from core.managers.validation_manager import ValidationManager
         self.validation_manager = ValidationManager(self)
@@ -335,22 +359,37 @@ class EHDownloaderCore:
             enabled: Seleniumを有効化するかどうか
         """
         try:
-            # ⭐Phase2: UIBridge経由でアクセス⭐
+            # ワーカーは凍結済みスナップショットを参照するため、バッチ中の変更はここで上書きする
+            self._selenium_always_override = enabled
+            
+            # ⭐Phase2: UIBridge経由でアクセス（Tk変数の更新はメインスレッドで行う）⭐
             ui_bridge = self.session_manager.ui_bridge
-            old_value = ui_bridge.get_option_value('selenium_always_enabled')
-            if old_value is not None:
-                if ui_bridge.set_option_value('selenium_always_enabled', enabled):
-                    # 状態変更を通知
-                    ui_bridge.publish_state_change('selenium_always_enabled', enabled, old_value)
-                    ui_bridge.post_log(f"【Selenium GUI更新】{old_value} → {enabled}")
+            
+            def apply():
+                old_value = ui_bridge.get_option_value('selenium_always_enabled')
+                if old_value is not None:
+                    if ui_bridge.set_option_value('selenium_always_enabled', enabled):
+                        # 状態変更を通知
+                        ui_bridge.publish_state_change('selenium_always_enabled', enabled, old_value)
+                        ui_bridge.post_log(f"【Selenium GUI更新】{old_value} → {enabled}")
+                    else:
+                        ui_bridge.post_log("【Selenium GUI更新】設定に失敗しました", "warning")
                 else:
-                    ui_bridge.post_log("【Selenium GUI更新】設定に失敗しました", "warning")
-            else:
-                ui_bridge.post_log("【Selenium GUI更新】selenium_always_enabled変数が見つかりません", "warning")
+                    ui_bridge.post_log("【Selenium GUI更新】selenium_always_enabled変数が見つかりません", "warning")
+            
+            if not ui_bridge.execute_gui_async(apply):
+                ui_bridge.post_log("【Selenium GUI更新】GUIスレッドに更新を依頼できませんでした", "warning")
                 
         except Exception as e:
             self.session_manager.ui_bridge.post_log(f"【Selenium GUI更新】エラー: {e}", "error")
     
+    def _is_selenium_always_enabled(self) -> bool:
+        """常時Seleniumが有効か（スナップショット、バッチ中に内部で切り替えた場合はその値）"""
+        override = getattr(self, '_selenium_always_override', None)
+        if override is not None:
+            return override
+        return self.get_options_snapshot().selenium_always_enabled
+    
     def _invalidate_url_cache(self) -> None:
         """URLキャッシュを無効化（ロック不要）"""
         self.url_cache_valid = False
@@ -488,6 +527,7 @@ class EHDownloaderCore:
         self.current_gallery_url = ""
         self.current_image_page_url = ""
         self.current_save_folder = ""
+        self.gallery_manifest = None  # 現在のギャラリーフォルダのマニフェスト
         # self.current_gallery_title = ""  # StateManagerで一元管理に移行
         self.gallery_metadata = {}
         self.artist = ""
@@ -883,8 +923,8 @@ class EHDownloaderCore:
             Dict[str, Any]: オプション辞書（後方互換性のため辞書形式で返す）
         """
         try:
-            # ⭐統合: DownloadOptions クラスAPIを使用⭐
-            options = DownloadOptions.from_gui(self.parent)
+            # ⭐統合: DownloadOptions クラスAPIを使用（Tk変数はメインスレッドで読み取る）⭐
+            options = DownloadOptions.snapshot_from_gui(self.parent)
             
             # バリデーション
             is_valid, error_msg = options.validate()
@@ -898,15 +938,10 @@ class EHDownloaderCore:
             # 辞書形式に変換（後方互換性のため）
             options_dict = options.to_dict()
             
-            # folder_path を追加（DownloadOptionsに含まれていない）
+            # folder_path のデフォルト補完（スナップショット取得時にfolder_varから読み取り済み）
             import os
-            default_folder = os.path.join(os.path.expanduser("~"), "Documents")
-            folder_path = getattr(self.parent, 'folder_var', default_folder)
-            if hasattr(folder_path, 'get'):
-                folder_path = folder_path.get()
-            if not folder_path:
-                folder_path = default_folder
-            options_dict['folder_path'] = folder_path
+            if not options_dict.get('folder_path'):
+                options_dict['folder_path'] = os.path.join(os.path.expanduser("~"), "Documents")
             
             # resize_valuesがResizeValuesオブジェクトの場合は辞書に変換
             if hasattr(options_dict.get('resize_values'), 'to_dict'):
@@ -996,12 +1031,39 @@ class EHDownloaderCore:
     
     def _get_resize_values_safely(self) -> Optional[tuple]:
         """
-        resize_valuesを安全に取得(ImageProcessorへ委譲)
+        resize_valuesを安全に取得（オプションのスナップショットから）
         
         Returns:
             リサイズ値タプルまたはNone
         """
-        return self.image_processor.get_resize_values_safely()
+        return self.get_options_snapshot().resize_values.to_dict()
+    
+    def get_options_snapshot(self) -> DownloadOptions:
+        """
+        現在のギャラリーのオプションスナップショットを取得
+        
+        ダウンロード中のワーカースレッドはTk変数を直接読まずにこれを参照する。
+        ギャラリー開始前に呼ばれた場合はGUIから作成する。
+        
+        Returns:
+            凍結済みDownloadOptions
+        """
+        snapshot = getattr(self, 'options_snapshot', None)
+        if snapshot is None:
+            snapshot = self._create_options_snapshot(self._get_current_options())
+            self.options_snapshot = snapshot
+        return snapshot
+    
+    def _create_options_snapshot(self, options: Any) -> DownloadOptions:
+        """オプション（辞書またはDownloadOptions）から凍結済みスナップショットを作成"""
+        try:
+            if isinstance(options, DownloadOptions):
+                return options.freeze()
+            if isinstance(options, dict):
+                return DownloadOptions.from_dict(options).freeze()
+        except Exception as e:
+            self.session_manager.ui_bridge.post_log(f"オプションスナップショット作成エラー: {e}", "warning")
+        return DEFAULT_OPTIONS.freeze()
     
     def _start_compression_task(self, folder_path: str, url: Optional[str] = None) -> None:
         """
@@ -1013,6 +1075,19 @@ class EHDownloaderCore:
         """
         return self.compression_manager.start_compression_task(folder_path, url)
     
+    def _check_all_compressions_complete(self) -> bool:
+        """
+        すべての圧縮（待機中を含む）が完了しているか（CompressionManagerへ委譲）
+        
+        Returns:
+            完了している場合True
+        """
+        return self.compression_manager.check_all_compressions_complete()
+    
+    def _get_pending_compression_count(self) -> int:
+        """待機中・実行中の圧縮ジョブ数を取得（CompressionManagerへ委譲）"""
+        return self.compression_manager.get_pending_compression_count()
+    
     def _compress_folder(self, folder_path: str) -> bool:
         """
         フォルダの圧縮処理（CompressionManagerへ委譲）
@@ -1444,6 +1519,13 @@ class EHDownloaderCore:
         # 完了フラグをリセット
         self._sequence_complete_executed = False
         
+        # 工程別の所要時間・HTTPのホスト別計測をバッチ単位で集計
+        self.stage_metrics.reset()
+        self.session_manager.http_client.metrics.reset()
+        
+        # 常時Seleniumの内部切り替えはバッチ単位（以降はGUIの設定に従う）
+        self._selenium_always_override = None
+        
         # 重複実行防止フラグをリセット
         self._start_next_download_running = False
         
@@ -1513,6 +1595,7 @@ class EHDownloaderCore:
         # ⭐重要: 現在のダウンロード状態をクリア⭐
         self.current_image_page_url = None
         self.current_save_folder = None
+        self.gallery_manifest = None
         self._resume_in_progress = False
         self.group = ""
         
@@ -1595,10 +1678,8 @@ class EHDownloaderCore:
                         if hasattr(self.parent, '_load_options_for_download'):
                             self.parent._load_options_for_download()
                         
-                        # オプションを辞書形式で取得
-                        from config.download_options import DownloadOptions
-                        options_obj = DownloadOptions.from_gui(self.parent)
-                        options = options_obj.to_dict()  # ⭐修正: 辞書に変換⭐
+                        # オプションを辞書形式で取得（Tk変数はメインスレッドで読み取る）
+                        options = self._get_current_options()
                         
                         # ダウンロード処理を開始
                         print(f"[DEBUG] _schedule_next_download: self._download_url_thread呼び出し直前 url={url[:50]}")
@@ -1878,11 +1959,12 @@ class EHDownloaderCore:
         
         # エラー時に未完了フォルダを記録
         if hasattr(self, 'current_save_folder') and self.current_save_folder:
-            if self.parent.rename_incomplete_folder.get():
+            if self.get_options_snapshot().rename_incomplete_folder:
                 if not hasattr(self, 'incomplete_folders'):
                     self.incomplete_folders = set()
                 self.incomplete_folders.add(self.current_save_folder)
             self.session_manager.ui_bridge.post_log(f"未完了フォルダとして記録: {os.path.basename(self.current_save_folder)}", "info")
+            self.compression_manager.close_stream(self.current_save_folder)
         if hasattr(self, 'session_manager') and hasattr(self.session_manager, 'ui_bridge'):
             self.session_manager.ui_bridge.post_event(UIEvent(
                 event_type=UIEventType.ERROR,
@@ -1943,6 +2025,9 @@ class EHDownloaderCore:
             options: ダウンロードオプション
         """
         try:
+            # ⭐このギャラリーの間は凍結済みスナップショットを参照（ワーカーからTk変数を読まない）⭐
+            self.options_snapshot = self._create_options_snapshot(options)
+            
             # 1. 初期化とバリデーション
             normalized_url = self._initialize_download(url, options)
             if not normalized_url:
@@ -2018,6 +2103,10 @@ class EHDownloaderCore:
                 self.session_manager.ui_bridge.post_log(f"ダウンロード範囲エラー: {error_msg}", "error")
                 return None
             
+            # ⭐ライブラリに完了済みとして存在するギャラリーはネットワークアクセスせずにスキップ⭐
+            if self._skip_if_in_library(normalized_url, options, range_info):
+                return None
+            
             # ⭐修正: セッション初期化は不要（http_clientがスレッドローカルで管理）⭐
             # SSL設定を適用（必要な場合のみ）
             if hasattr(self, '_configure_ssl_settings'):
@@ -2065,6 +2154,38 @@ class EHDownloaderCore:
             self.session_manager.ui_bridge.post_log(f"初期化エラー: {e}", "error")
             return None
     
+    def _skip_if_in_library(self, normalized_url: str, options: Dict[str, Any], range_info: Any) -> bool:
+        """ライブラリ索引で完了済みのギャラリーをスキップ
+        
+        範囲指定ダウンロード・復帰ポイントからの再開・リスタートの場合は照会しない。
+        
+        Returns:
+            bool: スキップした場合True
+        """
+        if not options.get('library_skip_existing', True) or range_info is not None:
+            return False
+        if getattr(self, '_is_restart', False) or self.state_manager.get_resume_point(normalized_url):
+            return False
+        
+        self.library_index.ensure_scanned(options.get('folder_path', ''))
+        entry = self.library_index.find_completed(normalized_url, verify=True)
+        if entry is None:
+            return False
+        
+        self.session_manager.ui_bridge.post_log(
+            f"📚 ダウンロード済みのためスキップ: {os.path.basename(entry['path'])} ({entry.get('pages', 0)}ページ)"
+        )
+        self.state_manager.set_url_status(normalized_url, 'skipped')
+        self.parent.url_status[normalized_url] = 'skipped'
+        if hasattr(self.parent, 'download_list_widget'):
+            self.parent.async_executor.execute_gui_async(
+                lambda: self.parent.download_list_widget.update_status(
+                    normalized_url, 'skipped', error_message=f"ダウンロード済み: {entry['path']}"
+                )
+            )
+        self._schedule_next_download("ライブラリ登録済み")
+        return True
+    
     def _prepare_download_context(self, normalized_url: str, options: Dict[str, Any]) -> DownloadContext:
         """ダウンロードコンテキストの準備（DownloadContext APIを使用）
         
@@ -2228,6 +2349,12 @@ class EHDownloaderCore:
                 "debug"
             )
             
+            # ⭐ギャラリー単位のリサイズ進捗の集計を開始⭐
+            self.post_processor.track_gallery(
+                save_folder, url,
+                total_pages if self.get_options_snapshot().resize_enabled == "on" else 0
+            )
+            
             # ダウンロード実行（gallery_pages全体を渡す）
             success = self._gallery_downloader.download_gallery_pages(
                 save_folder, start_page, total_pages, url,
@@ -2260,6 +2387,17 @@ class EHDownloaderCore:
             options: ダウンロードオプション
         """
         try:
+            # ⭐以降このギャラリーの後処理ジョブは増えないため、進捗の集計を確定⭐
+            normalized_url = self.parent.normalize_url(url)
+            completed = (not self.state_manager.download_state.error_occurred and
+                         self.state_manager.get_skip_requested_url() != normalized_url)
+            self.post_processor.seal_gallery(save_folder, completed)
+            # ⭐変換・リサイズの書き込みが終わってから完了処理（リネーム・記録・圧縮）を行う⭐
+            self.post_processor.wait_for_gallery(save_folder)
+            if not completed:
+                # ⭐直接ZIP書き込み中のファイルハンドルを解放（.part は再開用に残る）⭐
+                self.compression_manager.close_stream(save_folder)
+            
             self._handle_download_completion(url, save_folder, options)
         except Exception as e:
             self.session_manager.ui_bridge.post_log(f"完了処理エラー: {e}", "error")
@@ -2636,7 +2774,7 @@ class EHDownloaderCore:
                     self.last_download_folder = self.current_save_folder
                     
                     # 圧縮処理：完了状態のURLのみ対象
-                    if self.parent.compression_enabled.get() and current_url_status == "completed":
+                    if self.get_options_snapshot().compression_enabled == "on" and current_url_status == "completed":
                         try:
                             folder_to_compress = self.current_save_folder
                             # 最後のURLの場合のみis_runningをFalseに設定
@@ -2655,7 +2793,7 @@ class EHDownloaderCore:
                                     self.last_download_folder = self.current_save_folder
 
                                     # 圧縮処理：完了状態のURLのみ対象
-                                    if self.parent.compression_enabled.get() and current_url_status == "completed":
+                                    if self.get_options_snapshot().compression_enabled == "on" and current_url_status == "completed":
                                         try:
                                             folder_to_compress = self.current_save_folder
                                             # ⭐修正: 直接圧縮処理を開始（非同期実行）⭐
@@ -2819,7 +2957,9 @@ class EHDownloaderCore:
                 return None  # キャッシュ無効
             else:
                 # 範囲が変更されていない場合、キャッシュを使用
-                cached_info = resume_info['gallery_info']
+                # 再開ポイントにはURLリストがコンパクト形式（辞書）で保存されている
+                cached_info = dict(resume_info['gallery_info'])
+                cached_info['image_page_urls'] = decode_image_page_urls(cached_info.get('image_page_urls', []))
                 self.session_manager.ui_bridge.post_log(
                     f"✅ 復帰ポイントからgallery_infoを復元: {len(cached_info['image_page_urls'])}個のURL（初期変数取得をスキップ）"
                 )
@@ -2854,14 +2994,10 @@ class EHDownloaderCore:
         self.session_manager.ui_bridge.post_log(f"📥 ギャラリー情報を取得中... (URL: {normalized_url[:50]}...)", "info")
         
         # Seleniumを使用するかチェック
-        use_selenium = False
-        if hasattr(self.parent, 'selenium_always_enabled') and hasattr(self.parent, 'selenium_use_for_page_info'):
-            selenium_always_enabled = self.parent.selenium_always_enabled.get() if hasattr(self.parent.selenium_always_enabled, 'get') else False
-            selenium_use_for_page_info = self.parent.selenium_use_for_page_info.get() if hasattr(self.parent.selenium_use_for_page_info, 'get') else False
-            use_selenium = selenium_always_enabled and selenium_use_for_page_info
-            
-            if use_selenium:
-                self.session_manager.ui_bridge.post_log("[INFO] ページ情報取得にSeleniumを使用します")
+        use_selenium = (self._is_selenium_always_enabled() and
+                        self.get_options_snapshot().selenium_use_for_page_info)
+        if use_selenium:
+            self.session_manager.ui_bridge.post_log("[INFO] ページ情報取得にSeleniumを使用します")
         
         # HTMLを取得
         try:
@@ -2951,61 +3087,89 @@ class EHDownloaderCore:
                 self.session_manager.ui_bridge.post_log("警告: フォームが見つかりません。警告ページをスキップできない可能性があります。", "warning")
                 return html
     
-    def _extract_all_image_page_urls(self, html: str, normalized_url: str, start_page: int) -> tuple:
+    def _extract_all_image_page_urls(self, gallery_page: GalleryPage, normalized_url: str, start_page: int,
+                                     options: Optional[Dict[str, Any]] = None) -> tuple:
         """全画像ページURLを抽出（⭐Phase3: サイト固有ロジック⭐）
         
+        ダウンロード範囲が有効な場合は、範囲を含む一覧ページ（?p=N）だけを取得する。
+        その場合の戻り値は画像番号の位置にURLを置いたリスト（範囲外はNone）で、
+        _apply_download_range_filter のスライスと絶対ページ番号はそのまま使える。
+        
         Args:
-            html: ギャラリーページのHTML
+            gallery_page: 解析済みのギャラリーページ（1ページ目）
             normalized_url: 正規化されたギャラリーURL
             start_page: 開始ページ番号
+            options: ダウンロードオプション（範囲指定の判定用）
             
         Returns:
             tuple: (all_image_urls, total_images, total_pages)
         """
         # 総画像数を取得
-        pattern_total = re.compile(r'Showing \d+ - \d+ of ([\d,]+) images')
-        m = pattern_total.search(html)
-        if not m:
-            self.session_manager.ui_bridge.post_log(f"[DEBUG] 画像枚数パターンマッチ失敗。HTML長: {len(html)}文字")
-            if "Showing" in html:
-                showing_index = html.find("Showing")
-                self.session_manager.ui_bridge.post_log(f"[DEBUG] 'Showing'が見つかりました: {html[showing_index:showing_index+100]}")
-            else:
-                self.session_manager.ui_bridge.post_log(f"[DEBUG] HTMLに'Showing'が含まれていません。HTML先頭500文字: {html[:500]}")
+        if not gallery_page.has_image_count:
+            self.session_manager.ui_bridge.post_log(
+                f"[DEBUG] 画像枚数パターンマッチ失敗。ページタイトル: {gallery_page.html_title[:100]}"
+            )
             raise ValueError("画像枚数が取得できませんでした")
         
-        total_images = int(m.group(1).replace(',', ''))
-        pages = math.ceil(total_images / 20)
+        total_images = gallery_page.total_images
+        thumbs_per_page = gallery_page.thumbs_per_page
+        pages = math.ceil(total_images / thumbs_per_page)
         self.session_manager.ui_bridge.post_log(f"総画像数={total_images}, 総ページ数={pages}")
         
+        # ⭐ダウンロード範囲を含む一覧ページだけを取得⭐
+        needed_range = self._get_needed_image_range(options, total_images, start_page)
+        if needed_range is not None:
+            first_index, last_index = needed_range
+            planned_pages = list(range(first_index // thumbs_per_page, last_index // thumbs_per_page + 1))
+            self.session_manager.ui_bridge.post_log(
+                f"ダウンロード範囲の一覧ページのみ取得: {len(planned_pages)}/{pages}ページ "
+                f"(画像{first_index + 1}〜{last_index + 1})"
+            )
+        else:
+            planned_pages = list(range(pages))
+        partial = len(planned_pages) < pages
+        
         # ⭐Phase1: ProgressTracker で進捗を作成⭐
         url_index = 0  # 仮のURL識別子（後で実際のインデックスに変更可能）
         self.progress_tracker.create(
             url_index=url_index,
             phase=DownloadPhase.URL_FETCHING,
-            total=pages,
+            total=len(planned_pages),
             status="個別ページURL取得中"
         )
         
-        # タグとメタデータ抽出
-        all_tags = self._extract_all_tags(html)
+        # タグとメタデータ（解析済みのギャラリーページから反映）
+        all_tags = gallery_page.tags
         self.session_manager.ui_bridge.post_log(f"抽出されたタグ: {list(all_tags.keys())}")
         self._update_metadata_with_tags(all_tags)
-        self._extract_gallery_metadata(html, normalized_url)
+        self._apply_gallery_metadata(gallery_page)
         
         # 全画像ページURLを取得
         self.session_manager.ui_bridge.post_log("📥 個別ページのURLを取得中...")
         self.session_manager.ui_bridge.post_log(f"[DEBUG] URL取得ループ開始: pages={pages}, normalized_url={normalized_url[:80]}")
         all_image_urls = []
-        pattern_thumbs = re.compile(r'https://e-hentai\.org/s/[a-z0-9]+/\d+-\d+')
+        seen_image_urls = set()
+        gallery_key = gallery_key_of(normalized_url)
+        index_host = host_of(normalized_url)
+        
+        def iter_index_pages():
+            """取得する一覧ページ番号（範囲の画像が揃わなければ残りのページも取得）"""
+            nonlocal partial
+            yield from planned_pages
+            if partial and not self._covers_image_range(all_image_urls, needed_range):
+                self.session_manager.ui_bridge.post_log(
+                    "範囲の画像URLが揃わないため、残りの一覧ページも取得します", "warning"
+                )
+                partial = False
+                yield from (p for p in range(pages) if p not in planned_pages)
         
-        # 全ページを巡回してURL収集
+        # 一覧ページを巡回してURL収集
         self.session_manager.ui_bridge.post_log(f"[DEBUG] range(pages)作成完了、forループ開始")
-        for p in range(pages):
+        for fetched_count, p in enumerate(iter_index_pages(), start=1):
             self.session_manager.ui_bridge.post_log(f"[DEBUG] ループ反復 p={p}/{pages} 開始")
             # ⭐Phase1: ProgressTrackerで進捗更新⭐
             self.session_manager.ui_bridge.post_log(f"[DEBUG] p={p}: ProgressTracker更新開始")
-            self.progress_tracker.update(url_index, current=p + 1)
+            self.progress_tracker.update(url_index, current=fetched_count)
             self.session_manager.ui_bridge.post_log(f"[DEBUG] p={p}: ProgressTracker更新完了")
             
             # 進捗ログ（20ページごとに間引き）
@@ -3019,8 +3183,8 @@ class EHDownloaderCore:
             try:
                 self.session_manager.ui_bridge.post_log(f"[DEBUG] p={p}: HTML取得開始 (p==0: {p==0})")
                 if p == 0:
-                    html_page = html
-                    self.session_manager.ui_bridge.post_log(f"[DEBUG] p={p}: キャッシュHTML使用 (長さ: {len(html_page)})")
+                    thumbs = list(gallery_page.image_page_urls)
+                    self.session_manager.ui_bridge.post_log(f"[DEBUG] p={p}: 解析済みページ使用 ({len(thumbs)}個)")
                 else:
                     # ⭐HTTP GETリトライロジック（タイムアウト10秒、最大3回）⭐
                     html_page = None
@@ -3030,7 +3194,8 @@ class EHDownloaderCore:
                             self.session_manager.ui_bridge.post_log(
                                 f"[DEBUG] p={p}: HTTP GET開始 (試行{retry+1}/{max_retries}, timeout=10s, URL={url[:80]})"
                             )
-                            html_page = self.session_manager.http_client.get(url, timeout=10).text
+                            with self.stage_metrics.measure(STAGE_INDEX_CRAWL, gallery_key, index_host):
+                                html_page = self.session_manager.http_client.get(url, timeout=10).text
                             self.session_manager.ui_bridge.post_log(
                                 f"[DEBUG] p={p}: HTTP GET完了 (長さ: {len(html_page)}, 試行{retry+1}回目で成功)"
                             )
@@ -3046,7 +3211,7 @@ class EHDownloaderCore:
                                 self.session_manager.ui_bridge.post_log(
                                     f"[DEBUG] p={p}: {wait}秒待機後にリトライします..."
                                 )
-                                time.sleep(wait)
+                                self.stage_metrics.sleep(STAGE_RETRY_BACKOFF, wait, gallery_key, index_host)
                             else:
                                 # 最終試行でも失敗
                                 raise
@@ -3059,28 +3224,29 @@ class EHDownloaderCore:
                                 self.session_manager.ui_bridge.post_log(
                                     f"[DEBUG] p={p}: {wait}秒待機後にリトライします..."
                                 )
-                                time.sleep(wait)
+                                self.stage_metrics.sleep(STAGE_RETRY_BACKOFF, wait, gallery_key, index_host)
                             else:
                                 raise
                     
                     if html_page is None:
                         raise requests.exceptions.RequestException("HTTP GETが{max_retries}回失敗しました")
-                
-                self.session_manager.ui_bridge.post_log(f"[DEBUG] p={p}: 正規表現検索開始")
-                thumbs = pattern_thumbs.findall(html_page)
-                self.session_manager.ui_bridge.post_log(f"[DEBUG] p={p}: 正規表現検索完了 ({len(thumbs)}個発見)")
+                    
+                    self.session_manager.ui_bridge.post_log(f"[DEBUG] p={p}: 正規表現検索開始")
+                    thumbs = extract_image_page_urls(html_page)
+                    self.session_manager.ui_bridge.post_log(f"[DEBUG] p={p}: 正規表現検索完了 ({len(thumbs)}個発見)")
                 
                 self.session_manager.ui_bridge.post_log(f"[DEBUG] p={p}: URL追加ループ開始")
                 for thumb in thumbs:
-                    if thumb not in all_image_urls:
+                    if thumb not in seen_image_urls:
+                        seen_image_urls.add(thumb)
                         all_image_urls.append(thumb)
                 self.session_manager.ui_bridge.post_log(f"[DEBUG] p={p}: URL追加完了 (合計: {len(all_image_urls)}個)")
                 
                 # ページ間待機
                 if p > 0 and p < pages - 1:
-                    wait_time = float(self.parent.wait_time.get() or 1)
+                    wait_time = float(self.get_options_snapshot().wait_time or 1)
                     self.session_manager.ui_bridge.post_log(f"[DEBUG] p={p}: {wait_time}秒待機開始")
-                    time.sleep(wait_time)
+                    self.stage_metrics.sleep(STAGE_RATE_LIMIT_WAIT, wait_time, gallery_key, index_host)
                     self.session_manager.ui_bridge.post_log(f"[DEBUG] p={p}: 待機完了")
                     
             except requests.exceptions.RequestException as req_err:
@@ -3100,6 +3266,10 @@ class EHDownloaderCore:
         
         self.session_manager.ui_bridge.post_log(f"[DEBUG] forループ完全終了、合計{len(all_image_urls)}個のURL収集")
         
+        # 一部の一覧ページだけ取得した場合は、画像番号の位置に並べる
+        if partial:
+            all_image_urls = self._position_image_page_urls(all_image_urls, total_images)
+        
         # ⭐Phase1: URL取得完了⭐
         self.session_manager.ui_bridge.post_log(f"[DEBUG] ProgressTracker完了通知開始")
         self.progress_tracker.complete(url_index, status=f"✅ {len(all_image_urls)}個のURL取得完了")
@@ -3113,20 +3283,56 @@ class EHDownloaderCore:
         self.session_manager.ui_bridge.post_log(f"✅ 個別ページのURL取得完了: {len(all_image_urls)}個のURLを取得しました")
         return all_image_urls, total_images, pages
     
-    def _apply_download_range_filter(self, all_image_urls: list, options: Dict[str, Any], 
-                                     gallery_url: str) -> tuple:
-        """ダウンロード範囲フィルターを適用（⭐Phase3: 範囲ロジック分離⭐）
+    def _get_needed_image_range(self, options: Optional[Dict[str, Any]], total_images: int,
+                                start_page: int) -> Optional[tuple]:
+        """ダウンロード範囲が対象とする画像の位置（ギャラリー全体での0始まり、両端を含む）
         
-        Args:
-            all_image_urls: 全画像ページURL
-            options: ダウンロードオプション
-            gallery_url: ギャラリーURL
-            
         Returns:
-            tuple: (filtered_urls, download_range_info)
+            tuple: (first_index, last_index)、範囲指定が適用されない場合None
+        """
+        download_range = self._resolve_download_range(options)
+        if download_range is None:
+            return None
+        start_range, end_range = download_range
+        if end_range is not None and end_range < start_range:
+            # _apply_download_range_filter と同じく開始点から最後までとして扱う
+            end_range = None
+        # 開始ページ調整（start_page）の後のリストに範囲を適用するため、その分ずらす
+        offset = max(0, start_page - 1)
+        first_index = offset + start_range
+        last_index = total_images - 1 if end_range is None else min(offset + end_range, total_images - 1)
+        if first_index >= total_images:
+            # 範囲外（_apply_download_range_filter が中断を判断する）
+            return None
+        return first_index, last_index
+    
+    @staticmethod
+    def _covers_image_range(image_page_urls: list, needed_range: Optional[tuple]) -> bool:
+        """取得済みの画像ページURLが範囲内の画像をすべて含むか"""
+        if needed_range is None:
+            return True
+        numbers = {int(url.rsplit('-', 1)[1]) for url in image_page_urls}
+        first_index, last_index = needed_range
+        return all(number in numbers for number in range(first_index + 1, last_index + 2))
+    
+    @staticmethod
+    def _position_image_page_urls(image_page_urls: list, total_images: int) -> list:
+        """画像ページURLを画像番号（URL末尾の -N）の位置に並べる（未取得の位置はNone）"""
+        positioned = [None] * total_images
+        for url in image_page_urls:
+            number = int(url.rsplit('-', 1)[1])
+            if 1 <= number <= total_images:
+                positioned[number - 1] = url
+        return positioned
+    
+    def _resolve_download_range(self, options: Optional[Dict[str, Any]]) -> Optional[tuple]:
+        """このURLに適用するダウンロード範囲を取得
+        
+        Returns:
+            tuple: (start_range, end_range)（end_rangeはNoneで最後まで）、適用しない場合None
         """
         if not options or not options.get('download_range_enabled', False):
-            return all_image_urls, None
+            return None
         
         # 範囲モード確認
         range_mode = options.get('download_range_mode', "全てのURL")
@@ -3136,7 +3342,7 @@ class EHDownloaderCore:
         should_apply = (range_mode != "1行目のURLのみ") or (current_url_index == 0)
         
         if not should_apply:
-            return all_image_urls, None
+            return None
         
         # 範囲値取得
         start_range_str = self._get_download_range_value(options.get('download_range_start', '0'))
@@ -3146,7 +3352,25 @@ class EHDownloaderCore:
         end_range = int(end_range_str) if end_range_str and end_range_str.strip() else None
         
         if start_range == 0 and end_range is None:
+            return None
+        return start_range, end_range
+    
+    def _apply_download_range_filter(self, all_image_urls: list, options: Dict[str, Any], 
+                                     gallery_url: str) -> tuple:
+        """ダウンロード範囲フィルターを適用（⭐Phase3: 範囲ロジック分離⭐）
+        
+        Args:
+            all_image_urls: 全画像ページURL
+            options: ダウンロードオプション
+            gallery_url: ギャラリーURL
+            
+        Returns:
+            tuple: (filtered_urls, download_range_info)
+        """
+        download_range = self._resolve_download_range(options)
+        if download_range is None:
             return all_image_urls, None
+        start_range, end_range = download_range
         
         original_count = len(all_image_urls)
         
@@ -3228,53 +3452,22 @@ class EHDownloaderCore:
                 return cached_info
             
             # 3. HTMLフェッチ
-            html = self._fetch_gallery_html(normalized_gallery_url)
+            with self.stage_metrics.measure(STAGE_INDEX_CRAWL, gallery_key_of(normalized_gallery_url),
+                                            host_of(normalized_gallery_url)):
+                html = self._fetch_gallery_html(normalized_gallery_url)
+            
+            # 3.5. ギャラリーページを1回だけ解析（URL抽出・タグ・メタデータ・タイトルで共有）
+            gallery_page = GalleryPage.parse(html, normalized_gallery_url)
             
-            # 4. 全画像ページURL抽出
+            # 4. 全画像ページURL抽出（タグ・メタデータの反映を含む）
             # [DEBUG] print("!!! 画像URL抽出開始", flush=True)
             all_image_urls, total_images, pages = self._extract_all_image_page_urls(
-                html, normalized_gallery_url, start_page
+                gallery_page, normalized_gallery_url, start_page, options
             )
             # [DEBUG] print(f"!!! 画像URL抽出完了: total_images={total_images}, pages={pages}", flush=True)
             
-            # 4.5. タイトルとメタデータを抽出
-            # [DEBUG] print("!!! BeautifulSoup初期化開始", flush=True)
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html, 'html.parser')
-            # [DEBUG] print("!!! BeautifulSoup初期化完了", flush=True)
-            
-            # ⭐修正: タイトル取得（<h1 id="gn">優先、空の場合は<title>）⭐
-            # [DEBUG] print("!!! タイトル取得開始", flush=True)
-            title_elem = soup.find('h1', id='gn')
-            gallery_title = title_elem.get_text(strip=True) if title_elem else ""
-            
-            # ⭐追加: h1が空の場合、titleタグから取得⭐
-            if not gallery_title:
-                title_elem = soup.find('title')
-                gallery_title = title_elem.get_text(strip=True) if title_elem else "Unknown"
-            
-            # [DEBUG] print(f"!!! タイトル取得完了: title='{gallery_title}'", flush=True)
-            
-            # ⭐DEBUG: メタデータ抽出前⭐
-            # [DEBUG] print("!!! post_log呼び出し直前（メタデータ前）", flush=True)
-            self.session_manager.ui_bridge.post_log(
-                f"[DEBUG] _extract_gallery_metadata()呼び出し直前: title='{gallery_title}'",
-                "debug"
-            )
-            # [DEBUG] print("!!! post_log呼び出し完了（メタデータ前）", flush=True)
-            
-            # メタデータ抽出（後続処理で使用）
-            # [DEBUG] print("!!! _extract_gallery_metadata()呼び出し直前", flush=True)
-            self._extract_gallery_metadata(html, normalized_gallery_url)
-            # [DEBUG] print("!!! _extract_gallery_metadata()呼び出し完了", flush=True)
-            
-            # ⭐DEBUG: メタデータ抽出後⭐
-            # [DEBUG] print("!!! post_log呼び出し直前（メタデータ後）", flush=True)
-            self.session_manager.ui_bridge.post_log(
-                f"[DEBUG] _extract_gallery_metadata()完了",
-                "debug"
-            )
-            # [DEBUG] print("!!! post_log呼び出し完了（メタデータ後）", flush=True)
+            # 4.5. タイトル（<h1 id="gn">優先、空の場合は<title>）
+            gallery_title = gallery_page.display_title
             
             # 5. ダウンロード範囲フィルター適用
             # [DEBUG] print("!!! ダウンロード範囲フィルター開始", flush=True)
@@ -3286,7 +3479,7 @@ class EHDownloaderCore:
             # 6. 結果を構築
             result = {
                 'total_pages': len(filtered_urls),
-                'image_page_urls': filtered_urls,
+                'image_page_urls': compact_image_page_urls(filtered_urls),
                 'start_page': start_page,
                 'original_total': total_images,
                 'original_total_images': total_images,
@@ -3313,119 +3506,33 @@ class EHDownloaderCore:
             self.session_manager.ui_bridge.post_log(error_msg, "error")
             raise DownloadErrorException(error_msg)
 
-    def _extract_gallery_metadata(self, html: str, gallery_url: Optional[str] = None) -> None:
+    def _apply_gallery_metadata(self, gallery_page: GalleryPage) -> None:
         """
-        ギャラリーページからメタデータを抽出
+        解析済みのギャラリーページからメタデータを反映
         
         Args:
-            html: ギャラリーページのHTML
-            gallery_url: ギャラリーURL（オプション）
+            gallery_page: 解析済みのギャラリーページ
         """
         try:
-            # ⭐DEBUG: メソッド開始⭐
-            self.session_manager.ui_bridge.post_log(
-                f"[DEBUG] _extract_gallery_metadata() START",
-                "debug"
-            )
-            
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html, 'html.parser')
+            # ギャラリーIDとトークン（URLから優先、なければHTMLから）
+            if gallery_page.gid:
+                self.gid = gallery_page.gid
+            if gallery_page.token:
+                self.token = gallery_page.token
+            
+            # アップローダー・投稿日・評価
+            if gallery_page.uploader:
+                self.uploader = gallery_page.uploader
+            if gallery_page.date:
+                self.date = gallery_page.date
+            if gallery_page.rating:
+                self.rating = gallery_page.rating
+            
+            # カテゴリ（Cosplay, Non-H など）
+            self.category = gallery_page.category
             
-            # ⭐DEBUG: BeautifulSoup初期化完了⭐
             self.session_manager.ui_bridge.post_log(
-                f"[DEBUG] BeautifulSoup parsing完了",
-                "debug"
-            )
-            
-            # ギャラリーIDとトークンを抽出（URLから優先）
-            if gallery_url:
-                # URLから直接抽出（例: https://e-hentai.org/g/3033168/575ac7b4eb/）
-                url_gid_match = re.search(r'/g/(\d+)/', gallery_url)
-                if url_gid_match:
-                    self.gid = url_gid_match.group(1)
-                
-                url_token_match = re.search(r'/g/\d+/([a-f0-9]+)', gallery_url)
-                if url_token_match:
-                    self.token = url_token_match.group(1)
-            
-            # ⭐DEBUG: gid/token抽出完了⭐
-            self.session_manager.ui_bridge.post_log(
-                f"[DEBUG] gid={getattr(self, 'gid', 'None')}, token={getattr(self, 'token', 'None')[:10] if hasattr(self, 'token') else 'None'}...",
-                "debug"
-            )
-            
-            # HTMLからも抽出を試みる（フォールバック）
-            if not hasattr(self, 'gid') or not self.gid:
-                gid_match = re.search(r'gid=(\d+)', html)
-                if gid_match:
-                    self.gid = gid_match.group(1)
-            
-            if not hasattr(self, 'token') or not self.token:
-                token_match = re.search(r'token=([a-f0-9]+)', html)
-                if token_match:
-                    self.token = token_match.group(1)
-            
-            # アップローダーを抽出（改善版）
-            # 方法1: gdn divから抽出
-            gdn_div = soup.find('div', id='gdn')
-            if gdn_div:
-                uploader_link = gdn_div.find('a')
-                if uploader_link:
-                    self.uploader = uploader_link.get_text(strip=True)
-            
-            # 方法2: フォールバック - td要素から抽出
-            if not hasattr(self, 'uploader') or not self.uploader:
-                uploader_elem = soup.find('td', string='Uploader:')
-                if uploader_elem and uploader_elem.find_next_sibling('td'):
-                    self.uploader = uploader_elem.find_next_sibling('td').get_text(strip=True)
-            
-            # 投稿日を抽出
-            posted_elem = soup.find('td', string='Posted:')
-            if posted_elem and posted_elem.find_next_sibling('td'):
-                self.date = posted_elem.find_next_sibling('td').get_text(strip=True)
-            
-            # 評価を抽出
-            rating_elem = soup.find('td', string='Rating:')
-            if rating_elem and rating_elem.find_next_sibling('td'):
-                self.rating = rating_elem.find_next_sibling('td').get_text(strip=True)
-            
-            # ⭐DEBUG: 基本情報抽出完了⭐
-            self.session_manager.ui_bridge.post_log(
-                f"[DEBUG] 基本情報抽出完了 (uploader, date, rating)",
-                "debug"
-            )
-            
-            # ⭐追加: カテゴリを抽出（gdc divから）⭐
-            # <div id="gdc"><div class="cs ct7" onclick="document.location='https://e-hentai.org/cosplay'">Cosplay</div></div>
-            # <div id="gdc"><div class="cs ct9" onclick="document.location='https://e-hentai.org/non-h'">Non-H</div></div>
-            self.category = ""
-            gdc_div = soup.find('div', id='gdc')
-            if gdc_div:
-                # 方法1: class="cs ct*"のdivを検索
-                category_div = gdc_div.find('div', class_=re.compile(r'cs\s+ct'))
-                if category_div:
-                    self.category = category_div.get_text(strip=True)
-                else:
-                    # 方法2: onclick属性から抽出
-                    category_link = gdc_div.find('div', onclick=re.compile(r'cosplay|doujinshi|manga|artist.*cg|game.*cg|western|non.*h|non-h|image.*set|asian.*porn|misc', re.I))
-                    if category_link:
-                        self.category = category_link.get_text(strip=True)
-            
-            # フォールバック: 正規表現で抽出（より柔軟なパターン）
-            if not self.category:
-                # パターン1: <div class="cs ct*" ...>Category</div>
-                category_match = re.search(r'<div\s+class="cs\s+ct[^"]*"[^>]*>([^<]+)</div>', html, re.IGNORECASE)
-                if category_match:
-                    self.category = category_match.group(1).strip()
-                else:
-                    # パターン2: onclick属性からURLを抽出してカテゴリ名を推測
-                    onclick_match = re.search(r'onclick="document\.location=\'https://e-hentai\.org/([^\']+)\'">([^<]+)</div>', html, re.IGNORECASE)
-                    if onclick_match:
-                        self.category = onclick_match.group(2).strip()
-            
-            # ⭐DEBUG: カテゴリ抽出完了⭐
-            self.session_manager.ui_bridge.post_log(
-                f"[DEBUG] カテゴリ抽出完了: category='{getattr(self, 'category', 'None')}'",
+                f"[DEBUG] メタデータ反映完了: gid={getattr(self, 'gid', 'None')}, category='{self.category}'",
                 "debug"
             )
             
@@ -3459,48 +3566,12 @@ class EHDownloaderCore:
                 response.raise_for_status()
                 html = response.text
                 
-                # BeautifulSoupでHTMLを解析
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # <div class="sb"><a href="..."></a></div>からギャラリーURLを取得
-                sb_div = soup.find('div', class_='sb')
-                # sb_div found
-                if sb_div:
-                    sb_link = sb_div.find('a', href=True)
-                    # sb_link found
-                    if sb_link:
-                        gallery_url = sb_link['href']
-                        # gallery_url from sb
-                        if not gallery_url.startswith('http'):
-                            gallery_url = f"https://{domain}.org{gallery_url}"
-                        self.session_manager.ui_bridge.post_log(f"個別画像ページ検出: ページ{start_page}から開始")
-                        # 正規化結果（sb要素から取得）
-                        return gallery_url, start_page
-                else:
-                    # sb要素が見つからない場合、HTMLの一部をログに出力
-                    # sb要素が見つかりません
-                    pass
-                
-                # フォールバック: 正規表現でギャラリーリンクを探す
-                gallery_patterns = [
-                    re.compile(r'href="([^"]*g/\d+/[a-f0-9]+/?)"'),  # 通常のギャラリーリンク
-                    re.compile(r'href="([^"]*g/\d+/[^"]*)"'),        # フォールバック
-                ]
-                
-                gallery_url = None
-                for pattern in gallery_patterns:
-                    gallery_links = pattern.findall(html)
-                    if gallery_links:
-                        # 最初のギャラリーリンクを使用
-                        gallery_url = gallery_links[0]
-                        if not gallery_url.startswith('http'):
-                            gallery_url = f"https://{domain}.org{gallery_url}"
-                        break
-                
+                # <div class="sb"><a href="..."></a></div>、なければ最初のギャラリーリンク
+                gallery_url = find_gallery_link(html)
                 if gallery_url:
+                    if not gallery_url.startswith('http'):
+                        gallery_url = f"https://{domain}.org{gallery_url}"
                     self.session_manager.ui_bridge.post_log(f"個別画像ページ検出: ページ{start_page}から開始")
-                    # 正規化結果（正規表現から取得）
                     return gallery_url, start_page
                 else:
                     # 最終フォールバック: 元の方法を使用
@@ -3638,6 +3709,11 @@ class EHDownloaderCore:
             self.session_manager.ui_bridge.post_log(f"画像情報取得処理エラー: {e}", "error")
             return None
 
+    def _get_selenium_fallback_handler(self):
+        """Selenium安全弁ハンドラー（ドライバープールの管理者）を取得"""
+        error_handler = getattr(self.parent, 'enhanced_error_handler', None)
+        return getattr(error_handler, 'selenium_handler', None)
+
     def _get_page_with_selenium(self, url: str) -> Optional[str]:
         """
         Seleniumを使用してページのHTMLを取得
@@ -3657,16 +3733,7 @@ class EHDownloaderCore:
             
             self.session_manager.ui_bridge.post_log("Seleniumを使用してページを取得中...")
             
-            # Chromeオプション設定
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            
-            # ドライバ初期化
-            driver = webdriver.Chrome(options=chrome_options)
-            
-            try:
+            def read_page(driver):
                 driver.get(url)
                 # ページ読み込み待機（最大30秒）
                 WebDriverWait(driver, 30).until(
@@ -3682,6 +3749,25 @@ class EHDownloaderCore:
                 else:
                     self.session_manager.ui_bridge.post_log("Seleniumページ取得失敗: HTMLが空です", "error")
                     return None
+            
+            # ⭐起動済みドライバーのプールがあれば再利用⭐
+            selenium_handler = self._get_selenium_fallback_handler()
+            if selenium_handler:
+                with selenium_handler.lease_driver({'timeout': 30}, timeout=120) as driver:
+                    if driver:
+                        return read_page(driver)
+            
+            # Chromeオプション設定
+            chrome_options = Options()
+            chrome_options.add_argument('--headless')
+            chrome_options.add_argument('--no-sandbox')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            
+            # ドライバ初期化
+            driver = webdriver.Chrome(options=chrome_options)
+            
+            try:
+                return read_page(driver)
             finally:
                 driver.quit()
                 
@@ -3707,16 +3793,7 @@ class EHDownloaderCore:
             
             self.session_manager.ui_bridge.post_log("Seleniumを使用して画像情報を取得中...")
             
-            # Chromeオプション設定
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            
-            # ドライバ初期化
-            driver = webdriver.Chrome(options=chrome_options)
-            
-            try:
+            def read_image_info(driver):
                 driver.get(url)
                 time.sleep(3)  # ページ読み込み待機
                 
@@ -3737,7 +3814,25 @@ class EHDownloaderCore:
                 else:
                     self.session_manager.ui_bridge.post_log("Selenium画像情報取得失敗: 画像URLが見つかりません", "error")
                     return None
-                    
+            
+            # ⭐起動済みドライバーのプールがあれば再利用⭐
+            selenium_handler = self._get_selenium_fallback_handler()
+            if selenium_handler:
+                with selenium_handler.lease_driver({'timeout': 30}, timeout=120) as driver:
+                    if driver:
+                        return read_image_info(driver)
+            
+            # Chromeオプション設定
+            chrome_options = Options()
+            chrome_options.add_argument('--headless')
+            chrome_options.add_argument('--no-sandbox')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            
+            # ドライバ初期化
+            driver = webdriver.Chrome(options=chrome_options)
+            
+            try:
+                return read_image_info(driver)
             finally:
                 driver.quit()
                 
@@ -3760,15 +3855,16 @@ class EHDownloaderCore:
         Returns:
             ファイル名文字列
         """
-        save_name_mode = self.parent.save_name.get()
+        options = self.get_options_snapshot()
+        save_name_mode = options.save_name
         
         # ⭐追加: 絶対ページ番号を取得（指定されていない場合は計算）⭐
         if absolute_page is None:
             absolute_page = self._get_absolute_page_number(page_num)
         
         # 1ページ目の特別命名をチェック
-        if page_num == 1 and self.parent.first_page_naming_enabled.get():
-            template = self.parent.first_page_naming_format.get()
+        if page_num == 1 and options.first_page_naming_enabled:
+            template = options.first_page_naming_format
             if template == "title":
                 # "title"の場合は実際のタイトルを使用
                 # ⭐GalleryInfo: 辞書またはGalleryInfoオブジェクトを処理⭐
@@ -3791,7 +3887,7 @@ class EHDownloaderCore:
                 ext = os.path.splitext(image_info['original_filename'])[1]
                 base_name = f"{page_num - 1:03d}{ext}"  # 000から開始
             elif save_name_mode == "custom_name":
-                template = self.parent.custom_name.get()
+                template = options.custom_name
                 ext = os.path.splitext(image_info['original_filename'])[1]
                 base_name = self._format_filename_template(
                     template, gallery_info, page_num, 
@@ -3844,7 +3940,7 @@ class EHDownloaderCore:
         if not os.path.exists(file_path):
             return file_path
         
-        mode = self.parent.duplicate_file_mode.get()
+        mode = self.get_options_snapshot().duplicate_file_mode
         # ⭐ファイル処理ログを明確に⭐
         mode_text = {
             "skip": "スキップ",
@@ -3910,7 +4006,7 @@ class EHDownloaderCore:
             image_data = response.content
             
             # 標準の保存処理を使用
-            result = self._save_image_data(image_data, file_path, "Original", image_url)
+            result = self._save_image_data(image_data, file_path, "Original", image_url, page_num)
             if result is True:  # スキップされた場合
                 # スキップ時はログを出力しない（情報量を減らす）
                 pass
@@ -3940,8 +4036,7 @@ class EHDownloaderCore:
             self._urllib3_retry_attempted = True
             
             # 「自動再開を待つ」オプションをチェック
-            if (hasattr(self.parent, 'wait_for_auto_recovery') and 
-                self.parent.wait_for_auto_recovery.get()):
+            if self.get_options_snapshot().wait_for_auto_recovery:
                 
                 # レジュームオプションを実行
                 resume_result = self._handle_urllib3_retry_failure(image_url, e)
@@ -3970,12 +4065,11 @@ class EHDownloaderCore:
             
             if error_type == "ssl":
                 # SSLエラーの場合
-                if (hasattr(self.parent, 'lower_security_level') and 
-                    self.parent.lower_security_level.get()):
+                options = self.get_options_snapshot()
+                if options.lower_security_level:
                     self.session_manager.ui_bridge.post_log("SSLエラー - セキュリティレベルを下げてリトライ", "info")
                     return self._retry_with_lower_security(url, error)
-                elif (hasattr(self.parent, 'skip_certificate_verify') and 
-                      self.parent.skip_certificate_verify.get()):
+                elif options.skip_certificate_verify:
                     self.session_manager.ui_bridge.post_log("SSLエラー - 証明書検証をスキップしてリトライ", "info")
                     return self._retry_without_cert_verify(url, error)
                 else:
@@ -4095,8 +4189,9 @@ class EHDownloaderCore:
                 ext = f".{save_format_option.lower()}"
             
             # １ページ目の特別命名処理
-            if page == 1 and hasattr(self.parent, 'first_page_naming_enabled') and self.parent.first_page_naming_enabled.get():
-                first_page_format = self.parent.first_page_naming_format.get().strip()
+            options = self.get_options_snapshot()
+            if page == 1 and options.first_page_naming_enabled:
+                first_page_format = (options.first_page_naming_format or "").strip()
                 
                 if first_page_format:
                     # {}で囲まれた部分のみを変数として扱う
@@ -4456,7 +4551,8 @@ class EHDownloaderCore:
             return False
 
     def _save_image_data(self, image_data: bytes, save_path: str, 
-                        save_format_option: str, original_url: Optional[str] = None) -> bool:
+                        save_format_option: str, original_url: Optional[str] = None,
+                        page: Optional[int] = None) -> bool:
         """
         画像データを保存する共通処理
         
@@ -4465,6 +4561,7 @@ class EHDownloaderCore:
             save_path: 保存パス
             save_format_option: 保存形式オプション
             original_url: 元のURL（オプション）
+            page: ページ番号（省略時はシングルスレッドなら現在のページ）
             
         Returns:
             成功時True
@@ -4485,65 +4582,83 @@ class EHDownloaderCore:
                 save_path = new_path
                 temp_path = save_path + '.tmp'
             
-            # JPG形式で保存する場合の処理
-            if save_format_option == "JPG":
+            options = self.get_options_snapshot()
+            # ⭐マルチスレッド時の current_page は他スレッドのページを指すため、呼び出し側の番号を使う⭐
+            if page is None and options.multithread_enabled != "on":
+                page = self.current_page
+            
+            # ⭐アニメーション判定はコンテナヘッダーのみで行い、保存先を先に確定する⭐
+            convert_quality = options.jpg_quality if save_format_option == "JPG" else None
+            if (save_format_option != "Original" and
+                options.preserve_animation and
+                original_url and
+                detect_animation(image_data)):
+                
+                convert_quality = None
+                original_ext = os.path.splitext(original_url.split('?')[0])[1]
+                if original_ext:
+                    new_save_path = os.path.splitext(save_path)[0] + original_ext
+                    if save_path != new_save_path:
+                        save_path = new_save_path
+                        temp_path = save_path + '.tmp'
+                        self.session_manager.ui_bridge.post_log(f"アニメーション画像の形式を保持: {os.path.basename(save_path)}")
+            
+            # ⭐JPG変換とリサイズはメモリ上のデータを1回デコードしてまとめて行う⭐
+            resize_job = None
+            if hasattr(self, 'image_processor'):
                 try:
-                    from PIL import Image
-                    from io import BytesIO
-                    
-                    with Image.open(BytesIO(image_data)) as img:
-                        # RGBモードに変換
-                        if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
-                            bg = Image.new('RGB', img.size, (255, 255, 255))
-                            if img.mode == 'P':
-                                img = img.convert('RGBA')
-                            bg.paste(img, mask=img.split()[3] if img.mode == 'RGBA' else None)
-                            img = bg
-                        elif img.mode != 'RGB':
-                            img = img.convert('RGB')
-                        
-                        quality = self.parent.jpg_quality.get() if hasattr(self.parent, 'jpg_quality') else 85
-                        with open(temp_path, 'wb') as f:
-                            img.save(f, 'JPEG', quality=quality)
-                        self.session_manager.ui_bridge.post_log(f"JPG形式で保存（品質: {quality}%）: {os.path.basename(save_path)}")
-                        
-                except Exception as jpg_error:
-                    self.session_manager.ui_bridge.post_log(f"JPG変換エラー: {jpg_error}, 通常の方法で保存します。")
-                    with open(temp_path, 'wb') as f:
-                        f.write(image_data)
-            else:
+                    resize_job = self.image_processor.build_resize_job(save_path, options)
+                except Exception as resize_error:
+                    self.session_manager.ui_bridge.post_log(f"リサイズ処理エラー: {resize_error}", "warning")
+            
+            # ⭐直接ZIP書き込みモード: フォルダに保存せずギャラリーのZIPへ追記⭐
+            if (convert_quality is None and resize_job is None and
+                    self.compression_manager.should_stream(options)):
+                if not self.compression_manager.stream_image(save_path, image_data, page):
+                    return True
+                return save_path
+            
+            # 変換しない場合は元データをそのまま保存
+            if convert_quality is None:
                 print(f"[DEBUG] core/downloader.py _save_image_data: open({temp_path}, 'wb')直前")
                 self.session_manager.ui_bridge.post_log(f"[DEBUG] core/downloader.py _save_image_data: open({temp_path}, 'wb')直前")
                 with open(temp_path, 'wb') as f:
                     f.write(image_data)
                 print(f"[DEBUG] core/downloader.py _save_image_data: open({temp_path}, 'wb')直後")
                 self.session_manager.ui_bridge.post_log(f"[DEBUG] core/downloader.py _save_image_data: open({temp_path}, 'wb')直後")
-            
-            # 一時ファイルを本来のファイル名に移動
-            if os.path.exists(temp_path):
-                if os.path.exists(save_path):
-                    os.remove(save_path)
-                os.rename(temp_path, save_path)
-            else:
-                raise DownloadErrorException(f"一時ファイルが見つかりません: {temp_path}")
-            
-            # アニメーション画像の処理
-            if (save_format_option != "Original" and 
-                hasattr(self.parent, 'preserve_animation') and 
-                self.parent.preserve_animation.get() and
-                original_url):
                 
-                if self._check_if_animated(save_path):
-                    original_ext = os.path.splitext(original_url.split('?')[0])[1]
-                    if original_ext:
-                        base_path = os.path.splitext(save_path)[0]
-                        new_save_path = base_path + original_ext
-                        if save_path != new_save_path:
-                            if os.path.exists(new_save_path):
-                                os.remove(new_save_path)
-                            os.rename(save_path, new_save_path)
-                            self.session_manager.ui_bridge.post_log(f"アニメーション画像の形式を保持: {os.path.basename(new_save_path)}")
-                            save_path = new_save_path
+                # 一時ファイルを本来のファイル名に移動
+                if os.path.exists(temp_path):
+                    if os.path.exists(save_path):
+                        os.remove(save_path)
+                    os.rename(temp_path, save_path)
+                else:
+                    raise DownloadErrorException(f"一時ファイルが見つかりません: {temp_path}")
+            
+            # ⭐後処理の完了時には次のギャラリーに切り替わっている場合があるため、投入時点のマニフェストを使う⭐
+            manifest = self.gallery_manifest
+            if convert_quality is None and resize_job is None:
+                self._record_manifest_page(manifest, page, save_path, image_data)
+                return save_path
+            
+            job = {'transform': {
+                'data': image_data,
+                'target_path': save_path,
+                'quality': convert_quality,
+                'resize': resize_job,
+            }}
+            # 後処理ステージに任せ、ダウンロードスレッドは次の画像へ進む
+            # （マニフェストには変換・リサイズ後のファイルを記録）
+            on_done = lambda: self._record_manifest_page(manifest, page, save_path)
+            if self.post_processor.submit(job, save_dir, save_path,
+                                          self.state_manager.get_stop_flag(), on_done=on_done):
+                return save_path
+            
+            result = run_post_process_job(job)
+            self.stage_metrics.record(STAGE_POST_PROCESS, result.get('elapsed'), getattr(self, 'gid', ''))
+            for message, level in result['messages']:
+                self.session_manager.ui_bridge.post_log(message, level)
+            on_done()
             
             return save_path
         except Exception as e:
@@ -4557,12 +4672,41 @@ class EHDownloaderCore:
             self._cleanup_temp_file(temp_path)
             raise
 
+    def open_gallery_manifest(self, save_folder: str) -> Optional[GalleryManifest]:
+        """ギャラリーフォルダのマニフェストを開く（以降の保存を記録）"""
+        if not save_folder:
+            self.gallery_manifest = None
+            return None
+        self.gallery_manifest = GalleryManifest(save_folder)
+        return self.gallery_manifest
+    
+    def _record_manifest_page(self, manifest: Optional[GalleryManifest], page: Optional[int],
+                              save_path: str, image_data: Optional[bytes] = None):
+        """保存した画像をギャラリーのマニフェストへ記録
+        
+        manifest は画像の保存（後処理の投入）時点のもの。
+        ページ番号が分からない場合（マルチスレッド）や、保存先が別フォルダの場合は記録しない。
+        """
+        if manifest is None or page is None:
+            return
+        if os.path.normcase(os.path.dirname(os.path.abspath(save_path))) != \
+                os.path.normcase(os.path.abspath(manifest.folder_path)):
+            return
+        try:
+            if image_data is not None:
+                manifest.record_data(page, save_path, image_data)
+            else:
+                manifest.record_file(page, save_path)
+        except Exception as e:
+            self.session_manager.ui_bridge.post_log(f"マニフェスト記録エラー: {e}", "debug")
+    
     def download_and_save_image(
         self,
         image_url: str,
         save_path: str,
         save_format_option: str,
-        options: Optional[Dict[str, Any]] = None
+        options: Optional[Dict[str, Any]] = None,
+        page: Optional[int] = None
     ) -> bool:
         """
         画像をダウンロードして保存（高度なオプション対応版）
@@ -4572,6 +4716,7 @@ class EHDownloaderCore:
             save_path: 保存先パス
             save_format_option: 保存形式オプション
             options: ダウンロードオプション
+            page: ページ番号（ZIP・マニフェストの並び順に使用）
             
         Returns:
             成功時True
@@ -4581,25 +4726,24 @@ class EHDownloaderCore:
             options = self._get_current_options()
         
         # ⭐修正: 常時Seleniumオプションを独立してチェック（変数名修正）⭐
-        always_use_selenium = False
-        if hasattr(self.parent, 'selenium_always_enabled') and hasattr(self.parent.selenium_always_enabled, 'get'):
-            always_use_selenium = self.parent.selenium_always_enabled.get()
+        always_use_selenium = self._is_selenium_always_enabled()
         
         # ⭐修正: httpxオプションを独立してチェック⭐
         httpx_enabled = options.get('httpx_enabled', False)
         
         # ⭐修正: 常時Seleniumまたはhttpxが有効な場合は、advanced_options_enabledに関わらず使用⭐
         if always_use_selenium or httpx_enabled or options.get('advanced_options_enabled', False):
-            return self._download_with_advanced_options(image_url, save_path, save_format_option, options)
+            return self._download_with_advanced_options(image_url, save_path, save_format_option, options, page)
         else:
-            return self._download_standard(image_url, save_path, save_format_option)
+            return self._download_standard(image_url, save_path, save_format_option, page)
 
     def _download_with_advanced_options(
         self,
         image_url: str,
         save_path: str,
         save_format_option: str,
-        options: Dict[str, Any]
+        options: Dict[str, Any],
+        page: Optional[int] = None
     ) -> bool:
         """
         高度なオプション対応のダウンロード方式
@@ -4615,9 +4759,7 @@ class EHDownloaderCore:
         """
         try:
             # ⭐修正: 常時Seleniumオプションをチェック（変数名修正）⭐
-            selenium_enabled = False
-            if hasattr(self.parent, 'selenium_always_enabled') and hasattr(self.parent.selenium_always_enabled, 'get'):
-                selenium_enabled = self.parent.selenium_always_enabled.get()
+            selenium_enabled = self._is_selenium_always_enabled()
             
             # ⭐最新のSelenium状態を取得（リアルタイム反映）⭐
             # 注: selenium_always_enabledは常時Seleniumとして使用されている
@@ -4629,30 +4771,31 @@ class EHDownloaderCore:
                 if selenium_enabled:
                     self.session_manager.ui_bridge.post_log("【常時Selenium】常時Seleniumオプションが有効です")
                 self.session_manager.ui_bridge.post_log("【Selenium】Seleniumを使用してダウンロード")
-                return self._download_with_selenium(image_url, save_path, save_format_option, options)
+                return self._download_with_selenium(image_url, save_path, save_format_option, options, page)
             
             # httpxが有効な場合
             elif options.get('httpx_enabled', False):
                 self.session_manager.ui_bridge.post_log("【httpx】httpxを使用してダウンロード")
-                return self._download_with_httpx(image_url, save_path, save_format_option, options)
+                return self._download_with_httpx(image_url, save_path, save_format_option, options, page)
             
             # User-Agent偽装が有効な場合
             elif options.get('user_agent_spoofing_enabled', False):
                 self.session_manager.ui_bridge.post_log("【User-Agent】User-Agent偽装を使用してダウンロード")
-                return self._download_with_user_agent_spoofing(image_url, save_path, save_format_option, options)
+                return self._download_with_user_agent_spoofing(image_url, save_path, save_format_option, options, page)
             
             # デフォルトは標準ダウンロード
             else:
                 # self.session_manager.ui_bridge.post_log("【標準】標準ダウンロード方式を使用")
-                return self._download_standard(image_url, save_path, save_format_option)
+                return self._download_standard(image_url, save_path, save_format_option, page)
                 
         except Exception as e:
             self.session_manager.ui_bridge.post_log(f"高度なオプション対応ダウンロードエラー: {e}", "error")
             # エラー時は標準ダウンロードにフォールバック
-            return self._download_standard(image_url, save_path, save_format_option)
+            return self._download_standard(image_url, save_path, save_format_option, page)
 
     def _download_with_selenium(self, image_url: str, save_path: str, 
-                                save_format_option: str, options: Dict[str, Any]) -> bool:
+                                save_format_option: str, options: Dict[str, Any],
+                                page: Optional[int] = None) -> bool:
         """
         Seleniumを使用したダウンロード
         
@@ -4711,21 +4854,12 @@ class EHDownloaderCore:
                     image_data = base64.b64decode(image_data_b64)
                     
                     # 保存処理
-                    result = self._save_image_data(image_data, save_path, save_format_option, image_url)
+                    result = self._save_image_data(image_data, save_path, save_format_option, image_url, page)
                     if result is True:
                         self.session_manager.ui_bridge.post_log(f"既存ファイルのためスキップ: {os.path.basename(save_path)}")
                     elif result:
                         self.session_manager.ui_bridge.post_log(f"Selenium画像保存完了: {os.path.basename(result)}")
                         
-                        # ⭐修正: リサイズ処理を実行⭐
-                        if hasattr(self, 'image_processor') and result != True:
-                            try:
-                                self.image_processor.process_image_resize(
-                                    result, None, 0, None, self._get_resize_values_safely()
-                                )
-                            except Exception as resize_error:
-                                self.session_manager.ui_bridge.post_log(f"リサイズ処理エラー: {resize_error}", "warning")
-                        
                         # ⭐ダウンロード成功時にエラーフラグをリセット⭐
                         # エラーカウントのリセットはenhanced_error_handlerで管理される
                         if hasattr(self, 'error_occurred'):
@@ -4743,7 +4877,8 @@ class EHDownloaderCore:
             raise DownloadErrorException(f"Seleniumダウンロードエラー: {e}")
 
     def _download_with_httpx(self, image_url: str, save_path: str, 
-                            save_format_option: str, options: Dict[str, Any]) -> bool:
+                            save_format_option: str, options: Dict[str, Any],
+                            page: Optional[int] = None) -> bool:
         """
         httpxを使用したダウンロード
         
@@ -4773,18 +4908,9 @@ class EHDownloaderCore:
                 image_data = response.content
                 
                 # 保存処理
-                result = self._save_image_data(image_data, save_path, save_format_option, image_url)
+                result = self._save_image_data(image_data, save_path, save_format_option, image_url, page)
                 if result is True:
                     self.session_manager.ui_bridge.post_log(f"既存ファイルのためスキップ: {os.path.basename(save_path)}")
-                elif result:
-                    # ⭐修正: リサイズ処理を実行⭐
-                    if hasattr(self, 'image_processor') and result != True:
-                        try:
-                            self.image_processor.process_image_resize(
-                                result, None, 0, None, self._get_resize_values_safely()
-                            )
-                        except Exception as resize_error:
-                            self.session_manager.ui_bridge.post_log(f"リサイズ処理エラー: {resize_error}", "warning")
                 return result
                 
             finally:
@@ -4795,7 +4921,8 @@ class EHDownloaderCore:
             raise DownloadErrorException(f"httpxダウンロードエラー: {e}")
 
     def _download_with_user_agent_spoofing(self, image_url: str, save_path: str, 
-                                           save_format_option: str, options: Dict[str, Any]) -> bool:
+                                           save_format_option: str, options: Dict[str, Any],
+                                           page: Optional[int] = None) -> bool:
         """
         User-Agent偽装を使用したダウンロード
         
@@ -4825,21 +4952,12 @@ class EHDownloaderCore:
                 image_data = response.content
                 
                 # 保存処理
-                result = self._save_image_data(image_data, save_path, save_format_option, image_url)
+                result = self._save_image_data(image_data, save_path, save_format_option, image_url, page)
                 if result is True:
                     self.session_manager.ui_bridge.post_log(f"既存ファイルのためスキップ: {os.path.basename(save_path)}")
                 elif result:
                     self.session_manager.ui_bridge.post_log(f"User-Agent偽装画像保存完了: {os.path.basename(result)}")
                     
-                    # ⭐修正: リサイズ処理を実行⭐
-                    if hasattr(self, 'image_processor') and result != True:
-                        try:
-                            self.image_processor.process_image_resize(
-                                result, None, 0, None, self._get_resize_values_safely()
-                            )
-                        except Exception as resize_error:
-                            self.session_manager.ui_bridge.post_log(f"リサイズ処理エラー: {resize_error}", "warning")
-                    
                     # エラーフラグをリセット
                     if hasattr(self, 'error_occurred'):
                         self.error_occurred = False
@@ -4849,7 +4967,8 @@ class EHDownloaderCore:
             self.session_manager.ui_bridge.post_log(f"User-Agent偽装ダウンロードエラー: {e}", "error")
             raise DownloadErrorException(f"User-Agent偽装ダウンロードエラー: {e}")
 
-    def _download_standard(self, image_url: str, save_path: str, save_format_option: str) -> bool:
+    def _download_standard(self, image_url: str, save_path: str, save_format_option: str,
+                           page: Optional[int] = None) -> bool:
         """
         標準ダウンロード方式（既存の実装）
         
@@ -4930,24 +5049,20 @@ class EHDownloaderCore:
                 temp_path = save_path + '.tmp'
 
             # 画像ダウンロード - with文でリソース管理
+            gallery_key = getattr(self, 'gid', '')
+            transfer_started = time.perf_counter()
             with self.session_manager.http_client.get(image_url, timeout=30, stream=True) as response:
                 response.raise_for_status()
                 image_data = response.content
+                self.stage_metrics.record(STAGE_TRANSFER, time.perf_counter() - transfer_started,
+                                          gallery_key, host_of(image_url))
                 # 標準の保存処理を使用
-                result = self._save_image_data(image_data, save_path, save_format_option, image_url)
+                with self.stage_metrics.measure(STAGE_SAVE, gallery_key):
+                    result = self._save_image_data(image_data, save_path, save_format_option, image_url, page)
                 if result is True:  # スキップされた場合
                     # スキップ時はログを出力しない（情報量を減らす）
                     pass
                 elif result:  # 保存パスが返された場合
-                    # ⭐修正: リサイズ処理を実行⭐
-                    if hasattr(self, 'image_processor') and result != True:
-                        try:
-                            self.image_processor.process_image_resize(
-                                result, None, 0, None, self._get_resize_values_safely()
-                            )
-                        except Exception as resize_error:
-                            self.session_manager.ui_bridge.post_log(f"リサイズ処理エラー: {resize_error}", "warning")
-                    
                     # ⭐ダウンロード成功時にエラーフラグをリセット⭐
                     # エラーカウントのリセットはenhanced_error_handlerで管理される
                     if hasattr(self, 'error_occurred'):
@@ -4999,6 +5114,15 @@ class EHDownloaderCore:
                         self.session_manager.ui_bridge.post_log(f"復帰ポイント: 既存のフォルダを使用します: {os.path.basename(resume_folder)}")
                         return resume_folder
             
+            # ⭐ライブラリ索引に同じギャラリーのフォルダがあれば再利用（フォルダ名の変更・連番に依存しない）⭐
+            if current_url and duplicate_mode != "overwrite" and hasattr(self, 'library_index'):
+                library_folder = self.library_index.find_folder(current_url)
+                if library_folder:
+                    self.session_manager.ui_bridge.post_log(
+                        f"📚 ライブラリ: 既存のフォルダを使用します: {os.path.basename(library_folder)}"
+                    )
+                    return library_folder
+            
             # フォルダ作成ロジック
             if os.path.exists(folder_path):
                 # 重複時の処理
@@ -5049,12 +5173,10 @@ class EHDownloaderCore:
         if not image_page_url:
             self.session_manager.ui_bridge.post_log("[エラーハンドリング] 画像ページURLが取得できませんでした", "warning")
         
-        max_retry_count = 3
-        if hasattr(self.parent, 'max_retry_count'):
-            try:
-                max_retry_count = int(self.parent.max_retry_count.get()) if hasattr(self.parent.max_retry_count, 'get') else int(self.parent.max_retry_count)
-            except (ValueError, TypeError):
-                max_retry_count = 3
+        try:
+            max_retry_count = int(self.get_options_snapshot().max_retry_count)
+        except (ValueError, TypeError):
+            max_retry_count = 3
         
         can_retry = retry_count < max_retry_count
         context_retry_count = max_retry_count if not can_retry else retry_count
@@ -5768,23 +5890,8 @@ class EHDownloaderCore:
             タグ情報の辞書（カテゴリ別）
         """
         try:
-            # タグ抽出の正規表現
-            pattern_tags = re.compile(r'id="ta_([^:]+):([^"]+)"[^>]*>([^<]+)</a>')
-            tags = [(m.group(1), m.group(2), m.group(3)) for m in pattern_tags.finditer(html)]
-            
-            # タグを辞書形式で整理
-            tag_dict = {}
-            for category, tag_id, tag_name in tags:
-                # カテゴリ別にタグを整理
-                if category not in tag_dict:
-                    tag_dict[category] = []
-                tag_dict[category].append({
-                    'id': tag_id,
-                    'name': tag_name,
-                    'full_tag': f"{category}:{tag_name}"
-                })
-            
-            return tag_dict
+            # ⭐ギャラリーページの解析では GalleryPage.tags を使用（抽出ルールは共通）⭐
+            return extract_tags(html)
         except Exception as e:
             self.session_manager.ui_bridge.post_log(f"タグ抽出エラー: {e}", "error")
             return {}
@@ -5854,14 +5961,14 @@ class EHDownloaderCore:
                 comprehensive_data['additional_tags'] = self.additional_tags
             
             # ダウンロードオプションを追加
-            if hasattr(self.parent, 'wait_time'):
-                comprehensive_data['download_options'] = {
-                    'wait_time': self.parent.wait_time.get(),
-                    'sleep_value': self.parent.sleep_value.get(),
-                    'save_format': self.parent.save_format.get(),
-                    'save_name': self.parent.save_name.get(),
-                    'folder_path': self.parent.folder_var.get(),
-                }
+            options = self.get_options_snapshot()
+            comprehensive_data['download_options'] = {
+                'wait_time': options.wait_time,
+                'sleep_value': options.sleep_value,
+                'save_format': options.save_format,
+                'save_name': options.save_name,
+                'folder_path': options.folder_path,
+            }
             
             # 現在のURL情報を追加
             if hasattr(self.parent, 'current_url_index'):
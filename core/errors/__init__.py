@@ -7,11 +7,13 @@ Core errors layer - エラー処理層
 from .enhanced_error_handler import EnhancedErrorHandler, ErrorCategory, ErrorSeverity, ErrorPersistence, RetryStrategy, FinalAction, ErrorContext, ErrorStrategy
 from .unified_error_resume_manager import UnifiedErrorResumeManager
 from .selenium_fallback_handler import SeleniumFallbackHandler
+from .selenium_driver_pool import SeleniumDriverPool
 
 __all__ = [
     'EnhancedErrorHandler',
     'UnifiedErrorResumeManager',
     'SeleniumFallbackHandler',
+    'SeleniumDriverPool',
     'ErrorCategory',
     'ErrorSeverity',
     'ErrorPersistence',
@@ -16,6 +16,7 @@ from core.errors.enhanced_error_handler import (
 )
 # ErrorCategoryStrategy からインポート
 from core.errors.error_category_strategy import ErrorCategoryStrategy
+from core.stage_metrics import get_stage_metrics, STAGE_RETRY_BACKOFF
 
 class CircuitState(Enum):
     """Circuit Breaker の状態"""
@@ -365,21 +366,23 @@ class AutoRetryManager:
         check_interval = 0.5
         elapsed = 0.0
         
-        while elapsed < delay:
-            # 一時停止チェック（state_managerにis_pausedメソッドがある場合のみ）
-            try:
-                if hasattr(self.state_manager, 'is_paused') and callable(getattr(self.state_manager, 'is_paused')):
-                    if self.state_manager.is_paused():
-                        self.logger.log("⏸️ ユーザーによる一時停止を検出", "info")
-                        return False
-            except Exception as e:
-                # is_paused()呼び出しエラーは無視して続行
-                pass
-            
-            # 待機
-            sleep_time = min(check_interval, delay - elapsed)
-            time.sleep(sleep_time)
-            elapsed += sleep_time
+        # リトライ待機として所要時間を記録（一時停止で打ち切った場合も実際に待った分を記録）
+        with get_stage_metrics().measure(STAGE_RETRY_BACKOFF):
+            while elapsed < delay:
+                # 一時停止チェック（state_managerにis_pausedメソッドがある場合のみ）
+                try:
+                    if hasattr(self.state_manager, 'is_paused') and callable(getattr(self.state_manager, 'is_paused')):
+                        if self.state_manager.is_paused():
+                            self.logger.log("⏸️ ユーザーによる一時停止を検出", "info")
+                            return False
+                except Exception as e:
+                    # is_paused()呼び出しエラーは無視して続行
+                    pass
+                
+                # 待機
+                sleep_time = min(check_interval, delay - elapsed)
+                time.sleep(sleep_time)
+                elapsed += sleep_time
         
         return True
     
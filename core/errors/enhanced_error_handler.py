@@ -237,6 +237,7 @@ class EnhancedErrorHandler:
             'enable_error_escalation': True,
             'enable_selenium_fallback': False,
             'selenium_timeout': 60,
+            'selenium_devtools_capture': True,
             'consecutive_error_threshold': 5,
             'critical_stage_abort_threshold': 3
         }
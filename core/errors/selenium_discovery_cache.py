@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Chrome/ChromeDriver探索結果のキャッシュ
+
+レジストリ参照・バージョン検証・ドライバー探索（インストール）の結果をディスクに保存し、
+次回以降は実行ファイルの mtime とサイズが一致するかだけを確認して再利用する。
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+DEFAULT_DISCOVERY_CACHE_FILE = "selenium_discovery_cache.json"
+
+
+class SeleniumDiscoveryCache:
+    """Chromeブラウザとドライバーのパス・バージョンの組を保持するキャッシュ"""
+
+    def __init__(self, cache_file: str = DEFAULT_DISCOVERY_CACHE_FILE):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._data: Dict[str, Any] = self._load()
+
+    # ------------------------------------------------------------------
+    # 参照
+    # ------------------------------------------------------------------
+
+    def get_chrome(self) -> Optional[str]:
+        """検証済みのChromeパスを取得（実行ファイルが変わっていればNone）"""
+        with self._lock:
+            entry = self._data.get('chrome')
+        if entry and self._matches(entry):
+            return entry['path']
+        return None
+
+    def get_driver(self, chrome_path: Optional[str]) -> Optional[str]:
+        """
+        Chromeと組になっている検証済みドライバーのパスを取得
+
+        ドライバーは探索時のChromeと同じ実行ファイル（同一 mtime/サイズ）の場合のみ有効。
+        """
+        with self._lock:
+            chrome_entry = self._data.get('chrome')
+            driver_entry = self._data.get('driver')
+        if not driver_entry or not self._matches(driver_entry):
+            return None
+        if chrome_path:
+            if not chrome_entry or os.path.normcase(chrome_entry['path']) != os.path.normcase(chrome_path):
+                return None
+            if driver_entry.get('chrome_fingerprint') != self._fingerprint_key(chrome_entry):
+                return None
+            if not self._matches(chrome_entry):
+                return None
+        return driver_entry['path']
+
+    # ------------------------------------------------------------------
+    # 更新
+    # ------------------------------------------------------------------
+
+    def store_chrome(self, path: str, version: Optional[str] = None):
+        """Chromeの探索結果を保存（Chromeが変わった場合はドライバーの組も破棄）"""
+        entry = self._make_entry(path)
+        if entry is None:
+            return
+        entry['version'] = version
+        with self._lock:
+            previous = self._data.get('chrome')
+            if not previous or self._fingerprint_key(previous) != self._fingerprint_key(entry):
+                self._data.pop('driver', None)
+            self._data['chrome'] = entry
+            self._save_locked()
+
+    def store_driver(self, path: str, chrome_path: Optional[str] = None):
+        """ドライバーの探索結果をChromeと組にして保存"""
+        entry = self._make_entry(path)
+        if entry is None:
+            return
+        with self._lock:
+            chrome_entry = self._data.get('chrome')
+            if chrome_path and chrome_entry and \
+                    os.path.normcase(chrome_entry['path']) == os.path.normcase(chrome_path):
+                entry['chrome_fingerprint'] = self._fingerprint_key(chrome_entry)
+            elif chrome_path:
+                return
+            self._data['driver'] = entry
+            self._save_locked()
+
+    def invalidate_driver(self):
+        """ドライバーのキャッシュを破棄（起動失敗時など）"""
+        with self._lock:
+            if self._data.pop('driver', None) is not None:
+                self._save_locked()
+
+    def invalidate(self):
+        """全キャッシュを破棄"""
+        with self._lock:
+            self._data = {}
+            self._save_locked()
+
+    # ------------------------------------------------------------------
+    # 内部ヘルパー
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _make_entry(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return {
+            'path': os.path.normpath(path),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'cached_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    @staticmethod
+    def _matches(entry: Dict[str, Any]) -> bool:
+        try:
+            stat = os.stat(entry['path'])
+        except (OSError, KeyError, TypeError):
+            return False
+        return stat.st_mtime_ns == entry.get('mtime_ns') and stat.st_size == entry.get('size')
+
+    @staticmethod
+    def _fingerprint_key(entry: Dict[str, Any]) -> str:
+        return f"{entry.get('path')}|{entry.get('mtime_ns')}|{entry.get('size')}"
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+        except Exception:
+            pass
+        return {}
+
+    def _save_locked(self):
+        """キャッシュファイルへ書き込み（ロック保持中に呼ぶ）"""
+        tmp_file = f"{self.cache_file}.tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.cache_file)
+        except Exception:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
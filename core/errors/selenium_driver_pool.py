@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Seleniumドライバープール - 起動済みChromeドライバーの再利用
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+
+class _PooledDriver:
+    """プール内のドライバーと利用状況"""
+
+    __slots__ = ('driver', 'uses', 'created_at', 'last_used')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class SeleniumDriverPool:
+    """
+    起動済みWebDriverを保持し、リース方式で貸し出すプール
+
+    - 貸し出し前にヘルスチェックを行い、応答しないドライバーは破棄して作り直す
+    - 規定回数使用したドライバー、例外後に応答しなくなったドライバーは返却時に破棄する
+    - 一定時間使われなかったドライバーはリーパースレッドが終了させる
+    """
+
+    def __init__(self, driver_factory: Callable[[Dict[str, Any]], Any], logger=None,
+                 max_drivers: int = 1, max_uses: int = 50, idle_timeout: float = 180.0):
+        """
+        Args:
+            driver_factory: 設定を受け取りドライバーを生成する関数（失敗時None）
+            logger: ロガー（log(message, level) を持つもの）
+            max_drivers: 同時に保持するドライバーの上限
+            max_uses: 1ドライバーあたりの最大使用回数（超えたら再生成）
+            idle_timeout: アイドル状態のドライバーを終了するまでの秒数
+        """
+        self._factory = driver_factory
+        self.logger = logger
+        self.max_drivers = max(1, int(max_drivers or 1))
+        self.max_uses = max(1, int(max_uses or 1))
+        self.idle_timeout = max(1.0, float(idle_timeout or 1.0))
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: List[_PooledDriver] = []
+        self._leased: Dict[int, _PooledDriver] = {}
+        self._creating = 0
+        self._closed = False
+        self._reaper: Optional[threading.Thread] = None
+        # リーパーは専用のイベントで待機する（_cond の通知を横取りして acquire() を待たせないため）
+        self._reaper_stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # 貸し出し・返却
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def lease(self, config: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None):
+        """
+        ドライバーを貸し出すコンテキストマネージャー
+
+        取得に失敗した場合は None を返すため、呼び出し側で確認すること。
+        ブロック内で例外が発生した場合は返却時にヘルスチェックを行う。
+        """
+        config = config or {}
+        driver = self.acquire(config, timeout)
+        failed = False
+        try:
+            yield driver
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            if driver is not None:
+                self.release(driver, check_health=failed)
+
+    def acquire(self, config: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None):
+        """ドライバーを取得（空きがなければ上限まで生成、上限なら返却を待機）"""
+        config = config or {}
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            entry = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return None
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if len(self._leased) + self._creating < self.max_drivers:
+                        self._creating += 1
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._log("[ドライバープール] ドライバーの空き待ちがタイムアウトしました", "warning")
+                        return None
+                    self._cond.wait(remaining)
+
+            if entry is None:
+                return self._create_and_lease(config)
+
+            # 待機中のドライバーはロック外でヘルスチェック（応答がなければ作り直す）
+            if self._is_alive(entry.driver):
+                self._apply_config(entry.driver, config)
+                with self._cond:
+                    self._leased[id(entry.driver)] = entry
+                return entry.driver
+
+            self._log("[ドライバープール] 応答しないドライバーを破棄して再生成します", "warning")
+            self._quit(entry.driver)
+
+    def release(self, driver, check_health: bool = False):
+        """ドライバーを返却（使用回数超過・異常時は破棄）"""
+        with self._cond:
+            entry = self._leased.pop(id(driver), None)
+        if entry is None:
+            self._quit(driver)
+            return
+
+        entry.uses += 1
+        entry.last_used = time.monotonic()
+        retire = entry.uses >= self.max_uses
+        if not retire and check_health and not self._is_alive(driver):
+            self._log("[ドライバープール] 異常終了したドライバーを破棄します", "warning")
+            retire = True
+
+        with self._cond:
+            if not retire and not self._closed:
+                self._idle.append(entry)
+                self._cond.notify()
+                return
+            self._cond.notify()
+
+        if entry.uses >= self.max_uses:
+            self._log(f"[ドライバープール] 使用回数上限({self.max_uses})に達したドライバーを再生成対象にしました", "debug")
+        self._quit(driver)
+
+    def shutdown(self):
+        """全ドライバーを終了（貸し出し中のものは返却時に終了）"""
+        with self._cond:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+            self._cond.notify_all()
+        self._reaper_stop.set()
+        for entry in idle:
+            self._quit(entry.driver)
+        if idle:
+            self._log(f"[ドライバープール] ドライバーを終了しました: {len(idle)}件", "debug")
+
+    def get_stats(self) -> Dict[str, int]:
+        """プールの状態を取得"""
+        with self._cond:
+            return {
+                'idle': len(self._idle),
+                'leased': len(self._leased),
+                'creating': self._creating,
+                'max_drivers': self.max_drivers,
+            }
+
+    # ------------------------------------------------------------------
+    # 内部処理
+    # ------------------------------------------------------------------
+
+    def _create_and_lease(self, config: Dict[str, Any]):
+        driver = None
+        try:
+            start_time = time.monotonic()
+            driver = self._factory(config)
+            if driver is not None:
+                self._log(f"[ドライバープール] ドライバーを起動しました ({time.monotonic() - start_time:.1f}秒)", "debug")
+        except Exception as e:
+            self._log(f"[ドライバープール] ドライバー生成エラー: {e}", "error")
+            driver = None
+
+        with self._cond:
+            self._creating -= 1
+            if driver is not None and not self._closed:
+                self._leased[id(driver)] = _PooledDriver(driver)
+                self._ensure_reaper()
+                return driver
+            self._cond.notify()
+
+        if driver is not None:
+            self._quit(driver)
+        return None
+
+    def _ensure_reaper(self):
+        """アイドルドライバーの回収スレッドを起動（ロック保持中に呼ぶ）"""
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._reaper = threading.Thread(target=self._reap_idle_drivers, daemon=True,
+                                        name="SeleniumDriverPoolReaper")
+        self._reaper.start()
+
+    def _reap_idle_drivers(self):
+        """idle_timeout を超えて使われていないドライバーを終了する"""
+        interval = min(30.0, self.idle_timeout / 2)
+        while True:
+            if self._reaper_stop.wait(interval):
+                return
+            with self._cond:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                expired = [e for e in self._idle if now - e.last_used >= self.idle_timeout]
+                if expired:
+                    self._idle = [e for e in self._idle if e not in expired]
+                if not self._idle and not self._leased and not self._creating:
+                    self._reaper = None
+                    stop = True
+                else:
+                    stop = False
+
+            for entry in expired:
+                self._quit(entry.driver)
+            if expired:
+                self._log(f"[ドライバープール] アイドルタイムアウトでドライバーを終了しました: {len(expired)}件", "debug")
+            if stop:
+                return
+
+    @staticmethod
+    def _apply_config(driver, config: Dict[str, Any]):
+        try:
+            driver.set_page_load_timeout(config.get('timeout', 30))
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(driver) -> bool:
+        try:
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _log(self, message: str, level: str = "info"):
+        if self.logger is not None:
+            try:
+                self.logger.log(message, level)
+            except Exception:
+                pass
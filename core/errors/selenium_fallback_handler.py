@@ -7,10 +7,14 @@ import traceback
 import time
 import os
 import base64
+import json
+from contextlib import contextmanager
 from typing import Dict, Any, Optional
 import requests
 
 from core.interfaces import IStateManager, ILogger
+from core.errors.selenium_driver_pool import SeleniumDriverPool
+from core.errors.selenium_discovery_cache import SeleniumDiscoveryCache
 
 
 class SeleniumFallbackHandler:
@@ -30,6 +34,64 @@ class SeleniumFallbackHandler:
         self.logger = logger
         self.error_config = error_config
         self.error_stats = error_stats
+        
+        # ⭐Chrome/ChromeDriver探索結果のキャッシュ（mtime/サイズで検証）⭐
+        self.discovery_cache = SeleniumDiscoveryCache()
+        
+        # ⭐起動済みドライバーを再利用するプール（毎回のブラウザ起動を避ける）⭐
+        self.driver_pool = SeleniumDriverPool(
+            driver_factory=self._create_pooled_driver,
+            logger=logger,
+            max_drivers=error_config.get('selenium_pool_size', 1),
+            max_uses=error_config.get('selenium_pool_max_uses', 50),
+            idle_timeout=error_config.get('selenium_pool_idle_timeout', 180)
+        )
+    
+    @contextmanager
+    def lease_driver(self, config: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None):
+        """
+        プールからドライバーを借りる（with文で使用し、ブロック終了時に返却される）
+        
+        Args:
+            config: Selenium設定（timeoutを参照）
+            timeout: 空きドライバー待ちの上限秒数
+            
+        Yields:
+            ドライバー（取得失敗時はNone）
+        """
+        with self.driver_pool.lease(config or {'timeout': 30}, timeout) as driver:
+            try:
+                yield driver
+            finally:
+                # 次の利用者に前回のネットワークイベントを残さない
+                if driver is not None:
+                    self._drain_performance_log(driver)
+    
+    def shutdown(self):
+        """プール内のドライバーを全て終了"""
+        self.driver_pool.shutdown()
+    
+    def _create_pooled_driver(self, config: Dict[str, Any]):
+        """プール用ドライバーの生成（詳細探索に失敗した場合は標準のheadless起動を試す）"""
+        driver = self._get_selenium_driver_with_retry(config, max_retries=2)
+        if driver:
+            return driver
+        
+        try:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+            
+            chrome_options = Options()
+            chrome_options.add_argument('--headless')
+            chrome_options.add_argument('--no-sandbox')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            self._enable_devtools_capture(chrome_options)
+            driver = webdriver.Chrome(options=chrome_options)
+            driver.set_page_load_timeout(config.get('timeout', 30))
+            return driver
+        except Exception as e:
+            self.logger.log(f"[Selenium安全弁] 標準ドライバー起動エラー: {e}", "debug")
+            return None
     
     def execute_fallback(self, analysis: Dict[str, Any], context) -> bool:
         """
@@ -65,13 +127,12 @@ class SeleniumFallbackHandler:
             # Selenium設定の取得
             selenium_config = self._get_selenium_config_for_error(analysis, context)
             
-            # Seleniumドライバーの取得
-            driver = self._get_selenium_driver_with_retry(selenium_config, max_retries=2)
-            if not driver:
-                self.logger.log("[Selenium安全弁] ドライバー取得に失敗しました。スキップします", "warning")
-                return False
-            
-            try:
+            # Seleniumドライバーの取得（プールから貸し出し）
+            with self.lease_driver(selenium_config, timeout=120) as driver:
+                if not driver:
+                    self.logger.log("[Selenium安全弁] ドライバー取得に失敗しました。スキップします", "warning")
+                    return False
+                
                 # 画像URLにアクセス
                 self.logger.log(f"[Selenium安全弁] 画像URLにアクセス中: {image_url[:100]}...", "debug")
                 success = self._navigate_to_image_with_selenium(driver, image_url, selenium_config)
@@ -115,12 +176,6 @@ class SeleniumFallbackHandler:
                     self.logger.log(f"[Selenium安全弁] 画像保存エラー: {save_error}", "error")
                     self.logger.log(f"[Selenium安全弁] 保存エラー詳細: {traceback.format_exc()}", "error")
                     return False
-                
-            finally:
-                try:
-                    driver.quit()
-                except Exception:
-                    pass
                     
         except Exception as e:
             self.logger.log(f"[Selenium安全弁] 実行エラー: {e}", "error")
@@ -185,7 +240,6 @@ class SeleniumFallbackHandler:
                 return None
             
             # Chromeがインストールされているかチェックし、パスを取得
-            chrome_installed = False
             chrome_binary_path = None
             
             # カスタムChromeパスが指定されている場合はそれを使用
@@ -197,78 +251,17 @@ class SeleniumFallbackHandler:
                         custom_path = custom_chrome_path.get().strip()
                         if custom_path and os.path.exists(custom_path):
                             chrome_binary_path = custom_path
-                            chrome_installed = True
                             self.logger.log(f"[Selenium安全弁] カスタムChromeパスを使用: {chrome_binary_path}", "debug")
             
-            # カスタムパスが指定されていない場合、自動検出
+            # カスタムパスが指定されていない場合、キャッシュ → 自動検出の順で取得
             if not chrome_binary_path:
-                try:
-                    import subprocess
-                    result = subprocess.run(
-                        ['reg', 'query', 'HKEY_CURRENT_USER\\Software\\Google\\Chrome\\BLBeacon', '/v', 'version'],
-                        capture_output=True,
-                        text=True,
-                        timeout=2
-                    )
-                    if result.returncode == 0:
-                        chrome_installed = True
-                except:
-                    pass
-            
-            # Chromeのパスを確認し、インストールを検証
-            chrome_paths = [
-                r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-                r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"
-            ]
-            
-            # レジストリからパスを取得
-            try:
-                import winreg
-                try:
-                    key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Google\Chrome\BLBeacon")
-                    install_path, _ = winreg.QueryValueEx(key, "path")
-                    winreg.CloseKey(key)
-                    if install_path and os.path.exists(install_path):
-                        chrome_paths.insert(0, install_path)
-                except:
-                    pass
-                
-                try:
-                    key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon")
-                    install_path, _ = winreg.QueryValueEx(key, "path")
-                    winreg.CloseKey(key)
-                    if install_path and os.path.exists(install_path):
-                        chrome_paths.insert(0, install_path)
-                except:
-                    pass
-            except:
-                pass
-            
-            # Chromeのパスを確認
-            if not chrome_installed:
-                for path in chrome_paths:
-                    if os.path.exists(path):
-                        chrome_installed = True
-                        chrome_binary_path = path
-                        break
-            else:
-                for path in chrome_paths:
-                    if os.path.exists(path):
-                        chrome_binary_path = path
-                        break
-            
-            # Chromeのインストールを検証
-            use_registry_version = self.error_config.get('selenium_use_registry_version', True)
-            if chrome_binary_path:
-                is_valid, validation_msg = self._validate_chrome_installation(chrome_binary_path, use_registry_version)
-                if not is_valid:
-                    self.logger.log(f"[Selenium安全弁] Chromeの検証に失敗: {validation_msg}", "warning")
-                    if os.path.exists(chrome_binary_path):
-                        self.logger.log(f"[Selenium安全弁] Chrome実行ファイルは存在します。検証エラーを無視して続行します", "warning")
-                    else:
-                        chrome_binary_path = None
+                chrome_binary_path = self.discovery_cache.get_chrome()
+                if chrome_binary_path:
+                    self.logger.log(f"[Selenium安全弁] キャッシュ済みChromeパスを使用: {chrome_binary_path}", "debug")
                 else:
-                    self.logger.log(f"[Selenium安全弁] {validation_msg}", "debug")
+                    chrome_binary_path = self._discover_chrome_binary()
+                    if chrome_binary_path:
+                        self.discovery_cache.store_chrome(chrome_binary_path, self._read_chrome_version())
             
             if not chrome_binary_path:
                 self.logger.log("[Selenium安全弁] Chromeがインストールされていません。リトライ上限達成時オプションに移行します", "warning")
@@ -377,6 +370,9 @@ class SeleniumFallbackHandler:
                         chrome_options.add_argument("--disable-extensions")
                         chrome_options.add_argument("--disable-logging")
                     
+                    # DevToolsネットワークキャプチャ用にパフォーマンスログを有効化
+                    self._enable_devtools_capture(chrome_options)
+                    
                     # ドライバーの取得
                     use_selenium_manager = self.error_config.get('selenium_manager_enabled', False)
                     driver_path = None
@@ -391,6 +387,14 @@ class SeleniumFallbackHandler:
                                 if custom_path and os.path.exists(custom_path):
                                     driver_path = os.path.normpath(custom_path)
                     
+                    # ⭐前回Chromeと組で検証済みのドライバーがあれば探索を省略⭐
+                    cached_driver_used = False
+                    if not driver_path and not use_selenium_manager:
+                        driver_path = self.discovery_cache.get_driver(chrome_binary_path)
+                        if driver_path:
+                            cached_driver_used = True
+                            self.logger.log(f"[Selenium安全弁] キャッシュ済みChromeDriverを使用: {driver_path}", "debug")
+                    
                     if not driver_path:
                         import threading
                         
@@ -462,6 +466,7 @@ class SeleniumFallbackHandler:
                         
                         if driver_path:
                             driver_path = os.path.normpath(driver_path)
+                            self.discovery_cache.store_driver(driver_path, chrome_binary_path)
                     
                     if not use_selenium_manager:
                         if driver_path and not os.path.exists(driver_path):
@@ -524,6 +529,8 @@ class SeleniumFallbackHandler:
                             driver = webdriver.Chrome(service=service, options=chrome_options)
                         except Exception as e:
                             self.logger.log(f"[Selenium安全弁] Chromeブラウザ起動エラー: {e}", "error")
+                            if cached_driver_used:
+                                self.discovery_cache.invalidate_driver()
                             continue
                     else:
                         driver_error = None
@@ -547,6 +554,8 @@ class SeleniumFallbackHandler:
                         
                         if driver_error:
                             self.logger.log(f"[Selenium安全弁] Chromeブラウザ起動エラー: {driver_error}", "error")
+                            if cached_driver_used:
+                                self.discovery_cache.invalidate_driver()
                             continue
                     
                     if not driver:
@@ -587,6 +596,8 @@ class SeleniumFallbackHandler:
             if wait_strategy == 'eager':
                 driver.execute_script("window.stop();")
             
+            # 以前のページのネットワークイベントを捨ててから遷移
+            self._drain_performance_log(driver)
             driver.get(url)
             
             try:
@@ -618,6 +629,10 @@ class SeleniumFallbackHandler:
                 self._extract_via_blob_url
             ]
             
+            # ⭐DevToolsキャプチャ: 元のレスポンス本体をそのまま取得（Canvas再エンコードなし）⭐
+            if self.error_config.get('selenium_devtools_capture', True):
+                methods.insert(0, self._extract_via_devtools)
+            
             for method in methods:
                 try:
                     image_data = method(driver, url)
@@ -638,6 +653,82 @@ class SeleniumFallbackHandler:
             self.logger.log(f"Selenium画像抽出エラー: {e}", "error")
             return None
     
+    def _enable_devtools_capture(self, chrome_options):
+        """パフォーマンスログ（DevToolsネットワークイベント）の記録を有効化"""
+        if not self.error_config.get('selenium_devtools_capture', True):
+            return
+        try:
+            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        except Exception as e:
+            self.logger.log(f"[Selenium安全弁] パフォーマンスログ設定エラー: {e}", "debug")
+    
+    @staticmethod
+    def _drain_performance_log(driver):
+        """溜まっているパフォーマンスログを読み捨てる"""
+        try:
+            driver.get_log('performance')
+        except Exception:
+            pass
+    
+    def _extract_via_devtools(self, driver, url: str):
+        """DevToolsのネットワークイベントから画像レスポンス本体を取得（元のバイト列のまま）
+
+        対象は指定URL（とそのリダイレクト先）のレスポンスのみ。同時に取得される favicon などの
+        別の画像は使わず、見つからない場合は None を返して他の抽出方法に任せる。
+        """
+        try:
+            entries = driver.get_log('performance')
+        except Exception as e:
+            self.logger.log(f"DevToolsログ取得エラー: {e}", "debug")
+            return None
+        
+        target_urls = {url}
+        try:
+            target_urls.add(driver.current_url)
+        except Exception:
+            pass
+        
+        target_request_ids = set()
+        request_id = None
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                # リダイレクトは同じrequestIdのまま新しいURLで送られる
+                request_url = params.get('request', {}).get('url')
+                redirect_url = (params.get('redirectResponse') or {}).get('url')
+                if (request_url in target_urls or redirect_url in target_urls or
+                        params.get('requestId') in target_request_ids):
+                    target_request_ids.add(params.get('requestId'))
+                    if request_url:
+                        target_urls.add(request_url)
+            elif method == 'Network.responseReceived':
+                response = params.get('response', {})
+                if not str(response.get('mimeType', '')).startswith('image/'):
+                    continue
+                if params.get('requestId') in target_request_ids or response.get('url') in target_urls:
+                    request_id = params.get('requestId')
+        
+        if not request_id:
+            return None
+        
+        try:
+            result = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except Exception as e:
+            self.logger.log(f"DevToolsレスポンス本体取得エラー: {e}", "debug")
+            return None
+        
+        body = result.get('body')
+        if not body:
+            return None
+        if result.get('base64Encoded'):
+            return base64.b64decode(body)
+        return body.encode('utf-8')
+    
     def _extract_via_canvas(self, driver, url: str):
         """Canvasを使用した画像データの抽出"""
         try:
@@ -723,6 +814,98 @@ class SeleniumFallbackHandler:
             self.logger.log(f"Blob URL画像抽出エラー: {e}", "debug")
             return None
     
+    def _discover_chrome_binary(self) -> Optional[str]:
+        """Chromeのパスを探索し、インストールを検証（レジストリ・既定パス）"""
+        chrome_installed = False
+        chrome_binary_path = None
+        
+        try:
+            import subprocess
+            result = subprocess.run(
+                ['reg', 'query', 'HKEY_CURRENT_USER\\Software\\Google\\Chrome\\BLBeacon', '/v', 'version'],
+                capture_output=True,
+                text=True,
+                timeout=2
+            )
+            if result.returncode == 0:
+                chrome_installed = True
+        except:
+            pass
+        
+        # Chromeのパスを確認し、インストールを検証
+        chrome_paths = [
+            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"
+        ]
+        
+        # レジストリからパスを取得
+        try:
+            import winreg
+            try:
+                key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Google\Chrome\BLBeacon")
+                install_path, _ = winreg.QueryValueEx(key, "path")
+                winreg.CloseKey(key)
+                if install_path and os.path.exists(install_path):
+                    chrome_paths.insert(0, install_path)
+            except:
+                pass
+        
+            try:
+                key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon")
+                install_path, _ = winreg.QueryValueEx(key, "path")
+                winreg.CloseKey(key)
+                if install_path and os.path.exists(install_path):
+                    chrome_paths.insert(0, install_path)
+            except:
+                pass
+        except:
+            pass
+        
+        # Chromeのパスを確認
+        if not chrome_installed:
+            for path in chrome_paths:
+                if os.path.exists(path):
+                    chrome_installed = True
+                    chrome_binary_path = path
+                    break
+        else:
+            for path in chrome_paths:
+                if os.path.exists(path):
+                    chrome_binary_path = path
+                    break
+        
+        # Chromeのインストールを検証
+        use_registry_version = self.error_config.get('selenium_use_registry_version', True)
+        if chrome_binary_path:
+            is_valid, validation_msg = self._validate_chrome_installation(chrome_binary_path, use_registry_version)
+            if not is_valid:
+                self.logger.log(f"[Selenium安全弁] Chromeの検証に失敗: {validation_msg}", "warning")
+                if os.path.exists(chrome_binary_path):
+                    self.logger.log(f"[Selenium安全弁] Chrome実行ファイルは存在します。検証エラーを無視して続行します", "warning")
+                else:
+                    chrome_binary_path = None
+            else:
+                self.logger.log(f"[Selenium安全弁] {validation_msg}", "debug")
+        
+        return chrome_binary_path
+    
+    def _read_chrome_version(self) -> Optional[str]:
+        """レジストリからChromeのバージョンを取得（取得できない環境ではNone）"""
+        try:
+            import winreg
+        except ImportError:
+            return None
+        for hive, key_path in ((winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon"),
+                               (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Google\Chrome\BLBeacon")):
+            try:
+                key = winreg.OpenKey(hive, key_path)
+                version, _ = winreg.QueryValueEx(key, "version")
+                winreg.CloseKey(key)
+                return version
+            except Exception:
+                continue
+        return None
+    
     def _validate_chrome_installation(self, chrome_path: str, use_registry: bool = True) -> tuple:
         """Chromeのインストールを検証"""
         try:
@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List, Tuple
 from enum import Enum
 from core.interfaces import IStateManager, ILogger, IGUIOperations, IFileOperations
+from core.models.image_page_urls import encode_image_page_urls
 
 class ErrorSeverity(Enum):
     """エラーの深刻度"""
@@ -1079,7 +1080,7 @@ class UnifiedErrorResumeManager:
                     'group': group,
                     'total_pages': original_total_pages if original_total_pages > 0 else current_total
                 },
-                'gallery_info': gallery_info_cache,
+                'gallery_info': self._encode_gallery_info(gallery_info_cache),
                 'timestamp': time.time()
             }
             
@@ -1103,6 +1104,16 @@ class UnifiedErrorResumeManager:
             self.logger.log(f"再開ポイント保存エラー詳細: {traceback.format_exc()}", "error")
             return False
     
+    @staticmethod
+    def _encode_gallery_info(gallery_info: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """再開ポイント保存用のgallery_info（画像ページURLはgid + keyのコンパクト形式）"""
+        if not gallery_info:
+            return gallery_info
+        encoded = dict(gallery_info)
+        if 'image_page_urls' in encoded:
+            encoded['image_page_urls'] = encode_image_page_urls(encoded['image_page_urls'])
+        return encoded
+    
     def restore_resume_info_detailed(self, normalized_url: str, resume_info: Dict[str, Any], 
                                       options: Dict[str, Any], use_mapping: bool = True,
                                       downloader_context: Optional[Any] = None) -> Tuple[Optional[int], int, Optional[Dict[str, Any]]]:
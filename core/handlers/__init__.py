@@ -1,14 +1,18 @@
 # -*- coding: utf-8 -*-
 """
 Core handlers layer - 処理実行層
-中断・再開、完了処理、ダウンロードフロー、画像処理、圧縮処理を担当
+中断・再開、完了処理、ダウンロードフロー、画像処理、画像後処理、圧縮処理を担当
 """
 
 from .completion_handler import CompletionHandler
 from .resume_manager import ResumeManager
 from .download_flow_manager import DownloadFlowManager
 from .image_processor import ImageProcessor
+from .post_processor import PostProcessingStage
 from .compression_manager import CompressionManager
+from .archive_writer import StreamingArchiveWriter
+from .compression_scheduler import CompressionScheduler
+from .gallery_manifest import GalleryManifest
 from .gallery_downloader import GalleryDownloader
 
 __all__ = [
@@ -16,6 +20,10 @@ __all__ = [
     'ResumeManager',
     'DownloadFlowManager',
     'ImageProcessor',
+    'PostProcessingStage',
     'CompressionManager',
+    'StreamingArchiveWriter',
+    'CompressionScheduler',
+    'GalleryManifest',
     'GalleryDownloader',
 ]
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Archive Codecs - TAR/7Z形式の圧縮コーデック
+
+責任範囲:
+- 圧縮形式（TAR.GZ / TAR.XZ / TAR.ZST / 7Z）ごとのアーカイブ作成
+- ブロック分割による並列圧縮（gzip・xzは独立したストリームの連結として出力）
+- 圧縮レベルの解決（自動の場合、画像主体のフォルダは高速プロファイル）
+"""
+
+import gzip
+import lzma
+import os
+import tarfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from core.handlers.archive_writer import STORED_EXTENSIONS
+from core.handlers.gallery_manifest import MANIFEST_FILENAME
+
+# 圧縮形式（GUIの選択肢）と拡張子
+ARCHIVE_FORMATS = ("ZIP", "7Z", "TAR", "TAR.XZ", "TAR.ZST")
+ARCHIVE_EXTENSIONS = {
+    "ZIP": ".zip",
+    "7Z": ".7z",
+    "TAR": ".tar.gz",
+    "TAR.XZ": ".tar.xz",
+    "TAR.ZST": ".tar.zst",
+}
+
+# 圧縮レベル（GUIの選択肢）
+COMPRESSION_LEVEL_AUTO = "自動"
+COMPRESSION_LEVEL_FAST = "高速"
+COMPRESSION_LEVEL_STANDARD = "標準"
+COMPRESSION_LEVEL_MAX = "最大"
+COMPRESSION_LEVELS = (COMPRESSION_LEVEL_AUTO, COMPRESSION_LEVEL_FAST,
+                      COMPRESSION_LEVEL_STANDARD, COMPRESSION_LEVEL_MAX)
+
+# 形式ごとの実際のレベル
+_GZIP_LEVELS = {COMPRESSION_LEVEL_FAST: 1, COMPRESSION_LEVEL_STANDARD: 6, COMPRESSION_LEVEL_MAX: 9}
+_XZ_PRESETS = {COMPRESSION_LEVEL_FAST: 0, COMPRESSION_LEVEL_STANDARD: 6, COMPRESSION_LEVEL_MAX: 9}
+_ZSTD_LEVELS = {COMPRESSION_LEVEL_FAST: 1, COMPRESSION_LEVEL_STANDARD: 9, COMPRESSION_LEVEL_MAX: 19}
+
+# 並列圧縮のブロックサイズ（xzは辞書サイズの約3倍、xz -T と同程度）
+_GZIP_BLOCK_SIZE = 4 * 1024 * 1024
+_XZ_BLOCK_SIZES = {COMPRESSION_LEVEL_FAST: 4 * 1024 * 1024,
+                   COMPRESSION_LEVEL_STANDARD: 24 * 1024 * 1024,
+                   COMPRESSION_LEVEL_MAX: 192 * 1024 * 1024}
+
+# アーカイブに含めないファイル（ダウンロード管理用）
+EXCLUDED_FILENAMES = frozenset({MANIFEST_FILENAME})
+
+# 圧縮済み画像がこの割合（バイト数）以上なら画像主体のフォルダとみなす
+_IMAGE_HEAVY_RATIO = 0.9
+
+
+def get_archive_extension(format_type: str) -> str:
+    return ARCHIVE_EXTENSIONS.get(format_type, ".zip")
+
+
+def _exclude_tar_member(tarinfo: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
+    return None if os.path.basename(tarinfo.name) in EXCLUDED_FILENAMES else tarinfo
+
+
+def is_image_heavy(folder_path: str) -> bool:
+    """フォルダの大半（バイト数）が圧縮済みの画像・アーカイブか"""
+    total = 0
+    stored = 0
+    for root, dirs, files in os.walk(folder_path):
+        for file in files:
+            try:
+                size = os.path.getsize(os.path.join(root, file))
+            except OSError:
+                continue
+            total += size
+            if os.path.splitext(file)[1].lower() in STORED_EXTENSIONS:
+                stored += size
+    return total > 0 and stored / total >= _IMAGE_HEAVY_RATIO
+
+
+def resolve_level(folder_path: str, level: str) -> str:
+    """圧縮レベルを解決（自動の場合、画像主体のフォルダは高速・それ以外は標準）"""
+    if level in _GZIP_LEVELS:
+        return level
+    return COMPRESSION_LEVEL_FAST if is_image_heavy(folder_path) else COMPRESSION_LEVEL_STANDARD
+
+
+class ParallelBlockWriter:
+    """書き込まれたデータをブロックに分けて並列に圧縮し、順番どおりに出力するファイルオブジェクト
+
+    gzip・xzはいずれも独立したストリーム（メンバー）の連結が有効なファイルとして
+    展開できるため、ブロックごとに単独で圧縮した結果をそのまま連結する。
+    """
+
+    def __init__(self, fileobj, compress_block: Callable[[bytes], bytes], block_size: int,
+                 workers: Optional[int] = None):
+        self.fileobj = fileobj
+        self.compress_block = compress_block
+        self.block_size = max(64 * 1024, int(block_size))
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        # 実行中のブロック数を制限してメモリ使用量を抑える
+        self.max_in_flight = self.workers + 1
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ArchiveCodec")
+        self._buffer = bytearray()
+        self._in_flight = deque()
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            block = bytes(self._buffer[:self.block_size])
+            del self._buffer[:self.block_size]
+            self._submit(block)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._buffer or not self._in_flight:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._in_flight:
+                self.fileobj.write(self._in_flight.popleft().result())
+        finally:
+            self.closed = True
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, block: bytes):
+        # lzma・zlibは圧縮中にGILを解放するためスレッドで並列化できる
+        self._in_flight.append(self._executor.submit(self.compress_block, block))
+        while len(self._in_flight) > self.max_in_flight:
+            self.fileobj.write(self._in_flight.popleft().result())
+
+
+def create_tar_archive(folder_path: str, archive_path: str, arcname: str, format_type: str,
+                       level: str = COMPRESSION_LEVEL_AUTO, workers: Optional[int] = None) -> Dict[str, Any]:
+    """TAR系アーカイブを作成
+
+    Args:
+        folder_path: 圧縮対象フォルダ
+        archive_path: 出力先
+        arcname: アーカイブ内のルートフォルダ名
+        format_type: "TAR"（gzip）/ "TAR.XZ" / "TAR.ZST"
+        level: 圧縮レベル
+        workers: 圧縮スレッド数（Noneの場合はCPUコア数）
+
+    Returns:
+        dict: 使用したコーデック情報 {'codec', 'level', 'workers'}
+    """
+    level = resolve_level(folder_path, level)
+    workers = max(1, int(workers or os.cpu_count() or 1))
+
+    if format_type == "TAR.ZST":
+        # zstandardはライブラリ自体がマルチスレッド圧縮に対応
+        import zstandard
+        compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVELS[level], threads=workers)
+        with open(archive_path, 'wb') as f:
+            with compressor.stream_writer(f, closefd=False) as writer:
+                with tarfile.open(fileobj=writer, mode='w|') as tar:
+                    tar.add(folder_path, arcname=arcname, filter=_exclude_tar_member)
+        return {'codec': 'zstd', 'level': _ZSTD_LEVELS[level], 'workers': workers}
+
+    if format_type == "TAR.XZ":
+        preset = _XZ_PRESETS[level]
+        compress_block = lambda block: lzma.compress(block, format=lzma.FORMAT_XZ, preset=preset)
+        block_size = _XZ_BLOCK_SIZES[level]
+        codec = {'codec': 'xz', 'level': preset, 'workers': workers}
+    else:
+        compresslevel = _GZIP_LEVELS[level]
+        compress_block = lambda block: gzip.compress(block, compresslevel=compresslevel, mtime=0)
+        block_size = _GZIP_BLOCK_SIZE
+        codec = {'codec': 'gzip', 'level': compresslevel, 'workers': workers}
+
+    with open(archive_path, 'wb') as f:
+        writer = ParallelBlockWriter(f, compress_block, block_size, workers)
+        try:
+            with tarfile.open(fileobj=writer, mode='w|') as tar:
+                tar.add(folder_path, arcname=arcname, filter=_exclude_tar_member)
+        finally:
+            writer.close()
+    return codec
+
+
+def create_7z_archive(folder_path: str, archive_path: str, arcname: str,
+                      level: str = COMPRESSION_LEVEL_AUTO) -> Dict[str, Any]:
+    """7Zアーカイブを作成（py7zrが必要）
+
+    py7zrのLZMA2はシングルスレッドのため、画像主体のフォルダの高速プロファイルでは
+    縮まない画像の圧縮を省略して無圧縮（COPY）で格納する。
+    """
+    import py7zr
+
+    resolved = resolve_level(folder_path, level)
+    if resolved == COMPRESSION_LEVEL_FAST and is_image_heavy(folder_path):
+        filters = [{'id': py7zr.FILTER_COPY}]
+        codec = {'codec': 'copy', 'level': 0, 'workers': 1}
+    else:
+        preset = _XZ_PRESETS[resolved]
+        filters = [{'id': py7zr.FILTER_LZMA2, 'preset': preset}]
+        codec = {'codec': 'lzma2', 'level': preset, 'workers': 1}
+
+    with py7zr.SevenZipFile(archive_path, 'w', filters=filters) as archive:
+        for root, dirs, files in os.walk(folder_path):
+            for file in sorted(files):
+                if file in EXCLUDED_FILENAMES:
+                    continue
+                file_path = os.path.join(root, file)
+                archive.write(file_path, os.path.join(arcname, os.path.relpath(file_path, folder_path)))
+    return codec
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+Archive Writer - ダウンロード中の画像を直接ZIPへ書き込むライター
+
+責任範囲:
+- ダウンロード完了した画像を開いたままのZIP（.part）へ追記
+- 中断・クラッシュ後の .part からの再開（ローカルヘッダーを走査して中央ディレクトリを再構築）
+- ページ順での中央ディレクトリ書き出しと、fsync後のリネームによる確定
+- エントリごとの圧縮方式の選択（圧縮済み画像は無圧縮、テキストはDeflate）
+"""
+
+import os
+import re
+import struct
+import threading
+import zipfile
+import zlib
+from datetime import datetime
+from typing import List, Optional, Set
+
+PART_SUFFIX = '.part'
+
+# 圧縮プロファイル（GUIの選択肢）
+COMPRESSION_PROFILE_AUTO = "自動（画像は無圧縮）"
+COMPRESSION_PROFILE_STORE = "すべて無圧縮"
+COMPRESSION_PROFILE_DEFLATE = "すべて圧縮"
+COMPRESSION_PROFILES = (COMPRESSION_PROFILE_AUTO, COMPRESSION_PROFILE_STORE, COMPRESSION_PROFILE_DEFLATE)
+
+# 既に圧縮されているため、Deflateしてもほぼ縮まない形式
+STORED_EXTENSIONS = frozenset((
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.heic', '.jxl',
+    '.zip', '.cbz', '.7z', '.rar', '.gz', '.xz', '.zst', '.mp4', '.webm',
+))
+# Deflateが有効なテキスト系の付随ファイル
+DEFLATED_EXTENSIONS = frozenset((
+    '.txt', '.html', '.htm', '.json', '.xml', '.csv', '.log', '.nfo', '.md',
+))
+
+# 不明な形式の判定に使うサンプルサイズと、Deflateを採用する圧縮率の上限
+_SAMPLE_SIZE = 64 * 1024
+_SAMPLE_RATIO_THRESHOLD = 0.9
+
+
+def choose_compress_type(name: str, sample: Optional[bytes] = None,
+                         profile: str = COMPRESSION_PROFILE_AUTO) -> int:
+    """
+    エントリの圧縮方式を選択
+
+    Args:
+        name: エントリ名（拡張子で判定）
+        sample: 不明な形式の判定に使うデータ先頭部分（Noneの場合はDeflate）
+        profile: 圧縮プロファイル
+
+    Returns:
+        zipfile.ZIP_STORED または zipfile.ZIP_DEFLATED
+    """
+    if profile == COMPRESSION_PROFILE_STORE:
+        return zipfile.ZIP_STORED
+    if profile == COMPRESSION_PROFILE_DEFLATE:
+        return zipfile.ZIP_DEFLATED
+
+    ext = os.path.splitext(name)[1].lower()
+    if ext in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    if ext in DEFLATED_EXTENSIONS or not sample:
+        return zipfile.ZIP_DEFLATED
+
+    # 不明な形式: 先頭を高速レベルで圧縮してみて、縮む場合のみDeflate
+    sample = sample[:_SAMPLE_SIZE]
+    ratio = len(zlib.compress(sample, 1)) / len(sample)
+    return zipfile.ZIP_DEFLATED if ratio < _SAMPLE_RATIO_THRESHOLD else zipfile.ZIP_STORED
+
+
+def choose_compress_type_for_file(file_path: str, profile: str = COMPRESSION_PROFILE_AUTO,
+                                  sample_unknown: bool = True) -> int:
+    """ファイルの圧縮方式を選択（不明な形式は先頭を読んで判定）"""
+    sample = None
+    ext = os.path.splitext(file_path)[1].lower()
+    if (profile == COMPRESSION_PROFILE_AUTO and sample_unknown and
+            ext not in STORED_EXTENSIONS and ext not in DEFLATED_EXTENSIONS):
+        try:
+            with open(file_path, 'rb') as f:
+                sample = f.read(_SAMPLE_SIZE)
+        except OSError:
+            sample = None
+    return choose_compress_type(file_path, sample, profile)
+
+_LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+# ページ番号を保持する独自の拡張フィールド（ローカルヘッダーにも書かれるためクラッシュ後も残る）
+_PAGE_EXTRA_ID = 0x6750
+_PAGE_EXTRA = struct.Struct('<HHI')
+_EXTRA_FIELD_HEADER = struct.Struct('<HH')
+
+
+def _natural_key(name: str):
+    """数字部分を数値として比較するソートキー"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+
+def _page_from_extra(extra: bytes) -> Optional[int]:
+    """拡張フィールドからページ番号を取得（無い場合None）"""
+    offset = 0
+    while offset + _EXTRA_FIELD_HEADER.size <= len(extra):
+        field_id, field_size = _EXTRA_FIELD_HEADER.unpack_from(extra, offset)
+        if field_id == _PAGE_EXTRA_ID and field_size == 4 and offset + 8 <= len(extra):
+            return _PAGE_EXTRA.unpack_from(extra, offset)[2]
+        offset += _EXTRA_FIELD_HEADER.size + field_size
+    return None
+
+
+class StreamingArchiveWriter:
+    """画像を1件ずつZIPへ追記するライター
+
+    書き込み中は "<archive>.part" を使用し、finalize() でページ順に並べた中央ディレクトリを
+    書き出してから本来の名前にリネームする。close() のみの場合は .part が残り、
+    次回同じパスで開くと続きから追記できる。
+    """
+
+    def __init__(self, archive_path: str, compression: int = zipfile.ZIP_DEFLATED,
+                 profile: str = COMPRESSION_PROFILE_AUTO, sample_unknown: bool = True):
+        """初期化
+
+        Args:
+            archive_path: 完成後のアーカイブパス
+            compression: zipfileの既定の圧縮方式
+            profile: エントリごとの圧縮方式を決める圧縮プロファイル
+            sample_unknown: 不明な形式をデータの先頭で判定するか
+        """
+        self.archive_path = archive_path
+        self.part_path = archive_path + PART_SUFFIX
+        self.compression = compression
+        self.profile = profile
+        self.sample_unknown = sample_unknown
+        self._lock = threading.Lock()
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._names: Set[str] = set()
+        self.recovered_entries = 0
+
+    # ------------------------------------------------------------------
+    # 公開API
+    # ------------------------------------------------------------------
+
+    def open(self) -> 'StreamingArchiveWriter':
+        """.part を開く（既存の場合は続きから、壊れている場合は修復してから）"""
+        with self._lock:
+            if self._zip is not None:
+                return self
+            directory = os.path.dirname(self.part_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            if os.path.exists(self.part_path):
+                # 'a' モードはZIPでないファイルの末尾に新しいアーカイブを作ってしまうため先に確認
+                if not zipfile.is_zipfile(self.part_path):
+                    self.recovered_entries = self._recover_part()
+                self._zip = zipfile.ZipFile(self.part_path, 'a', self.compression)
+            else:
+                self._zip = zipfile.ZipFile(self.part_path, 'w', self.compression)
+            self._names = set(self._zip.NameToInfo)
+        return self
+
+    def contains(self, arcname: str) -> bool:
+        """エントリが書き込み済みか"""
+        with self._lock:
+            return arcname in self._names
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._names)
+
+    def add(self, arcname: str, data: bytes, page: Optional[int] = None) -> bool:
+        """画像データをエントリとして追記
+
+        Args:
+            arcname: アーカイブ内のファイル名
+            data: 画像データ
+            page: ページ番号（中央ディレクトリの並び順に使用）
+
+        Returns:
+            bool: 追記した場合True、既に存在する場合False
+        """
+        info = zipfile.ZipInfo(arcname, date_time=datetime.now().timetuple()[:6])
+        info.compress_type = choose_compress_type(
+            arcname, data if self.sample_unknown else None, self.profile)
+        info.external_attr = 0o644 << 16
+        if page is not None:
+            info.extra = _PAGE_EXTRA.pack(_PAGE_EXTRA_ID, 4, int(page))
+
+        with self._lock:
+            if self._zip is None:
+                raise RuntimeError(f"アーカイブが開かれていません: {self.part_path}")
+            if arcname in self._names:
+                return False
+            self._zip.writestr(info, data)
+            # ローカルヘッダーとデータをディスクへ（クラッシュ時の修復対象にする）
+            self._zip.fp.flush()
+            self._names.add(arcname)
+        return True
+
+    def close(self):
+        """中央ディレクトリを書き出して閉じる（.part のまま、再開可能）"""
+        with self._lock:
+            if self._zip is not None:
+                self._zip.close()
+                self._zip = None
+
+    def finalize(self) -> str:
+        """ページ順に並べて閉じ、fsync後に本来のアーカイブ名へリネーム
+
+        Returns:
+            str: 確定したアーカイブパス
+        """
+        with self._lock:
+            if self._zip is None:
+                if not os.path.exists(self.part_path):
+                    raise FileNotFoundError(self.part_path)
+                self._zip = zipfile.ZipFile(self.part_path, 'a', self.compression)
+            self._zip.filelist.sort(key=self._order_key)
+            # 並び替えのみでも中央ディレクトリを書き直す
+            self._zip._didModify = True
+            self._zip.close()
+            self._zip = None
+
+            with open(self.part_path, 'rb+') as f:
+                os.fsync(f.fileno())
+            os.replace(self.part_path, self.archive_path)
+        return self.archive_path
+
+    # ------------------------------------------------------------------
+    # 内部処理
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _order_key(info: zipfile.ZipInfo):
+        """ページ番号順（番号の無いエントリは末尾）、同順位はファイル名の自然順"""
+        page = _page_from_extra(info.extra or b'')
+        return (float('inf') if page is None else page, _natural_key(info.filename))
+
+    def _recover_part(self) -> int:
+        """中央ディレクトリが失われた .part を修復
+
+        ローカルファイルヘッダーを先頭から辿り、データまで完全に書き込まれたエントリだけを残して
+        以降を切り詰め、中央ディレクトリを書き直す。
+
+        Returns:
+            int: 残したエントリ数
+        """
+        infos: List[zipfile.ZipInfo] = []
+        size = os.path.getsize(self.part_path)
+        offset = 0
+        with open(self.part_path, 'rb') as f:
+            while offset + _LOCAL_HEADER.size <= size:
+                f.seek(offset)
+                header = f.read(_LOCAL_HEADER.size)
+                (signature, version, flags, method, mod_time, mod_date,
+                 crc, compress_size, file_size, name_len, extra_len) = _LOCAL_HEADER.unpack(header)
+                # サイズ後置（データディスクリプタ）やZIP64のエントリは辿れないためそこで打ち切る
+                if signature != _LOCAL_HEADER_SIGNATURE or flags & 0x08 or not name_len or \
+                        compress_size == 0xFFFFFFFF or file_size == 0xFFFFFFFF:
+                    break
+                raw_name = f.read(name_len)
+                extra = f.read(extra_len)
+                end = offset + _LOCAL_HEADER.size + name_len + extra_len + compress_size
+                if len(raw_name) != name_len or len(extra) != extra_len or end > size:
+                    break
+
+                name = raw_name.decode('utf-8' if flags & 0x800 else 'cp437')
+                info = zipfile.ZipInfo(name, date_time=(
+                    (mod_date >> 9) + 1980, max(1, (mod_date >> 5) & 0x0F), max(1, mod_date & 0x1F),
+                    mod_time >> 11, (mod_time >> 5) & 0x3F, (mod_time & 0x1F) * 2))
+                info.flag_bits = flags
+                info.compress_type = method
+                info.CRC = crc
+                info.compress_size = compress_size
+                info.file_size = file_size
+                info.header_offset = offset
+                info.extract_version = version
+                info.extra = extra
+                info.external_attr = 0o644 << 16
+                infos.append(info)
+                offset = end
+
+        with open(self.part_path, 'rb+') as fp:
+            fp.truncate(offset)
+            fp.seek(offset)
+            rebuilt = zipfile.ZipFile(fp, 'w', self.compression)
+            rebuilt.start_dir = offset
+            for info in infos:
+                rebuilt.filelist.append(info)
+                rebuilt.NameToInfo[info.filename] = info
+            rebuilt.close()
+        return len(infos)
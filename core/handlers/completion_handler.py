@@ -223,7 +223,7 @@ class CompletionHandler:
             f"【完了処理】未完了状態のため、圧縮処理をスキップ: {normalized_url} (status: {url_status})"
         )
         
-        if self.parent.rename_incomplete_folder.get() and save_folder:
+        if self.parent.get_options_snapshot().rename_incomplete_folder and save_folder:
             try:
                 if not hasattr(self.parent, 'incomplete_folders'):
                     self.parent.incomplete_folders = set()
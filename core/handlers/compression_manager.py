@@ -4,14 +4,21 @@ Compression Manager - 圧縮処理の専門コンポーネント
 
 責任範囲:
 - フォルダ圧縮処理
-- 圧縮タスクの並行実行管理
+- 圧縮タスクのキュー投入と完了状態の管理（実行はCompressionSchedulerのワーカー）
 - 圧縮後のファイル削除処理
 - 未完了フォルダの接頭辞管理
+- ダウンロード中の画像の直接ZIP書き込み（ストリーミングモード）
 """
 
 import os
 import threading
-from typing import Optional
+from typing import Any, Dict, Optional
+
+from core.handlers.archive_codecs import (EXCLUDED_FILENAMES, create_7z_archive, create_tar_archive,
+                                          get_archive_extension)
+from core.handlers.archive_writer import StreamingArchiveWriter, choose_compress_type_for_file
+from core.handlers.compression_scheduler import CompressionScheduler
+from core.stage_metrics import get_stage_metrics, gallery_key_of, STAGE_COMPRESSION
 
 
 class CompressionManager:
@@ -35,9 +42,197 @@ class CompressionManager:
         self.compression_in_progress = False
         self.compression_target_folder = None
         self.compression_target_url = None
+        
+        # 直接ZIP書き込み中のライター（フォルダパス → ライター）
+        self._stream_writers: Dict[str, StreamingArchiveWriter] = {}
+        self._stream_lock = threading.Lock()
+        
+        # ⭐圧縮ジョブのキュー（同時実行数を制限し、未完了ジョブは再起動後に復元）⭐
+        self._tasks_lock = threading.Lock()
+        self.scheduler = CompressionScheduler(
+            self._run_compression_job,
+            max_workers=1,
+            log=self.session_manager.ui_bridge.post_log
+        )
+        self.scheduler.on_queue_changed = self._on_queue_changed
+    
+    # ------------------------------------------------------------------
+    # 圧縮キュー
+    # ------------------------------------------------------------------
+    
+    def _options(self):
+        """凍結済みのオプションスナップショット（圧縮ワーカーからTk変数を読まない）"""
+        return self.parent.get_options_snapshot()
+    
+    def _get_max_workers(self) -> int:
+        """同時圧縮数を取得（不正な値の場合は1）"""
+        try:
+            return max(1, int(self._options().compression_max_workers))
+        except Exception:
+            return 1
+    
+    def _on_queue_changed(self, queued: int, running: int):
+        """キューの深さをGUIのフッターへ反映"""
+        gui = self.parent.parent
+        if hasattr(gui, 'update_footer_compression_queue'):
+            gui.async_executor.execute_gui_async(
+                lambda: gui.update_footer_compression_queue(queued, running)
+            )
+    
+    def restore_pending_jobs(self) -> int:
+        """前回終了時に残っていた圧縮ジョブを復元して再開
+        
+        Returns:
+            int: 復元したジョブ数
+        """
+        if self._options().compression_enabled != "on":
+            return 0
+        self.scheduler.set_max_workers(self._get_max_workers())
+        restored = self.scheduler.restore()
+        if restored:
+            self.session_manager.ui_bridge.post_log(
+                f"🗜️  前回の未完了の圧縮ジョブを再開: {restored}件"
+            )
+        return restored
+    
+    def check_all_compressions_complete(self) -> bool:
+        """すべての圧縮（待機中を含む）が完了しているか"""
+        with self._tasks_lock:
+            if any(status in ('queued', 'running') for status in self.compression_tasks.values()):
+                return False
+        return self.scheduler.is_idle()
+    
+    def get_pending_compression_count(self) -> int:
+        """待機中・実行中の圧縮ジョブ数"""
+        return self.scheduler.queued_count() + self.scheduler.running_count()
+    
+    def shutdown(self):
+        """圧縮ワーカーを終了（未完了ジョブは次回起動時に再開）"""
+        self.scheduler.shutdown()
+    
+    # ------------------------------------------------------------------
+    # 直接ZIP書き込み（ストリーミングモード）
+    # ------------------------------------------------------------------
+    
+    def should_stream(self, options: Any) -> bool:
+        """画像を直接ZIPへ書き込むか判定
+        
+        Args:
+            options: オプションスナップショット
+            
+        Returns:
+            bool: ZIP圧縮かつ直接書き込みが有効ならTrue
+                  （JPG変換・リサイズでフォルダへの出力が必要な場合はFalse）
+        """
+        return (options.compression_enabled == "on" and
+                options.compression_format == "ZIP" and
+                bool(options.compression_stream_direct) and
+                options.save_format == "Original" and
+                options.resize_enabled != "on")
+    
+    def get_archive_path(self, folder_path: str, options: Optional[Any] = None) -> str:
+        """フォルダに対応するZIPのパスを取得（未完了接頭辞は除く）"""
+        if options is None:
+            options = self.parent.get_options_snapshot()
+        base_name = os.path.basename(os.path.normpath(folder_path))
+        prefix = options.incomplete_folder_prefix
+        if options.rename_incomplete_folder and prefix and base_name.startswith(prefix):
+            base_name = base_name[len(prefix):]
+        return os.path.join(os.path.dirname(os.path.normpath(folder_path)), f"{base_name}.zip")
+    
+    def _get_stream_writer(self, folder_path: str, create: bool = True) -> Optional[StreamingArchiveWriter]:
+        """フォルダ用のライターを取得（.part が残っていれば続きから開く）"""
+        key = os.path.normcase(os.path.normpath(folder_path))
+        with self._stream_lock:
+            writer = self._stream_writers.get(key)
+            if writer is not None:
+                return writer
+            options = self.parent.get_options_snapshot()
+            archive_path = self.get_archive_path(folder_path, options)
+            if not create and not os.path.exists(archive_path + '.part'):
+                return None
+            writer = StreamingArchiveWriter(
+                archive_path,
+                profile=options.compression_profile,
+                sample_unknown=options.compression_sample_unknown
+            ).open()
+            self._stream_writers[key] = writer
+        
+        if writer.recovered_entries:
+            self.session_manager.ui_bridge.post_log(
+                f"書き込み途中のZIPを修復しました: {os.path.basename(writer.part_path)} "
+                f"({writer.recovered_entries}件を保持)", "warning"
+            )
+        elif writer.names():
+            self.session_manager.ui_bridge.post_log(
+                f"書き込み途中のZIPから再開: {os.path.basename(writer.part_path)} "
+                f"({len(writer.names())}件)", "info"
+            )
+        return writer
+    
+    def stream_image(self, save_path: str, image_data: bytes, page: Optional[int] = None) -> bool:
+        """画像をギャラリーのZIPへ直接書き込む
+        
+        Args:
+            save_path: 通常モードでの保存パス（親フォルダとファイル名を使用）
+            image_data: 画像データ
+            page: ページ番号（ZIP内の並び順に使用）
+            
+        Returns:
+            bool: 書き込んだ場合True、既にZIP内に存在する場合False
+        """
+        writer = self._get_stream_writer(os.path.dirname(save_path))
+        return writer.add(os.path.basename(save_path), image_data, page)
+    
+    def is_streamed(self, save_path: str) -> bool:
+        """画像が書き込み途中のZIPに含まれているか（再開時の保存済み判定用）"""
+        try:
+            if not self.should_stream(self.parent.get_options_snapshot()):
+                return False
+            writer = self._get_stream_writer(os.path.dirname(save_path), create=False)
+            return writer is not None and writer.contains(os.path.basename(save_path))
+        except Exception:
+            return False
+    
+    def _finalize_stream(self, folder_path: str) -> Optional[str]:
+        """直接書き込み中のZIPを確定（対象がなければNone）"""
+        writer = self._get_stream_writer(folder_path, create=False)
+        if writer is None:
+            return None
+        key = os.path.normcase(os.path.normpath(folder_path))
+        with self._stream_lock:
+            self._stream_writers.pop(key, None)
+        return writer.finalize()
+    
+    def close_stream(self, folder_path: str):
+        """ギャラリーの書き込み中のZIPを閉じる（停止・エラー時。.part は再開用に残す）"""
+        key = os.path.normcase(os.path.normpath(folder_path))
+        with self._stream_lock:
+            writer = self._stream_writers.pop(key, None)
+        if writer is None:
+            return
+        try:
+            writer.close()
+        except Exception as e:
+            self.session_manager.ui_bridge.post_log(
+                f"ZIPのクローズエラー: {os.path.basename(writer.part_path)} - {e}", "error"
+            )
+    
+    def close_streams(self):
+        """書き込み中のZIPをすべて閉じる（.part は次回の再開用に残す）"""
+        with self._stream_lock:
+            writers = list(self._stream_writers.values())
+            self._stream_writers.clear()
+        for writer in writers:
+            try:
+                writer.close()
+            except Exception as e:
+                self.session_manager.ui_bridge.post_log(
+                    f"ZIPのクローズエラー: {os.path.basename(writer.part_path)} - {e}", "error"
+                )
     
     def start_compression_task(self, folder_path: str, url: Optional[str] = None):
-        """圧縮タスクを並行して開始
+        """圧縮タスクをキューへ投入（ワーカー数の上限内で順番に実行）
         
         Args:
             folder_path: 圧縮対象フォルダパス
@@ -45,12 +240,7 @@ class CompressionManager:
         """
         try:
             # 圧縮が有効かチェック
-            if not hasattr(self.parent.parent, 'compression_enabled'):
-                return
-            
-            compression_enabled = self.parent.parent.compression_enabled.get() \
-                if hasattr(self.parent.parent.compression_enabled, 'get') else "off"
-            if compression_enabled != "on":
+            if self._options().compression_enabled != "on":
                 return
             
             if not os.path.exists(folder_path):
@@ -59,59 +249,88 @@ class CompressionManager:
                 )
                 return
             
-            def compress_thread():
-                try:
-                    # 圧縮状態を実行中に設定
-                    self.compression_in_progress = True
-                    self.compression_target_folder = folder_path
-                    self.compression_target_url = url
-                    
-                    if url:
-                        self.compression_tasks[url] = 'running'
-                        self.session_manager.ui_bridge.post_log(
-                            f"🗜️  圧縮開始: {os.path.basename(folder_path)}"
-                        )
-                    else:
-                        self.session_manager.ui_bridge.post_log(
-                            f"🗜️  圧縮開始: {os.path.basename(folder_path)}"
-                        )
-                    
-                    # 圧縮実行
-                    self.compress_folder(folder_path)
-                    
-                    # ⭐修正: 圧縮完了処理（ログはcompress_folder内で出力済み）⭐
-                    self.compression_in_progress = False
-                    self.compression_target_folder = None
-                    self.compression_target_url = None
-                    
-                    if url:
-                        self.compression_tasks[url] = 'completed'
-                        
-                        # UIスレッドで圧縮完了マーカーを追加
-                        self.parent.parent.async_executor.execute_gui_async(
-                            lambda: self._add_compression_complete_marker(url)
-                        )
-                    
-                except Exception as e:
-                    if url:
-                        self.compression_tasks[url] = 'error'
-                        self.session_manager.ui_bridge.post_log(
-                            f"圧縮エラー: {folder_path} (URL: {url}) - {e}", "error"
-                        )
-                    else:
-                        self.session_manager.ui_bridge.post_log(
-                            f"圧縮エラー: {folder_path} - {e}", "error"
-                        )
+            # 同時実行数の変更をキューに反映
+            self.scheduler.set_max_workers(self._get_max_workers())
             
-            # 圧縮を別スレッドで実行
-            compression_thread = threading.Thread(target=compress_thread, daemon=True)
-            compression_thread.start()
+            # ワーカーが先に状態を更新しても上書きしないよう投入前に設定し、失敗時は元に戻す
+            previous_status = None
+            if url:
+                with self._tasks_lock:
+                    previous_status = self.compression_tasks.get(url)
+                    self.compression_tasks[url] = 'queued'
+            if not self.scheduler.submit(folder_path, url):
+                if url:
+                    with self._tasks_lock:
+                        if self.compression_tasks.get(url) == 'queued':
+                            if previous_status is None:
+                                self.compression_tasks.pop(url, None)
+                            else:
+                                self.compression_tasks[url] = previous_status
+                self.session_manager.ui_bridge.post_log(
+                    f"圧縮は待機中または実行中です: {os.path.basename(folder_path)}", "debug"
+                )
+                return
+            
+            queued = self.scheduler.queued_count()
+            if queued:
+                self.session_manager.ui_bridge.post_log(
+                    f"🗜️  圧縮待ち: {os.path.basename(folder_path)} (待機 {queued}件)", "debug"
+                )
             
         except Exception as e:
             self.session_manager.ui_bridge.post_log(
                 f"圧縮タスク開始エラー: {e}", "error"
             )
     
+    def _run_compression_job(self, folder_path: str, url: Optional[str] = None):
+        """圧縮ジョブの実行（CompressionSchedulerのワーカースレッドから呼ばれる）"""
+        try:
+            # 圧縮状態を実行中に設定
+            self.compression_in_progress = True
+            self.compression_target_folder = folder_path
+            self.compression_target_url = url
+            
+            if url:
+                with self._tasks_lock:
+                    self.compression_tasks[url] = 'running'
+            self.session_manager.ui_bridge.post_log(
+                f"🗜️  圧縮開始: {os.path.basename(folder_path)}"
+            )
+            
+            # 圧縮実行（工程別の所要時間に記録）
+            stage_metrics = get_stage_metrics()
+            gallery_key = gallery_key_of(url) or stage_metrics.gallery_for_folder(folder_path)
+            with stage_metrics.measure(STAGE_COMPRESSION, gallery_key):
+                self.compress_folder(folder_path)
+            
+            # ⭐修正: 圧縮完了処理（ログはcompress_folder内で出力済み）⭐
+            if url:
+                with self._tasks_lock:
+                    self.compression_tasks[url] = 'completed'
+                
+                # UIスレッドで圧縮完了マーカーを追加
+                self.parent.parent.async_executor.execute_gui_async(
+                    lambda: self._add_compression_complete_marker(url)
+                )
+            
+        except Exception as e:
+            if url:
+                with self._tasks_lock:
+                    self.compression_tasks[url] = 'error'
+                self.session_manager.ui_bridge.post_log(
+                    f"圧縮エラー: {folder_path} (URL: {url}) - {e}", "error"
+                )
+            else:
+                self.session_manager.ui_bridge.post_log(
+                    f"圧縮エラー: {folder_path} - {e}", "error"
+                )
+        finally:
+            # 他のワーカーが実行中でなければ圧縮状態を解除
+            if self.scheduler.running_count() <= 1:
+                self.compression_in_progress = False
+                self.compression_target_folder = None
+                self.compression_target_url = None
+    
     def compress_folder(self, folder_path: str):
         """フォルダの圧縮処理
         
@@ -119,19 +338,35 @@ class CompressionManager:
             folder_path: 圧縮対象フォルダパス
         """
         try:
-            if not hasattr(self.parent.parent, 'compression_enabled') or \
-               self.parent.parent.compression_enabled.get() != "on":
+            options = self._options()
+            if options.compression_enabled != "on":
+                return
+            
+            # ⭐画像後処理（JPG変換・リサイズ）が終わるまで待機してから圧縮⭐
+            post_processor = getattr(self.parent, 'post_processor', None)
+            if post_processor is not None:
+                post_processor.wait_for_gallery(folder_path)
+            
+            # ⭐直接書き込み済みのZIPは確定するだけ（フォルダの再走査・再読み込みは不要）⭐
+            archive_path = self._finalize_stream(folder_path)
+            if archive_path:
+                self.session_manager.ui_bridge.post_log(
+                    f"✅ ZIP圧縮完了: {os.path.basename(archive_path)}"
+                )
+                try:
+                    if not os.listdir(folder_path):
+                        os.rmdir(folder_path)
+                except OSError:
+                    pass
                 return
             
             # フォルダ名から接頭辞を削除（圧縮前に実行）
-            if hasattr(self.parent.parent, 'rename_incomplete_folder') and \
-               self.parent.parent.rename_incomplete_folder.get():
+            if options.rename_incomplete_folder:
                 new_folder_path = self.remove_incomplete_prefix(folder_path)
                 if new_folder_path and new_folder_path != folder_path:
                     folder_path = new_folder_path
             
-            format_type = self.parent.parent.compression_format.get() \
-                if hasattr(self.parent.parent, 'compression_format') else "ZIP"
+            format_type = options.compression_format or "ZIP"
             base_name = os.path.basename(folder_path)
             parent_dir = os.path.dirname(folder_path)
             
@@ -139,15 +374,19 @@ class CompressionManager:
                 archive_path = os.path.join(parent_dir, f"{base_name}.zip")
                 
                 # リサイズ設定に応じた圧縮対象の決定
-                resize_enabled = hasattr(self.parent.parent, 'resize_enabled') and \
-                                self.parent.parent.resize_enabled.get() == "on"
-                keep_original = hasattr(self.parent.parent, 'keep_original') and \
-                               self.parent.parent.keep_original.get()
+                resize_enabled = options.resize_enabled == "on"
+                keep_original = options.keep_original
+                
+                # ⭐エントリごとに圧縮方式を選択（圧縮済み画像は無圧縮で格納）⭐
+                stored_count = 0
+                deflated_count = 0
                 
                 import zipfile
                 with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
                     for root, dirs, files in os.walk(folder_path):
                         for file in files:
+                            if file in EXCLUDED_FILENAMES:
+                                continue
                             file_path = os.path.join(root, file)
                             arc_name = os.path.relpath(file_path, folder_path)
                             
@@ -168,48 +407,57 @@ class CompressionManager:
                                 should_compress = True
                             
                             if should_compress:
-                                zipf.write(file_path, arc_name)
+                                compress_type = choose_compress_type_for_file(
+                                    file_path, options.compression_profile,
+                                    options.compression_sample_unknown
+                                )
+                                zipf.write(file_path, arc_name, compress_type=compress_type)
+                                if compress_type == zipfile.ZIP_STORED:
+                                    stored_count += 1
+                                else:
+                                    deflated_count += 1
                 
                 self.session_manager.ui_bridge.post_log(
                     f"✅ ZIP圧縮完了: {os.path.basename(archive_path)}"
                 )
+                self.session_manager.ui_bridge.post_log(
+                    f"ZIPエントリ: 無圧縮 {stored_count}件 / Deflate {deflated_count}件", "debug"
+                )
                 
                 # 圧縮後フォルダごと削除（優先）
-                if hasattr(self.parent.parent, 'compression_delete_folder') and \
-                   self.parent.parent.compression_delete_folder.get():
+                if options.compression_delete_folder:
                     self._delete_folder_after_compression(folder_path)
                 # ⭐修正: 圧縮後オリジナル削除（ログはsafe_delete_compressed_files内で出力済み）⭐
-                elif hasattr(self.parent.parent, 'compression_delete_original') and \
-                     self.parent.parent.compression_delete_original.get():
+                elif options.compression_delete_original:
                     self.safe_delete_compressed_files(
                         folder_path, resize_enabled, keep_original
                     )
             
             elif format_type == "7Z":
                 # 7Z圧縮（py7zrライブラリが必要）
+                archive_path = os.path.join(parent_dir, f"{base_name}{get_archive_extension(format_type)}")
+                level = self.parent.get_options_snapshot().compression_level
                 try:
-                    import py7zr
-                    archive_path = os.path.join(parent_dir, f"{base_name}.7z")
-                    with py7zr.SevenZipFile(archive_path, 'w') as archive:
-                        archive.writeall(folder_path, base_name)
-                    self.session_manager.ui_bridge.post_log(
-                        f"✅ 7Z圧縮完了: {os.path.basename(archive_path)}"
-                    )
+                    codec = create_7z_archive(folder_path, archive_path, base_name, level)
                 except ImportError:
                     self.session_manager.ui_bridge.post_log(
                         "7Z圧縮にはpy7zrライブラリが必要です", "error"
                     )
                     return
+                self._log_codec_result(format_type, archive_path, codec)
             
-            elif format_type == "TAR":
-                # TAR圧縮
-                import tarfile
-                archive_path = os.path.join(parent_dir, f"{base_name}.tar.gz")
-                with tarfile.open(archive_path, 'w:gz') as tar:
-                    tar.add(folder_path, arcname=base_name)
-                self.session_manager.ui_bridge.post_log(
-                    f"✅ TAR圧縮完了: {os.path.basename(archive_path)}"
-                )
+            elif format_type in ("TAR", "TAR.XZ", "TAR.ZST"):
+                # ⭐TAR圧縮（ブロック分割による並列圧縮・zstdはライブラリのマルチスレッド）⭐
+                archive_path = os.path.join(parent_dir, f"{base_name}{get_archive_extension(format_type)}")
+                level = self.parent.get_options_snapshot().compression_level
+                try:
+                    codec = create_tar_archive(folder_path, archive_path, base_name, format_type, level)
+                except ImportError:
+                    self.session_manager.ui_bridge.post_log(
+                        "TAR.ZST圧縮にはzstandardライブラリが必要です", "error"
+                    )
+                    return
+                self._log_codec_result(format_type, archive_path, codec)
             
         except Exception as e:
             self.session_manager.ui_bridge.post_log(
@@ -217,6 +465,15 @@ class CompressionManager:
             )
             raise
     
+    def _log_codec_result(self, format_type: str, archive_path: str, codec: Dict[str, Any]):
+        """TAR・7Z圧縮の完了ログ（使用したコーデックはデバッグログ）"""
+        self.session_manager.ui_bridge.post_log(
+            f"✅ {format_type}圧縮完了: {os.path.basename(archive_path)}"
+        )
+        self.session_manager.ui_bridge.post_log(
+            f"圧縮コーデック: {codec['codec']} レベル{codec['level']} ({codec['workers']}スレッド)", "debug"
+        )
+    
     def _delete_folder_after_compression(self, folder_path: str):
         """圧縮後にフォルダごと削除
         
@@ -287,6 +544,10 @@ class CompressionManager:
                         file_ext = os.path.splitext(file)[1].lower()
                         should_delete = file_ext in image_extensions
                     
+                    # マニフェストは削除した画像を指すため一緒に削除
+                    if file in EXCLUDED_FILENAMES:
+                        should_delete = True
+                    
                     if should_delete:
                         try:
                             os.remove(file_path)
@@ -327,10 +588,7 @@ class CompressionManager:
             str: 変更後のフォルダパス（変更なしの場合は元のパス）
         """
         try:
-            if not hasattr(self.parent.parent, 'incomplete_folder_prefix'):
-                return folder_path
-            
-            prefix = self.parent.parent.incomplete_folder_prefix.get()
+            prefix = self._options().incomplete_folder_prefix
             if not prefix or not folder_path:
                 return folder_path
             
@@ -364,14 +622,14 @@ class CompressionManager:
             renamed_folders: リネーム済みフォルダのセット
         """
         try:
-            if not hasattr(self.parent.parent, 'rename_incomplete_folder') or \
-               not self.parent.parent.rename_incomplete_folder.get():
+            options = self._options()
+            if not options.rename_incomplete_folder:
                 return
             
             if not incomplete_folders:
                 return
             
-            prefix = self.parent.parent.incomplete_folder_prefix.get()
+            prefix = options.incomplete_folder_prefix
             if not prefix:
                 return
             
@@ -385,6 +643,11 @@ class CompressionManager:
                     if folder_path in renamed_folders:
                         continue
                     
+                    # ⭐画像後処理の書き込みが残っている場合は終わるまで待つ⭐
+                    post_processor = getattr(self.parent, 'post_processor', None)
+                    if post_processor is not None:
+                        post_processor.wait_for_gallery(folder_path)
+                    
                     # 既に接頭辞が付いているかチェック
                     folder_name = os.path.basename(folder_path)
                     if folder_name.startswith(prefix):
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Compression Scheduler - 圧縮ジョブのキューとワーカー管理
+
+責任範囲:
+- 圧縮ジョブの優先度付きFIFOキュー（同じフォルダの重複投入を防止）
+- 同時に実行する圧縮ワーカー数の上限（ディスクの奪い合いを防ぐ）
+- 未完了ジョブのファイル保存と、再起動後の復元
+- キューの深さ（待機数・実行中数）の通知
+"""
+
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_QUEUE_FILE = "compression_queue.json"
+
+# 優先度（小さいほど先に実行、同じ優先度は投入順）
+PRIORITY_RESTORED = -1  # 前回終了時に残っていたジョブ
+PRIORITY_NORMAL = 0
+
+
+class CompressionScheduler:
+    """圧縮ジョブのスケジューラー
+
+    ジョブは (優先度, 投入順) の順にワーカーへ渡され、runner(folder_path, url) で実行される。
+    未完了ジョブ（待機中・実行中）はジョブの増減のたびに queue_file へ保存し、
+    restore() で次回起動時に復元する。
+    """
+
+    def __init__(self, runner: Callable[[str, Optional[str]], None], max_workers: int = 1,
+                 queue_file: str = DEFAULT_QUEUE_FILE,
+                 log: Optional[Callable[[str, str], None]] = None):
+        """初期化
+
+        Args:
+            runner: ジョブを実行する関数 (folder_path, url)
+            max_workers: 同時に実行する圧縮数
+            queue_file: 未完了ジョブの保存先
+            log: ログ出力関数 (message, level)
+        """
+        self.runner = runner
+        self.max_workers = max(1, int(max_workers or 1))
+        self.queue_file = queue_file
+        self._log = log or (lambda message, level="info": None)
+
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._cond = threading.Condition(threading.Lock())
+        self._jobs: Dict[str, Dict[str, Any]] = {}  # フォルダキー → ジョブ（待機中・実行中）
+        self._running: Dict[str, Dict[str, Any]] = {}
+        self._workers: List[threading.Thread] = []
+        self._closed = False
+        # restore() 前に投入があっても前回の未完了ジョブを上書きしないよう先に読み込む
+        self._saved_jobs: List[Dict[str, Any]] = self._load()
+        self.on_queue_changed: Optional[Callable[[int, int], None]] = None
+
+    # ------------------------------------------------------------------
+    # 公開API
+    # ------------------------------------------------------------------
+
+    def submit(self, folder_path: str, url: Optional[str] = None,
+               priority: int = PRIORITY_NORMAL) -> bool:
+        """圧縮ジョブを投入
+
+        Returns:
+            bool: 投入した場合True（同じフォルダが待機中・実行中、または終了済みの場合False）
+        """
+        key = self._normalize(folder_path)
+        with self._cond:
+            if self._closed or key in self._jobs:
+                return False
+            job = {
+                'folder_path': folder_path,
+                'url': url,
+                'priority': int(priority),
+                'enqueued_at': time.time(),
+            }
+            self._jobs[key] = job
+            self._queue.put((job['priority'], next(self._seq), key))
+            self._ensure_workers()
+            self._save_locked()
+        self._notify_queue_changed()
+        return True
+
+    def restore(self) -> int:
+        """前回終了時に残っていたジョブを復元（フォルダが存在しないものは破棄）
+
+        Returns:
+            int: 復元したジョブ数
+        """
+        with self._cond:
+            saved, self._saved_jobs = self._saved_jobs, []
+
+        restored = 0
+        for job in sorted(saved, key=lambda j: j.get('enqueued_at', 0)):
+            folder_path = job.get('folder_path')
+            if not folder_path or not os.path.isdir(folder_path):
+                continue
+            if self.submit(folder_path, job.get('url'), PRIORITY_RESTORED):
+                restored += 1
+        # 破棄したジョブを保存内容から除く
+        with self._cond:
+            self._save_locked()
+        return restored
+
+    def set_max_workers(self, max_workers: int):
+        """同時実行数を変更（減らした場合は実行中のジョブの完了後に反映）"""
+        with self._cond:
+            self.max_workers = max(1, int(max_workers or 1))
+            if self._queue.qsize():
+                self._ensure_workers()
+
+    def queued_count(self) -> int:
+        """待機中のジョブ数"""
+        with self._cond:
+            return len(self._jobs) - len(self._running)
+
+    def running_count(self) -> int:
+        """実行中のジョブ数"""
+        with self._cond:
+            return len(self._running)
+
+    def is_idle(self) -> bool:
+        """待機中・実行中のジョブがないか"""
+        with self._cond:
+            return not self._jobs
+
+    def is_scheduled(self, folder_path: str) -> bool:
+        """フォルダの圧縮が待機中・実行中か"""
+        with self._cond:
+            return self._normalize(folder_path) in self._jobs
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """すべてのジョブが終わるまで待機
+
+        Returns:
+            bool: 完了したらTrue、タイムアウトした場合False
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._jobs, timeout)
+
+    def shutdown(self):
+        """新規投入を止めてワーカーを終了（未完了ジョブは保存済みのまま次回へ持ち越す）"""
+        with self._cond:
+            self._closed = True
+            workers = len(self._workers)
+        for _ in range(workers):
+            self._queue.put((float('inf'), next(self._seq), None))
+
+    # ------------------------------------------------------------------
+    # 内部処理
+    # ------------------------------------------------------------------
+
+    def _ensure_workers(self):
+        """待機ジョブに対してワーカーが足りなければ起動（ロック保持中に呼ぶ）"""
+        self._workers = [w for w in self._workers if w.is_alive()]
+        while len(self._workers) < self.max_workers and not self._closed:
+            worker = threading.Thread(
+                target=self._worker_loop, name=f"Compression-{len(self._workers) + 1}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _worker_loop(self):
+        while True:
+            try:
+                _, _, key = self._queue.get(timeout=5.0)
+            except queue.Empty:
+                # 待機ジョブがなければワーカーを終了（次の投入で再起動）
+                with self._cond:
+                    if self._queue.empty():
+                        self._workers.remove(threading.current_thread())
+                        return
+                continue
+
+            with self._cond:
+                job = self._jobs.get(key) if key is not None else None
+                if job is None or self._closed:
+                    if key is None or self._closed:
+                        self._workers.remove(threading.current_thread())
+                        return
+                    continue
+                self._running[key] = job
+            self._notify_queue_changed()
+
+            try:
+                self.runner(job['folder_path'], job['url'])
+            except Exception as e:
+                self._log(f"圧縮ジョブエラー: {job['folder_path']} - {e}", "error")
+            finally:
+                with self._cond:
+                    self._running.pop(key, None)
+                    self._jobs.pop(key, None)
+                    self._save_locked()
+                    self._cond.notify_all()
+                    # 同時実行数を減らした場合は余分なワーカーを終了
+                    retire = len(self._workers) > self.max_workers
+                    if retire:
+                        self._workers.remove(threading.current_thread())
+                self._notify_queue_changed()
+            if retire:
+                return
+
+    def _load(self) -> List[Dict[str, Any]]:
+        """保存済みの未完了ジョブを読み込み"""
+        try:
+            with open(self.queue_file, 'r', encoding='utf-8') as f:
+                return list(json.load(f).get('jobs', []))
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            self._log(f"圧縮キューの読み込みエラー: {e}", "warning")
+            return []
+
+    def _save_locked(self):
+        """未完了ジョブを保存（ロック保持中に呼ぶ、ジョブがなければファイルを削除）"""
+        try:
+            jobs = list(self._jobs.values())
+            jobs.extend(job for job in self._saved_jobs
+                        if self._normalize(job.get('folder_path') or '') not in self._jobs)
+            if not jobs:
+                if os.path.exists(self.queue_file):
+                    os.remove(self.queue_file)
+                return
+            data = {'version': 1, 'jobs': jobs}
+            temp_file = self.queue_file + '.tmp'
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_file, self.queue_file)
+        except Exception as e:
+            self._log(f"圧縮キューの保存エラー: {e}", "warning")
+
+    def _notify_queue_changed(self):
+        if self.on_queue_changed is None:
+            return
+        with self._cond:
+            running = len(self._running)
+            queued = len(self._jobs) - running
+        try:
+            self.on_queue_changed(queued, running)
+        except Exception as e:
+            self._log(f"圧縮キュー通知エラー: {e}", "debug")
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return os.path.normcase(os.path.normpath(path))
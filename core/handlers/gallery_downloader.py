@@ -14,6 +14,8 @@ from core.utils.validation import require_not_none, safe_str, validate_url, vali
 from core.utils.contracts import require
 from core.errors.error_context import ErrorContext
 from core.errors.enhanced_error_handler import FinalAction
+from core.handlers.gallery_manifest import PAGE_OK
+from core.stage_metrics import gallery_key_of, host_of, STAGE_IMAGE_PAGE, STAGE_RATE_LIMIT_WAIT
 
 
 class GalleryDownloader:
@@ -223,7 +225,7 @@ class GalleryDownloader:
                     self.parent.download_list_widget.update_status(normalized_gallery_url, 'pending')
                 
                 # 未完了フォルダとして記録
-                if save_folder and self.parent.rename_incomplete_folder.get():
+                if save_folder and self.core.get_options_snapshot().rename_incomplete_folder:
                     if not hasattr(self.core, 'incomplete_folders'):
                         self.core.incomplete_folders = set()
                     self.core.incomplete_folders.add(save_folder)
@@ -359,7 +361,7 @@ class GalleryDownloader:
             save_folder: 保存先フォルダ
         """
         # 未完了フォルダとして記録
-        if save_folder and self.parent.rename_incomplete_folder.get():
+        if save_folder and self.core.get_options_snapshot().rename_incomplete_folder:
             if not hasattr(self.core, 'incomplete_folders'):
                 self.core.incomplete_folders = set()
             self.core.incomplete_folders.add(save_folder)
@@ -606,7 +608,8 @@ class GalleryDownloader:
             stage_data = resume_info.get('stage_data', {}) if resume_info else {}
             save_path = stage_data.get('save_path')
             
-            if save_path and os.path.exists(save_path):
+            if save_path and (os.path.exists(save_path) or
+                              self.core.compression_manager.is_streamed(save_path)):
                 # 画像保存済み：次のページから開始
                 actual_start_page = actual_start_page + 1
                 self.session_manager.ui_bridge.post_log(
@@ -778,8 +781,7 @@ class GalleryDownloader:
             display_range_info = download_range_info
             if download_range_info and download_range_info.get('enabled'):
                 # 範囲モード確認
-                options = self.core._get_current_options()
-                range_mode = options.get('download_range_mode', "全てのURL")
+                range_mode = self.core.get_options_snapshot().download_range_mode
                 if range_mode == "1行目のURLのみ" and current_url_index > 0:
                     display_range_info = None
             
@@ -1042,6 +1044,19 @@ class GalleryDownloader:
             "debug"
         )
         
+        # ⭐マニフェスト: 保存済みページは画像ページを取得せずにスキップ⭐
+        manifest = self.core.open_gallery_manifest(save_folder)
+        
+        # ⭐工程別の所要時間: 後処理・圧縮（フォルダ単位）をこのギャラリーとして集計⭐
+        stage_metrics = self.core.stage_metrics
+        gallery_key = gallery_key_of(normalized_url)
+        stage_metrics.bind_folder(save_folder, gallery_key)
+        manifest_skipped = 0
+        if manifest is not None and len(manifest):
+            self.session_manager.ui_bridge.post_log(
+                f"マニフェストを読み込み: 保存済み{len(manifest)}ページ", "info"
+            )
+        
         # 各画像ページをダウンロード
         for index, image_page_url in enumerate(download_image_urls, start=actual_start_page):
             # ⭐DEBUG: 各画像処理開始⭐
@@ -1108,6 +1123,11 @@ class GalleryDownloader:
                         "info"
                     )
                 
+                # 保存済み（サイズ一致）のページは通信せずにスキップ
+                if manifest is not None and self._check_manifest_page(manifest, index, actual_total_pages):
+                    manifest_skipped += 1
+                    continue
+                
                 # 実際の画像ダウンロード処理
                 self._process_single_image_page(
                     image_page_url, index, actual_total_pages,
@@ -1118,7 +1138,8 @@ class GalleryDownloader:
                 
                 # 待機時間
                 if wait_time_value > 0:
-                    time.sleep(wait_time_value)
+                    stage_metrics.sleep(STAGE_RATE_LIMIT_WAIT, wait_time_value, gallery_key,
+                                        host_of(image_page_url))
                 
             except Exception as e:
                 self.session_manager.ui_bridge.post_log(
@@ -1134,6 +1155,11 @@ class GalleryDownloader:
                 # 継続してスキップ
                 continue
         
+        if manifest_skipped:
+            self.session_manager.ui_bridge.post_log(
+                f"マニフェストにより{manifest_skipped}ページをスキップ（画像ページの取得なし）", "info"
+            )
+        
         # ⭐Phase1.1: ダウンロードループ完了を通知⭐
         current_url_index = self.state_manager.get_current_url_index()
         if current_url_index is not None:
@@ -1144,6 +1170,33 @@ class GalleryDownloader:
         
         self.session_manager.ui_bridge.post_log("ダウンロードループ完了", "info")
     
+    def _check_manifest_page(self, manifest, page_num: int, total_pages: int) -> bool:
+        """マニフェストでページの保存状態を確認
+        
+        Returns:
+            保存済みでスキップできる場合True（途中で切れたファイルは削除して再ダウンロード）
+        """
+        state = manifest.check(page_num)
+        if state is None:
+            return False
+        if state == PAGE_OK:
+            return True
+        
+        entry = manifest.get(page_num)
+        file_path = manifest.resolve(entry) if entry else None
+        self.session_manager.ui_bridge.post_log(
+            f"[{page_num}/{total_pages}] 保存済みファイルが不完全なため再ダウンロード（{state}）: "
+            f"{os.path.basename(file_path) if file_path else ''}",
+            "warning"
+        )
+        if file_path and os.path.exists(file_path):
+            try:
+                os.remove(file_path)
+            except OSError as e:
+                self.session_manager.ui_bridge.post_log(f"不完全なファイルの削除エラー: {e}", "warning")
+        manifest.forget(page_num)
+        return False
+    
     def _process_single_image_page(
         self, 
         image_page_url: str, 
@@ -1185,7 +1238,9 @@ class GalleryDownloader:
                 f"[DEBUG] _get_image_info_from_page()呼び出し直前",
                 "debug"
             )
-            image_info = self.core._get_image_info_from_page(image_page_url)
+            with self.core.stage_metrics.measure(STAGE_IMAGE_PAGE, gallery_key_of(image_page_url),
+                                                 host_of(image_page_url)):
+                image_info = self.core._get_image_info_from_page(image_page_url)
             self.session_manager.ui_bridge.post_log(
                 f"[DEBUG] _get_image_info_from_page()完了: image_info={image_info is not None}",
                 "debug"
@@ -1359,7 +1414,7 @@ class GalleryDownloader:
         """
         try:
             # Seleniumが有効かチェック
-            if not hasattr(self.core.parent, 'selenium_enabled') or not self.core.parent.selenium_enabled.get():
+            if not self.core.get_options_snapshot().selenium_enabled:
                 self.session_manager.ui_bridge.post_log(
                     "Seleniumが無効のため、Selenium処理をスキップします",
                     "warning"
@@ -1420,6 +1475,14 @@ class GalleryDownloader:
         Returns:
             {'status': 'success'} または {'status': 'skipped'}
         """
+        # ⭐直接ZIP書き込みモード: 書き込み途中のZIPに含まれていればスキップ⭐
+        if self.core.compression_manager.is_streamed(save_path):
+            self.session_manager.ui_bridge.post_log(
+                f"[{page_num}/{total_pages}] スキップ（ZIP書き込み済み）: {os.path.basename(save_path)}",
+                "info"
+            )
+            return {'status': 'skipped'}
+        
         # ファイルが既に存在するかチェック
         if os.path.exists(save_path):
             if duplicate_mode == 'skip':
@@ -1438,7 +1501,8 @@ class GalleryDownloader:
         
         # 画像をダウンロードして保存
         success = self.core.download_and_save_image(
-            image_url, save_path, None, {}  # save_format_option, optionsはコア側で処理
+            image_url, save_path, None, {},  # save_format_option, optionsはコア側で処理
+            page=page_num
         )
         
         if success:
@@ -1457,7 +1521,7 @@ class GalleryDownloader:
             save_folder: 保存フォルダパス
             url: ギャラリーURL（オプション）
         """
-        if save_folder and self.parent.rename_incomplete_folder.get():
+        if save_folder and self.core.get_options_snapshot().rename_incomplete_folder:
             if not hasattr(self.core, 'incomplete_folders'):
                 self.core.incomplete_folders = set()
             self.core.incomplete_folders.add(save_folder)
@@ -1466,6 +1530,10 @@ class GalleryDownloader:
                 "info"
             )
         
+        # ⭐直接ZIP書き込み中のファイルハンドルを解放（.part は再開用に残る）⭐
+        if save_folder:
+            self.core.compression_manager.close_stream(save_folder)
+        
         # ⭐修正: "incomplete"ステータスを設定（有効なDownloadStatus）⭐
         if url:
             normalized_url = self.parent.normalize_url(url)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Gallery Manifest - ギャラリーフォルダごとの保存済みページの記録
+
+責任範囲:
+- 保存した画像ごとに ページ番号・最終ファイル名・サイズ・ハッシュ をフォルダ内のマニフェストへ追記
+- 再開時に、画像ページを取得せずに保存済みページを判定（通信なし）
+- サイズ・ハッシュの不一致による途中で切れたファイルの検出
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+MANIFEST_FILENAME = '.ehd_manifest.jsonl'
+
+# check() の結果
+PAGE_OK = 'ok'
+PAGE_MISSING = 'missing'
+PAGE_TRUNCATED = 'truncated'
+PAGE_CORRUPT = 'corrupt'
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def hash_file(file_path: str) -> str:
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class GalleryManifest:
+    """ギャラリーフォルダのマニフェスト
+
+    1行1エントリのJSON Lines形式で追記する（同じページは後の行が優先）。
+    追記のみのためクラッシュしても最後の不完全な行を読み飛ばすだけで済む。
+    ファイル名はフォルダからの相対パスで記録するため、フォルダ名が変わっても有効。
+    """
+
+    def __init__(self, folder_path: str):
+        self.folder_path = folder_path
+        self.manifest_path = os.path.join(folder_path, MANIFEST_FILENAME)
+        self._lock = threading.Lock()
+        self._pages: Dict[int, Dict[str, Any]] = {}
+        self._needs_newline = False  # 最後の行が書き込み途中で終わっている
+        self._load()
+
+    # ------------------------------------------------------------------
+    # 公開API
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pages)
+
+    def get(self, page: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._pages.get(int(page))
+            return dict(entry) if entry is not None else None
+
+    def pages(self) -> Dict[int, Dict[str, Any]]:
+        with self._lock:
+            return {page: dict(entry) for page, entry in self._pages.items()}
+
+    def record_data(self, page: int, file_path: str, data: bytes):
+        """保存したデータをそのまま記録（書き込んだバイト列からサイズ・ハッシュを計算）"""
+        self._append(page, file_path, len(data), hash_bytes(data))
+
+    def record_file(self, page: int, file_path: str):
+        """保存済みファイルを記録（JPG変換など後処理で書き込まれたファイル）"""
+        try:
+            self._append(page, file_path, os.path.getsize(file_path), hash_file(file_path))
+        except OSError:
+            pass
+
+    def check(self, page: int, verify_hash: bool = False) -> Optional[str]:
+        """ページの保存状態を判定
+
+        Args:
+            page: ページ番号
+            verify_hash: ハッシュまで照合するか（全データを読むため遅い）
+
+        Returns:
+            記録がない場合None、それ以外は PAGE_OK / PAGE_MISSING / PAGE_TRUNCATED / PAGE_CORRUPT
+        """
+        entry = self.get(page)
+        if entry is None:
+            return None
+        file_path = self.resolve(entry)
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return PAGE_MISSING
+        if size != entry.get('size'):
+            return PAGE_TRUNCATED
+        if verify_hash and entry.get('sha1'):
+            try:
+                if hash_file(file_path) != entry['sha1']:
+                    return PAGE_CORRUPT
+            except OSError:
+                return PAGE_MISSING
+        return PAGE_OK
+
+    def is_complete(self, page: int) -> bool:
+        return self.check(page) == PAGE_OK
+
+    def resolve(self, entry: Dict[str, Any]) -> str:
+        """エントリのファイルの絶対パス"""
+        return os.path.join(self.folder_path, entry['file'])
+
+    def forget(self, page: int):
+        """ページの記録を無効化（再ダウンロード前に呼ぶ）"""
+        with self._lock:
+            if self._pages.pop(int(page), None) is None:
+                return
+            self._write_line({'page': int(page), 'removed': True})
+
+    # ------------------------------------------------------------------
+    # 内部処理
+    # ------------------------------------------------------------------
+
+    def _append(self, page: int, file_path: str, size: int, sha1: str):
+        entry = {
+            'page': int(page),
+            'file': os.path.relpath(file_path, self.folder_path),
+            'size': int(size),
+            'sha1': sha1,
+            'time': round(time.time(), 3),
+        }
+        with self._lock:
+            self._pages[entry['page']] = entry
+            self._write_line(entry)
+
+    def _write_line(self, entry: Dict[str, Any]):
+        """1行追記（ロック保持中に呼ぶ）"""
+        try:
+            with open(self.manifest_path, 'a', encoding='utf-8') as f:
+                if self._needs_newline:
+                    f.write('\n')
+                    self._needs_newline = False
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        except OSError:
+            pass
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        self._needs_newline = bool(lines) and not lines[-1].endswith('\n')
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                page = int(entry['page'])
+            except (ValueError, KeyError, TypeError):
+                continue  # 書き込み途中の行
+            if entry.get('removed'):
+                self._pages.pop(page, None)
+            elif 'file' in entry and 'size' in entry:
+                self._pages[page] = entry
@@ -12,6 +12,8 @@ Image Processor - 画像処理の専門コンポーネント
 import os
 from typing import Dict, Any, Optional
 
+from core.stage_metrics import get_stage_metrics, STAGE_POST_PROCESS
+
 
 class ImageProcessor:
     """画像処理を担当するプロセッサー
@@ -29,9 +31,57 @@ class ImageProcessor:
         self.parent = parent
         self.session_manager = parent.session_manager
     
+    def build_resize_job(self, image_path: str, options: Optional[Any] = None,
+                         resize_values: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """リサイズ設定を後処理ジョブ用の辞書にまとめる
+        
+        Args:
+            image_path: 画像ファイルパス
+            options: オプションスナップショット（Noneの場合は現在のものを取得）
+            resize_values: リサイズパラメータ（Noneの場合はスナップショットから取得）
+            
+        Returns:
+            utils.image_ops.resize_image_file の引数。リサイズしない場合はNone
+        """
+        # ⭐ギャラリー単位のオプションスナップショットを参照（Tk変数は読まない）⭐
+        if options is None:
+            options = self.parent.get_options_snapshot()
+        
+        # リサイズ機能が無効の場合はスキップ
+        if options.resize_enabled != "on":
+            return None
+        
+        # resize_valuesが渡されていない場合は取得
+        if resize_values is None:
+            resize_values = options.resize_values.to_dict()
+        
+        if not resize_values:
+            self.session_manager.ui_bridge.post_log("リサイズ値が取得できません", "warning")
+            return None
+        
+        # リサイズ後のファイル名を生成
+        resized_path = self._generate_resized_path(
+            image_path, options.resize_save_location or "child", options
+        )
+        
+        return {
+            'image_path': image_path,
+            'resize_mode': options.resize_mode,
+            'resize_values': {
+                k: int(v) if isinstance(v, str) and v.isdigit() else v
+                for k, v in resize_values.items()
+            },
+            'save_path': resized_path,
+            'interpolation_mode': options.interpolation_mode,
+            'jpg_quality': options.jpg_quality,
+        }
+    
     def process_image_resize(self, image_path: str, gallery_info: Any, page_num: int, 
                             image_info: Any, resize_values: Optional[Dict[str, Any]] = None) -> bool:
-        """画像のリサイズ処理
+        """保存済み画像のリサイズ処理
+        
+        ダウンロード直後の画像は _save_image_data がデコード1回でリサイズまで行うため、
+        このメソッドは既存ファイルを後からリサイズする場合に使う。
         
         Args:
             image_path: 画像ファイルパス
@@ -44,52 +94,32 @@ class ImageProcessor:
             bool: 成功したらTrue
         """
         try:
-            # リサイズ機能が無効の場合はスキップ
-            if not hasattr(self.parent.parent, 'resize_enabled') or \
-               self.parent.parent.resize_enabled.get() != "on":
-                return False
-            
-            # リサイズ値とモードを取得
-            resize_mode = self.parent.parent.resize_mode.get()
-            
-            # resize_valuesが渡されていない場合は取得
-            if resize_values is None:
-                resize_values = self.get_resize_values_safely()
-            
-            if not resize_values:
-                self.session_manager.ui_bridge.post_log("リサイズ値が取得できません", "warning")
+            resize_job = self.build_resize_job(image_path, resize_values=resize_values)
+            if resize_job is None:
                 return False
             
             self.session_manager.ui_bridge.post_log(
-                f"リサイズ処理開始: {image_path} (モード: {resize_mode})", "debug"
+                f"リサイズ処理開始: {image_path} (モード: {resize_job['resize_mode']})", "debug"
             )
             
-            # リサイズ処理を実行
-            from utils.file_utils import EHDownloaderFileUtils
-            file_utils = EHDownloaderFileUtils(self.parent.parent)
-            
-            # リサイズ後の保存場所を決定
-            resize_save_location = "child"  # デフォルト
-            if hasattr(self.parent.parent, 'resize_save_location'):
-                resize_save_location = self.parent.parent.resize_save_location.get()
+            # ⭐後処理ステージに投入（ダウンロードスレッドは待たずに次へ進む）⭐
+            post_processor = getattr(self.parent, 'post_processor', None)
+            if post_processor is not None and post_processor.submit(
+                    {'resize': resize_job}, os.path.dirname(image_path), image_path,
+                    self.parent.state_manager.get_stop_flag()):
+                return True
             
-            # リサイズ後のファイル名を生成
-            resized_path = self._generate_resized_path(
-                image_path, resize_save_location
-            )
-            
-            # リサイズ実行（resize_valuesを辞書形式で渡す）
-            resize_values_dict = {
-                k: int(v) if isinstance(v, str) and v.isdigit() else v 
-                for k, v in resize_values.items()
-            }
-            success = file_utils.resize_image(
-                image_path, resize_mode, resize_values_dict, resized_path
-            )
+            # ステージが使えない場合はこのスレッドで実行
+            from utils.image_ops import resize_image_file
+            stage_metrics = get_stage_metrics()
+            with stage_metrics.measure(STAGE_POST_PROCESS, stage_metrics.gallery_for_folder(os.path.dirname(image_path))):
+                success, messages = resize_image_file(**resize_job)
+            for message in messages:
+                self.session_manager.ui_bridge.post_log(message, "debug")
             
             if success:
                 self.session_manager.ui_bridge.post_log(
-                    f"リサイズ処理完了: {resized_path}", "debug"
+                    f"リサイズ処理完了: {resize_job['save_path']}", "debug"
                 )
             else:
                 self.session_manager.ui_bridge.post_log(
@@ -104,35 +134,56 @@ class ImageProcessor:
             )
             raise
     
-    def _generate_resized_path(self, image_path: str, resize_save_location: str) -> str:
+    def on_gallery_resize_complete(self, progress: Dict[str, Any]):
+        """ギャラリーの全画像のリサイズ完了時の処理（後処理ステージから呼ばれる）
+        
+        Args:
+            progress: ギャラリーの進捗（url, expected, submitted, finished, resized）
+        """
+        url = progress.get('url')
+        if not url:
+            return
+        self.session_manager.ui_bridge.post_log(
+            f"リサイズ完了: {progress['resized']}/{progress['finished']}件 ({url})", "info"
+        )
+        
+        def mark():
+            gui = self.parent.parent
+            if hasattr(gui, 'download_list_widget'):
+                gui.download_list_widget.mark_resized(self.parent.parent.normalize_url(url))
+            if hasattr(gui, 'url_panel'):
+                gui.url_panel._add_resize_complete_marker(url)
+        
+        # UIスレッドでリサイズ完了マーカーを追加
+        self.parent.parent.async_executor.execute_gui_async(mark)
+    
+    def _generate_resized_path(self, image_path: str, resize_save_location: str,
+                               options: Optional[Any] = None) -> str:
         """リサイズ後のファイルパスを生成
         
         Args:
             image_path: 元の画像パス
             resize_save_location: 保存場所 ('child' or 'same')
+            options: オプションスナップショット（Noneの場合は現在のものを取得）
             
         Returns:
             str: リサイズ後の保存パス
         """
+        if options is None:
+            options = self.parent.get_options_snapshot()
         base_name = os.path.splitext(os.path.basename(image_path))[0]
         ext = os.path.splitext(image_path)[1]
         
         # ファイル名の接頭辞・接尾辞を取得
-        resized_prefix = ""
-        resized_suffix = "_resized"
-        if hasattr(self.parent.parent, 'resized_prefix'):
-            resized_prefix = self.parent.parent.resized_prefix.get()
-        if hasattr(self.parent.parent, 'resized_suffix'):
-            resized_suffix = self.parent.parent.resized_suffix.get()
+        resized_prefix = options.resized_prefix
+        resized_suffix = options.resized_suffix
         
         resized_filename = f"{resized_prefix}{base_name}{resized_suffix}{ext}"
         
         # 保存場所に基づいてパスを決定
         if resize_save_location == "child":
             # 子ディレクトリに保存
-            subdir_name = "resized"  # デフォルト
-            if hasattr(self.parent.parent, 'resized_subdir_name'):
-                subdir_name = self.parent.parent.resized_subdir_name.get()
+            subdir_name = options.resized_subdir_name or "resized"
             
             original_dir = os.path.dirname(image_path)
             resized_dir = os.path.join(original_dir, subdir_name)
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+Post Processor - 画像後処理ステージ
+
+責任範囲:
+- JPG変換・リサイズをプロセスプールで実行（ダウンロードスレッドを塞がない）
+- 待機ジョブ数の上限によるバックプレッシャー
+- ギャラリー単位の未完了ジョブ数の管理（圧縮はこれを待ってから開始する）
+- ギャラリー単位のリサイズ進捗（予定数・完了数）の集計と完了通知
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from core.stage_metrics import get_stage_metrics, STAGE_POST_PROCESS
+from utils.image_ops import run_post_process_job
+
+
+class _GalleryProgress:
+    """ギャラリー単位のリサイズ進捗"""
+
+    __slots__ = ('url', 'expected', 'submitted', 'finished', 'resized', 'sealed', 'notified')
+
+    def __init__(self, url: str, expected: int):
+        self.url = url
+        self.expected = max(0, int(expected or 0))
+        self.submitted = 0
+        self.finished = 0
+        self.resized = 0
+        self.sealed = False
+        self.notified = False
+
+    def is_complete(self) -> bool:
+        if self.finished < self.submitted:
+            return False
+        if self.sealed:
+            return True
+        return self.expected > 0 and self.finished >= self.expected
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'url': self.url,
+            'expected': self.expected,
+            'submitted': self.submitted,
+            'finished': self.finished,
+            'resized': self.resized,
+        }
+
+
+class PostProcessingStage:
+    """画像後処理ステージ
+
+    ジョブは utils.image_ops.run_post_process_job に渡す辞書で表す。
+    同じファイルに対するジョブ（JPG変換→リサイズ）は投入順に直列実行される。
+    track_gallery() で登録したギャラリーは、リサイズを含むジョブの完了数を集計し、
+    全件完了した時点で on_resize_complete(進捗辞書) を1回だけ呼び出す。
+    """
+
+    def __init__(self, parent, max_workers: Optional[int] = None,
+                 max_pending: Optional[int] = None):
+        """初期化
+
+        Args:
+            parent: EHDownloaderCoreインスタンス（依存性注入）
+            max_workers: ワーカープロセス数（Noneの場合はCPUコア数）
+            max_pending: 実行中・待機中ジョブの上限（Noneの場合はワーカー数の4倍）
+        """
+        self.parent = parent
+        self.session_manager = parent.session_manager
+        self.max_workers = max(1, int(max_workers or os.cpu_count() or 1))
+        self.max_pending = max(1, int(max_pending or self.max_workers * 4))
+
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._cond = threading.Condition(threading.Lock())
+        self._pending: Dict[str, int] = {}
+        self._chains: Dict[str, Future] = {}
+        self._progress: Dict[str, _GalleryProgress] = {}
+        self._closed = False
+        self.on_resize_complete: Optional[Callable[[Dict[str, Any]], None]] = None
+
+    # ------------------------------------------------------------------
+    # ジョブ投入
+    # ------------------------------------------------------------------
+
+    def submit(self, job: Dict[str, Any], gallery_folder: str, path_key: str,
+               stop_event: Optional[threading.Event] = None,
+               on_done: Optional[Callable[[], None]] = None) -> bool:
+        """後処理ジョブを投入
+
+        待機ジョブが上限に達している場合は空きが出るまで待機する。
+
+        Args:
+            job: run_post_process_job に渡すジョブ
+            gallery_folder: ジョブが属するギャラリーフォルダ
+            path_key: 直列化に使うファイルパス（同じパスのジョブは順番に実行）
+            stop_event: セットされたら待機を打ち切るイベント
+            on_done: ジョブが成功した後に呼ぶ関数（マニフェストへの記録など）
+
+        Returns:
+            bool: 投入できたらTrue（Falseの場合は呼び出し側で同期処理すること）
+        """
+        if not self._acquire_slot(stop_event):
+            return False
+
+        gallery_key = self._normalize(gallery_folder)
+        chain_key = self._normalize(path_key)
+        counts_resize = self._has_resize(job)
+        completion = Future()
+        with self._cond:
+            self._pending[gallery_key] = self._pending.get(gallery_key, 0) + 1
+            progress = self._progress.get(gallery_key)
+            if progress is not None and counts_resize:
+                progress.submitted += 1
+            previous = self._chains.get(chain_key)
+            self._chains[chain_key] = completion
+
+        if previous is not None:
+            # 同じファイルの前のジョブ（JPG変換など）が終わってから実行
+            previous.add_done_callback(
+                lambda _: self._dispatch(job, gallery_key, chain_key, completion, counts_resize, on_done))
+        else:
+            self._dispatch(job, gallery_key, chain_key, completion, counts_resize, on_done)
+        return True
+
+    # ------------------------------------------------------------------
+    # ギャラリー単位の進捗
+    # ------------------------------------------------------------------
+
+    def track_gallery(self, gallery_folder: str, url: str, expected: int = 0):
+        """ギャラリーのリサイズ進捗の集計を開始
+
+        Args:
+            gallery_folder: ギャラリーフォルダ
+            url: ギャラリーURL（完了通知に含める）
+            expected: リサイズ予定の画像数（不明な場合0、seal_gallery() で確定）
+        """
+        with self._cond:
+            self._progress[self._normalize(gallery_folder)] = _GalleryProgress(url, expected)
+
+    def seal_gallery(self, gallery_folder: str, completed: bool = True):
+        """ギャラリーのダウンロード終了を通知（以降のジョブ投入はない）
+
+        Args:
+            gallery_folder: ギャラリーフォルダ
+            completed: 正常完了した場合True（Falseの場合は完了通知を行わない）
+        """
+        gallery_key = self._normalize(gallery_folder)
+        with self._cond:
+            progress = self._progress.get(gallery_key)
+            if progress is None:
+                return
+            progress.sealed = True
+            if not completed:
+                progress.notified = True
+            notify = self._pop_if_complete(gallery_key, progress)
+        if notify is not None:
+            self._notify_resize_complete(notify)
+
+    def get_gallery_progress(self, gallery_folder: str) -> Optional[Dict[str, Any]]:
+        """ギャラリーのリサイズ進捗を取得（集計していない場合None）"""
+        with self._cond:
+            progress = self._progress.get(self._normalize(gallery_folder))
+            return progress.to_dict() if progress is not None else None
+
+    def wait_for_gallery(self, gallery_folder: str, timeout: Optional[float] = None) -> bool:
+        """ギャラリーの後処理がすべて終わるまで待機
+
+        Returns:
+            bool: 完了したらTrue、タイムアウトした場合False
+        """
+        gallery_key = self._normalize(gallery_folder)
+        with self._cond:
+            if self._pending.get(gallery_key, 0):
+                self.session_manager.ui_bridge.post_log(
+                    f"画像後処理の完了を待機中: {self._pending[gallery_key]}件", "debug"
+                )
+            return self._cond.wait_for(
+                lambda: not self._pending.get(gallery_key, 0), timeout)
+
+    def pending_count(self, gallery_folder: Optional[str] = None) -> int:
+        """未完了ジョブ数を取得（フォルダ指定なしの場合は全体）"""
+        with self._cond:
+            if gallery_folder is None:
+                return sum(self._pending.values())
+            return self._pending.get(self._normalize(gallery_folder), 0)
+
+    def shutdown(self, wait: bool = False):
+        """ワーカーを終了"""
+        with self._executor_lock:
+            self._closed = True
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    # ------------------------------------------------------------------
+    # 内部処理
+    # ------------------------------------------------------------------
+
+    def _acquire_slot(self, stop_event: Optional[threading.Event]) -> bool:
+        while not self._slots.acquire(timeout=0.5):
+            if self._closed or (stop_event is not None and stop_event.is_set()):
+                return False
+        if self._closed:
+            self._slots.release()
+            return False
+        return True
+
+    def _get_executor(self):
+        """プロセスプールを遅延生成（生成できない環境ではスレッドプール）"""
+        with self._executor_lock:
+            if self._executor is None and not self._closed:
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                except Exception as e:
+                    self.session_manager.ui_bridge.post_log(
+                        f"プロセスプールを作成できません。スレッドで後処理します: {e}", "warning"
+                    )
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="PostProcess")
+            return self._executor
+
+    def _dispatch(self, job: Dict[str, Any], gallery_key: str, chain_key: str,
+                  completion: Future, counts_resize: bool,
+                  on_done: Optional[Callable[[], None]] = None):
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                raise RuntimeError("後処理ステージは終了しています")
+            future = executor.submit(run_post_process_job, job)
+        except Exception:
+            # プールが使えない場合（終了済み・BrokenProcessPool）はこのスレッドで実行
+            future = Future()
+            try:
+                future.set_result(run_post_process_job(job))
+            except Exception as e:
+                future.set_exception(e)
+        future.add_done_callback(
+            lambda f: self._finish(f, gallery_key, chain_key, completion, counts_resize, on_done))
+
+    def _finish(self, future: Future, gallery_key: str, chain_key: str, completion: Future,
+                counts_resize: bool, on_done: Optional[Callable[[], None]] = None):
+        resized = False
+        notify = None
+        try:
+            result = future.result()
+            resized = bool(result.get('resized'))
+            # ワーカー内の処理時間（プールの待ち時間は含まない）
+            stage_metrics = get_stage_metrics()
+            stage_metrics.record(STAGE_POST_PROCESS, result.get('elapsed'),
+                                 stage_metrics.gallery_for_folder(gallery_key))
+            for message, level in result.get('messages', []):
+                self.session_manager.ui_bridge.post_log(message, level)
+            if on_done is not None:
+                on_done()
+        except Exception as e:
+            self.session_manager.ui_bridge.post_log(f"画像後処理エラー: {e}", "error")
+        finally:
+            with self._cond:
+                progress = self._progress.get(gallery_key)
+                if progress is not None and counts_resize:
+                    progress.finished += 1
+                    if resized:
+                        progress.resized += 1
+                    notify = self._pop_if_complete(gallery_key, progress)
+                remaining = self._pending.get(gallery_key, 0) - 1
+                if remaining > 0:
+                    self._pending[gallery_key] = remaining
+                else:
+                    self._pending.pop(gallery_key, None)
+                if self._chains.get(chain_key) is completion:
+                    del self._chains[chain_key]
+                self._cond.notify_all()
+            self._slots.release()
+            completion.set_result(None)
+        if notify is not None:
+            self._notify_resize_complete(notify)
+
+    def _pop_if_complete(self, gallery_key: str, progress: _GalleryProgress) -> Optional[Dict[str, Any]]:
+        """完了していれば進捗を取り除いて返す（ロック保持中に呼ぶ）"""
+        if progress.sealed and progress.finished >= progress.submitted:
+            self._progress.pop(gallery_key, None)
+        if progress.notified or not progress.is_complete():
+            return None
+        progress.notified = True
+        return progress.to_dict()
+
+    def _notify_resize_complete(self, progress: Dict[str, Any]):
+        if not progress['resized'] or self.on_resize_complete is None:
+            return
+        try:
+            self.on_resize_complete(progress)
+        except Exception as e:
+            self.session_manager.ui_bridge.post_log(f"リサイズ完了通知エラー: {e}", "warning")
+
+    @staticmethod
+    def _has_resize(job: Dict[str, Any]) -> bool:
+        transform = job.get('transform') or {}
+        return bool(job.get('resize') or transform.get('resize'))
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return os.path.normcase(os.path.normpath(path))
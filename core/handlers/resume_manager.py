@@ -104,7 +104,7 @@ class ResumeManager:
         self.state_manager.set_url_status(normalized_url, 'skipped')
         
         # 未完了フォルダを記録
-        if save_folder and self.parent.parent.rename_incomplete_folder.get():
+        if save_folder and self.parent.get_options_snapshot().rename_incomplete_folder:
             if not hasattr(self.parent, 'incomplete_folders'):
                 self.parent.incomplete_folders = set()
             self.parent.incomplete_folders.add(save_folder)
@@ -17,6 +17,8 @@ import io
 from typing import Dict, List, Any, Optional
 from bs4 import BeautifulSoup
 
+from core.stage_metrics import get_stage_metrics
+
 
 class GalleryInfoManager:
     """ギャラリー情報の専門管理クラス"""
@@ -115,9 +117,7 @@ class GalleryInfoManager:
         try:
             # ⭐修正: 個別保存オプションの判定を簡潔化⭐
             # dl_log_individual_saveがONの場合のみ実行
-            if not hasattr(self.parent.parent, 'dl_log_individual_save'):
-                return
-            if not self.parent.parent.dl_log_individual_save.get():
+            if not self.parent.get_options_snapshot().dl_log_individual_save:
                 return
             
             # ギャラリー情報を準備（取得済みのメタデータを確実に利用）
@@ -208,14 +208,8 @@ class GalleryInfoManager:
             save_folder: 保存先フォルダ
         """
         try:
-            # ⭐修正: 保存形式をStringVarから正しく取得⭐
-            save_format = 'HTML'  # デフォルト
-            if hasattr(self.parent.parent, 'dl_log_file_format'):
-                format_var = self.parent.parent.dl_log_file_format
-                if hasattr(format_var, 'get'):
-                    save_format = format_var.get()
-                else:
-                    save_format = format_var  # StringVarではない場合は直接使用
+            # ⭐保存形式はオプションスナップショットから取得（Tk変数を読まない）⭐
+            save_format = self.parent.get_options_snapshot().dl_log_file_format or 'HTML'
             
             # 個別ディレクトリへの保存
             if save_format == 'HTML':
@@ -490,10 +484,11 @@ class GalleryInfoManager:
         """全URL完了時の一括保存処理"""
         try:
             # 一括保存が有効な場合のみ実行
-            if not hasattr(self.parent.parent, 'dl_log_enabled') or not self.parent.parent.dl_log_enabled.get():
+            options = self.parent.get_options_snapshot()
+            if not options.dl_log_enabled:
                 return
             # dl_log_enabledがOFFでもdl_log_batch_saveがONなら実行可能
-            if not hasattr(self.parent.parent, 'dl_log_batch_save') or not self.parent.parent.dl_log_batch_save.get():
+            if not options.dl_log_batch_save:
                 return
             
             # 親ディレクトリ（保存フォルダ）に一括保存を実行
@@ -506,7 +501,7 @@ class GalleryInfoManager:
         """親ディレクトリ（保存フォルダ）に一括保存"""
         try:
             # 親ディレクトリ（保存フォルダ）を取得
-            parent_dir = self.parent.parent.folder_var.get()
+            parent_dir = self.parent.get_options_snapshot().folder_path
             if not parent_dir or not os.path.exists(parent_dir):
                 self.session_manager.ui_bridge.post_log("保存フォルダが設定されていません", "warning")
                 return
@@ -528,6 +523,13 @@ class GalleryInfoManager:
             
             self.session_manager.ui_bridge.post_log(f"📝 一括ダウンロード情報を保存しました: {os.path.basename(filepath)}")
             
+            # ⭐追加: 工程別の所要時間をJSONで保存⭐
+            metrics_path = os.path.join(parent_dir, f"performance_{timestamp}.json")
+            get_stage_metrics().export_json(
+                metrics_path, extra={'http': self.session_manager.http_client.get_metrics_snapshot()}
+            )
+            self.session_manager.ui_bridge.post_log(f"📊 パフォーマンス計測を保存しました: {os.path.basename(metrics_path)}")
+            
         except Exception as e:
             self.session_manager.ui_bridge.post_log(f"一括保存エラー: {e}", "error")
     
@@ -622,7 +624,7 @@ class GalleryInfoManager:
     <div class="stats">
         <h2>統計情報</h2>
         <p>完了したギャラリー数: {len(all_gallery_data)}</p>
-        <p>保存場所: {self.parent.parent.folder_var.get()}</p>
+        <p>保存場所: {self.parent.get_options_snapshot().folder_path}</p>
     </div>
     
     <div class="summary">
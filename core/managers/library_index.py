@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+"""
+LibraryIndex - ダウンロード済みギャラリーの索引
+
+責任範囲:
+- gid/token → 保存先（フォルダまたはアーカイブ）・ページ数・完了状態の対応表
+- 保存先ルートの差分スキャン（ディレクトリのmtimeをキャッシュし、変更分のみ gallery_info_* を読む）
+- DLリスト追加時・保存フォルダ作成時の照会（ネットワークアクセスなし）
+- 索引のファイル保存（再起動後も再スキャン不要）
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import zipfile
+from typing import Any, Dict, Optional, Tuple
+
+from core.handlers.archive_codecs import ARCHIVE_EXTENSIONS
+
+DEFAULT_INDEX_FILE = "library_index.json"
+
+GALLERY_URL_PATTERN = re.compile(r'https?://(?:www\.)?e[-x]hentai\.org/g/(\d+)/([0-9a-f]{10})', re.IGNORECASE)
+_PAGES_PATTERN = re.compile(r'(?:ページ数|pages)\s*(?::|,)\s*(?:</strong>\s*)?(\d+)')
+_TITLE_PATTERNS = (
+    re.compile(r'<title>ギャラリー情報 - ([^<]+)</title>'),
+    re.compile(r'^タイトル: (.+)$', re.MULTILINE),
+    re.compile(r'^title,(.+)$', re.MULTILINE),
+)
+_SIDECAR_PREFIX = 'gallery_info_'
+_SIDECAR_EXTENSIONS = ('.txt', '.csv', '.html')
+_SIDECAR_MAX_BYTES = 1024 * 1024
+
+# gallery_downloader が画像スキップ時に作成するプレースホルダー（画像のファイル名の拡張子を .txt にしたもの）
+PLACEHOLDER_HEADER = "画像ダウンロード失敗"
+
+STATE_COMPLETED = 'completed'
+STATE_INCOMPLETE = 'incomplete'
+
+
+def parse_gallery_id(url: str) -> Optional[Tuple[str, str]]:
+    """ギャラリーURLから (gid, token) を取得"""
+    match = GALLERY_URL_PATTERN.search(url or '')
+    return (match.group(1), match.group(2).lower()) if match else None
+
+
+def parse_sidecar(text: str) -> Optional[Dict[str, Any]]:
+    """gallery_info_* の内容（TXT/CSV/HTML）からgid・ページ数・タイトルを取得"""
+    ids = parse_gallery_id(text)
+    if ids is None:
+        return None
+    pages_match = _PAGES_PATTERN.search(text)
+    title = ''
+    for pattern in _TITLE_PATTERNS:
+        title_match = pattern.search(text)
+        if title_match:
+            title = title_match.group(1).strip()
+            break
+    return {
+        'gid': ids[0],
+        'token': ids[1],
+        'pages': int(pages_match.group(1)) if pages_match else 0,
+        'title': title,
+    }
+
+
+def read_folder_sidecar(folder_path: str) -> Optional[Dict[str, Any]]:
+    """フォルダ内の gallery_info_* からgid・ページ数・タイトルを取得（新しいものを優先）"""
+    try:
+        names = sorted(os.listdir(folder_path), reverse=True)
+    except OSError:
+        return None
+    for name in names:
+        if name.startswith(_SIDECAR_PREFIX) and name.endswith(_SIDECAR_EXTENSIONS):
+            try:
+                with open(os.path.join(folder_path, name), 'r', encoding='utf-8', errors='replace') as f:
+                    info = parse_sidecar(f.read(_SIDECAR_MAX_BYTES))
+            except OSError:
+                continue
+            if info:
+                return info
+    return None
+
+
+def folder_has_placeholders(folder_path: str) -> bool:
+    """フォルダにスキップされたページのプレースホルダーが残っているか
+
+    ファイル名は保存名のテンプレートに従うため、gallery_info_* 以外の .txt の先頭行で判定する。
+    """
+    try:
+        names = os.listdir(folder_path)
+    except OSError:
+        return False
+    header = PLACEHOLDER_HEADER.encode('utf-8')
+    for name in names:
+        if not name.lower().endswith('.txt') or name.startswith(_SIDECAR_PREFIX):
+            continue
+        try:
+            with open(os.path.join(folder_path, name), 'rb') as f:
+                if f.read(len(header)) == header:
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+class LibraryIndex:
+    """ダウンロード済みギャラリーの索引
+
+    エントリは gid をキーに {gid, token, url, path, pages, state, title, updated_at} を保持する。
+    ダウンロード完了時の record() と、保存先ルートの scan() の両方で更新される。
+
+    ⭐lookup() / find_completed() はGUIスレッドから呼ばれるため、メモリ上の参照のみでファイルI/Oを行わない。
+      scan() のファイルI/Oとファイル保存はロックの外で行い、結果の反映だけを短いロック内で行う⭐
+    """
+
+    def __init__(self, parent, index_file: str = DEFAULT_INDEX_FILE, scan_interval: float = 60.0):
+        """
+        Args:
+            parent: EHDownloaderCore インスタンス（委譲元）
+            index_file: 索引の保存先
+            scan_interval: ensure_scanned() で再スキャンするまでの最短間隔（秒）
+        """
+        self.parent = parent
+        self.session_manager = parent.session_manager
+        self.index_file = index_file
+        self.scan_interval = scan_interval
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._save_seq = 0  # 保存内容の世代（古い内容で上書きしないため）
+        self._saved_seq = 0
+        self._galleries: Dict[str, Dict[str, Any]] = {}
+        self._dir_mtimes: Dict[str, Dict[str, float]] = {}  # ルート → {子のパス: mtime}
+        self._last_scan: Dict[str, float] = {}
+        self._load()
+
+    # ========================================
+    # 照会
+    # ========================================
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """URLのギャラリーの索引エントリを取得（メモリ上の参照のみ、保存先の存在は確認しない）"""
+        ids = parse_gallery_id(url)
+        if ids is None:
+            return None
+        with self._lock:
+            entry = self._galleries.get(ids[0])
+            return dict(entry) if entry is not None else None
+
+    def resolve(self, url: str) -> Optional[Dict[str, Any]]:
+        """保存先の現在のパスを確認した索引エントリを取得（保存先が存在しない場合None）
+
+        ファイルI/Oを伴うため、ダウンロードスレッドなどGUIスレッド以外から呼ぶ。
+        """
+        ids = parse_gallery_id(url)
+        if ids is None:
+            return None
+        with self._lock:
+            entry = self._galleries.get(ids[0])
+        if entry is None:
+            return None
+        path = self._resolve_path(entry)
+        if path is None:
+            return None
+        if path != entry['path']:
+            with self._lock:
+                # 確認中に record() / scan() で置き換えられていなければ新しいパスを反映
+                if self._galleries.get(ids[0]) is entry:
+                    self._galleries[ids[0]] = dict(entry, path=path)
+        return dict(entry, path=path)
+
+    def find_completed(self, url: str, verify: bool = False) -> Optional[Dict[str, Any]]:
+        """URLのギャラリーが完了済みとして保存されていればエントリを返す
+
+        Args:
+            verify: 保存先の存在を確認する（ファイルI/Oを伴うためGUIスレッドではFalse）
+        """
+        entry = self.resolve(url) if verify else self.lookup(url)
+        if entry is None or entry.get('state') != STATE_COMPLETED:
+            return None
+        return entry
+
+    def find_folder(self, url: str) -> Optional[str]:
+        """URLのギャラリーの既存の保存フォルダ（アーカイブ化されていないもの）を取得"""
+        entry = self.resolve(url)
+        if entry is None or not os.path.isdir(entry['path']):
+            return None
+        return entry['path']
+
+    # ========================================
+    # 更新
+    # ========================================
+
+    def record(self, url: str, path: str, pages: int = 0, state: str = STATE_COMPLETED,
+               title: str = ''):
+        """ダウンロード結果を索引へ記録"""
+        ids = parse_gallery_id(url)
+        if ids is None or not path:
+            return
+        with self._lock:
+            self._galleries[ids[0]] = {
+                'gid': ids[0],
+                'token': ids[1],
+                'url': url,
+                'path': os.path.normpath(path),
+                'pages': int(pages or 0),
+                'state': state,
+                'title': title or '',
+                'updated_at': time.time(),
+            }
+            pending_save = self._prepare_save()
+        self._write(*pending_save)
+
+    def ensure_scanned(self, root_folder: str) -> int:
+        """前回のスキャンから scan_interval 以上経過していればスキャン"""
+        if not root_folder:
+            return 0
+        key = self._normalize(root_folder)
+        with self._lock:
+            if time.time() - self._last_scan.get(key, 0) < self.scan_interval:
+                return 0
+        return self.scan(root_folder)
+
+    def scan(self, root_folder: str) -> int:
+        """保存先ルートを差分スキャン
+
+        直下のフォルダ・アーカイブのうちmtimeが前回から変わったものだけ gallery_info_* を読む。
+        消えたフォルダのエントリは、アーカイブ化されていなければ索引から除く。
+
+        Returns:
+            int: 更新したエントリ数
+        """
+        if not root_folder or not os.path.isdir(root_folder):
+            return 0
+        key = self._normalize(root_folder)
+        prefix = self._get_incomplete_prefix()
+        with self._lock:
+            cached = dict(self._dir_mtimes.get(key, {}))
+            galleries = dict(self._galleries)
+
+        # ⭐ファイルI/Oはロックの外で行う（GUIスレッドの照会を止めない）⭐
+        seen: Dict[str, float] = {}
+        found: Dict[str, Tuple[Optional[Dict[str, Any]], Dict[str, Any]]] = {}  # gid → (スキャン前のエントリ, 新しいエントリ)
+        try:
+            children = list(os.scandir(root_folder))
+        except OSError as e:
+            self.session_manager.ui_bridge.post_log(f"ライブラリのスキャンエラー: {e}", "warning")
+            return 0
+
+        for child in children:
+            try:
+                is_dir = child.is_dir()
+                if not is_dir and not child.name.lower().endswith('.zip'):
+                    continue
+                mtime = child.stat().st_mtime
+            except OSError:
+                continue
+            path = os.path.normpath(child.path)
+            seen[path] = mtime
+            if cached.get(path) == mtime:
+                continue
+            info = read_folder_sidecar(path) if is_dir else self._read_zip_sidecar(path)
+            if info is None:
+                continue
+            state = STATE_INCOMPLETE if prefix and child.name.startswith(prefix) else STATE_COMPLETED
+            if state == STATE_COMPLETED and is_dir and folder_has_placeholders(path):
+                state = STATE_INCOMPLETE
+            existing = galleries.get(info['gid'])
+            # ダウンロード時に記録したエントリ（より正確）は、保存先が残っている限り優先
+            if existing and existing.get('path') != path and self._resolve_path(existing):
+                continue
+            # スキャンでは未完了の記録を完了へ引き上げない（完了はダウンロード・修復の record() のみ）
+            if existing and existing.get('state') == STATE_INCOMPLETE:
+                state = STATE_INCOMPLETE
+            found[info['gid']] = (existing, {
+                'gid': info['gid'],
+                'token': info['token'],
+                'url': f"https://e-hentai.org/g/{info['gid']}/{info['token']}/",
+                'path': path,
+                'pages': info['pages'],
+                'state': state,
+                'title': info['title'],
+                'updated_at': mtime,
+            })
+
+        # 消えたフォルダのエントリ
+        missing = [gid for gid, entry in galleries.items()
+                   if self._normalize(os.path.dirname(entry['path'])) == key and
+                   self._resolve_path(entry) is None]
+
+        # 結果の反映（スキャン中に record() 等で置き換えられたエントリはそちらを優先）
+        updated = 0
+        removed = []
+        pending_save = None
+        with self._lock:
+            for gid, (existing, entry) in found.items():
+                if self._galleries.get(gid) is not existing:
+                    continue
+                self._galleries[gid] = entry
+                updated += 1
+            for gid in missing:
+                if gid in self._galleries and self._galleries[gid] is galleries[gid]:
+                    del self._galleries[gid]
+                    removed.append(gid)
+
+            self._dir_mtimes[key] = seen
+            self._last_scan[key] = time.time()
+            if updated or removed or seen != cached:
+                pending_save = self._prepare_save()
+        if pending_save is not None:
+            self._write(*pending_save)
+
+        if updated or removed:
+            self.session_manager.ui_bridge.post_log(
+                f"📚 ライブラリ索引を更新: {updated}件更新 / {len(removed)}件削除", "debug"
+            )
+        return updated
+
+    # ========================================
+    # 内部処理
+    # ========================================
+
+    def _resolve_path(self, entry: Dict[str, Any]) -> Optional[str]:
+        """保存先の現在のパスを解決（未完了接頭辞の除去・圧縮後のアーカイブを考慮）"""
+        path = entry.get('path')
+        if not path:
+            return None
+        if os.path.exists(path):
+            return path
+        parent_dir, name = os.path.split(path)
+        names = [name]
+        prefix = self._get_incomplete_prefix()
+        if prefix and name.startswith(prefix):
+            names.append(name[len(prefix):])
+        for candidate_name in names:
+            candidate = os.path.join(parent_dir, candidate_name)
+            if candidate_name != name and os.path.isdir(candidate):
+                return candidate
+            for extension in ARCHIVE_EXTENSIONS.values():
+                if os.path.exists(candidate + extension):
+                    return candidate + extension
+        return None
+
+    def _read_zip_sidecar(self, archive_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with zipfile.ZipFile(archive_path) as archive:
+                for info in sorted(archive.infolist(), key=lambda i: i.filename, reverse=True):
+                    name = os.path.basename(info.filename)
+                    if (name.startswith(_SIDECAR_PREFIX) and name.endswith(_SIDECAR_EXTENSIONS) and
+                            info.file_size <= _SIDECAR_MAX_BYTES):
+                        result = parse_sidecar(archive.read(info).decode('utf-8', errors='replace'))
+                        if result:
+                            return result
+        except (OSError, zipfile.BadZipFile):
+            return None
+        return None
+
+    def _get_incomplete_prefix(self) -> str:
+        # バックグラウンドスレッドから呼ばれるため、Tk変数ではなく凍結済みスナップショットを参照
+        try:
+            options = self.parent.get_options_snapshot()
+            if options.rename_incomplete_folder:
+                return options.incomplete_folder_prefix
+        except Exception:
+            pass
+        return ''
+
+    def _load(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._galleries = dict(data.get('galleries', {}))
+            self._dir_mtimes = {root: dict(children) for root, children in data.get('directories', {}).items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.session_manager.ui_bridge.post_log(f"ライブラリ索引の読み込みエラー: {e}", "warning")
+
+    def _prepare_save(self) -> Tuple[int, str]:
+        """保存する内容をシリアライズ（ロック保持中に呼び、書き込みはロック外の _write() で行う）"""
+        data = {'version': 1, 'galleries': self._galleries, 'directories': self._dir_mtimes}
+        self._save_seq += 1
+        return self._save_seq, json.dumps(data, ensure_ascii=False)
+
+    def _write(self, seq: int, text: str):
+        """索引を保存（より新しい内容が書き込み済みなら何もしない）"""
+        with self._save_lock:
+            if seq <= self._saved_seq:
+                return
+            try:
+                temp_file = self.index_file + '.tmp'
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                os.replace(temp_file, self.index_file)
+                self._saved_seq = seq
+            except Exception as e:
+                self.session_manager.ui_bridge.post_log(f"ライブラリ索引の保存エラー: {e}", "warning")
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return os.path.normcase(os.path.normpath(path))
@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+RepairManager - 未完了ギャラリーの修復
+
+責任範囲:
+- 保存先ルートの差分・並列スキャン（プレースホルダー・未完了接頭辞のフォルダ・マニフェストと食い違うファイル）
+- 不足ページの画像ページURLの解決（プレースホルダーの記録、またはギャラリー一覧の該当ページのみ取得）
+- 不足ページのみの並列取得（ホスト単位のレートリミッターでリクエスト間隔を保証）
+- プレースホルダーの置き換え（一時ファイル → os.replace）と未完了接頭辞の除去
+"""
+
+import copy
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from core.handlers.gallery_manifest import MANIFEST_FILENAME, PAGE_OK, GalleryManifest
+from core.managers.library_index import PLACEHOLDER_HEADER, STATE_COMPLETED, read_folder_sidecar
+from core.network.rate_limiter import HostRateLimiter
+
+_PLACEHOLDER_MAX_BYTES = 4096
+_PLACEHOLDER_URL_PATTERN = re.compile(r'^URL: (\S+)\s*$', re.MULTILINE)
+_PLACEHOLDER_PAGE_PATTERN = re.compile(r'^ページ: (\d+)/(\d+)\s*$', re.MULTILINE)
+
+# ギャラリー一覧の1ページあたりのサムネイル数（_extract_all_image_page_urls と同じ前提）
+THUMBS_PER_INDEX_PAGE = 20
+IMAGE_PAGE_URL_PATTERN = re.compile(r'https?://(?:www\.)?e[-x]hentai\.org/s/[0-9a-f]+/(\d+)-(\d+)')
+
+_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp')
+_BANDWIDTH_EXCEEDED_SUFFIX = '/509.gif'
+
+
+def parse_placeholder(text: str) -> Optional[Dict[str, Any]]:
+    """プレースホルダーの内容から画像ページURL・ページ番号を取得"""
+    if not text.startswith(PLACEHOLDER_HEADER):
+        return None
+    url_match = _PLACEHOLDER_URL_PATTERN.search(text)
+    page_match = _PLACEHOLDER_PAGE_PATTERN.search(text)
+    if not url_match or not page_match:
+        return None
+    return {
+        'url': url_match.group(1),
+        'page': int(page_match.group(1)),
+        'total': int(page_match.group(2)),
+    }
+
+
+class RepairManager:
+    """未完了ギャラリーの修復
+
+    修復対象は {folder, name, incomplete, gallery_url, title, pages, tasks, complete} の辞書で表す。
+    tasks は不足ページごとの {page, url, base, placeholder, stale} で、
+    url が None のページはギャラリー一覧から画像ページURLを解決する。
+    """
+
+    def __init__(self, parent, scan_workers: Optional[int] = None):
+        """
+        Args:
+            parent: EHDownloaderCore インスタンス（委譲元）
+            scan_workers: スキャンの並列数（Noneの場合はCPUコア数、最大8）
+        """
+        self.parent = parent
+        self.session_manager = parent.session_manager
+        self.scan_workers = scan_workers or min(8, os.cpu_count() or 1)
+        self._lock = threading.Lock()
+        self._folder_cache: Dict[str, tuple] = {}  # フォルダ → (mtimeのキー, 修復対象)
+        self._stop_event = threading.Event()
+        self._running = False
+
+    # ========================================
+    # 公開API
+    # ========================================
+
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._running
+
+    def stop(self):
+        """実行中の修復を中断"""
+        self._stop_event.set()
+
+    def scan(self, root_folder: str) -> List[Dict[str, Any]]:
+        """保存先ルート直下のギャラリーフォルダを並列にスキャンし、修復対象を返す
+
+        フォルダ（とマニフェスト）のmtimeが前回から変わっていないフォルダは前回の結果を使う。
+        """
+        if not root_folder or not os.path.isdir(root_folder):
+            return []
+        try:
+            folders = [entry.path for entry in os.scandir(root_folder) if entry.is_dir()]
+        except OSError as e:
+            self.session_manager.ui_bridge.post_log(f"修復スキャンエラー: {e}", "warning")
+            return []
+
+        prefix = self._get_incomplete_prefix()
+        with ThreadPoolExecutor(max_workers=self.scan_workers, thread_name_prefix="RepairScan") as executor:
+            results = list(executor.map(lambda folder: self._scan_folder_cached(folder, prefix), folders))
+
+        with self._lock:
+            # 消えたフォルダのキャッシュを整理
+            alive = set(folders)
+            for folder in [f for f in self._folder_cache if f not in alive]:
+                del self._folder_cache[folder]
+        return [target for target in results if target is not None]
+
+    def repair(self, root_folder: str, max_workers: int = 3, wait_time: float = 0.5) -> Dict[str, int]:
+        """保存先ルートの未完了ギャラリーを修復
+
+        Args:
+            root_folder: 保存先ルート
+            max_workers: 同時取得数
+            wait_time: 同一ホストへのリクエスト間隔（秒）
+
+        Returns:
+            dict: {'folders', 'pages', 'repaired', 'failed', 'completed'}
+        """
+        with self._lock:
+            if self._running:
+                self.session_manager.ui_bridge.post_log("修復は既に実行中です", "warning")
+                return {}
+            self._running = True
+        self._stop_event.clear()
+        summary = {'folders': 0, 'pages': 0, 'repaired': 0, 'failed': 0, 'completed': 0}
+        try:
+            targets = self.scan(root_folder)
+            summary['folders'] = len(targets)
+            summary['pages'] = sum(len(target['tasks']) for target in targets)
+            if not targets:
+                self.session_manager.ui_bridge.post_log("🔧 修復が必要なギャラリーはありません", "info")
+                return summary
+            self.session_manager.ui_bridge.post_log(
+                f"🔧 修復開始: {summary['folders']}フォルダ / 不足{summary['pages']}ページ "
+                f"(同時取得数: {max_workers})", "info"
+            )
+
+            limiter = HostRateLimiter(wait_time)
+            for target in targets:
+                if self._stop_event.is_set():
+                    break
+                self._resolve_image_page_urls(target, limiter)
+
+            # 全フォルダの不足ページをまとめて並列取得
+            manifests = {target['folder']: GalleryManifest(target['folder']) for target in targets}
+            jobs = [(target, task) for target in targets for task in target['tasks'] if task['url']]
+            with ThreadPoolExecutor(max_workers=max(1, int(max_workers)),
+                                    thread_name_prefix="RepairFetch") as executor:
+                futures = [
+                    executor.submit(self._fetch_page, task, manifests[target['folder']], limiter)
+                    for target, task in jobs
+                ]
+                for (target, task), future in zip(jobs, futures):
+                    try:
+                        task['done'] = future.result()
+                    except Exception as e:
+                        task['done'] = False
+                        self.session_manager.ui_bridge.post_log(
+                            f"修復エラー: {target['name']} p{task['page']} - {e}", "warning"
+                        )
+
+            for target in targets:
+                done = sum(1 for task in target['tasks'] if task.get('done'))
+                summary['repaired'] += done
+                summary['failed'] += len(target['tasks']) - done
+                if self._finish_folder(target):
+                    summary['completed'] += 1
+
+            self.session_manager.ui_bridge.post_log(
+                f"🔧 修復完了: {summary['repaired']}ページ取得 / 失敗{summary['failed']}ページ / "
+                f"完了にしたフォルダ{summary['completed']}件", "info"
+            )
+            return summary
+        finally:
+            with self._lock:
+                self._running = False
+
+    # ========================================
+    # スキャン
+    # ========================================
+
+    def _scan_folder_cached(self, folder_path: str, prefix: str) -> Optional[Dict[str, Any]]:
+        try:
+            key = (os.stat(folder_path).st_mtime, self._manifest_mtime(folder_path), prefix)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._folder_cache.get(folder_path)
+        if cached is None or cached[0] != key:
+            cached = (key, self._scan_folder(folder_path, prefix))
+            with self._lock:
+                self._folder_cache[folder_path] = cached
+        # 修復中にタスクへ結果を書き込むため、キャッシュとは別の辞書を返す
+        return copy.deepcopy(cached[1])
+
+    def _scan_folder(self, folder_path: str, prefix: str) -> Optional[Dict[str, Any]]:
+        """フォルダの不足ページを調べる（修復不要の場合None）"""
+        name = os.path.basename(folder_path)
+        incomplete = bool(prefix) and name.startswith(prefix)
+        tasks: Dict[int, Dict[str, Any]] = {}
+        image_count = 0
+        try:
+            entries = list(os.scandir(folder_path))
+        except OSError:
+            return None
+
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            extension = os.path.splitext(entry.name)[1].lower()
+            if extension in _IMAGE_EXTENSIONS:
+                image_count += 1
+            elif extension == '.txt' and not entry.name.startswith('gallery_info_'):
+                placeholder = self._read_placeholder(entry.path)
+                if placeholder:
+                    tasks[placeholder['page']] = {
+                        'page': placeholder['page'],
+                        'url': placeholder['url'],
+                        'base': os.path.splitext(entry.path)[0],
+                        'placeholder': entry.path,
+                        'stale': None,
+                    }
+
+        # マニフェストと食い違うファイル（削除・途中で切れたもの）
+        if os.path.exists(os.path.join(folder_path, MANIFEST_FILENAME)):
+            manifest = GalleryManifest(folder_path)
+            for page, entry in manifest.pages().items():
+                if page in tasks or manifest.check(page) == PAGE_OK:
+                    continue
+                file_path = manifest.resolve(entry)
+                tasks[page] = {
+                    'page': page,
+                    'url': None,
+                    'base': os.path.splitext(file_path)[0],
+                    'placeholder': None,
+                    'stale': file_path,
+                }
+
+        if not tasks and not incomplete:
+            return None
+
+        info = read_folder_sidecar(folder_path) or {}
+        gallery_url = (f"https://e-hentai.org/g/{info['gid']}/{info['token']}/"
+                       if info.get('gid') else None)
+        pages = info.get('pages', 0)
+        return {
+            'folder': folder_path,
+            'name': name,
+            'incomplete': incomplete,
+            'gallery_url': gallery_url,
+            'title': info.get('title', ''),
+            'pages': pages,
+            'tasks': [tasks[page] for page in sorted(tasks)],
+            # 不足ページがなく、画像数がページ数に達していれば接頭辞を外すだけで完了
+            'complete': not tasks and pages > 0 and image_count >= pages,
+        }
+
+    @staticmethod
+    def _read_placeholder(file_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            if os.path.getsize(file_path) > _PLACEHOLDER_MAX_BYTES:
+                return None
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                return parse_placeholder(f.read())
+        except OSError:
+            return None
+
+    @staticmethod
+    def _manifest_mtime(folder_path: str) -> float:
+        try:
+            return os.stat(os.path.join(folder_path, MANIFEST_FILENAME)).st_mtime
+        except OSError:
+            return 0.0
+
+    # ========================================
+    # 取得
+    # ========================================
+
+    def _resolve_image_page_urls(self, target: Dict[str, Any], limiter: HostRateLimiter):
+        """URLの分からない不足ページを、該当するギャラリー一覧ページだけ取得して解決"""
+        unresolved = [task for task in target['tasks'] if not task['url']]
+        if not unresolved:
+            return
+        if not target['gallery_url']:
+            self.session_manager.ui_bridge.post_log(
+                f"ギャラリー情報がないため{len(unresolved)}ページのURLを解決できません: {target['name']}",
+                "warning"
+            )
+            return
+
+        by_index_page: Dict[int, List[Dict[str, Any]]] = {}
+        for task in unresolved:
+            by_index_page.setdefault((task['page'] - 1) // THUMBS_PER_INDEX_PAGE, []).append(task)
+
+        for index_page, tasks in sorted(by_index_page.items()):
+            url = target['gallery_url'] if index_page == 0 else f"{target['gallery_url']}?p={index_page}"
+            try:
+                html = self._get(url, limiter).text
+                if "Content Warning" in html or "Offensive For Everyone" in html:
+                    html = self._get(url + ("&" if "?" in url else "?") + "nw=session", limiter).text
+            except Exception as e:
+                self.session_manager.ui_bridge.post_log(f"ギャラリー一覧の取得エラー: {url} - {e}", "warning")
+                continue
+            found = {int(match.group(2)): match.group(0) for match in IMAGE_PAGE_URL_PATTERN.finditer(html)}
+            for task in tasks:
+                task['url'] = found.get(task['page'])
+
+    def _fetch_page(self, task: Dict[str, Any], manifest: GalleryManifest,
+                    limiter: HostRateLimiter) -> bool:
+        """不足ページを取得してプレースホルダー（または壊れたファイル）と置き換える"""
+        from bs4 import BeautifulSoup
+
+        if self._stop_event.is_set():
+            return False
+        response = self._get(task['url'], limiter)
+        img_tag = BeautifulSoup(response.content, 'html.parser').find('img', {'id': 'img'})
+        if not img_tag or not img_tag.get('src'):
+            raise ValueError("画像タグが見つかりません")
+        image_url = img_tag['src']
+        if image_url.endswith(_BANDWIDTH_EXCEEDED_SUFFIX):
+            raise ValueError("画像の閲覧制限に達しています")
+
+        data = self._get(image_url, limiter, timeout=60).content
+        if not data:
+            raise ValueError("画像データが空です")
+
+        extension = os.path.splitext(urlparse(image_url).path)[1].lower() or '.jpg'
+        final_path = task['base'] + extension
+        temp_path = final_path + '.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, final_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        for old_path in (task['placeholder'], task['stale']):
+            if old_path and old_path != final_path and os.path.exists(old_path):
+                os.remove(old_path)
+        manifest.record_data(task['page'], final_path, data)
+        self.session_manager.ui_bridge.post_log(
+            f"🔧 修復: {os.path.basename(final_path)} (p{task['page']})", "info"
+        )
+        return True
+
+    def _get(self, url: str, limiter: HostRateLimiter, timeout: float = 30):
+        if not limiter.acquire(url, self._stop_event):
+            raise InterruptedError("修復が中断されました")
+        response = self.session_manager.http_client.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response
+
+    # ========================================
+    # 仕上げ
+    # ========================================
+
+    def _finish_folder(self, target: Dict[str, Any]) -> bool:
+        """不足ページがすべて揃ったフォルダの未完了接頭辞を外し、索引を完了に更新"""
+        if target['tasks']:
+            if not all(task.get('done') for task in target['tasks']):
+                return False
+        elif not target['complete']:
+            self.session_manager.ui_bridge.post_log(
+                f"不足ページを特定できません（ギャラリーの再ダウンロードが必要）: {target['name']}", "warning"
+            )
+            return False
+
+        folder_path = target['folder']
+        if target['incomplete']:
+            folder_path = self.parent.compression_manager.remove_incomplete_prefix(folder_path)
+            incomplete_folders = getattr(self.parent, 'incomplete_folders', None)
+            if incomplete_folders is not None:
+                incomplete_folders.discard(target['folder'])
+        if target['gallery_url']:
+            self.parent.library_index.record(
+                target['gallery_url'], folder_path, target['pages'], STATE_COMPLETED, target['title']
+            )
+        return True
+
+    def _get_incomplete_prefix(self) -> str:
+        # リネーム設定が現在OFFでも、以前に接頭辞を付けたフォルダは修復対象にする
+        # ⭐修復スレッドから呼ばれるため、Tk変数ではなく凍結済みスナップショットを参照⭐
+        try:
+            return self.parent.get_options_snapshot().incomplete_folder_prefix
+        except Exception:
+            return ''
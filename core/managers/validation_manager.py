@@ -223,7 +223,7 @@ class ValidationManager:
                 return "untitled"
             
             # 文字列変換ルールを適用
-            if hasattr(self.parent.parent, 'string_conversion_enabled') and self.parent.parent.string_conversion_enabled.get():
+            if self.parent.get_options_snapshot().string_conversion_enabled:
                 filename = self._apply_string_conversion(filename)
             
             # 既存の無効文字置換処理
@@ -8,9 +8,13 @@ from core.models.progress_bar import (
     ProgressStatus,
     ProgressBarSnapshot
 )
+from core.models.image_page_urls import ImagePageUrlList
+from core.models.gallery_page import GalleryPage
 
 __all__ = [
     'ProgressBar',
     'ProgressStatus',
-    'ProgressBarSnapshot'
+    'ProgressBarSnapshot',
+    'ImagePageUrlList',
+    'GalleryPage'
 ]
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+GalleryPage - ギャラリーページのHTMLを1回だけ解析したモデル
+
+タイトル・タグ・枚数・一覧ページ・画像ページURL・メタデータを1回の解析でまとめて抽出し、
+URL抽出・メタデータ抽出・フォルダ名用タイトル取得で共有する。
+抽出ルールはネットワークやGUIに依存しないため、保存したHTMLに対してそのまま確認できる。
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from core.models.image_page_urls import compact_image_page_urls
+
+SHOWING_PATTERN = re.compile(r'Showing (\d+) - (\d+) of ([\d,]+) images')
+IMAGE_PAGE_URL_PATTERN = re.compile(r'https://e-hentai\.org/s/[a-z0-9]+/\d+-\d+')
+TAG_PATTERN = re.compile(r'id="ta_([^:]+):([^"]+)"[^>]*>([^<]+)</a>')
+
+_URL_GID_PATTERN = re.compile(r'/g/(\d+)/')
+_URL_TOKEN_PATTERN = re.compile(r'/g/\d+/([a-f0-9]+)')
+_HTML_GID_PATTERN = re.compile(r'gid=(\d+)')
+_HTML_TOKEN_PATTERN = re.compile(r'token=([a-f0-9]+)')
+_INDEX_PAGE_PATTERN = re.compile(r'[?&]p=(\d+)')
+_TORRENT_PATTERN = re.compile(r'Torrent Download\s*\((\d+)\)')
+_CATEGORY_CLASS_PATTERN = re.compile(r'cs\s+ct')
+_CATEGORY_ONCLICK_PATTERN = re.compile(
+    r'cosplay|doujinshi|manga|artist.*cg|game.*cg|western|non.*h|non-h|image.*set|asian.*porn|misc', re.I
+)
+_CATEGORY_HTML_PATTERNS = (
+    (re.compile(r'<div\s+class="cs\s+ct[^"]*"[^>]*>([^<]+)</div>', re.IGNORECASE), 1),
+    (re.compile(r'onclick="document\.location=\'https://e-hentai\.org/([^\']+)\'">([^<]+)</div>', re.IGNORECASE), 2),
+)
+_GALLERY_LINK_PATTERNS = (
+    re.compile(r'<div class="sb">\s*<a href="([^"]+)"'),
+    re.compile(r'href="([^"]*g/\d+/[a-f0-9]+/?)"'),  # 通常のギャラリーリンク
+    re.compile(r'href="([^"]*g/\d+/[^"]*)"'),        # フォールバック
+)
+
+
+def extract_image_page_urls(html: str) -> List[str]:
+    """一覧ページのHTMLから画像ページURLを出現順に抽出（重複は除く）"""
+    return list(dict.fromkeys(IMAGE_PAGE_URL_PATTERN.findall(html)))
+
+
+def extract_tags(html: str) -> Dict[str, List[Dict[str, str]]]:
+    """HTMLから全タグを名前空間別に抽出"""
+    tags: Dict[str, List[Dict[str, str]]] = {}
+    for match in TAG_PATTERN.finditer(html):
+        namespace, tag_id, tag_name = match.group(1), match.group(2), match.group(3)
+        tags.setdefault(namespace, []).append({
+            'id': tag_id,
+            'name': tag_name,
+            'full_tag': f"{namespace}:{tag_name}"
+        })
+    return tags
+
+
+def find_gallery_link(html: str) -> Optional[str]:
+    """個別画像ページのHTMLからギャラリーへのリンクを取得（相対URLのまま）"""
+    for pattern in _GALLERY_LINK_PATTERNS:
+        match = pattern.search(html)
+        if match:
+            return match.group(1)
+    return None
+
+
+@dataclass
+class GalleryPage:
+    """ギャラリーページ（一覧の1ページ目）の解析結果"""
+    title: str = ""                 # <h1 id="gn">
+    jp_title: str = ""              # <h1 id="gj">
+    html_title: str = ""            # <title>
+    tags: Dict[str, List[Dict[str, str]]] = field(default_factory=dict)
+    total_images: int = 0           # "Showing a - b of N images" のN（取得できない場合0）
+    showing_first: int = 0
+    showing_last: int = 0
+    length: int = 0                 # 詳細欄の Length（取得できない場合サムネイル数）
+    index_page_count: int = 0       # 一覧ページのリンクから見た総ページ数
+    image_page_urls: Any = field(default_factory=list)
+    torrent_count: int = 0
+    gid: str = ""
+    token: str = ""
+    uploader: str = ""
+    date: str = ""
+    rating: str = ""
+    category: str = ""
+
+    @property
+    def has_image_count(self) -> bool:
+        return self.total_images > 0
+
+    @property
+    def display_title(self) -> str:
+        """進捗表示用のタイトル（h1優先、空の場合は<title>）"""
+        return self.title or self.html_title or "Unknown"
+
+    @property
+    def thumbs_per_page(self) -> int:
+        """1一覧ページあたりのサムネイル数（最初のページの表示範囲、通常20）"""
+        if self.total_images > self.showing_last:
+            return max(1, self.showing_last - self.showing_first + 1)
+        return 20
+
+    @classmethod
+    def parse(cls, html: str, gallery_url: Optional[str] = None) -> 'GalleryPage':
+        """ギャラリーページのHTMLを解析
+
+        Args:
+            html: ギャラリーページのHTML
+            gallery_url: ギャラリーURL（gid・tokenはURLを優先）
+        """
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'html.parser')
+        page = cls()
+
+        page.title = cls._element_text(soup.find('h1', id='gn'))
+        page.jp_title = cls._element_text(soup.find('h1', id='gj'))
+        page.html_title = cls._element_text(soup.find('title'))
+        page.tags = extract_tags(html)
+
+        showing = SHOWING_PATTERN.search(html)
+        if showing:
+            page.showing_first = int(showing.group(1))
+            page.showing_last = int(showing.group(2))
+            page.total_images = int(showing.group(3).replace(',', ''))
+
+        page.image_page_urls = compact_image_page_urls(extract_image_page_urls(html))
+        page.gid, page.token = cls._parse_ids(html, gallery_url)
+
+        # 詳細欄（<td>Label:</td><td>値</td>）は1回の走査で対応表にする
+        labels: Dict[str, str] = {}
+        for td in soup.find_all('td'):
+            label = td.string
+            if label and label not in labels:
+                value_td = td.find_next_sibling('td')
+                labels[label] = value_td.get_text(strip=True) if value_td is not None else ''
+
+        gdn_div = soup.find('div', id='gdn')
+        uploader_link = gdn_div.find('a') if gdn_div else None
+        page.uploader = cls._element_text(uploader_link) or labels.get('Uploader:', '')
+        page.date = labels.get('Posted:', '')
+        page.rating = labels.get('Rating:', '')
+        page.category = cls._parse_category(soup, html)
+        page.length = cls._parse_length(soup)
+
+        page.index_page_count = cls._parse_index_page_count(soup)
+        torrent = _TORRENT_PATTERN.search(html)
+        page.torrent_count = int(torrent.group(1)) if torrent else 0
+        return page
+
+    # ------------------------------------------------------------------
+    # 内部処理
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _element_text(element) -> str:
+        return element.get_text(strip=True) if element else ""
+
+    @staticmethod
+    def _parse_ids(html: str, gallery_url: Optional[str]) -> tuple:
+        gid = token = ""
+        if gallery_url:
+            gid_match = _URL_GID_PATTERN.search(gallery_url)
+            token_match = _URL_TOKEN_PATTERN.search(gallery_url)
+            gid = gid_match.group(1) if gid_match else ""
+            token = token_match.group(1) if token_match else ""
+        if not gid:
+            gid_match = _HTML_GID_PATTERN.search(html)
+            gid = gid_match.group(1) if gid_match else ""
+        if not token:
+            token_match = _HTML_TOKEN_PATTERN.search(html)
+            token = token_match.group(1) if token_match else ""
+        return gid, token
+
+    @staticmethod
+    def _parse_category(soup, html: str) -> str:
+        gdc_div = soup.find('div', id='gdc')
+        if gdc_div:
+            category_div = (gdc_div.find('div', class_=_CATEGORY_CLASS_PATTERN) or
+                            gdc_div.find('div', onclick=_CATEGORY_ONCLICK_PATTERN))
+            category = category_div.get_text(strip=True) if category_div else ""
+            if category:
+                return category
+        # フォールバック: 正規表現で抽出
+        for pattern, group in _CATEGORY_HTML_PATTERNS:
+            match = pattern.search(html)
+            if match:
+                return match.group(group).strip()
+        return ""
+
+    @staticmethod
+    def _parse_length(soup) -> int:
+        gdd_div = soup.find('div', id='gdd')
+        if gdd_div:
+            for row in gdd_div.find_all('tr'):
+                cells = row.find_all('td')
+                if len(cells) >= 2 and cells[0].text.strip().replace(':', '') == 'Length':
+                    # "23 pages" のような形式からページ数を抽出
+                    match = re.search(r'(\d+)', cells[1].text.strip())
+                    if match:
+                        return int(match.group(1))
+        # 代替方法：ページサムネイル数をカウント
+        return len(soup.find_all('div', {'class': 'gdtm'}))
+
+    @staticmethod
+    def _parse_index_page_count(soup) -> int:
+        ptt = soup.find('table', class_='ptt')
+        if not ptt:
+            return 1
+        last_index = 0
+        for link in ptt.find_all('a', href=True):
+            match = _INDEX_PAGE_PATTERN.search(link['href'])
+            if match:
+                last_index = max(last_index, int(match.group(1)))
+        return last_index + 1
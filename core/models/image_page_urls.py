@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+画像ページURLリストのコンパクト表現
+
+https://e-hentai.org/s/<key>/<gid>-<page> 形式のURLは key 以外が共通のため、
+接頭辞・gid・先頭のページ番号と、固定長の key を連結した1つの文字列だけを保持し、
+アクセス時にURLを組み立てる。メモリ上のキャッシュと再開ポイントのJSONの両方で使用する。
+"""
+
+import re
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Optional
+
+COMPACT_FORMAT = 'compact-v1'
+
+_IMAGE_PAGE_URL_PATTERN = re.compile(r'^(https?://[^/]+/s/)([0-9a-z]+)/(\d+)-(\d+)$')
+_MISSING_KEY_CHAR = '-'  # 未取得の位置（範囲外など）
+
+
+class ImagePageUrlList(Sequence):
+    """画像ページURLの読み取り専用シーケンス
+
+    i番目の要素は f"{prefix}{key_i}/{gid}-{first_page + i}"（未取得の位置はNone）。
+    スライスもコピーせずに同じ表現で返す。
+    """
+
+    __slots__ = ('prefix', 'gid', 'first_page', 'key_width', '_keys')
+
+    def __init__(self, prefix: str, gid: str, first_page: int, key_width: int, keys: str):
+        self.prefix = prefix
+        self.gid = gid
+        self.first_page = first_page
+        self.key_width = key_width
+        self._keys = keys
+
+    # ------------------------------------------------------------------
+    # 変換
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_urls(cls, urls: Iterable[Optional[str]]) -> Optional['ImagePageUrlList']:
+        """URLリストから作成（形式が揃っておらずコンパクトにできない場合None）"""
+        urls = list(urls)
+        prefix = gid = None
+        first_page = key_width = None
+        keys = []
+        for index, url in enumerate(urls):
+            if url is None:
+                keys.append(None)
+                continue
+            match = _IMAGE_PAGE_URL_PATTERN.match(url)
+            if not match:
+                return None
+            url_prefix, key, url_gid, page = match.group(1), match.group(2), match.group(3), int(match.group(4))
+            if prefix is None:
+                prefix, gid, key_width = url_prefix, url_gid, len(key)
+                first_page = page - index
+            elif (url_prefix != prefix or url_gid != gid or len(key) != key_width or
+                  page != first_page + index):
+                return None
+            keys.append(key)
+        if prefix is None:
+            return None
+        missing = _MISSING_KEY_CHAR * key_width
+        return cls(prefix, gid, first_page, key_width, ''.join(key or missing for key in keys))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ImagePageUrlList':
+        return cls(data['prefix'], data['gid'], int(data['first_page']),
+                   int(data['key_width']), data['keys'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSONに保存できる辞書に変換"""
+        return {
+            'format': COMPACT_FORMAT,
+            'prefix': self.prefix,
+            'gid': self.gid,
+            'first_page': self.first_page,
+            'key_width': self.key_width,
+            'keys': self._keys,
+        }
+
+    # ------------------------------------------------------------------
+    # シーケンス
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._keys) // self.key_width
+
+    def __getitem__(self, index):
+        length = len(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(length)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            stop = max(start, stop)
+            return ImagePageUrlList(self.prefix, self.gid, self.first_page + start, self.key_width,
+                                    self._keys[start * self.key_width:stop * self.key_width])
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("画像ページURLのインデックスが範囲外です")
+        key = self._keys[index * self.key_width:(index + 1) * self.key_width]
+        if key[0] == _MISSING_KEY_CHAR:
+            return None
+        return f"{self.prefix}{key}/{self.gid}-{self.first_page + index}"
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ImagePageUrlList):
+            return (self.prefix, self.gid, self.first_page, self.key_width, self._keys) == \
+                   (other.prefix, other.gid, other.first_page, other.key_width, other._keys)
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __reduce__(self):
+        return (self.__class__, (self.prefix, self.gid, self.first_page, self.key_width, self._keys))
+
+
+def compact_image_page_urls(urls):
+    """可能ならコンパクト表現に変換（できない場合は元のリストのまま）"""
+    if isinstance(urls, ImagePageUrlList) or not urls:
+        return urls
+    compact = ImagePageUrlList.from_urls(urls)
+    return compact if compact is not None else urls
+
+
+def encode_image_page_urls(urls):
+    """JSON保存用に変換（コンパクト表現は辞書、それ以外はリスト）"""
+    compact = compact_image_page_urls(urls)
+    if isinstance(compact, ImagePageUrlList):
+        return compact.to_dict()
+    return list(urls) if urls is not None else urls
+
+
+def decode_image_page_urls(value):
+    """JSONから復元（従来のリスト形式もそのまま受け付ける）"""
+    if isinstance(value, dict) and value.get('format') == COMPACT_FORMAT:
+        return ImagePageUrlList.from_dict(value)
+    return value
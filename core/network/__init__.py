@@ -4,13 +4,18 @@ Core network layer - ネットワーク通信層
 HTTP通信、リトライ管理、ダウンロードセッション・タスク管理を担当
 """
 
-from .http_client import HttpClient
+from .http_client import HttpClient, get_shared_http_client
+from .http_metrics import HttpMetrics
+from .rate_limiter import HostRateLimiter
 from .integrated_retry_manager import IntegratedRetryManager
 from .download_session import DownloadSession
 from .download_task import DownloadTask
 
 __all__ = [
     'HttpClient',
+    'get_shared_http_client',
+    'HttpMetrics',
+    'HostRateLimiter',
     'IntegratedRetryManager',
     'DownloadSession',
     'DownloadTask',
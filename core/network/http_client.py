@@ -2,15 +2,21 @@
 """
 統合HTTPクライアント - requests.get/session.getを全て統合
 ⭐修正: スレッドローカルストレージで各スレッドが独立したセッションを持つ⭐
+⭐修正: 接続プール（アダプタ）は全スレッドで共有し、スレッドが変わってもkeep-aliveを再利用する⭐
 """
 
 import requests
 import time
+import weakref
 from typing import Dict, Any, Optional, Callable
 from urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
 import threading
 
+from core.stage_metrics import get_stage_metrics, host_of, STAGE_RETRY_BACKOFF
+from core.network.http_metrics import (
+    HttpMetrics, TimedHTTPAdapter, begin_connect_tracking, end_connect_tracking
+)
+
 
 class HttpClient:
     """
@@ -20,8 +26,14 @@ class HttpClient:
     ⭐重要: スレッドローカルストレージでセッションを管理⭐
     requests.Session()はスレッドセーフではないため、
     各スレッドが独立したセッションを持つことで競合を防ぐ
+    
+    ソケットを持つ接続プール（HTTPAdapter）は1つを全セッションで共有する。
+    スレッドごとのセッションはヘッダー・クッキーの入れ物にすぎず、スレッド終了とともに破棄される。
     """
     
+    # 共有接続プールのホストあたりの最大保持接続数（ダウンロードワーカー数より大きく取る）
+    POOL_MAXSIZE = 32
+    
     def __init__(self, parent=None, logger=None):
         """
         Args:
@@ -36,19 +48,32 @@ class HttpClient:
         self._thread_local = threading.local()
         print(f"[HTTP_CLIENT] スレッドローカルストレージ初期化完了: {id(self._thread_local)}")
         
+        # 全スレッドのセッションで共有するクッキージャー（CookieJarは内部でロックされる）
+        self._cookie_jar = requests.cookies.RequestsCookieJar()
+        self._extra_headers: Dict[str, str] = {}
+        
+        # 生存中のセッション（set_headers用。スレッド終了で自動的に外れる）と共有接続プール
+        self._sessions = weakref.WeakSet()
+        self._session_lock = threading.Lock()
+        self._adapter: Optional[TimedHTTPAdapter] = None
+        
         # デフォルト設定
         self.default_timeout = 30.0
         self.default_max_retries = 3
         self.default_backoff_factor = 1.0
         print(f"[HTTP_CLIENT] デフォルト設定: timeout={self.default_timeout}, retries={self.default_max_retries}")
         
-        # リクエスト統計
+        # リクエスト統計（複数スレッドから更新されるため _count() で加算）
         self.stats = {
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0,
             'retry_requests': 0,
         }
+        self._stats_lock = threading.Lock()
+        
+        # ⭐追加: ホスト別の計測（レイテンシ・転送量・ステータスコード・接続の再利用）⭐
+        self.metrics = HttpMetrics()
         print("[HTTP_CLIENT] ========== HttpClient初期化完了 ==========")
 
     
@@ -62,18 +87,9 @@ class HttpClient:
         """
         # ⭐スレッドローカルストレージからセッションを取得⭐
         if not hasattr(self._thread_local, 'session') or self._thread_local.session is None:
-            # このスレッド用のセッションを生成
+            # このスレッド用のセッションを生成（接続プールは共有）
             session = requests.Session()
-            
-            # リトライ設定
-            retry_strategy = Retry(
-                total=self.default_max_retries,
-                backoff_factor=self.default_backoff_factor,
-                status_forcelist=[429, 500, 502, 503, 504],
-                allowed_methods=["HEAD", "GET", "OPTIONS", "POST"]
-            )
-            
-            adapter = HTTPAdapter(max_retries=retry_strategy)
+            adapter = self._get_adapter()
             session.mount("http://", adapter)
             session.mount("https://", adapter)
             
@@ -84,6 +100,12 @@ class HttpClient:
                 'Accept-Language': 'ja,en-US;q=0.9,en;q=0.8',
             })
             
+            # 共有クッキー・追加ヘッダー
+            session.cookies = self._cookie_jar
+            with self._session_lock:
+                session.headers.update(self._extra_headers)
+                self._sessions.add(session)
+            
             # スレッドローカルストレージに保存
             self._thread_local.session = session
             
@@ -93,6 +115,22 @@ class HttpClient:
         
         return self._thread_local.session
     
+    def _get_adapter(self) -> TimedHTTPAdapter:
+        """全スレッドで共有する接続プール（HTTPAdapter）を取得"""
+        with self._session_lock:
+            if self._adapter is None:
+                # リトライ設定
+                retry_strategy = Retry(
+                    total=self.default_max_retries,
+                    backoff_factor=self.default_backoff_factor,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=["HEAD", "GET", "OPTIONS", "POST"]
+                )
+                self._adapter = TimedHTTPAdapter(
+                    pool_connections=10, pool_maxsize=self.POOL_MAXSIZE, max_retries=retry_strategy
+                )
+            return self._adapter
+    
     def get(self, url: str, **kwargs) -> requests.Response:
         """
         GETリクエストを実行
@@ -137,7 +175,7 @@ class HttpClient:
         """
         try:
             # 統計更新
-            self.stats['total_requests'] += 1
+            self._count('total_requests')
             
             # タイムアウト設定
             if 'timeout' not in kwargs:
@@ -156,14 +194,27 @@ class HttpClient:
             print(f"[HTTP_CLIENT] {method}実行直前: URL={url[:80]}, Thread={thread_id}")
             
             # ⭐HTTP通信を実行（ロック不要）⭐
-            if method == 'GET':
-                print(f"[HTTP_CLIENT] session.get()呼び出し...")
-                response = session.get(url, **kwargs)
-                print(f"[HTTP_CLIENT] session.get()完了!")
-            elif method == 'POST':
-                response = session.post(url, **kwargs)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+            # ⭐追加: 接続確立・TTFB・全体時間・転送量をホスト別に計測⭐
+            host = host_of(url)
+            begin_connect_tracking()
+            self.metrics.request_started(host)
+            started = time.perf_counter()
+            response = None
+            try:
+                if method == 'GET':
+                    print(f"[HTTP_CLIENT] session.get()呼び出し...")
+                    response = session.get(url, **kwargs)
+                    print(f"[HTTP_CLIENT] session.get()完了!")
+                elif method == 'POST':
+                    response = session.post(url, **kwargs)
+                else:
+                    raise ValueError(f"Unsupported HTTP method: {method}")
+            finally:
+                connects, connect_seconds, proxied = end_connect_tracking()
+                self.metrics.request_finished(
+                    host, time.perf_counter() - started, response,
+                    connects, connect_seconds, stream=kwargs.get('stream', False), proxied=proxied
+                )
             
             # ⭐DEBUG: HTTP通信完了⭐
             print(f"[HTTP_CLIENT] {method}完了: Status={response.status_code}, Thread={thread_id}")
@@ -172,12 +223,12 @@ class HttpClient:
             response.raise_for_status()
             
             # 統計更新
-            self.stats['successful_requests'] += 1
+            self._count('successful_requests')
             
             return response
             
         except requests.exceptions.RequestException as e:
-            self.stats['failed_requests'] += 1
+            self._count('failed_requests')
             self.log(f"HTTPリクエストエラー: {url} - {e}", "error")
             raise
     
@@ -217,13 +268,13 @@ class HttpClient:
                 
                 if attempt < max_retries:
                     # リトライ
-                    self.stats['retry_requests'] += 1
+                    self._count('retry_requests')
                     self.log(f"リトライ {attempt + 1}/{max_retries}: {url}", "warning")
                     
                     if on_retry:
                         on_retry(attempt + 1, e)
                     
-                    time.sleep(retry_delay)
+                    get_stage_metrics().sleep(STAGE_RETRY_BACKOFF, retry_delay, host=host_of(url))
                 else:
                     # リトライ上限
                     break
@@ -232,23 +283,36 @@ class HttpClient:
         raise last_error
     
     def set_cookies(self, cookies: Dict[str, str]):
-        """クッキーを設定"""
-        with self._session_lock:
-            self._session.cookies.update(cookies)
+        """クッキーを設定（全スレッドのセッションで共有）"""
+        self._cookie_jar.update(cookies)
     
     def set_headers(self, headers: Dict[str, str]):
-        """ヘッダーを設定"""
+        """ヘッダーを設定（既存・今後生成される全セッションに適用）"""
         with self._session_lock:
-            self._session.headers.update(headers)
+            self._extra_headers.update(headers)
+            for session in self._sessions:
+                session.headers.update(headers)
     
     def reset_session(self):
-        """セッションをリセット"""
-        self._init_session()
+        """セッションをリセット（各スレッドは次回リクエスト時に再生成）"""
+        self.close()
         self.log("HTTPセッションをリセットしました", "info")
     
     def get_stats(self) -> Dict[str, int]:
         """統計情報を取得"""
-        return self.stats.copy()
+        with self._stats_lock:
+            return self.stats.copy()
+    
+    def get_metrics_snapshot(self) -> Dict[str, Any]:
+        """統計情報とホスト別の計測のスナップショット（JSON出力・パフォーマンスパネル用）"""
+        snapshot = self.metrics.snapshot()
+        snapshot['counters'] = self.get_stats()
+        return snapshot
+    
+    def _count(self, key: str):
+        """統計カウンタを加算（スレッドセーフ）"""
+        with self._stats_lock:
+            self.stats[key] += 1
     
     def log(self, message: str, level: str = "info"):
         """ログ出力"""
@@ -258,8 +322,31 @@ class HttpClient:
             self.parent.log(f"[HttpClient] {message}", level)
     
     def close(self):
-        """セッションをクローズ"""
+        """共有接続プールを閉じ、全スレッドのセッションを破棄（次回リクエスト時に再生成）"""
         with self._session_lock:
-            if self._session:
-                self._session.close()
-                self._session = None
+            adapter, self._adapter = self._adapter, None
+            self._sessions = weakref.WeakSet()
+            # 既存のスレッドローカル参照を無効化
+            self._thread_local = threading.local()
+        if adapter is not None:
+            try:
+                adapter.close()
+            except Exception:
+                pass
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_shared_http_client() -> HttpClient:
+    """
+    GUI部品（Torrentマネージャー、DLリストのサムネイル等）で共有するHttpClientを取得
+    
+    接続プール（keep-alive）・クッキー・リトライ設定をプロセス内で共有する。
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
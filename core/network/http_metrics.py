@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+HttpMetrics - HTTP通信のホスト別計測
+
+責任範囲:
+- ホスト別の接続確立・TTFB・全体時間のヒストグラム（core.stage_metrics.LatencyHistogram）
+- ホスト別の転送量・ステータスコード内訳・通信エラー数・接続の再利用率・実行中リクエスト数
+- 接続確立（TCP+TLS）の時間と再利用の判定のため、接続を計測する HTTPAdapter を提供
+  （プロキシ経由の接続は計測できないため、再利用か否かは不明として数える）
+
+⭐接続はスレッドローカルのセッションの中で呼び出し元スレッドが確立するため、
+  計測値もスレッドローカルに積んでリクエスト完了時に回収する⭐
+"""
+
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+from requests.adapters import HTTPAdapter
+from requests.utils import select_proxy
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from core.stage_metrics import LatencyHistogram
+
+_connect_state = threading.local()
+
+
+def begin_connect_tracking():
+    """このスレッドの接続確立の計測を開始"""
+    _connect_state.count = 0
+    _connect_state.seconds = 0.0
+    _connect_state.proxied = False
+
+
+def end_connect_tracking() -> Tuple[int, float, bool]:
+    """開始以降にこのスレッドで確立した接続数・所要時間の合計・プロキシ経由の送信があったか"""
+    return (getattr(_connect_state, 'count', 0), getattr(_connect_state, 'seconds', 0.0),
+            getattr(_connect_state, 'proxied', False))
+
+
+def _record_connect(seconds: float):
+    _connect_state.count = getattr(_connect_state, 'count', 0) + 1
+    _connect_state.seconds = getattr(_connect_state, 'seconds', 0.0) + seconds
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(time.perf_counter() - started)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(time.perf_counter() - started)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """接続確立を計測する HTTPAdapter（プロキシ経由の接続は計測対象外）"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        # プロキシ経由の接続は計測されないため、接続数0でも再利用とは判定できない
+        if select_proxy(request.url, proxies):
+            _connect_state.proxied = True
+        return super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+
+class _HostStats:
+    """1ホスト分の集計（HttpMetrics のロック内で更新）"""
+
+    __slots__ = ('requests', 'errors', 'in_flight', 'bytes', 'new_connections',
+                 'reused_connections', 'unknown_connections', 'status_codes', 'connect', 'ttfb', 'total')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.bytes = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.unknown_connections = 0
+        self.status_codes: Dict[int, int] = {}
+        self.connect = LatencyHistogram()
+        self.ttfb = LatencyHistogram()
+        self.total = LatencyHistogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        responses = self.new_connections + self.reused_connections
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'in_flight': self.in_flight,
+            'bytes': self.bytes,
+            'new_connections': self.new_connections,
+            'reused_connections': self.reused_connections,
+            'unknown_connections': self.unknown_connections,
+            'reuse_ratio': round(self.reused_connections / responses, 4) if responses else None,
+            'status_codes': {str(code): count for code, count in sorted(self.status_codes.items())},
+            'connect': self.connect.to_dict(),
+            'ttfb': self.ttfb.to_dict(),
+            'total': self.total.to_dict(),
+        }
+
+
+class HttpMetrics:
+    """HTTP通信のホスト別計測
+
+    request_started() / request_finished() はどのスレッドからでも呼べる。
+    TTFBはレスポンスヘッダー受信まで（response.elapsed）、全体時間は stream=False なら本文の受信まで。
+    接続の再利用率はレスポンスを受け取ったリクエストのうち、新規接続を確立しなかったものの割合。
+    プロキシ経由のリクエストは判定できないため不明として数え、再利用率から除く（判定できたものが無ければNone）。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+        self._in_flight = 0
+        self._hosts: Dict[str, _HostStats] = {}
+
+    def request_started(self, host: str):
+        """リクエスト開始（実行中リクエスト数を加算）"""
+        with self._lock:
+            self._in_flight += 1
+            self._host(host).in_flight += 1
+
+    def request_finished(self, host: str, total_seconds: float, response=None,
+                         connects: int = 0, connect_seconds: float = 0.0, stream: bool = False,
+                         proxied: bool = False):
+        """リクエスト完了（response が None の場合は通信エラー）"""
+        ttfb = size = None
+        if response is not None:
+            elapsed = getattr(response, 'elapsed', None)
+            ttfb = elapsed.total_seconds() if elapsed is not None else None
+            size = self._response_size(response, stream)
+
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            stats = self._host(host)
+            stats.in_flight = max(0, stats.in_flight - 1)
+            stats.requests += 1
+            stats.total.add(total_seconds)
+            if connects:
+                stats.connect.add(connect_seconds / connects)
+            if response is None:
+                stats.errors += 1
+                return
+            if proxied:
+                stats.unknown_connections += 1
+            elif connects:
+                stats.new_connections += 1
+            else:
+                stats.reused_connections += 1
+            if ttfb is not None:
+                stats.ttfb.add(ttfb)
+            stats.bytes += size
+            stats.status_codes[response.status_code] = stats.status_codes.get(response.status_code, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """集計のスナップショット（JSONに変換できる辞書）"""
+        with self._lock:
+            return {
+                'started_at': self._started_at,
+                'elapsed': round(time.time() - self._started_at, 3),
+                'in_flight': self._in_flight,
+                'hosts': {host: stats.to_dict() for host, stats in self._hosts.items()},
+            }
+
+    def reset(self):
+        """集計をクリア（実行中リクエスト数は維持）"""
+        with self._lock:
+            self._started_at = time.time()
+            hosts, self._hosts = self._hosts, {}
+            for host, stats in hosts.items():
+                if stats.in_flight:
+                    self._host(host).in_flight = stats.in_flight
+
+    def _host(self, host: str) -> _HostStats:
+        stats = self._hosts.get(host)
+        if stats is None:
+            stats = self._hosts[host] = _HostStats()
+        return stats
+
+    @staticmethod
+    def _response_size(response, stream: bool) -> int:
+        """転送量（Content-Length優先、無ければ読み込み済みの本文の長さ）"""
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit():
+            return int(content_length)
+        if not stream:
+            return len(response.content)
+        return 0
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+ホスト単位のレートリミッター
+複数スレッドから同じホストへアクセスする際に、リクエスト開始間隔を保証する
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from core.stage_metrics import get_stage_metrics, STAGE_RATE_LIMIT_WAIT
+
+
+class HostRateLimiter:
+    """
+    ホスト単位の最小リクエスト間隔を保証するレートリミッター
+
+    各リクエストはロック内で「次に使える時刻」を予約し、ロック外でその時刻まで待機する。
+    そのため待機中のスレッドが他ホストへのリクエストを妨げることはない。
+    """
+
+    def __init__(self, min_interval: float = 0.0):
+        """
+        Args:
+            min_interval: 同一ホストへのリクエスト開始間隔（秒）
+        """
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+        self.min_interval = max(0.0, float(min_interval or 0.0))
+
+    def set_interval(self, min_interval: float):
+        """リクエスト間隔を変更"""
+        with self._lock:
+            self.min_interval = max(0.0, float(min_interval or 0.0))
+
+    def acquire(self, url: str, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        URLのホストに対するリクエスト枠を確保し、その時刻まで待機する
+
+        Args:
+            url: リクエスト先URL
+            stop_event: セットされたら待機を打ち切るイベント
+
+        Returns:
+            リクエストしてよい場合True、stop_eventにより中断された場合False
+        """
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+
+        delay = slot - now
+        if delay <= 0:
+            return True
+        # 停止で打ち切られた場合も含め、実際に待った時間を記録する
+        try:
+            if stop_event is not None:
+                return not stop_event.wait(delay)
+            time.sleep(delay)
+            return True
+        finally:
+            get_stage_metrics().record(STAGE_RATE_LIMIT_WAIT, time.monotonic() - now, host=host)
+
+    def reset(self):
+        """予約状態をクリア"""
+        with self._lock:
+            self._next_slot.clear()
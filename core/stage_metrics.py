@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+StageMetrics - 処理工程ごとの所要時間の計測
+
+責任範囲:
+- 一覧ページ取得・画像ページ解決・画像転送・保存・後処理・圧縮・レート制限待機・リトライ待機の所要時間を記録
+- 固定バケットのヒストグラムで集計（記録はロック内の加算のみで、サンプルは保持しない）
+- 工程別の全体集計に加え、ギャラリー別・ホスト別に集計
+- GUIのパフォーマンスパネル用のスナップショットとJSON出力
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+# 工程
+STAGE_INDEX_CRAWL = 'index_crawl'
+STAGE_IMAGE_PAGE = 'image_page_resolve'
+STAGE_TRANSFER = 'image_transfer'
+STAGE_SAVE = 'save'
+STAGE_POST_PROCESS = 'post_process'
+STAGE_COMPRESSION = 'compression'
+STAGE_RATE_LIMIT_WAIT = 'rate_limit_wait'
+STAGE_RETRY_BACKOFF = 'retry_backoff'
+
+STAGE_LABELS = OrderedDict([
+    (STAGE_INDEX_CRAWL, '一覧ページ取得'),
+    (STAGE_IMAGE_PAGE, '画像ページ解決'),
+    (STAGE_TRANSFER, '画像転送'),
+    (STAGE_SAVE, '保存'),
+    (STAGE_POST_PROCESS, '後処理'),
+    (STAGE_COMPRESSION, '圧縮'),
+    (STAGE_RATE_LIMIT_WAIT, 'レート制限待機'),
+    (STAGE_RETRY_BACKOFF, 'リトライ待機'),
+])
+
+_GALLERY_ID_PATTERN = re.compile(r'/(?:g/(\d+)/|s/[0-9a-z]+/(\d+)-)')
+
+
+def host_of(url: Optional[str]) -> str:
+    """URLのホスト名（小文字）"""
+    if not url:
+        return ''
+    try:
+        return urlparse(url).netloc.lower()
+    except ValueError:
+        return ''
+
+
+def gallery_key_of(url: Optional[str]) -> str:
+    """ギャラリーURL・画像ページURLから集計用のギャラリーキー（gid）を取得"""
+    match = _GALLERY_ID_PATTERN.search(url or '')
+    if not match:
+        return ''
+    return match.group(1) or match.group(2)
+
+
+class LatencyHistogram:
+    """所要時間の固定バケットヒストグラム
+
+    バケット境界は1ms〜10分の対数的な間隔で、パーセンタイルはバケットの上限で近似する。
+    """
+
+    BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5,
+              1.0, 2.0, 5.0, 10.0, 20.0, 60.0, 120.0, 300.0, 600.0)
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(self.BOUNDS) + 1)  # 最後は上限超え
+
+    def add(self, seconds: float):
+        seconds = max(0.0, float(seconds))
+        if self.count == 0 or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.count += 1
+        self.total += seconds
+        for index, bound in enumerate(self.BOUNDS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """q（0〜1）パーセンタイルの近似値"""
+        if not self.count:
+            return 0.0
+        target = max(1, int(round(q * self.count)))
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                upper = self.BOUNDS[index] if index < len(self.BOUNDS) else self.max
+                return min(upper, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total': round(self.total, 6),
+            'mean': round(self.mean, 6),
+            'min': round(self.min, 6),
+            'max': round(self.max, 6),
+            'p50': round(self.percentile(0.5), 6),
+            'p95': round(self.percentile(0.95), 6),
+            'buckets': {('inf' if index == len(self.BOUNDS) else str(self.BOUNDS[index])): bucket
+                        for index, bucket in enumerate(self.buckets) if bucket},
+        }
+
+
+class StageMetrics:
+    """工程別の所要時間の集計
+
+    record() はどのスレッドからでも呼べる。ギャラリー別の集計は直近 max_galleries 件だけ保持する。
+    後処理・圧縮のようにフォルダしか分からない工程は、bind_folder() で登録した対応からギャラリーを引く。
+    """
+
+    def __init__(self, max_galleries: int = 200):
+        self.max_galleries = max_galleries
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+        self._stages: Dict[str, LatencyHistogram] = {}
+        self._galleries: 'OrderedDict[str, Dict[str, LatencyHistogram]]' = OrderedDict()
+        self._hosts: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._folders: Dict[str, str] = {}
+
+    # ------------------------------------------------------------------
+    # 記録
+    # ------------------------------------------------------------------
+
+    def record(self, stage: str, seconds: float, gallery: Optional[str] = None,
+               host: Optional[str] = None):
+        """工程の所要時間を記録"""
+        if not self.enabled or seconds is None:
+            return
+        with self._lock:
+            self._histogram(self._stages, stage).add(seconds)
+            if gallery:
+                stages = self._galleries.get(gallery)
+                if stages is None:
+                    stages = self._galleries[gallery] = {}
+                    while len(self._galleries) > self.max_galleries:
+                        self._galleries.popitem(last=False)
+                else:
+                    self._galleries.move_to_end(gallery)
+                self._histogram(stages, stage).add(seconds)
+            if host:
+                self._histogram(self._hosts.setdefault(host, {}), stage).add(seconds)
+
+    @contextmanager
+    def measure(self, stage: str, gallery: Optional[str] = None, host: Optional[str] = None):
+        """with ブロックの所要時間を記録（例外で抜けた場合も記録する）"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started, gallery, host)
+
+    def sleep(self, stage: str, seconds: float, gallery: Optional[str] = None,
+              host: Optional[str] = None):
+        """待機して、その時間を工程（レート制限待機・リトライ待機）として記録"""
+        if seconds <= 0:
+            return
+        with self.measure(stage, gallery, host):
+            time.sleep(seconds)
+
+    def bind_folder(self, folder_path: str, gallery: str):
+        """保存フォルダとギャラリーキーを対応付ける"""
+        if folder_path and gallery:
+            with self._lock:
+                self._folders[self._normalize(folder_path)] = gallery
+
+    def gallery_for_folder(self, folder_path: Optional[str]) -> str:
+        """保存フォルダのギャラリーキー（未登録の場合はフォルダ名）"""
+        if not folder_path:
+            return ''
+        with self._lock:
+            gallery = self._folders.get(self._normalize(folder_path))
+        return gallery or os.path.basename(os.path.normpath(folder_path))
+
+    def reset(self):
+        """集計をクリア（バッチ開始時）"""
+        with self._lock:
+            self._started_at = time.time()
+            self._stages.clear()
+            self._galleries.clear()
+            self._hosts.clear()
+            self._folders.clear()
+
+    # ------------------------------------------------------------------
+    # 参照・出力
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """集計のスナップショット（JSONに変換できる辞書）"""
+        with self._lock:
+            return {
+                'started_at': self._started_at,
+                'elapsed': round(time.time() - self._started_at, 3),
+                'stages': self._dump(self._stages),
+                'galleries': {gallery: self._dump(stages) for gallery, stages in self._galleries.items()},
+                'hosts': {host: self._dump(stages) for host, stages in self._hosts.items()},
+            }
+
+    def stage_summary(self, gallery: Optional[str] = None) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Dict[str, Any]]]]:
+        """パネル表示用の (工程別, ホスト別{ホスト: 工程別}) の集計（galleryを指定するとそのギャラリーのみ）"""
+        with self._lock:
+            stages = self._galleries.get(gallery, {}) if gallery else self._stages
+            return self._dump(stages), {host: self._dump(host_stages)
+                                        for host, host_stages in self._hosts.items()}
+
+    def export_json(self, file_path: str, extra: Optional[Dict[str, Any]] = None) -> str:
+        """スナップショットをJSONファイルに出力"""
+        data = {'version': 1, 'exported_at': time.time(), 'stage_labels': dict(STAGE_LABELS)}
+        data.update(self.snapshot())
+        if extra:
+            data.update(extra)
+        temp_file = file_path + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, file_path)
+        return file_path
+
+    # ------------------------------------------------------------------
+    # 内部処理
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _histogram(stages: Dict[str, LatencyHistogram], stage: str) -> LatencyHistogram:
+        histogram = stages.get(stage)
+        if histogram is None:
+            histogram = stages[stage] = LatencyHistogram()
+        return histogram
+
+    @staticmethod
+    def _dump(stages: Dict[str, LatencyHistogram]) -> Dict[str, Dict[str, Any]]:
+        return {stage: histogram.to_dict() for stage, histogram in stages.items()}
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return os.path.normcase(os.path.normpath(path))
+
+
+_shared_metrics: Optional[StageMetrics] = None
+_shared_metrics_lock = threading.Lock()
+
+
+def get_stage_metrics() -> StageMetrics:
+    """プロセス内で共有する StageMetrics を取得
+
+    HttpClient・レートリミッター・後処理ステージなど、コアへの参照を持たない部品からも記録できるようにする。
+    """
+    global _shared_metrics
+    with _shared_metrics_lock:
+        if _shared_metrics is None:
+            _shared_metrics = StageMetrics()
+        return _shared_metrics
@@ -13,6 +13,7 @@ import webbrowser
 from gui.components.download_list_model import DownloadItem, DownloadStatus
 from gui.components.download_list_controller import DownloadListController
 from core.communication.ui_bridge import ThreadSafeUIBridge
+from core.network.http_client import get_shared_http_client
 
 
 class DownloadListTreeview(ttk.Frame):
@@ -721,12 +722,10 @@ class DownloadListTreeview(ttk.Frame):
     def _get_thumbnail_url(self, gallery_url):
         """ギャラリーのサムネイルURLを取得（gd1要素のbackground URL方式）"""
         try:
-            import requests
             import re
             
-            # ギャラリーページを取得
-            response = requests.get(gallery_url, timeout=10)
-            response.raise_for_status()
+            # ギャラリーページを取得（共有HttpClientで接続を再利用）
+            response = get_shared_http_client().get(gallery_url, timeout=10)
             html = response.text
             
             # gd1要素のbackground URLを取得
@@ -755,12 +754,10 @@ class DownloadListTreeview(ttk.Frame):
                 return
             
             # サムネイル画像を取得
-            import requests
             from PIL import Image, ImageTk
             from io import BytesIO
             
-            response = requests.get(thumbnail_url, timeout=10)
-            response.raise_for_status()
+            response = get_shared_http_client().get(thumbnail_url, timeout=10)
             
             # 画像を読み込み
             image = Image.open(BytesIO(response.content))
@@ -59,6 +59,9 @@ class DownloadListWidget:
         self.on_url_added: Optional[Callable] = None
         self.on_url_removed: Optional[Callable] = None
         self.on_status_changed: Optional[Callable] = None
+        
+        # ⭐ライブラリ索引の照会（URL → 完了済みエントリ or None、後で設定）⭐
+        self.library_lookup: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None
     
     # ==================== 公開API: URL操作 ====================
     
@@ -75,6 +78,9 @@ class DownloadListWidget:
         """
         item = self.controller.add_url(url, **kwargs)
         
+        if item:
+            self._mark_if_in_library(url)
+        
         if item and self.on_url_added:
             self.on_url_added(url)
         
@@ -91,8 +97,23 @@ class DownloadListWidget:
             追加された件数
         """
         items = self.controller.add_urls_batch(urls)
+        for item in items:
+            self._mark_if_in_library(item.url)
         return len(items)
     
+    def _mark_if_in_library(self, url: str) -> bool:
+        """ライブラリにダウンロード済みのURLをスキップ状態にする（ネットワークアクセスなし）"""
+        if self.library_lookup is None:
+            return False
+        try:
+            entry = self.library_lookup(url)
+        except Exception:
+            return False
+        if not entry:
+            return False
+        self.update_status(url, DownloadStatus.SKIPPED, error_message=f"ダウンロード済み: {entry['path']}")
+        return True
+    
     def remove_url(self, url: str) -> bool:
         """
         URLを削除
@@ -12,6 +12,8 @@ import json
 from datetime import datetime
 from config.settings import ToolTip
 from config.constants import *
+from core.handlers.archive_codecs import ARCHIVE_FORMATS, COMPRESSION_LEVELS
+from core.handlers.archive_writer import COMPRESSION_PROFILES
 
 # ツールチップのテキスト定義
 TOOLTIP_TEXTS = {
@@ -1561,6 +1563,17 @@ class EHDownloaderOptionsPanel:
         
         self.duplicate_folder_cb.bind('<<ComboboxSelected>>', _on_dup_folder_change)
         
+        # ⭐追加: ライブラリ索引によるダウンロード済みギャラリーのスキップ⭐
+        if not hasattr(self.parent, 'library_skip_existing'):
+            self.parent.library_skip_existing = tk.BooleanVar(value=True)
+        self.library_skip_existing_cb = ttk.Checkbutton(dup_folder_content, text="ダウンロード済みのギャラリーはスキップ", variable=self.parent.library_skip_existing)
+        self.library_skip_existing_cb.grid(row=1, column=0, columnspan=2, sticky="w", pady=(5, 0))
+        ToolTip(self.library_skip_existing_cb, "💡 ダウンロード済みのスキップ:\n"
+                                               "• 保存先のフォルダ・ZIPをギャラリーID（gid）で索引化し、\n"
+                                               "  完了済みのギャラリーはDLリスト追加時・DL開始時にスキップします\n"
+                                               "• フォルダ名の命名規則や連番に関係なく判定します（通信なし）\n"
+                                               "• 既存フォルダの判定にはギャラリー情報ファイル（gallery_info_*）を使用します")
+        
         # 初期値設定の修正（設定読み込み後に実行）
         def _set_initial_dup_folder_value():
             try:
@@ -1728,10 +1741,72 @@ class EHDownloaderOptionsPanel:
                            "• 保存フォルダにサブディレクトリが存在する場合は削除しません")
         ToolTip(self.compression_delete_folder_cb, compression_tips)
         
+        # ⭐追加: ダウンロード中に直接ZIPへ書き込むオプション⭐
+        if not hasattr(self.parent, 'compression_stream_direct'):
+            self.parent.compression_stream_direct = tk.BooleanVar(value=False)
+        self.compression_stream_direct_cb = ttk.Checkbutton(compression_frame, text="ダウンロード中に直接ZIPへ書き込む", variable=self.parent.compression_stream_direct)
+        self.compression_stream_direct_cb.grid(row=3, column=0, columnspan=2, sticky="w", padx=5, pady=2)
+        ToolTip(self.compression_stream_direct_cb, "💡 直接ZIP書き込み:\n"
+                                                  "• 画像をフォルダに保存せず、ダウンロードするたびにZIPへ追記します\n"
+                                                  "• 書き込み中は「.zip.part」となり、完了時にページ順で確定します\n"
+                                                  "• 中断した場合は .part から続きを再開します\n"
+                                                  "• 保存形式がOriginal以外、またはリサイズ有効の場合は従来どおり完了後に圧縮します")
+        
+        # ⭐追加: ZIPエントリの圧縮プロファイル⭐
+        if not hasattr(self.parent, 'compression_profile'):
+            self.parent.compression_profile = tk.StringVar(value="自動（画像は無圧縮）")
+        if not hasattr(self.parent, 'compression_sample_unknown'):
+            self.parent.compression_sample_unknown = tk.BooleanVar(value=True)
+        ttk.Label(compression_frame, text="圧縮方式:").grid(row=4, column=0, sticky="w", padx=5, pady=2)
+        self.compression_profile_cb = ttk.Combobox(compression_frame, textvariable=self.parent.compression_profile, values=list(COMPRESSION_PROFILES), state="readonly", width=20)
+        self.compression_profile_cb.grid(row=4, column=1, sticky="w", padx=5, pady=2)
+        ToolTip(self.compression_profile_cb, "💡 圧縮方式:\n"
+                                             "• 自動: JPG/PNG/WebP/GIFなど圧縮済みの画像は無圧縮で格納し、\n"
+                                             "  テキスト等の付随ファイルのみ圧縮します（高速・サイズはほぼ同じ）\n"
+                                             "• すべて無圧縮: 最速\n"
+                                             "• すべて圧縮: 従来どおりすべてDeflateで圧縮")
+        self.compression_sample_unknown_cb = ttk.Checkbutton(compression_frame, text="不明な形式は試し圧縮で判定", variable=self.parent.compression_sample_unknown)
+        self.compression_sample_unknown_cb.grid(row=5, column=0, columnspan=2, sticky="w", padx=5, pady=2)
+        
+        # ⭐追加: 同時に実行する圧縮数（超過分はキューで待機）⭐
+        if not hasattr(self.parent, 'compression_max_workers'):
+            self.parent.compression_max_workers = tk.StringVar(value="1")
+        ttk.Label(compression_frame, text="同時圧縮数:").grid(row=6, column=0, sticky="w", padx=5, pady=2)
+        self.compression_max_workers_entry = ttk.Entry(compression_frame, textvariable=self.parent.compression_max_workers, width=5)
+        self.compression_max_workers_entry.grid(row=6, column=1, sticky="w", padx=5, pady=2)
+        ToolTip(self.compression_max_workers_entry, "💡 同時圧縮数:\n"
+                                                    "• ダウンロード完了したギャラリーの圧縮を同時に何件まで実行するか\n"
+                                                    "• 超過分は完了順に待機し、フッターに待機数を表示します\n"
+                                                    "• 未完了の圧縮は終了時に保存され、次回起動時に再開します\n"
+                                                    "• 同じディスクへの書き込みが競合するため、通常は1を推奨")
+        
+        # ⭐追加: 圧縮形式とTAR・7Zの圧縮レベル⭐
+        if not hasattr(self.parent, 'compression_level'):
+            self.parent.compression_level = tk.StringVar(value="自動")
+        ttk.Label(compression_frame, text="圧縮形式:").grid(row=7, column=0, sticky="w", padx=5, pady=2)
+        self.compression_format_cb = ttk.Combobox(compression_frame, textvariable=self.parent.compression_format, values=list(ARCHIVE_FORMATS), state="readonly", width=10)
+        self.compression_format_cb.grid(row=7, column=1, sticky="w", padx=5, pady=2)
+        ToolTip(self.compression_format_cb, "💡 圧縮形式:\n"
+                                            "• ZIP: 標準（直接書き込み・圧縮方式の選択はZIPのみ）\n"
+                                            "• TAR: tar.gz（ブロック分割で並列圧縮）\n"
+                                            "• TAR.XZ: 高圧縮（ブロック分割で並列圧縮）\n"
+                                            "• TAR.ZST: 高速・高圧縮（zstandardライブラリが必要）\n"
+                                            "• 7Z: py7zrライブラリが必要")
+        ttk.Label(compression_frame, text="圧縮レベル:").grid(row=8, column=0, sticky="w", padx=5, pady=2)
+        self.compression_level_cb = ttk.Combobox(compression_frame, textvariable=self.parent.compression_level, values=list(COMPRESSION_LEVELS), state="readonly", width=10)
+        self.compression_level_cb.grid(row=8, column=1, sticky="w", padx=5, pady=2)
+        ToolTip(self.compression_level_cb, "💡 圧縮レベル（TAR・7Z）:\n"
+                                           "• 自動: 圧縮済みの画像が大半のフォルダは高速、それ以外は標準\n"
+                                           "• 高速: 7Zで画像が大半の場合は無圧縮で格納します\n"
+                                           "• 最大: 時間がかかります（TAR.XZはメモリも多く使用します）")
+        
         # 圧縮オプションのグレーアウト機能を統合ヘルパーで実装
         detail_widgets = [self.compression_delete_original_cb]
         if hasattr(self, 'compression_delete_folder_cb'):
             detail_widgets.append(self.compression_delete_folder_cb)
+        detail_widgets.extend([self.compression_stream_direct_cb, self.compression_profile_cb,
+                               self.compression_sample_unknown_cb, self.compression_max_workers_entry,
+                               self.compression_format_cb, self.compression_level_cb])
         self.state_manager._register_grayout_option('compression_enabled', detail_widgets, value_map={'on': True, 'off': False})
 
         # 3. 待機時間
@@ -0,0 +1,292 @@
+"""
+パフォーマンスパネル - 工程別の所要時間のライブ表示
+
+core.stage_metrics の集計と HttpClient のホスト別計測を1秒ごとに表として表示する。
+工程の行を展開するとホスト別の内訳を表示し、JSONへの出力・集計のリセットができる。
+HTTPタブではホスト別のレイテンシ・転送量・ステータスコード・接続の再利用率を表示する。
+"""
+
+import os
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog
+from typing import Any, Dict, Optional
+
+from core.stage_metrics import STAGE_LABELS, get_stage_metrics
+
+REFRESH_INTERVAL_MS = 1000
+
+SCOPE_BATCH = "バッチ全体"
+SCOPE_GALLERY = "現在のギャラリー"
+
+_COLUMNS = (
+    ('count', "回数", 60),
+    ('mean', "平均", 70),
+    ('p50', "p50", 70),
+    ('p95', "p95", 70),
+    ('max', "最大", 70),
+    ('total', "合計", 80),
+)
+
+_HTTP_COLUMNS = (
+    ('requests', "リクエスト", 70),
+    ('in_flight', "実行中", 50),
+    ('reuse', "再利用率", 60),
+    ('connect', "接続 p50", 70),
+    ('ttfb', "TTFB p50", 70),
+    ('ttfb_p95', "TTFB p95", 70),
+    ('total', "全体 p95", 70),
+    ('bytes', "転送量", 80),
+    ('status', "ステータス", 160),
+)
+
+
+def format_seconds(seconds: float) -> str:
+    """所要時間を表示用に整形（1秒未満はms、1分以上は分:秒）"""
+    if seconds < 1.0:
+        return f"{seconds * 1000:.0f}ms"
+    if seconds < 60.0:
+        return f"{seconds:.2f}s"
+    minutes, rest = divmod(int(seconds), 60)
+    return f"{minutes}:{rest:02d}"
+
+
+def format_bytes(size: int) -> str:
+    """転送量を表示用に整形"""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.2f}GB"
+
+
+class PerformancePanel:
+    """工程別の所要時間を表示するパネル"""
+
+    def __init__(self, parent):
+        """
+        Args:
+            parent: メインウィンドウインスタンス
+        """
+        self.parent = parent
+        self.root = parent.root
+        self.metrics = get_stage_metrics()
+        self.frame: Optional[tk.Frame] = None
+        self.tree: Optional[ttk.Treeview] = None
+        self.http_tree: Optional[ttk.Treeview] = None
+        self.http_summary_var = tk.StringVar(value="")
+        self.scope_var = tk.StringVar(value=SCOPE_BATCH)
+        self._refresh_job = None
+
+    def create_panel(self, parent_pane, before=None):
+        """パネルを作成して parent_pane に追加"""
+        self.frame = tk.Frame(parent_pane)
+        if before is not None:
+            parent_pane.add(self.frame, height=140, before=before)
+        else:
+            parent_pane.add(self.frame, height=140)
+
+        header = tk.Frame(self.frame)
+        header.pack(fill=tk.X, padx=5, pady=2)
+        tk.Label(header, text="パフォーマンス", font=("", 10, "bold")).pack(side=tk.LEFT)
+        tk.Button(header, text="リセット", command=self.reset).pack(side=tk.RIGHT, padx=2)
+        tk.Button(header, text="JSON出力", command=self.export_json).pack(side=tk.RIGHT, padx=2)
+        ttk.Combobox(
+            header, textvariable=self.scope_var, values=(SCOPE_BATCH, SCOPE_GALLERY),
+            state="readonly", width=14
+        ).pack(side=tk.RIGHT, padx=5)
+
+        notebook = ttk.Notebook(self.frame)
+        notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+
+        stage_tab = tk.Frame(notebook)
+        notebook.add(stage_tab, text="工程")
+        self.tree = self._create_tree(stage_tab, "工程", 180, _COLUMNS)
+
+        http_tab = tk.Frame(notebook)
+        notebook.add(http_tab, text="HTTP")
+        tk.Label(http_tab, textvariable=self.http_summary_var, anchor=tk.W).pack(fill=tk.X)
+        self.http_tree = self._create_tree(http_tab, "ホスト", 160, _HTTP_COLUMNS)
+
+        self._schedule_refresh()
+
+    @staticmethod
+    def _create_tree(parent, first_heading: str, first_width: int, columns) -> ttk.Treeview:
+        body = tk.Frame(parent)
+        body.pack(fill=tk.BOTH, expand=True)
+        tree = ttk.Treeview(body, columns=[name for name, _, _ in columns], height=5)
+        tree.heading('#0', text=first_heading)
+        tree.column('#0', width=first_width, stretch=True)
+        for name, label, width in columns:
+            tree.heading(name, text=label)
+            tree.column(name, width=width, anchor=tk.E if name != 'status' else tk.W, stretch=False)
+        scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        return tree
+
+    # ===============================================
+    # 操作
+    # ===============================================
+
+    def export_json(self):
+        """集計をJSONファイルに出力（保存先を選択）"""
+        initial_dir = ''
+        if hasattr(self.parent, 'folder_var'):
+            initial_dir = self.parent.folder_var.get() or ''
+        file_path = filedialog.asksaveasfilename(
+            title="パフォーマンス計測の出力先",
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json")],
+            initialdir=initial_dir if os.path.isdir(initial_dir) else None,
+            initialfile=f"performance_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        if not file_path:
+            return
+        try:
+            self.metrics.export_json(file_path, self._export_extra())
+            self.parent.log(f"📊 パフォーマンス計測を出力しました: {os.path.basename(file_path)}", "info")
+        except Exception as e:
+            self.parent.log(f"パフォーマンス計測の出力エラー: {e}", "error")
+
+    def reset(self):
+        """集計をクリア"""
+        self.metrics.reset()
+        http_client = self._http_client()
+        if http_client is not None:
+            http_client.metrics.reset()
+        self._refresh()
+
+    def stop(self):
+        """定期更新を停止（終了時）"""
+        if self._refresh_job is not None:
+            try:
+                self.root.after_cancel(self._refresh_job)
+            except Exception:
+                pass
+            self._refresh_job = None
+
+    # ===============================================
+    # 表示更新
+    # ===============================================
+
+    def _schedule_refresh(self):
+        self._refresh_job = self.root.after(REFRESH_INTERVAL_MS, self._on_refresh_timer)
+
+    def _on_refresh_timer(self):
+        self._refresh_job = None
+        try:
+            if self.frame is not None and self.frame.winfo_ismapped():
+                self._refresh()
+        except tk.TclError:
+            return  # ウィンドウ破棄後
+        except Exception as e:
+            print(f"パフォーマンスパネル更新エラー: {e}")
+        self._schedule_refresh()
+
+    def _refresh(self):
+        if self.tree is None:
+            return
+        self._refresh_stages()
+        self._refresh_http()
+
+    def _refresh_stages(self):
+        gallery = self._current_gallery() if self.scope_var.get() == SCOPE_GALLERY else None
+        if self.scope_var.get() == SCOPE_GALLERY and not gallery:
+            stages, hosts = {}, {}
+        else:
+            stages, hosts = self.metrics.stage_summary(gallery)
+            if gallery:
+                hosts = {}  # ホスト別の内訳はバッチ全体のみ
+
+        visible = set()
+        for stage, label in STAGE_LABELS.items():
+            summary = stages.get(stage)
+            if not summary:
+                continue
+            self._upsert(stage, '', label, summary)
+            visible.add(stage)
+            for host in sorted(hosts):
+                host_summary = hosts[host].get(stage)
+                if host_summary:
+                    iid = f"{stage}|{host}"
+                    self._upsert(iid, stage, host, host_summary)
+                    visible.add(iid)
+
+        # 集計から消えた行（リセット・スコープ変更）を削除
+        for stage in self.tree.get_children(''):
+            for child in self.tree.get_children(stage):
+                if child not in visible:
+                    self.tree.delete(child)
+            if stage not in visible:
+                self.tree.delete(stage)
+
+    def _refresh_http(self):
+        http_client = self._http_client()
+        if http_client is None or self.http_tree is None:
+            return
+        snapshot = http_client.get_metrics_snapshot()
+        counters = snapshot['counters']
+        self.http_summary_var.set(
+            f"リクエスト {counters.get('total_requests', 0)} / 成功 {counters.get('successful_requests', 0)}"
+            f" / 失敗 {counters.get('failed_requests', 0)} / リトライ {counters.get('retry_requests', 0)}"
+            f" / 実行中 {snapshot['in_flight']}"
+        )
+
+        hosts = snapshot['hosts']
+        for host in sorted(hosts):
+            stats = hosts[host]
+            status = " ".join(f"{code}:{count}" for code, count in stats['status_codes'].items())
+            if stats['errors']:
+                status = f"{status} エラー:{stats['errors']}".strip()
+            values = (
+                stats['requests'],
+                stats['in_flight'],
+                f"{stats['reuse_ratio'] * 100:.0f}%" if stats['reuse_ratio'] is not None else "-",
+                format_seconds(stats['connect']['p50']),
+                format_seconds(stats['ttfb']['p50']),
+                format_seconds(stats['ttfb']['p95']),
+                format_seconds(stats['total']['p95']),
+                format_bytes(stats['bytes']),
+                status,
+            )
+            self._set_row(self.http_tree, f"http|{host}", '', host or "(不明)", values)
+        visible = {f"http|{host}" for host in hosts}
+        for iid in self.http_tree.get_children(''):
+            if iid not in visible:
+                self.http_tree.delete(iid)
+
+    def _upsert(self, iid: str, parent_iid: str, text: str, summary: Dict[str, Any]):
+        values = (
+            summary['count'],
+            format_seconds(summary['mean']),
+            format_seconds(summary['p50']),
+            format_seconds(summary['p95']),
+            format_seconds(summary['max']),
+            format_seconds(summary['total']),
+        )
+        self._set_row(self.tree, iid, parent_iid, text, values)
+
+    @staticmethod
+    def _set_row(tree: ttk.Treeview, iid: str, parent_iid: str, text: str, values):
+        if tree.exists(iid):
+            tree.item(iid, values=values)
+        else:
+            tree.insert(parent_iid, tk.END, iid=iid, text=text, values=values)
+
+    def _current_gallery(self) -> str:
+        core = getattr(self.parent, 'downloader_core', None)
+        return getattr(core, 'gid', '') if core is not None else ''
+
+    def _http_client(self):
+        core = getattr(self.parent, 'downloader_core', None)
+        session_manager = getattr(core, 'session_manager', None)
+        return getattr(session_manager, 'http_client', None)
+
+    def _export_extra(self) -> Dict[str, Any]:
+        """JSONに含める補足情報（HTTPのホスト別計測）"""
+        http_client = self._http_client()
+        if http_client is None:
+            return {}
+        return {'http': http_client.get_metrics_snapshot()}
@@ -11,6 +11,7 @@ import os
 import re
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 from bs4 import BeautifulSoup
 from selenium import webdriver
@@ -20,6 +21,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from config.settings import ToolTip
+from core.network.http_client import get_shared_http_client
+from core.network.rate_limiter import HostRateLimiter
 
 class TorrentDownloadManager:
     def __init__(self, parent):
@@ -45,6 +48,8 @@ class TorrentDownloadManager:
         self._default_error_handling = "中断"
         self._default_torrent_selection = "並び順で最下部"
         self._default_duplicate_file_mode = "rename"  # デフォルトはリネーム（連番）
+        self._default_concurrent_fetch = 1  # 1の場合は従来通りの逐次処理
+        self._max_concurrent_fetch = 8
         
         # フィルタリング設定のデフォルト値
         self._default_filtering_enabled = False
@@ -57,6 +62,7 @@ class TorrentDownloadManager:
         self.error_handling = None
         self.torrent_selection = None
         self.duplicate_file_mode = None
+        self.concurrent_fetch = self._default_concurrent_fetch
         
         # フィルタリング設定の内部値
         self.filtering_enabled = None
@@ -72,6 +78,7 @@ class TorrentDownloadManager:
         self.error_handling_var = None
         self.torrent_selection_var = None
         self.duplicate_file_mode_var = None
+        self.concurrent_fetch_var = None
         
         # フィルタリング設定のGUI変数
         self.filtering_enabled_var = None
@@ -88,6 +95,14 @@ class TorrentDownloadManager:
         # スキップ処理中フラグ
         self._skip_processing = False
         
+        # スキップ済み・実行中のURLインデックス（ワーカーとGUIスレッドで共有）
+        self._skip_lock = threading.Lock()
+        self._skipped_indices = set()
+        self._active_indices = set()
+        
+        # HTTP（接続プール・クッキーは共有HttpClient、並列取得時はレートリミッターも共有）
+        self._rate_limiter = None
+        
         # セレクションオプション
         self.selection_options = [
             "並び順で最下部",
@@ -111,6 +126,7 @@ class TorrentDownloadManager:
         self.tooltip_texts = {
             'save_directory': 'Torrentファイルの保存先ディレクトリを指定します。',
             'page_wait': 'ページ遷移時の待機時間（秒）を指定します。サーバーに負荷をかけないよう適切な値を設定してください。',
+            'concurrent_fetch': '同時に処理するギャラリー数を指定します（1〜8）。\n2以上の場合は並列で取得し、Waitは同一ホストへのリクエスト間隔として適用されます。',
             'error_handling': 'ダウンロードエラーが発生した場合の処理方法を選択します。',
             'torrent_selection': '複数のTorrentファイルが存在する場合の選択方法を指定します。',
             'duplicate_file_mode': '同名のTorrentファイルが既に存在する場合の処理方法を選択します。\n・上書き: 既存ファイルを上書き保存\n・リネーム（連番）: ファイル名に連番を付けて保存\n・スキップ: 同名ファイルはスキップして次のURLに進む',
@@ -218,6 +234,13 @@ class TorrentDownloadManager:
         self.page_wait_entry.pack(side="left", padx=(5, 0))
         ToolTip(self.page_wait_entry, self.tooltip_texts['page_wait'])
         
+        ttk.Label(wait_frame, text="同時取得数:").pack(side="left", padx=(15, 0))
+        self.concurrent_fetch_var = tk.StringVar()
+        self.concurrent_fetch_spinbox = ttk.Spinbox(wait_frame, from_=1, to=self._max_concurrent_fetch,
+                                                    textvariable=self.concurrent_fetch_var, width=5)
+        self.concurrent_fetch_spinbox.pack(side="left", padx=(5, 0))
+        ToolTip(self.concurrent_fetch_spinbox, self.tooltip_texts['concurrent_fetch'])
+        
         # エラー時処理
         error_frame = ttk.Frame(settings_frame)
         error_frame.pack(fill="x", padx=5, pady=2)
@@ -476,6 +499,9 @@ class TorrentDownloadManager:
     
     def _clear_download_state(self):
         """ダウンロード状態をクリア"""
+        with self._skip_lock:
+            self._skipped_indices.clear()
+        
         # 全URLの状態をリセット（成功状態は保持）
         for i, torrent_data in enumerate(self.torrent_data):
             current_status = torrent_data.get('status', '')
@@ -524,6 +550,8 @@ class TorrentDownloadManager:
         self.torrent_data = []
         self.resume_points = {}
         self.current_index = 0
+        with self._skip_lock:
+            self._skipped_indices.clear()
         # Treeviewのアイテムをクリア
         for item in self.url_tree.get_children():
             self.url_tree.delete(item)
@@ -553,6 +581,14 @@ class TorrentDownloadManager:
         else:
             self.page_wait_time = self._default_page_wait_time
             
+        if self.concurrent_fetch_var:
+            try:
+                self.concurrent_fetch = min(max(int(self.concurrent_fetch_var.get()), 1), self._max_concurrent_fetch)
+            except (ValueError, TypeError):
+                self.concurrent_fetch = self._default_concurrent_fetch
+        else:
+            self.concurrent_fetch = self._default_concurrent_fetch
+            
         if self.error_handling_var:
             self.error_handling = self.error_handling_var.get()
         else:
@@ -619,6 +655,8 @@ class TorrentDownloadManager:
                     self.torrent_save_directory = tm_settings['save_directory']
                 if 'page_wait_time' in tm_settings:
                     self.page_wait_time = tm_settings['page_wait_time']
+                if 'concurrent_fetch' in tm_settings:
+                    self.concurrent_fetch = tm_settings['concurrent_fetch']
                 if 'error_handling' in tm_settings:
                     self.error_handling = tm_settings['error_handling']
                 if 'torrent_selection' in tm_settings:
@@ -639,6 +677,8 @@ class TorrentDownloadManager:
                 self.torrent_save_dir_var.set(self.torrent_save_directory or self._default_torrent_save_directory)
             if self.page_wait_var:
                 self.page_wait_var.set(str(self.page_wait_time or self._default_page_wait_time))
+            if self.concurrent_fetch_var:
+                self.concurrent_fetch_var.set(str(self.concurrent_fetch or self._default_concurrent_fetch))
             if self.error_handling_var:
                 self.error_handling_var.set(self.error_handling or self._default_error_handling)
             if self.torrent_selection_var:
@@ -680,6 +720,10 @@ class TorrentDownloadManager:
     
     def _download_worker(self):
         """ダウンロードワーカースレッド"""
+        if (self.concurrent_fetch or 1) > 1:
+            self._download_worker_concurrent()
+            return
+
         try:
             # 中断されたURLから再開
             start_index = self.current_index
@@ -688,6 +732,10 @@ class TorrentDownloadManager:
                 if self.stop_flag.is_set():
                     break
                 
+                # 手動でスキップ済みのURLは処理しない
+                if self._is_skipped(i):
+                    continue
+                
                 data = self.torrent_data[i]
                 current_status = data.get('status', '')
                 
@@ -698,9 +746,14 @@ class TorrentDownloadManager:
                 
                 self.current_index = i
                 self._update_url_status(i, "downloading")
+                self._set_active(i, True)
                 
                 try:
                     result = self._download_single_torrent(data, i)
+                    self._set_active(i, False)
+                    if self._is_skipped(i):
+                        # 実行中にスキップされた: 結果は反映せず次のURLへ
+                        continue
                     if result == True or result == "succeeded":
                         self._update_url_status(i, "succeeded")
                         self.completed_count += 1
@@ -749,6 +802,9 @@ class TorrentDownloadManager:
                                 break
                         
                 except Exception as e:
+                    self._set_active(i, False)
+                    if self._is_skipped(i):
+                        continue
                     self._update_url_status(i, "failed")
                     self._log(f"URL{i+1} ERROR: {str(e)}")
                     
@@ -792,10 +848,152 @@ class TorrentDownloadManager:
         except Exception as e:
             self._log(f"Download worker error: {str(e)}")
         finally:
+            with self._skip_lock:
+                self._active_indices.clear()
+            self.is_running = False
+            self.is_paused = False
+            if self.window:
+                self.window.after(0, lambda: self._toggle_buttons_state(False))
+    
+    def _download_worker_concurrent(self):
+        """
+        並列ダウンロードワーカー（同時取得数 > 1 の場合）
+
+        ギャラリー単位の処理をスレッドプールで並列実行する。
+        ページWaitは各処理内のsleepではなく、ホスト単位のレートリミッターで
+        リクエスト開始間隔として適用する。状態更新と結果処理はこのスレッドで行う。
+        """
+        max_workers = self.concurrent_fetch
+        self._rate_limiter = HostRateLimiter(self.page_wait_time)
+        pending = {}  # Future -> index
+        paused = []  # 中断で停止したインデックス（再開位置に含める）
+        interrupted = False
+
+        try:
+            # 未完了のURLを中断位置から順に投入
+            queue_indices = [
+                i for i in range(self.current_index, len(self.torrent_data))
+                if self.torrent_data[i].get('status', '') not in ['succeeded', 'completed', 'success']
+                and not self._is_skipped(i)
+            ]
+            self._log(f"並列取得開始: {len(queue_indices)} URLs (同時取得数: {max_workers})")
+            next_pos = 0
+
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="torrent_fetch") as executor:
+                while next_pos < len(queue_indices) or pending:
+                    # 空きがあれば次のURLを投入
+                    while (next_pos < len(queue_indices) and len(pending) < max_workers
+                           and not self.stop_flag.is_set() and not interrupted):
+                        i = queue_indices[next_pos]
+                        next_pos += 1
+                        if self._is_skipped(i):
+                            continue
+                        self._update_url_status(i, "downloading")
+                        self._set_active(i, True)
+                        pending[executor.submit(self._download_single_torrent, self.torrent_data[i], i)] = i
+
+                    if not pending:
+                        break
+
+                    done, _ = wait(list(pending), timeout=0.5, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        i = pending.pop(future)
+                        self._set_active(i, False)
+                        if self._is_skipped(i):
+                            # 実行中にスキップされた: 結果でスキップ状態を上書きしない
+                            continue
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            self._log(f"URL{i+1} ERROR: {str(e)}")
+                            result = False
+                        if not self._handle_concurrent_result(self.torrent_data[i], i, result):
+                            interrupted = True
+                        if self.torrent_data[i].get('status') == "paused":
+                            paused.append(i)
+
+                    # 再開位置は未完了の最小インデックス
+                    remaining = [j for j in list(pending.values()) + queue_indices[next_pos:] + paused
+                                 if not self._is_skipped(j)]
+                    self.current_index = min(remaining) if remaining else len(self.torrent_data)
+
+            # 完了チェック
+            if not self.stop_flag.is_set() and not interrupted:
+                self.current_index = len(self.torrent_data)
+                self._log("ALL DONE. Open folder?")
+                if self.window:
+                    self.window.after(0, self._show_completion_dialog)
+
+        except Exception as e:
+            self._log(f"Download worker error: {str(e)}")
+        finally:
+            self._rate_limiter = None
+            with self._skip_lock:
+                self._active_indices.clear()
             self.is_running = False
             self.is_paused = False
             if self.window:
                 self.window.after(0, lambda: self._toggle_buttons_state(False))
+
+    def _handle_concurrent_result(self, data, index, result):
+        """
+        並列ダウンロードの結果を処理
+
+        Returns:
+            処理を継続する場合True、エラー処理「中断」により停止する場合False
+        """
+        if result == True or result == "succeeded":
+            self._update_url_status(index, "succeeded")
+            self.completed_count += 1
+            self._update_progress()
+            self._log(f"URL{index+1} SUCCESS")
+            return True
+        if result == "inappropriate":
+            self._update_url_status(index, "inappropriate")
+            self._log(f"URL{index+1} INAPPROPRIATE")
+            return True
+        if self.stop_flag.is_set():
+            self._log(f"URL{index+1}: 中断により停止")
+            self._update_url_status(index, "paused")
+            return True
+
+        self._update_url_status(index, "failed")
+        self._log(f"URL{index+1} ERROR: Download failed")
+
+        if self.error_handling == "そのURLをスキップ":
+            self._update_url_status(index, "skipped")
+            return True
+        if self.error_handling == "SeleniumをONにして1度だけ再試行":
+            try:
+                if self._download_with_selenium(data, index):
+                    self._update_url_status(index, "succeeded")
+                    self.completed_count += 1
+                    self._update_progress()
+                    self._log(f"URL{index+1} SUCCESS (Selenium retry)")
+                else:
+                    self._log(f"URL{index+1} ERROR: Selenium retry failed")
+            except Exception as selenium_error:
+                self._log(f"URL{index+1} ERROR: Selenium retry failed - {str(selenium_error)}")
+            return True
+
+        # 中断: 新規投入を止め、実行中のものは完了まで待つ
+        self._log("Download interrupted due to error")
+        return False
+
+    def _http_request(self, method, url, **kwargs):
+        """共有HttpClient（keep-alive・共有クッキー・リトライ設定）でリクエストを実行"""
+        limiter = self._rate_limiter
+        if limiter is not None and not limiter.acquire(url, self.stop_flag):
+            raise InterruptedError("中断されました")
+        client = get_shared_http_client()
+        if method == 'POST':
+            return client.post(url, **kwargs)
+        return client.get(url, **kwargs)
+
+    def _wait_page_interval(self):
+        """ページWait（並列モードではレートリミッターが間隔を管理するため待機しない）"""
+        if self._rate_limiter is None:
+            time.sleep(self.page_wait_time)
     
     def _download_single_torrent(self, data, index):
         """単一のTorrentファイルをダウンロード"""
@@ -812,7 +1010,7 @@ class TorrentDownloadManager:
             self._create_resume_point(data, index)
             
             # ギャラリーページにアクセス
-            response = requests.get(data['source_url'], timeout=30)
+            response = self._http_request('GET', data['source_url'], timeout=30)
             response.raise_for_status()
             
             # コンテンツ警告処理
@@ -820,7 +1018,7 @@ class TorrentDownloadManager:
                 self._log(f"URL{index+1}: コンテンツ警告検出")
                 # 警告承諾処理
                 post_data = {'apply_warning': 'Apply Warning'}
-                response = requests.post(data['source_url'], data=post_data, timeout=20)
+                response = self._http_request('POST', data['source_url'], data=post_data, timeout=20)
                 response.raise_for_status()
                 self._log(f"URL{index+1}: 警告を承諾しました")
                 
@@ -832,11 +1030,11 @@ class TorrentDownloadManager:
             self._update_resume_point(index, 'gallery_page_loaded')
             
             # 中断フラグチェック
-            if self.stop_flag.is_set() or self.pause_event.is_set():
+            if self._should_stop(index):
                 return False
             
             # 待機
-            time.sleep(self.page_wait_time)
+            self._wait_page_interval()
             
             # 共通のTorrent処理を実行
             return self._process_torrent_download(data, index, response)
@@ -845,6 +1043,23 @@ class TorrentDownloadManager:
             self._log(f"URL{index+1} Download error: {str(e)}")
             return False
     
+    def _is_skipped(self, index):
+        """手動でスキップされたURLか"""
+        with self._skip_lock:
+            return index in self._skipped_indices
+    
+    def _should_stop(self, index):
+        """中断・一時停止、またはこのURLのスキップが要求されているか"""
+        return self.stop_flag.is_set() or self.pause_event.is_set() or self._is_skipped(index)
+    
+    def _set_active(self, index, active):
+        """実行中のURLとして登録/解除"""
+        with self._skip_lock:
+            if active:
+                self._active_indices.add(index)
+            else:
+                self._active_indices.discard(index)
+    
     def _create_resume_point(self, data, index):
         """復帰ポイントを作成"""
         self.resume_points[index] = {
@@ -1054,7 +1269,7 @@ class TorrentDownloadManager:
         """安全なTorrentファイルダウンロード"""
         try:
             # リクエストサイズ制限
-            response = requests.get(torrent_url, timeout=timeout, stream=True)
+            response = self._http_request('GET', torrent_url, timeout=timeout, stream=True)
             response.raise_for_status()
             
             # ファイルサイズチェック（例：10MB制限）
@@ -1290,10 +1505,9 @@ class TorrentDownloadManager:
                 if success:
                     self._log("URLをスキップしました")
                     # ダウンロードマネージャー固有の処理
-                    if self.current_index < len(self.torrent_data):
-                        self._update_url_status(self.current_index, "skipped")
-                        self._update_progress()
-                        self.current_index += 1
+                    index = self._skip_target_index()
+                    if index is not None:
+                        self._mark_skipped(index)
                 else:
                     self._log("スキップ処理に失敗しました")
             else:
@@ -1301,37 +1515,18 @@ class TorrentDownloadManager:
                 self._log("手動スキップ専用メソッドが見つかりません。既存の処理を使用します。")
                 # スキップボタンが押されました
                 
-                if self.current_index < len(self.torrent_data):
-                    self._log(f"URL {self.current_index + 1} をスキップします")
-                    self._update_url_status(self.current_index, "skipped")
+                index = self._skip_target_index()
+                if index is not None:
+                    self._log(f"URL {index + 1} をスキップします")
                     # completed_countは増加させない（実際にダウンロードが完了した場合のみ増加）
-                    self._update_progress()
-                    self.current_index += 1
+                    self._mark_skipped(index)
                     
-                    # 中断状態の場合は新しいスレッドで再開
+                    # 中断状態の場合は旧ワーカーの終了を待ってから新しいスレッドで再開
                     if self.is_paused:
-                        self.is_paused = False
-                        self.stop_flag.clear()
-                        self.pause_event.clear()
-                        self._log("RESUMED")
-                        
-                        self.download_thread = threading.Thread(target=self._download_worker, daemon=True)
-                        self.download_thread.start()
-                        self._toggle_buttons_state(True)
+                        self._resume_after_worker_exit()
                     elif self.is_running:
-                        # 実行中の場合はスレッドを停止して新しいスレッドで再開
-                        self.stop_flag.set()
-                        self._log("現在のスレッドを停止して再開します")
-                        
-                        def restart_download():
-                            time.sleep(0.2)  # スレッド終了を待つ時間を延長
-                            if not self.stop_flag.is_set():  # 再度スキップされていないかチェック
-                                self.stop_flag.clear()
-                                self.download_thread = threading.Thread(target=self._download_worker, daemon=True)
-                                self.download_thread.start()
-                                self._toggle_buttons_state(True)
-                        
-                        threading.Thread(target=restart_download, daemon=True).start()
+                        # 実行中の場合はワーカーを止めない（対象URLだけが中断され、結果は破棄される）
+                        self._log("実行中のURLを中断して次のURLへ進みます")
                     else:
                         self._log("アイドル状態のため、スキップのみ実行")
                 else:
@@ -1343,6 +1538,48 @@ class TorrentDownloadManager:
                 self._skip_processing = False
             threading.Thread(target=clear_skip_flag, daemon=True).start()
     
+    def _skip_target_index(self):
+        """スキップ対象のURLインデックス（実行中で最も若いURL、無ければ再開位置）"""
+        with self._skip_lock:
+            active = sorted(i for i in self._active_indices if i not in self._skipped_indices)
+            skipped = set(self._skipped_indices)
+        if active:
+            return active[0]
+        index = self.current_index
+        while index < len(self.torrent_data) and index in skipped:
+            index += 1
+        return index if index < len(self.torrent_data) else None
+    
+    def _mark_skipped(self, index):
+        """URLをスキップ済みにする（以降、そのURLの結果で状態を上書きしない）"""
+        with self._skip_lock:
+            self._skipped_indices.add(index)
+        self._update_url_status(index, "skipped")
+        self._update_progress()
+        if index == self.current_index:
+            self.current_index = index + 1
+    
+    def _resume_after_worker_exit(self):
+        """旧ワーカーの終了を待ってから停止フラグをクリアし、ダウンロードを再開"""
+        old_thread = self.download_thread
+        self._log("RESUMED")
+        
+        def restart_download():
+            # 旧ワーカー（並列時は実行中の取得）が残っている間は停止フラグをクリアしない
+            if old_thread is not None and old_thread.is_alive():
+                old_thread.join()
+            if self.window is None:
+                return  # 待機中にウィンドウが閉じられた
+            self.is_running = True
+            self.is_paused = False
+            self.stop_flag.clear()
+            self.pause_event.clear()
+            self.download_thread = threading.Thread(target=self._download_worker, daemon=True)
+            self.download_thread.start()
+            self.window.after(0, lambda: self._toggle_buttons_state(True))
+        
+        threading.Thread(target=restart_download, daemon=True).start()
+    
     def _update_progress(self):
         """プログレス表示を更新"""
         def update_ui():
@@ -1357,6 +1594,10 @@ class TorrentDownloadManager:
     
     def _update_url_status(self, index, status):
         """URLの状態を更新"""
+        # スキップ済みのURLは、実行中だった取得の結果で上書きしない
+        if status != "skipped" and self._is_skipped(index):
+            return
+        
         # torrent_dataの状態も更新
         if 0 <= index < len(self.torrent_data):
             self.torrent_data[index]['status'] = status
@@ -1702,7 +1943,7 @@ class TorrentDownloadManager:
         """通常のDLメソッド（Content Warning承諾後用）"""
         try:
             # 待機
-            time.sleep(self.page_wait_time)
+            self._wait_page_interval()
             
             # 共通のTorrent処理を実行
             return self._process_torrent_download(data, index, response)
@@ -1738,19 +1979,19 @@ class TorrentDownloadManager:
                 return False
             
             # 中断フラグチェック
-            if self.stop_flag.is_set() or self.pause_event.is_set():
+            if self._should_stop(index):
                 return False
             
             # Torrentページにアクセス
             torrent_page_url = torrent_links[0].replace("&amp;", "&")
-            torrent_response = requests.get(torrent_page_url, timeout=30)
+            torrent_response = self._http_request('GET', torrent_page_url, timeout=30)
             torrent_response.raise_for_status()
             
             # 復帰ポイント更新（Torrentページ移動後）
             self._update_resume_point(index, 'torrent_page_loaded')
             
             # 中断フラグチェック
-            if self.stop_flag.is_set() or self.pause_event.is_set():
+            if self._should_stop(index):
                 return False
             
             # Torrent情報を抽出
@@ -1760,7 +2001,7 @@ class TorrentDownloadManager:
                 return False
             
             # 中断フラグチェック
-            if self.stop_flag.is_set() or self.pause_event.is_set():
+            if self._should_stop(index):
                 return False
             
             # 候補から選択
@@ -1818,7 +2059,7 @@ class TorrentDownloadManager:
             self._update_resume_point(index, 'torrent_selected')
             
             # 中断フラグチェック
-            if self.stop_flag.is_set() or self.pause_event.is_set():
+            if self._should_stop(index):
                 return False
             
             # Torrentファイルをダウンロード（安全な処理）
@@ -1831,7 +2072,7 @@ class TorrentDownloadManager:
             self._update_resume_point(index, 'download_ready')
             
             # 中断フラグチェック
-            if self.stop_flag.is_set() or self.pause_event.is_set():
+            if self._should_stop(index):
                 return False
             
             # ファイルを保存（安全な処理）
@@ -1946,6 +2187,7 @@ class TorrentDownloadManager:
             # デフォルト値を内部値に設定
             self.torrent_save_directory = self._default_torrent_save_directory
             self.page_wait_time = self._default_page_wait_time
+            self.concurrent_fetch = self._default_concurrent_fetch
             self.error_handling = self._default_error_handling
             self.torrent_selection = self._default_torrent_selection
             self.duplicate_file_mode = self._default_duplicate_file_mode
@@ -1972,6 +2214,7 @@ class TorrentDownloadManager:
                 # 設定を内部値に適用
                 self.torrent_save_directory = settings.get("save_directory", self._default_torrent_save_directory)
                 self.page_wait_time = settings.get("page_wait_time", self._default_page_wait_time)
+                self.concurrent_fetch = settings.get("concurrent_fetch", self._default_concurrent_fetch)
                 self.error_handling = settings.get("error_handling", self._default_error_handling)
                 self.torrent_selection = settings.get("torrent_selection", self._default_torrent_selection)
                 self.duplicate_file_mode = settings.get("duplicate_file_mode", self._default_duplicate_file_mode)
@@ -1996,6 +2239,7 @@ class TorrentDownloadManager:
             # エラー時はデフォルト値を使用
             self.torrent_save_directory = self._default_torrent_save_directory
             self.page_wait_time = self._default_page_wait_time
+            self.concurrent_fetch = self._default_concurrent_fetch
             self.error_handling = self._default_error_handling
             self.torrent_selection = self._default_torrent_selection
             self.duplicate_file_mode = self._default_duplicate_file_mode
@@ -17,6 +17,7 @@ from tkinter import Event
 
 from gui.components.url_panel import EHDownloaderUrlPanel
 from gui.components.progress_panel import EHDownloaderProgressPanel
+from gui.components.performance_panel import PerformancePanel
 from gui.components.options_panel import EHDownloaderOptionsPanel
 from gui.components.download_list_widget import DownloadListWidget
 from core.downloader import EHDownloaderCore
@@ -99,8 +100,14 @@ class EHDownloader:
         
         # === 圧縮設定 ===
         'compression_enabled': "off",        # 圧縮機能（off/on）
-        'compression_format': "ZIP",         # 圧縮形式（ZIP/7Z/TAR）
+        'compression_format': "ZIP",         # 圧縮形式（ZIP/7Z/TAR/TAR.XZ/TAR.ZST）
         'compression_delete_original': False,  # 圧縮後オリジナル削除
+        'compression_stream_direct': False,  # ダウンロード中に直接ZIPへ書き込む
+        'compression_profile': "自動（画像は無圧縮）",  # ZIPエントリの圧縮方式
+        'compression_sample_unknown': True,  # 不明な形式は試し圧縮で判定
+        'compression_max_workers': "1",      # 同時に実行する圧縮数
+        'compression_level': "自動",         # TAR・7Zの圧縮レベル
+        'library_skip_existing': True,       # ダウンロード済みのギャラリーをスキップ
         
         # === エラー処理・再開設定 ===
         'error_handling_enabled': True,           # エラー処理のON/OFF
@@ -172,6 +179,8 @@ class EHDownloader:
         'duplicate_folder_mode', 'initial_error_mode', 'error_handling_mode',
         'rename_incomplete_folder', 'incomplete_folder_prefix',
         'compression_enabled', 'compression_format', 'compression_delete_original', 'compression_delete_folder',
+        'compression_stream_direct', 'compression_profile', 'compression_sample_unknown',
+        'compression_max_workers', 'compression_level', 'library_skip_existing',
         'auto_resume_enabled', 'auto_resume_delay', 'retry_delay_increment',
         'max_retry_delay', 'max_retry_mode', 'max_retry_count', 'retry_limit_action',
         'selenium_scope', 'selenium_failure_action',
@@ -538,6 +547,12 @@ class EHDownloader:
         # ⭐起動時にGUIとオプション値を強制同期⭐
         self.root.after(200, self._sync_gui_with_internal_state)
         
+        # ⭐追加: 前回終了時に残っていた圧縮ジョブを再開（設定反映後）⭐
+        self.root.after(1000, self._restore_compression_queue)
+        
+        # ⭐追加: 保存先のライブラリ索引をバックグラウンドで差分スキャン⭐
+        self.root.after(1500, self._scan_library_index)
+        
         # 起動時の設定自動読み込みは不要（load_settings_and_stateで完了済み）
     
     def _initialize_tkinter_variables(self) -> None:
@@ -586,6 +601,12 @@ class EHDownloader:
         self.compression_enabled = tk.StringVar(value="off")
         self.compression_format = tk.StringVar(value="ZIP")
         self.compression_delete_original = tk.BooleanVar(value=False)
+        self.compression_stream_direct = tk.BooleanVar(value=False)
+        self.compression_profile = tk.StringVar(value="自動（画像は無圧縮）")
+        self.compression_sample_unknown = tk.BooleanVar(value=True)
+        self.compression_max_workers = tk.StringVar(value="1")
+        self.compression_level = tk.StringVar(value="自動")
+        self.library_skip_existing = tk.BooleanVar(value=True)
         self.auto_resume_delay = tk.StringVar(value="5")
         self.retry_delay_increment = tk.StringVar(value="10")
         self.max_retry_delay = tk.StringVar(value="60")
@@ -775,6 +796,15 @@ class EHDownloader:
         )
         self.footer_elapsed_label.pack(side=tk.RIGHT)
         
+        # 右側: 圧縮キュー（待機中・実行中のジョブがある場合のみ表示内容あり）
+        self.footer_compression_label = tk.Label(
+            self.footer_frame, 
+            text="", 
+            anchor=tk.E,
+            padx=10
+        )
+        self.footer_compression_label.pack(side=tk.RIGHT)
+        
         # 上部水平パネル
         self.top_h_pane = tk.PanedWindow(self.main_v_pane, orient="horizontal", sashwidth=3, sashrelief="raised")
         self.main_v_pane.add(self.top_h_pane, height=800)  # DLリストとオプションパネルの表示エリアを300px増加
@@ -858,6 +888,10 @@ class EHDownloader:
         self.progress_panel.create_log_panel(self.bottom_pane)
         self.log_text = self.progress_panel.log_text
         
+        # ⭐追加: パフォーマンスパネル（工程別の所要時間、ログの上に配置）⭐
+        self.performance_panel = PerformancePanel(self)
+        self.performance_panel.create_panel(self.bottom_pane, before=self.progress_panel.log_frame)
+        
         # オプションパネル
         self.options_panel = EHDownloaderOptionsPanel(self)
         
@@ -871,6 +905,9 @@ class EHDownloader:
         self.downloader_core = EHDownloaderCore(self, self.state_manager)
         print("[MAIN_WINDOW] EHDownloaderCore生成完了")
         
+        # ⭐追加: DLリスト追加時にライブラリ索引を照会⭐
+        self.download_list_widget.library_lookup = self._lookup_library
+        
         # ⭐追加: StateManagerの状態変更リスナーを設定（downloader_core初期化後）⭐
         if hasattr(self.progress_panel, '_setup_state_listeners'):
             self.progress_panel._setup_state_listeners()
@@ -955,6 +992,41 @@ class EHDownloader:
         except Exception as e:
             pass  # エラーは無視
     
+    def _restore_compression_queue(self) -> None:
+        """前回終了時に残っていた圧縮ジョブを復元"""
+        try:
+            if hasattr(self, 'downloader_core') and hasattr(self.downloader_core, 'compression_manager'):
+                self.downloader_core.compression_manager.restore_pending_jobs()
+        except Exception as e:
+            self.log(f"圧縮キュー復元エラー: {e}", "error")
+    
+    def _lookup_library(self, url: str):
+        """ライブラリ索引で完了済みのギャラリーを照会（スキップ無効時はNone）"""
+        if not self.library_skip_existing.get() or not hasattr(self, 'downloader_core'):
+            return None
+        return self.downloader_core.library_index.find_completed(url)
+    
+    def _scan_library_index(self) -> None:
+        """保存先フォルダのライブラリ索引を更新（別スレッド）"""
+        try:
+            if not self.library_skip_existing.get() or not hasattr(self, 'downloader_core'):
+                return
+            root_folder = self.folder_var.get()
+            self.async_executor.execute_in_thread(
+                lambda: self.downloader_core.library_index.scan(root_folder)
+            )
+        except Exception as e:
+            self.log(f"ライブラリ索引スキャンエラー: {e}", "error")
+    
+    def update_footer_compression_queue(self, queued: int, running: int) -> None:
+        """フッターの圧縮キューの深さを更新"""
+        try:
+            if hasattr(self, 'footer_compression_label'):
+                text = f"圧縮: 実行中 {running} / 待機 {queued}" if queued or running else ""
+                self.footer_compression_label.config(text=text)
+        except Exception as e:
+            pass  # エラーは無視
+    
     def update_footer_elapsed_time(self, elapsed_seconds: float) -> None:
         """フッターの経過時間を更新"""
         try:
@@ -1586,6 +1658,7 @@ class EHDownloader:
                     'window_geometry': getattr(self.torrent_manager, 'window_geometry', '670x1100+100+100'),
                     'save_directory': getattr(self.torrent_manager, 'torrent_save_directory', ''),
                     'page_wait_time': getattr(self.torrent_manager, 'page_wait_time', 1.0),
+                    'concurrent_fetch': getattr(self.torrent_manager, 'concurrent_fetch', 1),
                     'error_handling': getattr(self.torrent_manager, 'error_handling', '中断'),
                     'torrent_selection': getattr(self.torrent_manager, 'torrent_selection', '並び順で最下部'),
                     'duplicate_file_mode': getattr(self.torrent_manager, 'duplicate_file_mode', 'rename'),
@@ -1871,6 +1944,8 @@ class EHDownloader:
                     self.torrent_manager.torrent_save_directory = tm_settings['save_directory']
                 if 'page_wait_time' in tm_settings:
                     self.torrent_manager.page_wait_time = tm_settings['page_wait_time']
+                if 'concurrent_fetch' in tm_settings:
+                    self.torrent_manager.concurrent_fetch = tm_settings['concurrent_fetch']
                 if 'error_handling' in tm_settings:
                     self.torrent_manager.error_handling = tm_settings['error_handling']
                 if 'torrent_selection' in tm_settings:
@@ -2139,6 +2214,14 @@ class EHDownloader:
                     if hasattr(self.parser, '_save_parser_settings'):
                         self.parser._save_parser_settings()
                 
+                # ⭐追加: パーサーのクロールDBを閉じる⭐
+                parser_instance = getattr(self, '_parser_instance', None)
+                if parser_instance is not None and hasattr(parser_instance, 'close_crawl_db'):
+                    try:
+                        parser_instance.close_crawl_db()
+                    except Exception as e:
+                        self.log(f"クロールDBクローズエラー: {e}", "error")
+                
                 # ⭐ウィンドウ終了時の一括保存処理⭐
                 self._save_batch_on_exit()
                 
@@ -2163,6 +2246,45 @@ class EHDownloader:
                             except Exception as e:
                                 self.log(f"HttpClientクローズエラー: {e}", "error")
                     
+                    # ⭐追加: Seleniumドライバープールの終了⭐
+                    if hasattr(self, 'enhanced_error_handler') and hasattr(self.enhanced_error_handler, 'selenium_handler'):
+                        try:
+                            self.enhanced_error_handler.selenium_handler.shutdown()
+                        except Exception as e:
+                            self.log(f"Seleniumドライバー終了エラー: {e}", "error")
+                    
+                    # ⭐追加: 直接書き込み中のZIPを閉じる（.partは次回の再開用に残す）⭐
+                    if hasattr(self.downloader_core, 'compression_manager'):
+                        try:
+                            self.downloader_core.compression_manager.close_streams()
+                        except Exception as e:
+                            self.log(f"ZIPクローズエラー: {e}", "error")
+                    
+                    # ⭐追加: パフォーマンスパネルの定期更新を停止⭐
+                    if hasattr(self, 'performance_panel'):
+                        self.performance_panel.stop()
+                    
+                    # ⭐追加: 実行中の修復を中断⭐
+                    if hasattr(self.downloader_core, 'repair_manager'):
+                        try:
+                            self.downloader_core.repair_manager.stop()
+                        except Exception as e:
+                            self.log(f"修復中断エラー: {e}", "error")
+                    
+                    # ⭐追加: 圧縮ワーカーの終了（未完了の圧縮ジョブは次回起動時に再開）⭐
+                    if hasattr(self.downloader_core, 'compression_manager'):
+                        try:
+                            self.downloader_core.compression_manager.shutdown()
+                        except Exception as e:
+                            self.log(f"圧縮ワーカー終了エラー: {e}", "error")
+                    
+                    # ⭐追加: 画像後処理ステージの終了⭐
+                    if hasattr(self.downloader_core, 'post_processor'):
+                        try:
+                            self.downloader_core.post_processor.shutdown()
+                        except Exception as e:
+                            self.log(f"画像後処理ステージ終了エラー: {e}", "error")
+                    
                     # ⭐追加: EventBusの停止⭐
                     if hasattr(self.downloader_core, 'event_bus'):
                         try:
@@ -3016,6 +3138,12 @@ class EHDownloader:
             self.compression_enabled.set(self.DEFAULT_VALUES['compression_enabled'])
             self.compression_format.set(self.DEFAULT_VALUES['compression_format'])
             self.compression_delete_original.set(self.DEFAULT_VALUES['compression_delete_original'])
+            self.compression_stream_direct.set(self.DEFAULT_VALUES['compression_stream_direct'])
+            self.compression_profile.set(self.DEFAULT_VALUES['compression_profile'])
+            self.compression_sample_unknown.set(self.DEFAULT_VALUES['compression_sample_unknown'])
+            self.compression_max_workers.set(self.DEFAULT_VALUES['compression_max_workers'])
+            self.compression_level.set(self.DEFAULT_VALUES['compression_level'])
+            self.library_skip_existing.set(self.DEFAULT_VALUES['library_skip_existing'])
             self.error_handling_mode.set(self.DEFAULT_VALUES['error_handling_mode'])
             self.auto_resume_delay.set(self.DEFAULT_VALUES['auto_resume_delay'])
             self.retry_delay_increment.set(self.DEFAULT_VALUES['retry_delay_increment'])
@@ -4130,6 +4258,7 @@ class EHDownloader:
             file_menu.add_command(label="設定プリセット読み込み", command=self._load_saved_options)
             file_menu.add_separator()
             file_menu.add_command(label="未完了URLのみバックアップ", command=self._backup_incomplete_urls)
+            file_menu.add_command(label="未完了ギャラリーを修復", command=self._repair_incomplete_galleries)
             file_menu.add_separator()
             file_menu.add_command(label="終了", command=self.on_closing)
             
@@ -4704,6 +4833,42 @@ class EHDownloader:
             self.log(f"未完了URLバックアップエラー: {e}", "error")
             messagebox.showerror("エラー", f"バックアップの作成に失敗しました:\n{e}")
     
+    def _repair_incomplete_galleries(self):
+        """保存先フォルダのプレースホルダー・未完了フォルダの不足ページのみ再取得（別スレッド）"""
+        try:
+            from tkinter import messagebox
+            
+            if not hasattr(self, 'downloader_core'):
+                return
+            if self.downloader_core.state_manager.is_download_running():
+                messagebox.showwarning("警告", "ダウンロード中は修復できません。")
+                return
+            repair_manager = self.downloader_core.repair_manager
+            if repair_manager.is_running():
+                messagebox.showinfo("情報", "修復は既に実行中です。")
+                return
+            
+            root_folder = self.folder_var.get()
+            if not root_folder or not os.path.isdir(root_folder):
+                messagebox.showwarning("警告", "保存先フォルダが見つかりません。")
+                return
+            if not messagebox.askyesno(
+                    "未完了ギャラリーを修復",
+                    f"保存先フォルダ内のプレースホルダー・未完了フォルダを検索し、\n"
+                    f"不足しているページのみ再取得します。\n\n{root_folder}\n\n実行しますか？"):
+                return
+            
+            try:
+                wait_time = float(self.wait_time.get() or 0.5)
+            except ValueError:
+                wait_time = 0.5
+            max_workers = max(1, int(self.multithread_count.get() or 1))
+            self.async_executor.execute_in_thread(
+                lambda: repair_manager.repair(root_folder, max_workers, wait_time)
+            )
+        except Exception as e:
+            self.log(f"修復開始エラー: {e}", "error")
+    
     def _get_system_info(self):
         """システム情報を取得"""
         try:
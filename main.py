@@ -24,6 +24,9 @@ from config.constants import *
 from gui.main_window import EHDownloader
 
 if __name__ == "__main__":
+    # 画像後処理のプロセスプール用（exe化した場合に子プロセスがGUIを起動しないように）
+    import multiprocessing
+    multiprocessing.freeze_support()
     try:
         # Attempt to set DPI awareness for sharper UI on Windows
         from ctypes import windll
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+パーサー用クロールデータベース（SQLite）
+
+解析済みギャラリーを gid/token をキーとして永続化し、
+検索URLごとのクロールカーソル（最後の探索URL）を保持する。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+DEFAULT_CRAWL_DB_PATH = "parser_crawl.db"
+
+# galleries テーブルに専用カラムを持つフィールド（それ以外は extra に JSON で保存）
+_GALLERY_COLUMNS = (
+    'url', 'title', 'genre', 'date', 'pages', 'uploader',
+    'favorite_score', 'torrent', 'thumbnail',
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS galleries (
+    gid INTEGER NOT NULL,
+    token TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    url TEXT,
+    title TEXT,
+    genre TEXT,
+    date TEXT,
+    pages INTEGER,
+    uploader TEXT,
+    favorite_score,
+    torrent TEXT,
+    thumbnail TEXT,
+    extra TEXT,
+    added_at TEXT,
+    PRIMARY KEY (gid, token)
+);
+CREATE INDEX IF NOT EXISTS idx_galleries_seq ON galleries(seq);
+CREATE INDEX IF NOT EXISTS idx_galleries_genre ON galleries(genre);
+CREATE INDEX IF NOT EXISTS idx_galleries_date ON galleries(date);
+CREATE INDEX IF NOT EXISTS idx_galleries_uploader ON galleries(uploader);
+CREATE INDEX IF NOT EXISTS idx_galleries_pages ON galleries(pages);
+
+CREATE TABLE IF NOT EXISTS gallery_tags (
+    gid INTEGER NOT NULL,
+    token TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (gid, token, position)
+);
+CREATE INDEX IF NOT EXISTS idx_gallery_tags_tag ON gallery_tags(tag);
+
+CREATE TABLE IF NOT EXISTS crawl_cursors (
+    search_url TEXT PRIMARY KEY,
+    last_url TEXT NOT NULL,
+    last_gallery_id TEXT,
+    last_gallery_token TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_crawl_cursors_updated ON crawl_cursors(updated_at);
+"""
+
+
+class CrawlDatabase:
+    """
+    解析結果の永続化ストア
+
+    接続は1本をロックで保護して共有する（解析スレッドとGUIスレッドの双方から利用）。
+    """
+
+    def __init__(self, db_path: str = DEFAULT_CRAWL_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        """接続を閉じる"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # ギャラリー
+    # ------------------------------------------------------------------
+
+    def add_galleries(self, galleries: Iterable[Dict[str, Any]]) -> int:
+        """ギャラリーを追加（既存の gid/token は内容のみ更新し、並び順は維持）"""
+        rows, keys, tag_rows = self._build_rows(galleries)
+        if not rows:
+            return 0
+        with self._lock:
+            with self._conn:
+                self._insert_rows(rows, keys, tag_rows)
+        return len(rows)
+
+    def replace_galleries(self, galleries: Iterable[Dict[str, Any]]) -> int:
+        """全ギャラリーを置き換える（バックアップ読み込み時など）
+
+        削除と追加を1つのトランザクションで行うため、途中で例外が発生した場合は既存のデータが残る。
+        """
+        rows, keys, tag_rows = self._build_rows(galleries)
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM gallery_tags")
+                self._conn.execute("DELETE FROM galleries")
+                if rows:
+                    self._insert_rows(rows, keys, tag_rows)
+        return len(rows)
+
+    def clear_galleries(self):
+        """ギャラリーとタグを全削除（カーソルは保持）"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM gallery_tags")
+                self._conn.execute("DELETE FROM galleries")
+
+    def _build_rows(self, galleries: Iterable[Dict[str, Any]]):
+        """galleries / gallery_tags テーブルの行を作成"""
+        rows = []
+        tag_rows = []
+        keys = []
+        now = datetime.now().isoformat(timespec='seconds')
+        for gallery in galleries:
+            key = self._gallery_key(gallery)
+            if key is None:
+                continue
+            gid, token = key
+            extra = {k: v for k, v in gallery.items()
+                     if k not in _GALLERY_COLUMNS and k not in ('id', 'token', 'tags')}
+            rows.append((
+                gid, token,
+                *(gallery.get(column) for column in _GALLERY_COLUMNS),
+                json.dumps(extra, ensure_ascii=False) if extra else None,
+                now,
+            ))
+            keys.append((gid, token))
+            tag_rows.extend((gid, token, position, tag)
+                            for position, tag in enumerate(gallery.get('tags') or []))
+        return rows, keys, tag_rows
+
+    def _insert_rows(self, rows, keys, tag_rows):
+        """行を追加（ロック保持・トランザクション内で呼ぶ）"""
+        columns = ', '.join(_GALLERY_COLUMNS)
+        updates = ', '.join(f"{column}=excluded.{column}" for column in _GALLERY_COLUMNS)
+        placeholders = ', '.join('?' * (len(_GALLERY_COLUMNS) + 5))
+        next_seq = self._conn.execute(
+            "SELECT COALESCE(MAX(seq), -1) + 1 FROM galleries").fetchone()[0]
+        self._conn.executemany(
+            f"INSERT INTO galleries (gid, token, seq, {columns}, extra, added_at) "
+            f"VALUES ({placeholders}) "
+            f"ON CONFLICT(gid, token) DO UPDATE SET {updates}, extra=excluded.extra",
+            ((row[0], row[1], next_seq + i) + row[2:] for i, row in enumerate(rows)))
+        self._conn.executemany(
+            "DELETE FROM gallery_tags WHERE gid=? AND token=?", keys)
+        self._conn.executemany(
+            "INSERT INTO gallery_tags (gid, token, position, tag) VALUES (?, ?, ?, ?)",
+            tag_rows)
+
+    def count_galleries(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM galleries").fetchone()[0]
+
+    def load_galleries(self) -> List[Dict[str, Any]]:
+        """追加順にギャラリーを読み込み、パーサーの gallery_data 形式で返す"""
+        with self._lock:
+            tag_rows = self._conn.execute(
+                "SELECT gid, token, tag FROM gallery_tags ORDER BY gid, token, position").fetchall()
+            gallery_rows = self._conn.execute(
+                f"SELECT gid, token, {', '.join(_GALLERY_COLUMNS)}, extra "
+                f"FROM galleries ORDER BY seq").fetchall()
+
+        tags_by_key: Dict[tuple, List[str]] = {}
+        for gid, token, tag in tag_rows:
+            tags_by_key.setdefault((gid, token), []).append(tag)
+
+        galleries = []
+        for row in gallery_rows:
+            gid, token = row[0], row[1]
+            gallery = {'id': str(gid), 'token': token}
+            gallery.update(zip(_GALLERY_COLUMNS, row[2:-1]))
+            gallery['tags'] = tags_by_key.get((gid, token), [])
+            if row[-1]:
+                gallery.update(json.loads(row[-1]))
+            galleries.append(gallery)
+        return galleries
+
+    def gallery_keys(self) -> Set[str]:
+        """重複チェック用キー集合（"{gid}_{token}" 形式）"""
+        with self._lock:
+            rows = self._conn.execute("SELECT gid, token FROM galleries").fetchall()
+        return {f"{gid}_{token}" for gid, token in rows}
+
+    # ------------------------------------------------------------------
+    # クロールカーソル
+    # ------------------------------------------------------------------
+
+    def save_cursor(self, search_url: str, last_url: str,
+                    last_gallery_id: Optional[str] = None,
+                    last_gallery_token: Optional[str] = None):
+        """検索URLごとの最後の探索URLを保存"""
+        if not search_url or not last_url:
+            return
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO crawl_cursors "
+                    "(search_url, last_url, last_gallery_id, last_gallery_token, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(search_url) DO UPDATE SET last_url=excluded.last_url, "
+                    "last_gallery_id=excluded.last_gallery_id, "
+                    "last_gallery_token=excluded.last_gallery_token, "
+                    "updated_at=excluded.updated_at",
+                    (search_url, last_url, last_gallery_id, last_gallery_token, now))
+
+    def get_cursor(self, search_url: str) -> Optional[Dict[str, Any]]:
+        """検索URLに対応するカーソルを取得"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT search_url, last_url, last_gallery_id, last_gallery_token, updated_at "
+                "FROM crawl_cursors WHERE search_url=?", (search_url,)).fetchone()
+        return self._cursor_to_dict(row)
+
+    def get_latest_cursor(self) -> Optional[Dict[str, Any]]:
+        """最後に更新されたカーソルを取得"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT search_url, last_url, last_gallery_id, last_gallery_token, updated_at "
+                "FROM crawl_cursors ORDER BY updated_at DESC LIMIT 1").fetchone()
+        return self._cursor_to_dict(row)
+
+    # ------------------------------------------------------------------
+    # 内部ヘルパー
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _gallery_key(gallery: Dict[str, Any]):
+        token = gallery.get('token')
+        if not token:
+            return None
+        try:
+            return int(gallery.get('id')), str(token)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _cursor_to_dict(row) -> Optional[Dict[str, Any]]:
+        if not row:
+            return None
+        return {
+            'search_url': row[0],
+            'last_url': row[1],
+            'last_gallery_id': row[2],
+            'last_gallery_token': row[3],
+            'updated_at': row[4],
+        }
@@ -11,15 +11,21 @@ import traceback
 import webbrowser
 import io
 from PIL import Image, ImageTk
-from queue import Queue, Empty
+from queue import Queue, Empty, Full
 from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
 import os
 from datetime import datetime
 import ssl
 from config.settings import ToolTip
+from parser.crawl_database import CrawlDatabase
 
 class SearchResultParser:
 
+    # NDJSONバックアップ: 1行目がヘッダー（状態・設定）、2行目以降が1行1ギャラリー
+    BACKUP_NDJSON_FORMAT = "ehd-parser-backup"
+    BACKUP_NDJSON_VERSION = 2
+    BACKUP_CHUNK_SIZE = 500  # 読み込み時にTreeviewへ反映する件数単位
+
     def __init__(self, root, parent=None):
         self.root = root
         self.parent = parent  # 親ウィンドウへの参照（オプション）
@@ -118,6 +124,15 @@ class SearchResultParser:
         self.last_gallery_id = None  # 最後に処理したギャラリーのID
         self.last_gallery_token = None  # 最後に処理したギャラリーのトークン
 
+        # --- Persistent Crawl Database ---
+        self.crawl_db = None
+        self.current_search_url = None  # クロールカーソルのキー（解析開始時の検索URL）
+        self._restore_rows_job = None  # 復元結果をTreeviewへ追加する after() ジョブ
+        try:
+            self.crawl_db = CrawlDatabase()
+        except Exception as e:
+            self.log(f"クロールDB初期化エラー: {e}")
+
         # フィルタリング状態の管理を改善
         self.filter_states = {}  # 各行のフィルタリング状態を管理
         self.filter_history = []  # フィルター適用履歴
@@ -135,6 +150,9 @@ class SearchResultParser:
         # 設定読み込み
         self._load_parser_settings()
 
+        # 前回までの解析結果とクロールカーソルを復元
+        self._restore_from_crawl_db()
+
     def create_tooltip(self, widget, text):
         """ツールチップを作成"""
         tooltip = ToolTip(widget, text)
@@ -160,8 +178,21 @@ class SearchResultParser:
         if self.thumbnail_download_thread and self.thumbnail_download_thread.is_alive():
             self.thumbnail_download_thread.join(timeout=0.5)
 
+        self._cancel_restore_rows()
+        self.close_crawl_db()
+
         self.root.destroy()
 
+    def close_crawl_db(self):
+        """クロールDBを閉じる（パーサー・アプリ終了時）"""
+        crawl_db, self.crawl_db = self.crawl_db, None
+        if crawl_db is None:
+            return
+        try:
+            crawl_db.close()
+        except Exception as e:
+            print(f"クロールDBクローズエラー: {e}")
+
     def _save_parser_settings(self):
         """パーサー設定を保存（無効化）"""
         # メインウィンドウ経由で保存されるため、ここでは何もしない
@@ -984,6 +1015,7 @@ class SearchResultParser:
 
     def clear_database_internal(self):
         """データベースの内部クリア処理"""
+        self._cancel_restore_rows()
         self.gallery_data.clear()
         self.processed_urls.clear()
         self.processed_galleries.clear()
@@ -994,6 +1026,12 @@ class SearchResultParser:
         self.filter_history.clear()
         self.filter_states.clear()
         self._has_output_urls = False
+
+        if self.crawl_db:
+            try:
+                self.crawl_db.clear_galleries()
+            except Exception as e:
+                self.log(f"クロールDBクリアエラー: {e}")
         
         # Treeview をクリア
         self.tree.delete(*self.tree.get_children())
@@ -1006,8 +1044,8 @@ class SearchResultParser:
         self.output_button.configure(state=tk.DISABLED)
         self.continue_button.configure(state=tk.DISABLED)
 
-    def start_parsing_internal(self, url):
-        """内部解析処理"""
+    def start_parsing_internal(self, url, search_url=None):
+        """内部解析処理（search_url はクロールカーソルのキー。省略時は url）"""
         # ボタン状態変更
         self.parse_button.configure(text="解析中……", state=tk.DISABLED)
         self.output_button.configure(text="解析中……", state=tk.DISABLED)
@@ -1034,6 +1072,7 @@ class SearchResultParser:
                 return
             self._large_data_warning_shown = True
         
+        self.current_search_url = self.enforce_inline_dm_l(search_url or url)
         self.log(f"解析開始: {url} (目標: {self.current_thread_target}, ページWait: {page_wait_time}s)")
         
         # ⭐追加: 解析開始時に選択状態をクリア⭐
@@ -1088,7 +1127,7 @@ class SearchResultParser:
         self.last_gallery_token = None
         
         # 直接内部解析処理を呼び出し
-        self.start_parsing_internal(self.last_url_var.get())
+        self.start_parsing_internal(self.last_url_var.get(), search_url=self.current_search_url)
 
     def stop_parsing(self):
         """解析を中断"""
@@ -1310,46 +1349,47 @@ class SearchResultParser:
         """
         新しい解析ロジック: 必ず ?inline_set=dm_l を付与し、
         gl2c および gl1e に対応したギャラリーブロック抽出。
+
+        ページ取得は別スレッド（_crawl_page_fetcher）で先行して行い、
+        このスレッドは取得済みページの解析とモデルへの反映に専念する。
+        ページWaitは「取得開始間隔」として扱うため、解析時間と待機時間が重なる。
         """
         current_url = self.enforce_inline_dm_l(base_url)
-        total_parsed_count = 0
         current_thread_count = 0
-        page_number = 1
-        
+
+        # 取得済みページの受け渡しキュー（先読みは1ページまで）
+        page_queue = Queue(maxsize=1)
+        crawl_done = threading.Event()
+        fetcher_thread = threading.Thread(target=self._crawl_page_fetcher,
+                                          args=(current_url, page_wait_time, page_queue, crawl_done),
+                                          daemon=True)
+        fetcher_thread.start()
+
         try:
             while not self.stop_event.is_set():
                 if current_thread_count >= self.current_thread_target:
                     self.log(f"目標数 ({self.current_thread_target}) に到達しました。解析終了。")
                     break
 
-                self.last_url_var.set(current_url)
-
-                if page_number > 1:
-                    self.set_status(f"次のページ ({page_number}) へ待機中 ({page_wait_time}s)...")
-                    time.sleep(page_wait_time)
-
-                if self.stop_event.is_set():
-                    break
-
-                self.set_status(f"ページ {page_number} 取得中...")
-                self.log(f"ページ {page_number}: {current_url}")
+                try:
+                    kind, page_number, page_url, payload = page_queue.get(timeout=0.2)
+                except Empty:
+                    if not fetcher_thread.is_alive() and page_queue.empty():
+                        break
+                    continue
 
-                # 自動再開オプション適用のページ取得
-                response = self._fetch_page_with_auto_resume(current_url, page_number)
-                if not response:
-                    self.log(f"ページ取得に失敗しました: {current_url}")
-                    self.set_status(f"ページ取得失敗 (ページ {page_number})")
-                    self.root.after(0, self._handle_parsing_error, "ページ取得に失敗しました。")
+                if kind == 'end':
                     break
 
-                html_content = response.text
-                self.log(f"HTML取得成功 (サイズ: {len(html_content)} bytes)")
+                # 再開時はこのページから解析し直す
+                self.last_url_var.set(page_url)
+                self._save_crawl_cursor(page_url)
 
-                if "<title>Content Warning</title>" in html_content:
-                    self.log("コンテンツ警告ページ検出。処理中断。")
-                    self.root.after(0, self._handle_parsing_error, "コンテンツ警告ページが検出されました。")
+                if kind == 'error':
+                    self.root.after(0, self._handle_parsing_error, payload)
                     break
 
+                html_content = payload
                 self.set_status(f"ページ {page_number} 解析中...")
 
                 # ギャラリーブロック抽出（<tr> 単位）
@@ -1362,14 +1402,11 @@ class SearchResultParser:
                         gallery_blocks.append(tr_block)
 
                 self.log(f"ページ {page_number}: ギャラリーブロック数: {len(gallery_blocks)}")
-                #if gallery_blocks:
-                #    self.log(f"最初のギャラリーブロック: {gallery_blocks[0][:300]}...")
-                #else:
-                #    self.log("ギャラリーブロックが見つかりませんでした。")
 
                 # ギャラリーブロックの解析
                 newly_added_this_page = 0
                 valid_blocks = 0
+                new_galleries = []
 
                 for i, block_html in enumerate(gallery_blocks):
                     if self.stop_event.is_set() or current_thread_count >= self.current_thread_target:
@@ -1390,6 +1427,7 @@ class SearchResultParser:
                         gallery_key = f"{gallery_id}_{gallery_token}"
                         if gallery_key not in self.processed_galleries:
                             self.gallery_data.append(parsed_info)
+                            new_galleries.append(parsed_info)
                             self.processed_galleries.add(gallery_key)
                             self.processed_urls.add(gallery_url)  # 後方互換性のため
                             newly_added_this_page += 1
@@ -1411,48 +1449,199 @@ class SearchResultParser:
                         self.log(f"ブロック {i} は解析結果なしでスキップ。")
 
                 self.log(f"ページ {page_number}: {newly_added_this_page} 件の新規ギャラリーを追加（有効ブロック: {valid_blocks}/{len(gallery_blocks)}）")
+                self._persist_crawled_galleries(new_galleries)
                 
                 if valid_blocks == 0:
                     self.log(f"ページ {page_number}: 有効なギャラリーブロックが見つかりません。次のページへ。")
-                    next_match = re.search(r'<a id="unext" href="(.*?)">Next &gt;</a>', html_content)
-                    if next_match:
-                        next_url = next_match.group(1).replace('&amp;', '&')
-                        if next_url.startswith('/'):
-                            parsed_current = urlparse(current_url)
-                            next_url = f"{parsed_current.scheme}://{parsed_current.netloc}{next_url}"
-                        current_url = self.enforce_inline_dm_l(next_url)
-                        page_number += 1
-                        self.log(f"次のページURL: {next_url}")
-                        continue
-                    else:
-                        self.log("Nextボタンが見つかりませんでした。最終ページです。")
-                        break
+                    continue
 
                 self.root.after(0, self._update_result_list)
 
-                if self.stop_event.is_set() or current_thread_count >= self.current_thread_target:
+        except Exception as e:
+            self.log(f"予期せぬ解析エラー: {e}\n{traceback.format_exc()}")
+            self.root.after(0, self._handle_parsing_error, f"解析エラー: {e}")
+        finally:
+            # 取得スレッドに終了を通知（目標数到達・中断・エラー時）
+            crawl_done.set()
+            final_count = len(self.gallery_data)
+            self.root.after(0, self._finalize_parsing, final_count, current_thread_count)
+
+    def _crawl_page_fetcher(self, start_url, page_wait_time, page_queue, crawl_done):
+        """
+        検索結果ページの取得スレッド。
+
+        `unext` を辿りながらページを取得して page_queue に渡す。
+        page_wait_time は前回の取得開始からの最小間隔として適用する。
+        キューへは (種別, ページ番号, URL, HTML/エラーメッセージ) を投入し、
+        最後に必ず 'end' を投入する。
+        """
+        current_url = start_url
+        page_number = 1
+        last_fetch_started = None
+
+        try:
+            while not (self.stop_event.is_set() or crawl_done.is_set()):
+                if last_fetch_started is not None:
+                    remaining = page_wait_time - (time.monotonic() - last_fetch_started)
+                    if remaining > 0:
+                        self.set_status(f"次のページ ({page_number}) へ待機中 ({page_wait_time}s)...")
+                        if not self._wait_crawl_interval(remaining, crawl_done):
+                            break
+
+                last_fetch_started = time.monotonic()
+                self.set_status(f"ページ {page_number} 取得中...")
+                self.log(f"ページ {page_number}: {current_url}")
+
+                # 自動再開オプション適用のページ取得
+                response = self._fetch_page_with_auto_resume(current_url, page_number)
+                if not response:
+                    self.log(f"ページ取得に失敗しました: {current_url}")
+                    self.set_status(f"ページ取得失敗 (ページ {page_number})")
+                    self._put_crawl_item(page_queue, crawl_done,
+                                         ('error', page_number, current_url, "ページ取得に失敗しました。"))
+                    break
+
+                html_content = response.text
+                self.log(f"HTML取得成功 (サイズ: {len(html_content)} bytes)")
+
+                if "<title>Content Warning</title>" in html_content:
+                    self.log("コンテンツ警告ページ検出。処理中断。")
+                    self._put_crawl_item(page_queue, crawl_done,
+                                         ('error', page_number, current_url, "コンテンツ警告ページが検出されました。"))
+                    break
+
+                if not self._put_crawl_item(page_queue, crawl_done,
+                                            ('page', page_number, current_url, html_content)):
                     break
 
                 # 次のページを検索
-                next_match = re.search(r'<a id="unext" href="(.*?)">Next &gt;</a>', html_content)
-                if next_match:
-                    next_url = next_match.group(1).replace('&amp;', '&')
-                    if next_url.startswith('/'):
-                        parsed_current = urlparse(current_url)
-                        next_url = f"{parsed_current.scheme}://{parsed_current.netloc}{next_url}"
-                    current_url = self.enforce_inline_dm_l(next_url)
-                    page_number += 1
-                    self.log(f"次のページURL: {next_url}")
-                else:
+                next_url = self._extract_next_page_url(html_content, current_url)
+                if not next_url:
                     self.log("Nextボタンが見つかりませんでした。最終ページです。")
                     break
 
+                self.log(f"次のページURL: {next_url}")
+                current_url = self.enforce_inline_dm_l(next_url)
+                page_number += 1
+
         except Exception as e:
-            self.log(f"予期せぬ解析エラー: {e}\n{traceback.format_exc()}")
-            self.root.after(0, self._handle_parsing_error, f"解析エラー: {e}")
+            self.log(f"ページ取得スレッドエラー: {e}\n{traceback.format_exc()}")
+            self._put_crawl_item(page_queue, crawl_done,
+                                 ('error', page_number, current_url, f"解析エラー: {e}"))
         finally:
-            final_count = len(self.gallery_data)
-            self.root.after(0, self._finalize_parsing, final_count, current_thread_count)
+            self._put_crawl_item(page_queue, crawl_done, ('end', page_number, current_url, None))
+
+    def _put_crawl_item(self, page_queue, crawl_done, item):
+        """解析スレッドが終了していない限り、キューに空きが出るまで待って投入する"""
+        while not crawl_done.is_set():
+            try:
+                page_queue.put(item, timeout=0.2)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _wait_crawl_interval(self, seconds, crawl_done):
+        """ページ取得間隔の待機（中断・解析終了で即座に抜ける）"""
+        deadline = time.monotonic() + seconds
+        while not (self.stop_event.is_set() or crawl_done.is_set()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            crawl_done.wait(min(remaining, 0.2))
+        return False
+
+    def _extract_next_page_url(self, html_content, current_url):
+        """検索結果HTMLから次ページ（unext）の絶対URLを取得"""
+        next_match = re.search(r'<a id="unext" href="(.*?)">Next &gt;</a>', html_content)
+        if not next_match:
+            return None
+        next_url = next_match.group(1).replace('&amp;', '&')
+        if next_url.startswith('/'):
+            parsed_current = urlparse(current_url)
+            next_url = f"{parsed_current.scheme}://{parsed_current.netloc}{next_url}"
+        return next_url
+
+    def _restore_from_crawl_db(self):
+        """クロールDBから解析結果と最新のクロールカーソルを復元"""
+        if not self.crawl_db:
+            return
+        try:
+            galleries = self.crawl_db.load_galleries()
+            if galleries:
+                self.gallery_data = galleries
+                self.processed_galleries = self.crawl_db.gallery_keys()
+                self.processed_urls = {g['url'] for g in galleries if g.get('url')}
+                self.last_gallery_id = galleries[-1].get('id')
+                self.last_gallery_token = galleries[-1].get('token')
+                # ⭐Treeviewへの追加は起動後にチャンク単位で行う（コンストラクタをブロックしない）⭐
+                self._restore_rows_job = self.root.after(0, self._insert_restored_rows, 0)
+                self.log(f"クロールDBから {len(galleries)} 件を復元しました")
+
+            cursor = self.crawl_db.get_latest_cursor()
+            if cursor:
+                self.current_search_url = cursor['search_url']
+                self.last_url_var.set(cursor['last_url'])
+                self.continue_button.configure(state=tk.NORMAL)
+        except Exception as e:
+            self.log(f"クロールDB復元エラー: {e}")
+
+    def _insert_restored_rows(self, start):
+        """復元した解析結果をTreeviewへチャンク単位で追加（GUIスレッド）"""
+        self._restore_rows_job = None
+        end = min(start + self.BACKUP_CHUNK_SIZE, len(self.gallery_data))
+        for idx in range(start, end):
+            item_data = self.gallery_data[idx]
+            if not item_data or not item_data.get("url"):
+                continue
+            item_id = self.tree.insert("", tk.END, values=self._build_tree_values(idx, item_data))
+            if item_data["url"] in self.checked_items:
+                self.tree.item(item_id, tags=("checked",))
+
+        if end < len(self.gallery_data):
+            self.set_status(f"解析結果を復元中... {end}/{len(self.gallery_data)}件")
+            self._restore_rows_job = self.root.after(1, self._insert_restored_rows, end)
+        else:
+            self._refresh_result_summary()
+            self.update_status()
+
+    def _cancel_restore_rows(self):
+        """復元中のTreeview追加を中止（一覧を作り直す処理の前に呼ぶ）"""
+        if self._restore_rows_job is not None:
+            try:
+                self.root.after_cancel(self._restore_rows_job)
+            except Exception:
+                pass
+            self._restore_rows_job = None
+
+    def _lookup_crawl_cursor(self, search_url):
+        """検索URLに対応するクロールカーソルを取得"""
+        if not self.crawl_db or not search_url:
+            return None
+        try:
+            return self.crawl_db.get_cursor(self.enforce_inline_dm_l(search_url))
+        except Exception as e:
+            self.log(f"クロールカーソル取得エラー: {e}")
+            return None
+
+    def _save_crawl_cursor(self, page_url):
+        """現在の検索URLのクロールカーソルを更新（解析スレッドから呼ばれる）"""
+        if not self.crawl_db or not self.current_search_url:
+            return
+        try:
+            self.crawl_db.save_cursor(self.current_search_url, page_url,
+                                      self.last_gallery_id, self.last_gallery_token)
+        except Exception as e:
+            self.log(f"クロールカーソル保存エラー: {e}")
+
+    def _persist_crawled_galleries(self, galleries):
+        """1ページ分の新規ギャラリーをクロールDBへ保存"""
+        if not self.crawl_db or not galleries:
+            return
+        try:
+            self.crawl_db.add_galleries(galleries)
+        except Exception as e:
+            self.log(f"クロールDB保存エラー: {e}")
 
     def _handle_parsing_error(self, error_message):
         """解析エラーの処理"""
@@ -1590,16 +1779,7 @@ class SearchResultParser:
             
             self.log("Seleniumを使用してページを取得中...")
             
-            # Chromeオプション設定
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            
-            # ドライバ初期化
-            driver = webdriver.Chrome(options=chrome_options)
-            
-            try:
+            def read_page(driver):
                 driver.get(url)
                 time.sleep(3)  # ページ読み込み待機
                 
@@ -1613,7 +1793,26 @@ class SearchResultParser:
                         self.status_code = status_code
                 
                 return MockResponse(html_content)
-                
+            
+            # ⭐メインウィンドウのドライバープールがあれば再利用⭐
+            error_handler = getattr(self.parent, 'enhanced_error_handler', None)
+            selenium_handler = getattr(error_handler, 'selenium_handler', None)
+            if selenium_handler:
+                with selenium_handler.lease_driver({'timeout': 30}, timeout=120) as driver:
+                    if driver:
+                        return read_page(driver)
+            
+            # Chromeオプション設定
+            chrome_options = Options()
+            chrome_options.add_argument('--headless')
+            chrome_options.add_argument('--no-sandbox')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            
+            # ドライバ初期化
+            driver = webdriver.Chrome(options=chrome_options)
+            
+            try:
+                return read_page(driver)
             finally:
                 driver.quit()
                 
@@ -1787,19 +1986,9 @@ class SearchResultParser:
 
     def _update_result_list(self):
         """Treeviewの更新"""
-        # ページ数表示の更新
-        total_pages = len(self.gallery_data)
-        visible_pages = len(self.tree.get_children())
-        selected_pages = len(self.checked_items)
-        self.total_pages_var.set(f"取得ページ総数: {total_pages}")
-        self.selected_pages_var.set(f"選択: {selected_pages}/{visible_pages}")
-
-        # フィルターエリアと出力ボタンを有効化
-        self.enable_filter_area()
-        self.apply_filter_button.configure(state='normal')
-        if self.gallery_data:
-            self.output_button.configure(state='normal')
-            self.torrent_manager_button.configure(state='normal')
+        # 未追加の復元結果も含めて以下で反映する
+        self._cancel_restore_rows()
+        self._refresh_result_summary()
         
         yview = self.tree.yview()
         selected_items = self.tree.selection()
@@ -1813,21 +2002,7 @@ class SearchResultParser:
                 continue
 
             gallery_url = item_data.get("url")
-
-            values = [
-                "✓" if gallery_url in self.checked_items else "",  # Select列
-                str(idx + 1),  # Number列（1から始まる連番）
-                item_data.get("title", "N/A"),
-                item_data.get("genre", "N/A"),
-                item_data.get("date", "N/A"),
-                item_data.get("pages", "N/A"),
-                f"{item_data.get('favorite_score', 'N/A')}",
-                item_data.get("uploader", "N/A"),
-                ", ".join(item_data.get("tags", []))[:100] + ("..." if len(item_data.get("tags", [])) > 3 else ""),
-                gallery_url,
-                "あり" if item_data.get('torrent') else "なし",
-                item_data.get("thumbnail", "N/A")
-            ]
+            values = self._build_tree_values(idx, item_data)
             
             if gallery_url in current_items:
                 item_id = current_items[gallery_url]
@@ -1850,6 +2025,40 @@ class SearchResultParser:
         except Exception:
             pass
 
+    def _refresh_result_summary(self):
+        """件数表示とフィルター・出力ボタンの状態を更新"""
+        # ページ数表示の更新
+        total_pages = len(self.gallery_data)
+        visible_pages = len(self.tree.get_children())
+        selected_pages = len(self.checked_items)
+        self.total_pages_var.set(f"取得ページ総数: {total_pages}")
+        self.selected_pages_var.set(f"選択: {selected_pages}/{visible_pages}")
+
+        # フィルターエリアと出力ボタンを有効化
+        self.enable_filter_area()
+        self.apply_filter_button.configure(state='normal')
+        if self.gallery_data:
+            self.output_button.configure(state='normal')
+            self.torrent_manager_button.configure(state='normal')
+
+    def _build_tree_values(self, idx, item_data):
+        """Treeviewの1行分の値を生成"""
+        gallery_url = item_data.get("url")
+        return [
+            "✓" if gallery_url in self.checked_items else "",  # Select列
+            str(idx + 1),  # Number列（1から始まる連番）
+            item_data.get("title", "N/A"),
+            item_data.get("genre", "N/A"),
+            item_data.get("date", "N/A"),
+            item_data.get("pages", "N/A"),
+            f"{item_data.get('favorite_score', 'N/A')}",
+            item_data.get("uploader", "N/A"),
+            ", ".join(item_data.get("tags", []))[:100] + ("..." if len(item_data.get("tags", [])) > 3 else ""),
+            gallery_url,
+            "あり" if item_data.get('torrent') else "なし",
+            item_data.get("thumbnail", "N/A")
+        ]
+
     def on_tree_double_click(self, event):
         """Handle double-clicks on the Treeview to open gallery URLs."""
         item_id = self.tree.focus()
@@ -2069,65 +2278,69 @@ class SearchResultParser:
         else:
              _destroy()
 
+    def _collect_backup_state(self):
+        """バックアップに含める状態と設定を収集（GUIスレッドで呼ぶ）"""
+        return {
+            # ⭐削除: checked_itemsは保存しない⭐
+            'hidden_items': list(self.hidden_items),
+            
+            # フィルター関連
+            'filter_conditions': self.filter_conditions,
+            'filter_history': self.filter_history,
+            'filter_states': self.filter_states,
+            'filter_vars': {
+                'title_whitelist': self.filter_vars['title_whitelist'].get(),
+                'title_blacklist': self.filter_vars['title_blacklist'].get(),
+                'tags_whitelist': self.filter_vars['tags_whitelist'].get(),
+                'tags_blacklist': self.filter_vars['tags_blacklist'].get(),
+                'date_value': self.filter_vars['date_value'].get(),
+                'date_condition': self.filter_vars['date_condition'].get(),
+                'pages_value': self.filter_vars['pages_value'].get(),
+                'pages_condition': self.filter_vars['pages_condition'].get(),
+                'category_whitelist': self.filter_vars['category_whitelist'].get(),
+                'category_blacklist': self.filter_vars['category_blacklist'].get(),
+                'uploader_whitelist': self.filter_vars['uploader_whitelist'].get(),
+                'uploader_blacklist': self.filter_vars['uploader_blacklist'].get(),
+                'number_value': self.filter_vars['number_value'].get(),
+                'number_condition': self.filter_vars['number_condition'].get(),
+                'rating_value': self.filter_vars['rating_value'].get(),
+                'rating_condition': self.filter_vars['rating_condition'].get()
+            },
+            
+            # URL関連
+            'last_url': self.last_url_var.get(),
+            'last_gallery_id': self.last_gallery_id,
+            'last_gallery_token': self.last_gallery_token,
+            
+            # 設定値
+            'settings': {
+                'auto_thumb': self.auto_thumb_var.get(),
+                'thumb_wait': self.thumb_wait_time_var.get(),
+                'cache_size': self.cache_size_var.get(),
+                'page_wait': self.page_wait_time_var.get(),
+                'target_count': self.target_count_var.get(),
+                'skip_count': self.skip_count_var.get(),
+                'disable_thumb': self.disable_thumb_var.get()
+            }
+        }
+
     def save_data(self):
-        """データをバックアップ保存"""
+        """データをバックアップ保存（.ndjson はストリーミング形式、.json は従来形式）"""
         try:
             from datetime import datetime
             
             # タイムスタンプ付きのデフォルトファイル名
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            default_filename = f'gallery_backup_{timestamp}.json'
+            default_filename = f'gallery_backup_{timestamp}.ndjson'
             
-            save_data = {
-                # ギャラリーデータ（選択状態は保存しない）
-                'gallery_data': self.gallery_data,
-                # ⭐削除: checked_itemsは保存しない⭐
-                'hidden_items': list(self.hidden_items),
-                
-                # フィルター関連
-                'filter_conditions': self.filter_conditions,
-                'filter_history': self.filter_history,
-                'filter_states': self.filter_states,
-                'filter_vars': {
-                    'title_whitelist': self.filter_vars['title_whitelist'].get(),
-                    'title_blacklist': self.filter_vars['title_blacklist'].get(),
-                    'tags_whitelist': self.filter_vars['tags_whitelist'].get(),
-                    'tags_blacklist': self.filter_vars['tags_blacklist'].get(),
-                    'date_value': self.filter_vars['date_value'].get(),
-                    'date_condition': self.filter_vars['date_condition'].get(),
-                    'pages_value': self.filter_vars['pages_value'].get(),
-                    'pages_condition': self.filter_vars['pages_condition'].get(),
-                    'category_whitelist': self.filter_vars['category_whitelist'].get(),
-                    'category_blacklist': self.filter_vars['category_blacklist'].get(),
-                    'uploader_whitelist': self.filter_vars['uploader_whitelist'].get(),
-                    'uploader_blacklist': self.filter_vars['uploader_blacklist'].get(),
-                    'number_value': self.filter_vars['number_value'].get(),
-                    'number_condition': self.filter_vars['number_condition'].get(),
-                    'rating_value': self.filter_vars['rating_value'].get(),
-                    'rating_condition': self.filter_vars['rating_condition'].get()
-                },
-                
-                # URL関連
-                'last_url': self.last_url_var.get(),
-                'last_gallery_id': self.last_gallery_id,
-                'last_gallery_token': self.last_gallery_token,
-                
-                # 設定値
-                'settings': {
-                    'auto_thumb': self.auto_thumb_var.get(),
-                    'thumb_wait': self.thumb_wait_time_var.get(),
-                    'cache_size': self.cache_size_var.get(),
-                    'page_wait': self.page_wait_time_var.get(),
-                    'target_count': self.target_count_var.get(),
-                    'skip_count': self.skip_count_var.get(),
-                    'disable_thumb': self.disable_thumb_var.get()
-                }
-            }
+            state = self._collect_backup_state()
+            # ギャラリーデータ（選択状態は保存しない）。書き込みはワーカースレッドで行うためスナップショットを取る
+            galleries = list(self.gallery_data)
             
             file_path = filedialog.asksaveasfilename(
                 initialfile=default_filename,
-                defaultextension=".json",
-                filetypes=[("JSONファイル", "*.json"), ("すべてのファイル", "*.*")],
+                defaultextension=".ndjson",
+                filetypes=[("NDJSONファイル", "*.ndjson"), ("JSONファイル", "*.json"), ("すべてのファイル", "*.*")],
                 title="バックアップの保存"
             )
             
@@ -2135,16 +2348,61 @@ class SearchResultParser:
             self.root.focus_force()
             
             if file_path:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(save_data, f, ensure_ascii=False, indent=2)
-                self.log(f"データを保存しました: {file_path}")
+                self.save_backup_button.configure(state=tk.DISABLED)
+                threading.Thread(target=self._save_backup_worker,
+                                 args=(file_path, state, galleries),
+                                 daemon=True).start()
                 
         except Exception as e:
             self.log(f"保存エラー: {e}")
             messagebox.showerror("エラー", f"保存に失敗しました: {e}", parent=self.root)
 
+    def _save_backup_worker(self, file_path, state, galleries):
+        """バックアップ書き込み（ワーカースレッド）"""
+        error = None
+        try:
+            total = len(galleries)
+            tmp_path = f"{file_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                if file_path.lower().endswith('.json'):
+                    # 従来形式（1オブジェクト）
+                    self.set_status(f"バックアップ保存中... (0/{total})")
+                    json.dump(dict(state, gallery_data=galleries), f, ensure_ascii=False, indent=2)
+                else:
+                    header = dict(state,
+                                  format=self.BACKUP_NDJSON_FORMAT,
+                                  version=self.BACKUP_NDJSON_VERSION,
+                                  gallery_count=total)
+                    f.write(json.dumps(header, ensure_ascii=False, separators=(',', ':')))
+                    f.write('\n')
+                    for i, gallery in enumerate(galleries, 1):
+                        f.write(json.dumps(gallery, ensure_ascii=False, separators=(',', ':')))
+                        f.write('\n')
+                        if i % self.BACKUP_CHUNK_SIZE == 0:
+                            self.set_status(f"バックアップ保存中... ({i}/{total})")
+            os.replace(tmp_path, file_path)
+            self.set_status(f"バックアップ保存完了 ({total}件)")
+            self.log(f"データを保存しました: {file_path}")
+        except Exception as e:
+            error = e
+            self.log(f"保存エラー: {e}")
+        finally:
+            self.root.after(0, self._on_backup_saved, error)
+
+    def _on_backup_saved(self, error):
+        """バックアップ書き込み完了（GUIスレッド）"""
+        self.save_backup_button.configure(state=tk.NORMAL)
+        if error:
+            messagebox.showerror("エラー", f"保存に失敗しました: {error}", parent=self.root)
+
     def continue_from_last_url(self):
         """最後のURLから継続"""
+        # 入力中の検索URLにクロールカーソルがあれば、そこから継続する
+        cursor = self._lookup_crawl_cursor(self.url_entry.get().strip())
+        if cursor:
+            self.current_search_url = cursor['search_url']
+            self.last_url_var.set(cursor['last_url'])
+
         if not self.last_url_var.get():
             self.log("再開可能な解析情報がありません。")
             return
@@ -2172,73 +2430,206 @@ class SearchResultParser:
         # URLを入力フィールドに設定してから解析開始
         self.url_entry.delete(0, tk.END)
         self.url_entry.insert(0, self.last_url_var.get())
-        self.start_parsing_internal(self.last_url_var.get())
+        self.start_parsing_internal(self.last_url_var.get(), search_url=self.current_search_url)
 
     def load_data(self):
-        """バックアップからデータを読み込み"""
+        """バックアップからデータを読み込み（NDJSON・従来JSONの両形式に対応）"""
         try:
             file_path = filedialog.askopenfilename(
-                filetypes=[("JSONファイル", "*.json"), ("すべてのファイル", "*.*")],
+                filetypes=[("バックアップファイル", "*.ndjson *.json"), ("NDJSONファイル", "*.ndjson"),
+                           ("JSONファイル", "*.json"), ("すべてのファイル", "*.*")],
                 title="バックアップの読み込み"
             )
             
             if file_path:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    save_data = json.load(f)
+                if self.is_parsing:
+                    messagebox.showwarning("警告", "解析中はバックアップを読み込めません。", parent=self.root)
+                    return
+
+                # 現在のデータは読み込みに成功した時点で置き換える（失敗時はそのまま残す）
+                self.load_backup_button.configure(state=tk.DISABLED)
+                self.set_status("バックアップ読み込み中...")
+
+                load_queue = Queue(maxsize=4)
+                threading.Thread(target=self._load_backup_worker,
+                                 args=(file_path, load_queue),
+                                 daemon=True).start()
+                self.root.after(10, self._poll_backup_load, file_path, load_queue)
                 
-                # ギャラリーデータと選択状態の復元
-                self.gallery_data = save_data['gallery_data']
+        except Exception as e:
+            self.log(f"読み込みエラー: {e}")
+            messagebox.showerror("エラー", f"読み込みに失敗しました: {e}", parent=self.root)
+
+    def _load_backup_worker(self, file_path, load_queue):
+        """
+        バックアップ読み込み（ワーカースレッド）
+
+        ファイル全体の解析・検証とクロールDBの置き換えが成功してから
+        load_queue へ ('state', dict) → ('rows', list, 進捗率) ... → ('done', None) を投入する。
+        解析中は ('progress', 進捗率)、エラー時は ('error', 例外) で、既存のデータには触れない。
+        """
+        try:
+            header, galleries = self._read_backup_file(file_path, load_queue)
+            if self.crawl_db:
+                # 削除と追加は1トランザクション（失敗時は既存のクロールDBが残る）
+                self.crawl_db.replace_galleries(galleries)
+        except Exception as e:
+            load_queue.put(('error', e))
+            return
+
+        load_queue.put(('state', header))
+        total = max(len(galleries), 1)
+        for start in range(0, len(galleries), self.BACKUP_CHUNK_SIZE):
+            chunk = galleries[start:start + self.BACKUP_CHUNK_SIZE]
+            load_queue.put(('rows', chunk, (start + len(chunk)) / total))
+        load_queue.put(('done', None))
+
+    def _read_backup_file(self, file_path, load_queue):
+        """バックアップファイルを解析・検証して (ヘッダー, ギャラリーのリスト) を返す"""
+        file_size = max(os.path.getsize(file_path), 1)
+        with open(file_path, 'rb') as f:
+            first_line = f.readline()
+            header = None
+            try:
+                candidate = json.loads(first_line)
+                if isinstance(candidate, dict) and candidate.get('format') == self.BACKUP_NDJSON_FORMAT:
+                    header = candidate
+            except ValueError:
+                pass
+
+            galleries = []
+            if header is not None:
+                bytes_read = len(first_line)
+                for line_number, raw_line in enumerate(f, start=2):
+                    bytes_read += len(raw_line)
+                    if not raw_line.strip():
+                        continue
+                    try:
+                        gallery = json.loads(raw_line)
+                    except ValueError as e:
+                        raise ValueError(f"{line_number}行目を解析できません: {e}")
+                    if not isinstance(gallery, dict):
+                        raise ValueError(f"{line_number}行目がギャラリーデータではありません")
+                    galleries.append(gallery)
+                    if len(galleries) % self.BACKUP_CHUNK_SIZE == 0:
+                        load_queue.put(('progress', bytes_read / file_size))
+            else:
+                # 従来形式: ファイル全体が1つのJSONオブジェクト
+                f.seek(0)
+                try:
+                    header = json.load(f)
+                except ValueError as e:
+                    raise ValueError(f"バックアップファイルの形式ではありません: {e}")
+                if not isinstance(header, dict) or not isinstance(header.get('gallery_data', []), list):
+                    raise ValueError("バックアップファイルの形式ではありません")
+                galleries = header.pop('gallery_data', [])
+                if not all(isinstance(gallery, dict) for gallery in galleries):
+                    raise ValueError("ギャラリーデータの形式が不正です")
+        return header, galleries
+
+    def _poll_backup_load(self, file_path, load_queue):
+        """ワーカーから届いたチャンクをTreeviewへ反映（GUIスレッド）"""
+        try:
+            # 1回のポーリングでは1チャンクのみ処理してイベントループに制御を返す
+            item = load_queue.get_nowait()
+        except Empty:
+            self.root.after(10, self._poll_backup_load, file_path, load_queue)
+            return
+
+        kind = item[0]
+        try:
+            if kind == 'progress':
+                self.set_status(f"バックアップ解析中... {int(item[1] * 100)}%")
+            elif kind == 'state':
+                # 読み込みに成功したので現在のデータを置き換える
+                self._cancel_restore_rows()
+                self.gallery_data = []
+                self.processed_urls = set()
+                self.processed_galleries = set()
                 # ⭐修正: checked_itemsは復元せず、常に空のsetで初期化⭐
-                # self.checked_items = set(save_data['checked_items'])  # 削除
-                self.checked_items = set()  # 常に空で初期化
-                print(f"[DEBUG] Parser: load_data()でchecked_itemsを空に初期化: {self.checked_items}")
-                
-                self.hidden_items = set(save_data['hidden_items'])
-                
-                # フィルター関連の復元
-                self.filter_conditions = save_data['filter_conditions']
-                self.filter_history = save_data.get('filter_history', [])
-                self.filter_states = save_data.get('filter_states', {})
-                
-                # フィルター変数の復元
-                if 'filter_vars' in save_data:
-                    for key, value in save_data['filter_vars'].items():
-                        if key in self.filter_vars:
-                            self.filter_vars[key].set(value)
-                
-                # URL関連の復元
-                self.last_url_var.set(save_data.get('last_url', ''))
-                self.last_gallery_id = save_data.get('last_gallery_id')
-                self.last_gallery_token = save_data.get('last_gallery_token')
-                
-                # 設定値の復元
-                if 'settings' in save_data:
-                    settings = save_data['settings']
-                    self.auto_thumb_var.set(settings.get('auto_thumb', False))
-                    self.thumb_wait_time_var.set(settings.get('thumb_wait', 0.3))
-                    self.cache_size_var.set(settings.get('cache_size', 500))
-                    self.page_wait_time_var.set(settings.get('page_wait', 2.0))
-                    self.target_count_var.set(settings.get('target_count', 10))
-                    self.skip_count_var.set(settings.get('skip_count', 0))
-                    self.disable_thumb_var.set(settings.get('disable_thumb', False))
-                
-                # Treeviewの更新
-                self._update_result_list()
-                self.log(f"データを読み込みました: {file_path}")
-                
-                # ボタン状態の更新
-                if self.gallery_data:
-                    self.output_button.configure(
-                        text="解析結果を出力",
-                        state=tk.NORMAL,
-                        command=self.export_results
-                    )
-                    self.enable_filter_area()
-                    self.apply_filter_button.configure(state='normal')
-                
+                self.checked_items = set()
+                self.tree.delete(*self.tree.get_children())
+                self._apply_backup_state(item[1])
+            elif kind == 'rows':
+                rows, progress = item[1], item[2]
+                self._append_loaded_galleries(rows)
+                self.set_status(f"バックアップ読み込み中... {int(progress * 100)}% ({len(self.gallery_data)}件)")
+            elif kind == 'done':
+                self._finish_backup_load(file_path)
+                return
+            elif kind == 'error':
+                raise item[1]
         except Exception as e:
+            self.load_backup_button.configure(state=tk.NORMAL)
+            self.set_status("読み込み失敗")
             self.log(f"読み込みエラー: {e}")
             messagebox.showerror("エラー", f"読み込みに失敗しました: {e}", parent=self.root)
+            return
+
+        self.root.after(1, self._poll_backup_load, file_path, load_queue)
+
+    def _apply_backup_state(self, save_data):
+        """バックアップのヘッダー（状態・設定）を復元"""
+        self.hidden_items = set(save_data.get('hidden_items', []))
+        
+        # フィルター関連の復元
+        self.filter_conditions = save_data.get('filter_conditions', {})
+        self.filter_history = save_data.get('filter_history', [])
+        self.filter_states = save_data.get('filter_states', {})
+        
+        # フィルター変数の復元
+        if 'filter_vars' in save_data:
+            for key, value in save_data['filter_vars'].items():
+                if key in self.filter_vars:
+                    self.filter_vars[key].set(value)
+        
+        # URL関連の復元
+        self.last_url_var.set(save_data.get('last_url', ''))
+        self.last_gallery_id = save_data.get('last_gallery_id')
+        self.last_gallery_token = save_data.get('last_gallery_token')
+        
+        # 設定値の復元
+        if 'settings' in save_data:
+            settings = save_data['settings']
+            self.auto_thumb_var.set(settings.get('auto_thumb', False))
+            self.thumb_wait_time_var.set(settings.get('thumb_wait', 0.3))
+            self.cache_size_var.set(settings.get('cache_size', 500))
+            self.page_wait_time_var.set(settings.get('page_wait', 2.0))
+            self.target_count_var.set(settings.get('target_count', 10))
+            self.skip_count_var.set(settings.get('skip_count', 0))
+            self.disable_thumb_var.set(settings.get('disable_thumb', False))
+
+    def _append_loaded_galleries(self, galleries):
+        """読み込んだギャラリーを追加し、Treeviewへ末尾追加のみで反映"""
+        start_index = len(self.gallery_data)
+        self.gallery_data.extend(galleries)
+        for offset, item_data in enumerate(galleries):
+            if not item_data or not item_data.get("url"):
+                continue
+            self.processed_galleries.add(f"{item_data.get('id')}_{item_data.get('token')}")
+            self.processed_urls.add(item_data["url"])
+            self.tree.insert("", tk.END, values=self._build_tree_values(start_index + offset, item_data))
+        self.total_pages_var.set(f"取得ページ総数: {len(self.gallery_data)}")
+
+    def _finish_backup_load(self, file_path):
+        """バックアップ読み込み完了時の処理"""
+        self.load_backup_button.configure(state=tk.NORMAL)
+        # 行はチャンクごとに追加済みのため、表示数のみ更新する
+        self.total_pages_var.set(f"取得ページ総数: {len(self.gallery_data)}")
+        self.update_status()
+        self.set_status(f"バックアップ読み込み完了 ({len(self.gallery_data)}件)")
+        self.log(f"データを読み込みました: {file_path}")
+        
+        # ボタン状態の更新
+        if self.gallery_data:
+            self.output_button.configure(
+                text="解析結果を出力",
+                state=tk.NORMAL,
+                command=self.export_results
+            )
+            self.torrent_manager_button.configure(state='normal')
+            self.enable_filter_area()
+            self.apply_filter_button.configure(state='normal')
 
     def toggle_item_selection(self, item_id):
         """アイテムのチェック状態を切り替え"""
@@ -0,0 +1,420 @@
+# -*- coding: utf-8 -*-
+"""
+Image operations for EH Downloader
+
+GUIに依存しない画像処理関数群。後処理ステージのプロセスプールから呼び出されるため、
+Tk変数やGUIオブジェクトを参照せず、引数のみで動作する。
+各関数はログ出力の代わりにメッセージのリストを返す。
+"""
+
+import os
+import struct
+import time
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+# 補完モード名 → PILのリサンプリング名
+INTERPOLATION_NAMES = {
+    "三次補完（画質優先）": "LANCZOS",
+    "LANCZOS": "LANCZOS",
+    "BILINEAR": "BILINEAR",
+    "NEAREST": "NEAREST",
+    "二次補完（速度優先）": "BILINEAR",
+    "最近傍補完": "NEAREST",
+}
+
+# リサイズモード → resize_values のキー
+_RESIZE_VALUE_KEYS = {
+    "縦幅上限": "height",
+    "横幅上限": "width",
+    "長辺上限": "long",
+    "短辺上限": "short",
+    "長辺下限": "long",
+    "短辺下限": "short",
+    "長辺基準": "long",
+    "短辺基準": "short",
+    "比率": "percentage",
+    "パーセント": "percentage",
+}
+
+# 比率リサイズで許容する最大辺
+MAX_SAFE_SIZE = 10000
+
+# 高速縮小で最終フィルタに渡す画像の最小倍率（目標サイズに対する倍率）
+# JPEGのドラフトデコード（DCTスケーリング 1/2・1/4・1/8）と Image.reduce による
+# 整数倍の縮小は、結果が目標サイズのこの倍率以上に収まる範囲でのみ行う。
+# 最終フィルタ（LANCZOS等）は常に目標の2倍以上の画像から縮小するため、
+# 通常の縮小との差はエッジの僅かな鈍りに留まる（3.0以上ではほぼ区別できない）。
+FAST_DOWNSCALE_GAP = 2.0
+
+
+def get_resample_filter(interpolation_mode: str):
+    """補完モード名からPILのリサンプリングフィルタを取得"""
+    from PIL import Image
+    name = INTERPOLATION_NAMES.get(interpolation_mode, "LANCZOS")
+    resampling = getattr(Image, 'Resampling', Image)
+    return getattr(resampling, name)
+
+
+def get_target_size(resize_mode: str, resize_values: Dict[str, Any]) -> Optional[float]:
+    """リサイズモードに対応する目標値を取得（無効な場合None）"""
+    key = _RESIZE_VALUE_KEYS.get(resize_mode, "unified")
+    value = resize_values.get(key, "100" if key == "percentage" else "0")
+    try:
+        target_size = float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    return target_size if target_size > 0 else None
+
+
+def compute_resized_dimensions(width: int, height: int, resize_mode: str,
+                               target_size: float) -> Optional[Tuple[int, int]]:
+    """
+    リサイズ後のサイズを計算
+
+    Returns:
+        (幅, 高さ)。リサイズ不要な場合はNone
+    """
+    if resize_mode == "縦幅上限":
+        if height > target_size:
+            ratio = target_size / height
+            return int(width * ratio), int(target_size)
+        return None
+
+    if resize_mode == "横幅上限":
+        if width > target_size:
+            ratio = target_size / width
+            return int(target_size), int(height * ratio)
+        return None
+
+    if resize_mode in ("長辺上限", "長辺基準"):
+        longer_side = max(width, height)
+        if longer_side > target_size:
+            ratio = target_size / longer_side
+            return int(width * ratio), int(height * ratio)
+        return None
+
+    if resize_mode in ("短辺上限", "短辺基準"):
+        shorter_side = min(width, height)
+        if shorter_side > target_size:
+            ratio = target_size / shorter_side
+            return int(width * ratio), int(height * ratio)
+        return None
+
+    if resize_mode == "長辺下限":
+        longer_side = max(width, height)
+        if longer_side < target_size:
+            ratio = target_size / longer_side
+            return int(width * ratio), int(height * ratio)
+        return None
+
+    if resize_mode == "短辺下限":
+        shorter_side = min(width, height)
+        if shorter_side < target_size:
+            ratio = target_size / shorter_side
+            return int(width * ratio), int(height * ratio)
+        return None
+
+    if resize_mode in ("比率", "パーセント"):
+        ratio = target_size / 100.0
+        new_size = (int(width * ratio), int(height * ratio))
+        if max(new_size) > MAX_SAFE_SIZE:
+            return None
+        return new_size
+
+    # 統一（長辺を目標値に揃える）
+    longer_side = max(width, height)
+    if longer_side > target_size:
+        ratio = target_size / longer_side
+        return int(width * ratio), int(height * ratio)
+    return None
+
+
+def _is_jpeg_path(path: str) -> bool:
+    return path.lower().endswith(('.jpg', '.jpeg'))
+
+
+# ----------------------------------------------------------------------
+# アニメーション判定（コンテナヘッダーのみを読む。画素データはデコードしない）
+# ----------------------------------------------------------------------
+
+def _gif_has_multiple_frames(data: bytes) -> bool:
+    """GIFのブロック構造を走査し、画像ディスクリプタが2つ以上あるか判定"""
+    if len(data) < 13:
+        return False
+    pos = 13
+    flags = data[10]
+    if flags & 0x80:
+        pos += 3 * (2 << (flags & 0x07))
+
+    frames = 0
+    size = len(data)
+    while pos < size:
+        block = data[pos]
+        if block == 0x3B:  # トレーラー
+            break
+        if block == 0x21:  # 拡張ブロック
+            pos += 2
+        elif block == 0x2C:  # 画像ディスクリプタ
+            frames += 1
+            if frames > 1:
+                return True
+            if pos + 10 > size:
+                break
+            local_flags = data[pos + 9]
+            pos += 10
+            if local_flags & 0x80:
+                pos += 3 * (2 << (local_flags & 0x07))
+            pos += 1  # LZW最小コードサイズ
+        else:
+            break
+        # サブブロックを読み飛ばす
+        while pos < size:
+            length = data[pos]
+            pos += 1
+            if length == 0:
+                break
+            pos += length
+    return False
+
+
+def _png_has_multiple_frames(data: bytes) -> bool:
+    """APNGの acTL チャンク（IDATより前に置かれる）を確認"""
+    pos = 8
+    size = len(data)
+    while pos + 8 <= size:
+        length, chunk_type = struct.unpack('>I4s', data[pos:pos + 8])
+        if chunk_type == b'acTL':
+            if pos + 12 > size:
+                return False
+            return struct.unpack('>I', data[pos + 8:pos + 12])[0] > 1
+        if chunk_type in (b'IDAT', b'IEND'):
+            return False
+        pos += 12 + length
+    return False
+
+
+def detect_animation(data: bytes) -> bool:
+    """
+    画像データがアニメーション画像かを判定
+
+    GIF/APNG/WebPのコンテナヘッダーだけを読むため、画像のデコードは行わない。
+    """
+    if not data:
+        return False
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return _gif_has_multiple_frames(data)
+    if data[:8] == b'\x89PNG\r\n\x1a\n':
+        return _png_has_multiple_frames(data)
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        # VP8X チャンクのアニメーションフラグ
+        return data[12:16] == b'VP8X' and len(data) > 20 and bool(data[20] & 0x02)
+    return False
+
+
+# ----------------------------------------------------------------------
+# 変換・リサイズ
+# ----------------------------------------------------------------------
+
+def _flatten_to_rgb(img):
+    """JPG保存用にRGBへ変換（透過情報を持つ画像は白背景に合成）"""
+    from PIL import Image
+    if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
+        bg = Image.new('RGB', img.size, (255, 255, 255))
+        bg.paste(img, mask=img.split()[3])
+        return bg
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+def _save_jpeg(img, target_path: str, quality: int):
+    """一時ファイル経由でJPG保存"""
+    temp_path = target_path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            img.save(f, 'JPEG', quality=quality)
+        os.replace(temp_path, target_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _write_bytes(data: bytes, target_path: str):
+    temp_path = target_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, target_path)
+
+
+def _request_jpeg_draft(img, new_size: Tuple[int, int], reducing_gap: float):
+    """
+    JPEGデコーダーに縮小デコード（ドラフト）を要求
+
+    画素データを読み込む前のJPEG画像に対してのみ有効。
+    要求サイズは目標の reducing_gap 倍とし、それ以上の大きさで最も小さいスケールが選ばれる。
+    """
+    if getattr(img, 'format', None) != 'JPEG' or reducing_gap <= 0:
+        return
+    request = (int(new_size[0] * reducing_gap), int(new_size[1] * reducing_gap))
+    if request[0] < img.size[0] and request[1] < img.size[1]:
+        img.draft(img.mode, request)
+
+
+def _resize_decoded(img, image_path: str, resize: Dict[str, Any],
+                    allow_draft: bool = False) -> Tuple[bool, List[str]]:
+    """
+    デコード済み画像からリサイズ画像を保存
+
+    Args:
+        allow_draft: 画素未読み込みのJPEGに対し、縮小デコードを使ってよいか
+
+    Returns:
+        (成功したか（リサイズ不要の場合もTrue）, ログメッセージのリスト)
+    """
+    messages: List[str] = []
+    resize_mode = resize['resize_mode']
+    target_size = get_target_size(resize_mode, resize.get('resize_values') or {})
+    if target_size is None:
+        messages.append("リサイズ値が無効です。リサイズをスキップします。リサイズ設定を確認してください。")
+        return False, messages
+
+    original_width, original_height = img.size
+    new_size = compute_resized_dimensions(original_width, original_height, resize_mode, target_size)
+    if new_size is None:
+        messages.append(f"リサイズは不要です（条件を満たしていません）: {os.path.basename(image_path)}")
+        return True, messages
+
+    # ⭐大きな縮小はドラフトデコードと整数倍縮小で先に小さくしてから最終フィルタを掛ける⭐
+    reducing_gap = resize.get('reducing_gap', FAST_DOWNSCALE_GAP)
+    downscale = new_size[0] < original_width and new_size[1] < original_height
+    if downscale and allow_draft:
+        _request_jpeg_draft(img, new_size, reducing_gap)
+
+    resample = get_resample_filter(resize.get('interpolation_mode', "三次補完（画質優先）"))
+    if downscale and reducing_gap and reducing_gap > 0:
+        resized_img = img.resize(new_size, resample, reducing_gap=reducing_gap)
+    else:
+        resized_img = img.resize(new_size, resample)
+
+    target_path = resize.get('save_path') or image_path
+    target_dir = os.path.dirname(target_path)
+    if target_dir:
+        os.makedirs(target_dir, exist_ok=True)
+
+    if _is_jpeg_path(target_path):
+        _save_jpeg(_flatten_to_rgb(resized_img), target_path, resize.get('jpg_quality', 85))
+    else:
+        resized_img.save(target_path)
+
+    messages.append(
+        f"リサイズが完了しました: {original_width}x{original_height} → "
+        f"{new_size[0]}x{new_size[1]} ({os.path.basename(target_path)})"
+    )
+    return True, messages
+
+
+def resize_image_file(image_path: str, resize_mode: str, resize_values: Dict[str, Any],
+                      save_path: Optional[str] = None,
+                      interpolation_mode: str = "三次補完（画質優先）",
+                      jpg_quality: int = 85) -> Tuple[bool, List[str]]:
+    """
+    保存済みの画像ファイルをリサイズして保存
+
+    Args:
+        image_path: 元画像のパス
+        resize_mode: リサイズモード
+        resize_values: リサイズ値の辞書
+        save_path: 保存先パス（Noneの場合は上書き）
+        interpolation_mode: 補完モード名
+        jpg_quality: JPG保存時の品質
+
+    Returns:
+        (成功したか（リサイズ不要の場合もTrue）, ログメッセージのリスト)
+    """
+    from PIL import Image
+
+    resize = {
+        'resize_mode': resize_mode,
+        'resize_values': resize_values,
+        'save_path': save_path,
+        'interpolation_mode': interpolation_mode,
+        'jpg_quality': jpg_quality,
+    }
+    with Image.open(image_path) as img:
+        return _resize_decoded(img, image_path, resize, allow_draft=True)
+
+
+def transform_image_data(data: bytes, target_path: str, quality: Optional[int] = None,
+                         resize: Optional[Dict[str, Any]] = None) -> Tuple[bool, List[Tuple[str, str]]]:
+    """
+    メモリ上の画像データを1回だけデコードし、必要な出力をまとめて生成
+
+    Args:
+        data: ダウンロードした画像データ
+        target_path: 保存先パス
+        quality: JPG変換する場合の品質（Noneの場合、target_pathには保存済みとみなす）
+        resize: リサイズ設定（resize_image_file と同じキー、Noneの場合はリサイズしない）
+
+    Returns:
+        (リサイズに成功したか, (メッセージ, レベル) のリスト)
+    """
+    from PIL import Image
+
+    resized = False
+    messages: List[Tuple[str, str]] = []
+    with Image.open(BytesIO(data)) as img:
+        source = img
+        if quality is not None:
+            try:
+                source = _flatten_to_rgb(img)
+                _save_jpeg(source, target_path, quality)
+                messages.append((f"JPG形式で保存（品質: {quality}%）: {os.path.basename(target_path)}", "info"))
+            except Exception as e:
+                # 変換できない場合は元データをそのまま保存（従来の挙動と同じ）
+                messages.append((f"JPG変換エラー: {e}, 通常の方法で保存します。", "info"))
+                _write_bytes(data, target_path)
+                source = img
+
+        if resize:
+            try:
+                # JPG変換済み（フル解像度でデコード済み）の場合はドラフトを使えない
+                resized, resize_messages = _resize_decoded(
+                    source, target_path, resize, allow_draft=source is img and quality is None)
+                messages.extend((message, "debug") for message in resize_messages)
+            except Exception as e:
+                messages.append((f"リサイズ処理エラー: {e}", "warning"))
+    return resized, messages
+
+
+def run_post_process_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    後処理ジョブを実行（プロセスプールのエントリポイント）
+
+    job:
+        'transform': transform_image_data の引数（ダウンロード直後の画像、任意）
+        'resize': resize_image_file の引数（保存済みファイルのリサイズ、任意）
+
+    Returns:
+        {'resized': リサイズに成功したか, 'messages': [(メッセージ, レベル), ...], 'elapsed': 処理時間（秒）}
+    """
+    started = time.perf_counter()
+    result = {'resized': False, 'messages': []}
+
+    transform = job.get('transform')
+    if transform:
+        resized, messages = transform_image_data(**transform)
+        result['resized'] = resized
+        result['messages'].extend(messages)
+
+    resize = job.get('resize')
+    if resize:
+        resized, messages = resize_image_file(**resize)
+        result['resized'] = result['resized'] or resized
+        result['messages'].extend((message, "debug") for message in messages)
+
+    result['elapsed'] = time.perf_counter() - started
+    return result